@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Tiered Article Fetcher
+Fetches article HTML with a pooled HTTP GET first and only falls back to the
+Playwright browser when that response is unusable.
+
+Most DVIDS and Military Times article bodies are in the server-rendered
+HTML, so the browser tier is only needed when the HTTP response
+- has an error or bot-wall status (403, 429, ...), or
+- is missing the content selectors the extractor relies on (empty body, or
+  a challenge / access denied page)
+
+Per-source counts of each tier and each escalation reason are kept, so the
+savings can be reported at the end of a run. Pages from either tier can also
+be kept in an HTMLArchive for offline re-parsing.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import etree, html as lxml_html
+
+USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+BOT_WALL_STATUSES = {401, 403, 429, 503}
+BOT_WALL_MARKERS = (
+    'access denied',
+    'just a moment...',
+    'cf-browser-verification',
+    'challenge-platform',
+    'captcha',
+    'pardon our interruption',
+    'request unsuccessful. incapsula',
+)
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Content check -> XPath that is true when the body the extractor reads is present
+CONTENT_CHECKS = {
+    # extract_article: first direct <p> of div.asset_container / div.asset_news_container
+    'dvids': etree.XPath(
+        f"boolean(//div[{_has_class('asset_container')} or {_has_class('asset_news_container')}]"
+        f"/p[normalize-space()])"),
+    # extract_article: <p> under div.article-content / div.entry-content, else <article>
+    'military_times': etree.XPath(
+        f"boolean(//div[{_has_class('article-content')} or {_has_class('entry-content')}]//p[normalize-space()]"
+        f" | //article//p[normalize-space()])"),
+}
+
+
+class TieredFetcher:
+    """HTTP-first HTML fetcher with a browser fallback and per-tier hit stats (thread-safe)"""
+
+    def __init__(self, browser_fetch: Callable[[str], Optional[str]],
+                 session: Optional[requests.Session] = None, timeout: int = 20, pool_size: int = 4,
+                 rate_limiter=None, archive=None):
+        """
+        Args:
+            browser_fetch: Called with the URL when HTTP is not usable; returns
+                           rendered HTML or None
+            session: Shared HTTP session (a pooled one is created if None)
+            timeout: HTTP request timeout in seconds
+            pool_size: Connections kept per host
+            rate_limiter: Object with wait(), called before every HTTP request
+            archive: HTMLArchive that fetched pages are stored in (None: off)
+        """
+        self.browser_fetch = browser_fetch
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.archive = archive
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({
+                'User-Agent': USER_AGENT,
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.9',
+            })
+        self.session = session
+        self.stats: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._stats_lock = threading.Lock()
+
+    def fetch(self, url: str, source: str, check: str) -> Optional[str]:
+        """
+        Return the article HTML, or None if both tiers fail
+
+        Args:
+            url: Article URL
+            source: Stats bucket (e.g. 'dvids', 'armytimes')
+            check: Key in CONTENT_CHECKS for this page type
+        """
+        html, reason = self._fetch_http(url, CONTENT_CHECKS[check])
+        if html is not None:
+            self._count(source, 'http')
+            self._archive(url, html, source)
+            return html
+
+        self._count(source, f'escalated_{reason}')
+        try:
+            html = self.browser_fetch(url)
+        except Exception:
+            html = None
+
+        self._count(source, 'browser' if html else 'failed')
+        if html:
+            self._archive(url, html, source)
+        return html
+
+    def _archive(self, url: str, html: str, source: str):
+        if not self.archive:
+            return
+        try:
+            self.archive.put(url, html, source)
+        except Exception as e:
+            # Losing an archive copy must not lose the article
+            print(f"   ⚠️  Archive write failed for {url[:60]}: {str(e)[:50]}")
+
+    def _count(self, source: str, key: str):
+        with self._stats_lock:
+            self.stats[source][key] += 1
+
+    def _fetch_http(self, url: str, content_check) -> tuple:
+        """Returns (html, None) when usable, else (None, escalation reason)"""
+        if self.rate_limiter:
+            self.rate_limiter.wait()
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.exceptions.RequestException:
+            return None, 'http_error'
+
+        if response.status_code in BOT_WALL_STATUSES:
+            return None, 'bot_wall'
+        if response.status_code != 200 or not response.content:
+            return None, 'http_error'
+
+        try:
+            doc = lxml_html.document_fromstring(response.content)
+        except (etree.ParserError, ValueError):
+            return None, 'empty_body'
+
+        if not content_check(doc):
+            # Challenge pages never carry the article body; only label them
+            if any(marker in response.text[:5000].lower() for marker in BOT_WALL_MARKERS):
+                return None, 'bot_wall'
+            return None, 'empty_body'
+
+        return response.text, None
+
+    def print_stats(self):
+        """Print each tier's hit rate per source"""
+        if not self.stats:
+            return
+
+        print(f"\n{'='*70}")
+        print("📡 FETCH TIERS")
+        print(f"{'='*70}")
+        for source, stats in sorted(self.stats.items()):
+            total = stats['http'] + stats['browser'] + stats['failed']
+            if not total:
+                continue
+            reasons = ', '.join(f"{key[len('escalated_'):]}: {value}"
+                                for key, value in sorted(stats.items()) if key.startswith('escalated_'))
+            print(f"{source:20} HTTP {stats['http']:>6,} ({stats['http'] / total:6.1%})  "
+                  f"browser {stats['browser']:>6,} ({stats['browser'] / total:6.1%})  "
+                  f"failed {stats['failed']:>4,}")
+            if reasons:
+                print(f"{'':20} escalations - {reasons}")
+        print(f"{'='*70}\n")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Award Output Sinks
+Append-only writers for GWAC award records with a fixed schema.
+
+Rows are written as they arrive instead of being collected and dumped at
+the end, so the writer never needs the full list and a crash mid-run leaves
+everything written so far readable:
+
+- CSVSink / NDJSONSink flush after every write
+- ParquetSink writes a directory of complete part files, one per row group
+  (read it back with pandas.read_parquet(directory))
+"""
+
+import csv
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Same keys, in the same order, as GWACHistoricalScraper._build_award_record
+AWARD_FIELDS = [
+    'gwac_key', 'gwac_name', 'gwac_parent_contract', 'award_id',
+    'recipient_name', 'recipient_uei', 'recipient_duns', 'recipient_city', 'recipient_state',
+    'award_amount', 'total_outlayed', 'start_date', 'end_date', 'description',
+    'awarding_agency', 'awarding_sub_agency', 'award_type', 'data_source', 'scraped_at'
+]
+NUMERIC_FIELDS = {'award_amount', 'total_outlayed'}
+
+
+class AwardSink:
+    """Base sink: thread-safe write(rows) / close(), usable as a context manager"""
+
+    extension = ''
+
+    def __init__(self, path: Path, fields: Optional[List[str]] = None):
+        self.path = Path(path)
+        self.fields = fields or AWARD_FIELDS
+        self.rows_written = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, rows: List[Dict]):
+        if not rows:
+            return
+        with self._lock:
+            self._write(rows)
+            self.rows_written += len(rows)
+
+    def close(self):
+        with self._lock:
+            self._close()
+        logger.info(f"Saved {self.rows_written} records to {self.path}")
+
+    def _write(self, rows: List[Dict]):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CSVSink(AwardSink):
+    extension = 'csv'
+
+    def __init__(self, path: Path, fields: Optional[List[str]] = None):
+        super().__init__(path, fields)
+        self._file = open(self.path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fields, extrasaction='ignore')
+        self._writer.writeheader()
+        self._file.flush()
+
+    def _write(self, rows: List[Dict]):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+
+class NDJSONSink(AwardSink):
+    extension = 'ndjson'
+
+    def __init__(self, path: Path, fields: Optional[List[str]] = None):
+        super().__init__(path, fields)
+        self._file = open(self.path, 'w', encoding='utf-8')
+
+    def _write(self, rows: List[Dict]):
+        self._file.writelines(
+            json.dumps({field: row.get(field) for field in self.fields}, default=str) + '\n'
+            for row in rows
+        )
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+
+class ParquetSink(AwardSink):
+    """Buffers rows and writes each full row group as its own part file"""
+
+    extension = 'parquet'
+
+    def __init__(self, path: Path, fields: Optional[List[str]] = None, row_group_size: int = 50000):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        super().__init__(path, fields)
+        self._pa = pa
+        self._pq = pq
+        self.row_group_size = row_group_size
+        self.schema = pa.schema([
+            (field, pa.float64() if field in NUMERIC_FIELDS else pa.string())
+            for field in self.fields
+        ])
+        self.path.mkdir(exist_ok=True)
+        for old_part in self.path.glob('part-*.parquet'):
+            old_part.unlink()
+        self._buffer: List[Dict] = []
+        self._parts = 0
+
+    def _write(self, rows: List[Dict]):
+        self._buffer.extend(rows)
+        while len(self._buffer) >= self.row_group_size:
+            self._flush(self._buffer[:self.row_group_size])
+            del self._buffer[:self.row_group_size]
+
+    def _flush(self, rows: List[Dict]):
+        columns = {}
+        for field in self.fields:
+            values = [row.get(field) for row in rows]
+            if field in NUMERIC_FIELDS:
+                columns[field] = [_to_float(value) for value in values]
+            else:
+                columns[field] = [None if value is None else str(value) for value in values]
+
+        # Readers skip files starting with '_', so a part is only visible once complete
+        table = self._pa.Table.from_pydict(columns, schema=self.schema)
+        tmp_file = self.path / f"_part-{self._parts:05d}.tmp"
+        self._pq.write_table(table, tmp_file)
+        os.replace(tmp_file, self.path / f"part-{self._parts:05d}.parquet")
+        self._parts += 1
+
+    def _close(self):
+        if self._buffer:
+            self._flush(self._buffer)
+            self._buffer = []
+
+
+def _to_float(value) -> Optional[float]:
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+SINKS = {sink.extension: sink for sink in (CSVSink, NDJSONSink, ParquetSink)}
+
+
+def open_sink(output_format: str, base_path: Path, fields: Optional[List[str]] = None) -> AwardSink:
+    """
+    Open a sink for base_path + '.<format>'
+
+    Falls back to CSV if Parquet is requested but pyarrow is not installed.
+    """
+    sink_class = SINKS.get(output_format)
+    if sink_class is None:
+        raise ValueError(f"Unknown output format '{output_format}' (expected one of {', '.join(SINKS)})")
+
+    base_path = Path(base_path)
+    try:
+        return sink_class(base_path.with_name(f"{base_path.name}.{sink_class.extension}"), fields)
+    except ImportError:
+        logger.warning("pyarrow not installed, writing CSV instead. Install with: pip install pyarrow")
+        return CSVSink(base_path.with_name(f"{base_path.name}.csv"), fields)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Benchmark Contract Paragraph Parser
+Times contract_paragraph_parser against the previous inline regex cascade of
+DefenseGovContractScraper.parse_contract_paragraph, over the award paragraphs
+of dod-article-4319114.html and extracted-contracts-1764682796375.json.
+
+Usage: python3 scripts/benchmark-contract-parser.py [rounds]   (default 200)
+"""
+
+import importlib.util
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from contract_paragraph_parser import parse_contract_paragraph
+
+# test-contract-parser.py has a dash in its name, so load it by path
+_spec = importlib.util.spec_from_file_location('test_contract_parser', Path(__file__).parent / 'test-contract-parser.py')
+_test = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_test)
+
+
+def legacy_parse(paragraph: str, article_date: str, article_url: str) -> Optional[Dict]:
+    """Previous DefenseGovContractScraper.parse_contract_paragraph"""
+    if len(paragraph) < 100:  # Skip short paragraphs
+        return None
+
+    # Skip header/footer paragraphs
+    skip_keywords = ['this contract', 'no contract', 'list of contracts', 'follow contracts']
+    if any(keyword in paragraph.lower()[:100] for keyword in skip_keywords):
+        return None
+
+    try:
+        contract = {
+            'article_url': article_url,
+            'published_date': article_date,
+            'raw_paragraph': paragraph,
+            'scraped_at': datetime.now().isoformat()
+        }
+
+        # Extract vendor name and location (typically first part before "was awarded")
+        vendor_match = re.match(r'^([^,]+),\s+([^,]+),\s+([A-Z]{2}),?\s+(?:was awarded|has been awarded|received)', paragraph)
+        if vendor_match:
+            contract['vendor_name'] = vendor_match.group(1).strip()
+            contract['vendor_city'] = vendor_match.group(2).strip()
+            contract['vendor_state'] = vendor_match.group(3).strip()
+            contract['vendor_location'] = f"{contract['vendor_city']}, {contract['vendor_state']}"
+        else:
+            # Try alternative format: "Company Name* of City, State, was awarded"
+            vendor_match2 = re.match(r'^([^*]+)\*?\s+of\s+([^,]+),\s+([A-Z]{2}),?\s+(?:was awarded|has been awarded)', paragraph)
+            if vendor_match2:
+                contract['vendor_name'] = vendor_match2.group(1).strip()
+                contract['vendor_city'] = vendor_match2.group(2).strip()
+                contract['vendor_state'] = vendor_match2.group(3).strip()
+                contract['vendor_location'] = f"{contract['vendor_city']}, {contract['vendor_state']}"
+
+        if not contract.get('vendor_name'):
+            # Last resort: take first entity before "was awarded"
+            first_part = paragraph.split('was awarded')[0] if 'was awarded' in paragraph else paragraph[:200]
+            if ',' in first_part:
+                contract['vendor_name'] = first_part.split(',')[0].strip()
+
+        # Extract award amount
+        amount_patterns = [
+            r'\$(\d+(?:,\d{3})*(?:\.\d+)?)\s*(million|billion|thousand)',
+            r'\$(\d+(?:,\d{3})*(?:\.\d+)?)',
+            r'approximately \$(\d+(?:,\d{3})*(?:\.\d+)?)\s*(million|billion)',
+        ]
+
+        for pattern in amount_patterns:
+            amount_match = re.search(pattern, paragraph, re.IGNORECASE)
+            if amount_match:
+                amount_str = amount_match.group(1).replace(',', '')
+                multiplier = 1
+                if len(amount_match.groups()) > 1:
+                    unit = amount_match.group(2).lower()
+                    if unit == 'million':
+                        multiplier = 1_000_000
+                    elif unit == 'billion':
+                        multiplier = 1_000_000_000
+                    elif unit == 'thousand':
+                        multiplier = 1_000
+
+                contract['award_amount'] = float(amount_str) * multiplier
+                contract['award_amount_text'] = amount_match.group(0)
+                break
+
+        # Extract contract number (usually at end in parentheses)
+        contract_num_patterns = [
+            r'\(([A-Z0-9\-]+)\)\.',  # (CONTRACT-123).
+            r'\(Contract\s+([A-Z0-9\-]+)\)',  # (Contract ABC-123)
+            r'contract\s+(?:number\s+)?([A-Z0-9\-]{8,})',  # contract number ABC-123-456
+        ]
+
+        for pattern in contract_num_patterns:
+            contract_num_match = re.search(pattern, paragraph)
+            if contract_num_match:
+                contract['contract_number'] = contract_num_match.group(1)
+                break
+
+        # Extract contracting activity (usually mentions the service and location)
+        contracting_patterns = [
+            r'(U\.S\. (?:Army|Navy|Air Force|Marine Corps|Space Force)[^(\.]+)',
+            r'(Defense [^(\.]+)',
+            r'([A-Z][^\.]+Contracting (?:Activity|Office|Command)[^(\.]+)',
+        ]
+
+        for pattern in contracting_patterns:
+            contracting_match = re.search(pattern, paragraph)
+            if contracting_match:
+                contract['contracting_activity'] = contracting_match.group(1).strip()
+
+                # Extract service branch
+                if 'Army' in contract['contracting_activity']:
+                    contract['service_branch'] = 'army'
+                elif 'Navy' in contract['contracting_activity']:
+                    contract['service_branch'] = 'navy'
+                elif 'Air Force' in contract['contracting_activity']:
+                    contract['service_branch'] = 'air_force'
+                elif 'Marine' in contract['contracting_activity']:
+                    contract['service_branch'] = 'marine_corps'
+                elif 'Space Force' in contract['contracting_activity']:
+                    contract['service_branch'] = 'space_force'
+                break
+
+        # Extract completion date
+        completion_patterns = [
+            r'expected completion date is ([A-Z][a-z]+ \d{1,2}, \d{4})',
+            r'completion date of ([A-Z][a-z]+ \d{4})',
+            r'work is expected to be completed by ([A-Z][a-z]+ \d{1,2}, \d{4})',
+        ]
+
+        for pattern in completion_patterns:
+            completion_match = re.search(pattern, paragraph)
+            if completion_match:
+                date_str = completion_match.group(1)
+                try:
+                    if ',' in date_str:
+                        contract['completion_date'] = datetime.strptime(date_str, '%B %d, %Y').date().isoformat()
+                    else:
+                        contract['completion_date'] = datetime.strptime(date_str, '%B %Y').date().isoformat()
+                except:
+                    pass
+                break
+
+        # Extract fiscal year
+        fy_match = re.search(r'[Ff]iscal (?:year )?(\d{4})', paragraph)
+        if fy_match:
+            contract['fiscal_year'] = int(fy_match.group(1))
+
+        # Extract contract type
+        contract_types = ['firm-fixed-price', 'cost-plus-fixed-fee', 'cost-plus-award-fee', 
+                        'time-and-materials', 'indefinite-delivery/indefinite-quantity', 'IDIQ']
+        for ctype in contract_types:
+            if ctype.lower() in paragraph.lower():
+                contract['contract_type'] = ctype
+                break
+
+        # Small business indicators
+        small_biz_keywords = {
+            'small business': 'small_business',
+            '8(a)': '8a',
+            'service-disabled veteran-owned': 'sdvosb',
+            'woman-owned small business': 'wosb',
+            'HUBZone': 'hubzone'
+        }
+
+        for keyword, biz_type in small_biz_keywords.items():
+            if keyword.lower() in paragraph.lower():
+                contract['is_small_business'] = True
+                contract['small_business_type'] = biz_type
+                break
+
+        # Store full description
+        contract['contract_description'] = paragraph
+
+        # Calculate extraction confidence
+        confidence_score = 0.0
+        if contract.get('vendor_name'): confidence_score += 0.3
+        if contract.get('award_amount'): confidence_score += 0.2
+        if contract.get('contract_number'): confidence_score += 0.2
+        if contract.get('contracting_activity'): confidence_score += 0.15
+        if contract.get('service_branch'): confidence_score += 0.15
+        contract['extraction_confidence'] = confidence_score
+
+        # Only return if we got minimum viable data
+        if contract.get('vendor_name') and contract.get('contract_description'):
+            return contract
+
+        return None
+
+    except Exception as e:
+        print(f"    Error parsing contract: {e}")
+
+
+def timed(label: str, parse, paragraphs, rounds: int):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        results = [parse(paragraph, _test.ARTICLE_DATE, url) for url, paragraph in paragraphs]
+    elapsed = time.perf_counter() - start
+    rate = len(paragraphs) * rounds / elapsed
+    print(f"  {label:<28} {elapsed:8.2f}s  {rate:12,.0f} paragraphs/s")
+    return results, rate
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    paragraphs = _test.load_paragraphs()
+    print(f"{len(paragraphs)} paragraphs x {rounds} rounds")
+
+    print("\nTimings:")
+    legacy, legacy_rate = timed("legacy regex cascade", legacy_parse, paragraphs, rounds)
+    shared, shared_rate = timed("contract_paragraph_parser", parse_contract_paragraph, paragraphs, rounds)
+
+    for old, new in zip(legacy, shared):
+        for row in (old, new):
+            if row:
+                row.pop('scraped_at')
+        assert old == new, f"\n  legacy {old}\n  shared {new}"
+
+    contracts = sum(1 for row in shared if row)
+    print(f"\n✓ {contracts} contracts, results match the legacy parser ({shared_rate / legacy_rate:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
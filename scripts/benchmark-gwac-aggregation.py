@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark GWAC Contractor Aggregation
+Generates synthetic GWAC awards in API-sized pages and times each
+production path end to end, from the pages to contractor records:
+
+- legacy: collect every page into one list, then the previous per-award
+  dict loop
+- columnar: feed each page to gwac_aggregation.ContractorAggregator as it
+  arrives (column buffers, reduced every chunk_size awards)
+
+Usage: python3 scripts/benchmark-gwac-aggregation.py [award_count]   (default 1,000,000)
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent))
+from gwac_aggregation import ContractorAggregator, summary_to_records
+
+GWAC_NAMES = ['Alliant 2', 'OASIS Unrestricted', 'OASIS Small Business', 'CIO-SP3',
+              '8(a) STARS III', 'VETS 2', 'SEWP V', 'Polaris']
+PAGE_SIZE = 100  # Awards per spending_by_award page
+
+
+def generate_awards(count: int, contractors: int = 20000, seed: int = 42) -> List[Dict]:
+    """Synthetic awards; about 10% of contractors have no UEI"""
+    rng = random.Random(seed)
+    names = [f"Contractor {i} {'LLC' if i % 3 else 'Inc.'}" for i in range(contractors)]
+    ueis = [None if i % 10 == 0 else f"UEI{i:09d}" for i in range(contractors)]
+
+    awards = []
+    for n in range(count):
+        c = rng.randrange(contractors)
+        awards.append({
+            'gwac_name': rng.choice(GWAC_NAMES),
+            'award_id': f"AWD{n:08d}",
+            'recipient_name': names[c],
+            'recipient_uei': ueis[c],
+            'award_amount': round(rng.uniform(1e4, 5e7), 2),
+            'start_date': f"{rng.randint(2008, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        })
+    return awards
+
+
+def legacy_aggregate(awards: List[Dict]) -> List[Dict]:
+    """Previous GWACHistoricalScraper.aggregate_by_contractor, keyed on raw name"""
+    contractor_data = {}
+    for award in awards:
+        recipient = award.get('recipient_name') or 'Unknown'
+        if recipient not in contractor_data:
+            contractor_data[recipient] = {
+                'contractor_name': recipient,
+                'contractor_uei': award.get('recipient_uei'),
+                'gwacs': set(),
+                'total_awards': 0,
+                'total_value': 0,
+                'earliest_award': None,
+                'latest_award': None,
+                'awards_list': []
+            }
+        data = contractor_data[recipient]
+        data['gwacs'].add(award.get('gwac_name'))
+        data['total_awards'] += 1
+        data['total_value'] += float(award.get('award_amount') or 0)
+        award_date = award.get('start_date')
+        if award_date:
+            if not data['earliest_award'] or award_date < data['earliest_award']:
+                data['earliest_award'] = award_date
+            if not data['latest_award'] or award_date > data['latest_award']:
+                data['latest_award'] = award_date
+        data['awards_list'].append(award.get('award_id'))
+
+    aggregated = []
+    for data in contractor_data.values():
+        data['gwacs'] = list(data['gwacs'])
+        data['gwac_count'] = len(data['gwacs'])
+        aggregated.append(data)
+    aggregated.sort(key=lambda x: x['total_value'], reverse=True)
+    return aggregated
+
+
+def timed(label: str, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<40} {elapsed:8.2f}s")
+    return result, elapsed
+
+
+def legacy_end_to_end(pages: List[List[Dict]]) -> List[Dict]:
+    """Previous production path: collect every page into one list, then the dict loop"""
+    awards = []
+    for page in pages:
+        awards.extend(page)
+    return legacy_aggregate(awards)
+
+
+def columnar_end_to_end(pages: List[List[Dict]]) -> List[Dict]:
+    """Current production path: feed pages to ContractorAggregator as they arrive"""
+    aggregator = ContractorAggregator()
+    for page in pages:
+        aggregator.add_awards(page)
+    return summary_to_records(aggregator.summary())
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print(f"Generating {count:,} synthetic awards...")
+    awards = generate_awards(count)
+    pages = [awards[i:i + PAGE_SIZE] for i in range(0, count, PAGE_SIZE)]
+    del awards
+
+    print(f"\nEnd to end, from {len(pages):,} pages of {PAGE_SIZE} awards to contractor records:")
+    legacy, legacy_time = timed("legacy (list -> dict loop)", legacy_end_to_end, pages)
+    records, columnar_time = timed("columnar (pages -> ContractorAggregator)", columnar_end_to_end, pages)
+    print(f"  {'speedup':<40} {legacy_time / columnar_time:8.2f}x")
+
+    # Synthetic names are unique per contractor, so both keyings should agree
+    assert len(records) == len(legacy), f"{len(records)} contractors vs legacy {len(legacy)}"
+    assert sum(record['total_awards'] for record in records) == count
+    assert abs(sum(record['total_value'] for record in records) - sum(c['total_value'] for c in legacy)) < 1.0
+    legacy_by_name = {c['contractor_name']: c for c in legacy}
+    for record in records[:100]:
+        expected = legacy_by_name[record['contractor_name']]
+        assert record['total_awards'] == expected['total_awards']
+        assert record['earliest_award'] == expected['earliest_award']
+        assert record['latest_award'] == expected['latest_award']
+        assert sorted(record['gwacs']) == sorted(expected['gwacs'])
+
+    print(f"\n✓ {len(records):,} contractors, results match the legacy aggregation")
+
+
+if __name__ == "__main__":
+    main()
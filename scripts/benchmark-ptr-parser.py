@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark PTR Parser
+Runs PTRParser over the PDFs in pdf_cache twice: once as it parses them
+(page triage, then the text layer), and once with table extraction on every
+page, as the parser did before triage. Reports pages/sec and how many trades
+each recovers with a transaction date, a type and a ticker.
+
+Usage: python3 scripts/benchmark-ptr-parser.py [--limit N]   (pdfplumber's
+       per-page logging goes to stderr: add 2>/dev/null)
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pdfplumber
+
+sys.path.insert(0, str(Path(__file__).parent))
+from pdf_parser import PTRParser
+
+PDF_CACHE = Path(__file__).parent.parent / "pdf_cache"
+
+
+def parse_tables_only(parser: PTRParser, pdf_path: Path):
+    """Table extraction on every page, no triage"""
+    trades = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_num, page in enumerate(pdf.pages, 1):
+            parser.pages_parsed += 1
+            for table_idx, table in enumerate(page.extract_tables()):
+                if table and len(table) > 1:
+                    trades.extend(parser._parse_table(table, page_num, table_idx))
+    return trades
+
+
+def run(label: str, parse, pdfs):
+    start = time.time()
+    trades = [trade for pdf in pdfs for trade in parse(pdf)]
+    elapsed = time.time() - start
+    return label, elapsed, trades
+
+
+def report(label: str, elapsed: float, pages: int, trades):
+    complete = [t for t in trades if t['transaction_date'] and t['transaction_type'] != 'unknown']
+    with_ticker = [t for t in complete if t['ticker']]
+    print(f"  {label:<22} {elapsed:7.1f}s  {pages / elapsed:6.1f} pages/s  {len(trades):5} rows  "
+          f"{len(complete):5} trades with date+type  {len(with_ticker):5} with ticker")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--limit', type=int, default=None)
+    args = arg_parser.parse_args()
+
+    pdfs = sorted(PDF_CACHE.glob('*.pdf'))[:args.limit]
+    print(f"{len(pdfs)} PDFs from {PDF_CACHE}")
+
+    triage = PTRParser()
+    label, elapsed, trades = run('triage + text layer', lambda pdf: triage.parse_pdf(str(pdf)), pdfs)
+    results = [(label, elapsed, triage.pages_parsed, trades)]
+
+    tables = PTRParser()
+    label, elapsed, table_trades = run('tables on every page', lambda pdf: parse_tables_only(tables, pdf), pdfs)
+    results.append((label, elapsed, tables.pages_parsed, table_trades))
+
+    print(f"\nPages: {triage.pages_parsed} ({triage.pages_without_text} without a text layer, "
+          f"{triage.pages_skipped} without transactions)")
+    for label, elapsed, pages, parsed in results:
+        report(label, elapsed, pages, parsed)
+
+
+if __name__ == "__main__":
+    main()
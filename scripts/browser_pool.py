@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Browser Page Pool
+A pool of Playwright pages spread over a few browser contexts, shared by any
+number of worker threads.
+
+- The async Playwright API runs on one event loop in a background thread;
+  fetch() is a blocking, thread-safe call, so workers in a
+  ThreadPoolExecutor can each drive a page at the same time
+- Images, media, fonts and analytics/ad requests are aborted through
+  request routing, so pages only download what the HTML extractors read
+- Each context is recycled (closed and recreated with fresh pages) after a
+  set number of navigations, instead of restarting the whole browser
+- Navigations are spaced by a shared RateLimiter, so throughput is bounded
+  by the politeness interval rather than by per-article sleeps
+"""
+
+import asyncio
+import threading
+import time
+from typing import List, Optional
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:
+    async_playwright = None
+
+USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font'}
+BLOCKED_URL_PATTERNS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'googlesyndication.com',
+    'facebook.net',
+    'scorecardresearch.com',
+    'chartbeat.',
+    'quantserve.com',
+    'hotjar.com',
+    'newrelic.com',
+    'nr-data.net',
+    'adsafeprotected.com',
+)
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing out request starts across all workers"""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self):
+        with self._lock:
+            delay = self._next_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_at = time.monotonic() + self.min_interval
+
+
+class _ContextSlot:
+    """One browser context, its pages and its navigation count"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.context = None
+        self.pages = []
+        self.navigations = 0
+        self.draining = False
+        self.parked = 0
+
+
+class BrowserPagePool:
+    """Fixed set of pages across recycled contexts, fetched from many threads"""
+
+    def __init__(self, pages: int = 4, contexts: int = 2, recycle_after: int = 100,
+                 rate_limiter: Optional[RateLimiter] = None, settle: float = 0.0,
+                 headless: bool = True, timeout: int = 30000, block_resources: bool = True):
+        """
+        Args:
+            pages: Total pages (concurrent navigations)
+            contexts: Browser contexts the pages are spread over
+            recycle_after: Navigations before a context is recycled
+            rate_limiter: Shared limiter waited on before every navigation
+            settle: Default seconds to wait after DOMContentLoaded
+            headless: Run Chromium headless
+            timeout: Navigation timeout in milliseconds
+            block_resources: Abort image/media/font and analytics requests
+        """
+        if async_playwright is None:
+            raise ImportError("playwright not installed. Install with: pip install playwright")
+
+        self.contexts = max(1, min(contexts, pages))
+        self.pages_per_context = max(1, pages // self.contexts)
+        self.recycle_after = recycle_after
+        self.rate_limiter = rate_limiter
+        self.settle = settle
+        self.headless = headless
+        self.timeout = timeout
+        self.block_resources = block_resources
+
+        self.recycled = 0
+        self.blocked_requests = 0
+
+        self._loop = None
+        self._thread = None
+        self._playwright = None
+        self._browser = None
+        self._slots: List[_ContextSlot] = []
+        self._free = None
+
+    @property
+    def size(self) -> int:
+        return self.contexts * self.pages_per_context
+
+    # ---- Sync API (any thread) ----
+
+    def start(self):
+        """Launch the browser and open every context and page"""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='browser-pool', daemon=True)
+        self._thread.start()
+        self._run(self._start())
+        print(f"✅ Browser pool ready: {self.size} pages in {self.contexts} contexts\n")
+
+    def close(self):
+        if not self._loop:
+            return
+        try:
+            self._run(self._close())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+
+    def fetch(self, url: str, settle: Optional[float] = None) -> Optional[str]:
+        """Navigate a free page to url and return the rendered HTML (blocks)"""
+        return self._run(self._fetch(url, self.settle if settle is None else settle))
+
+    def fetch_many(self, urls: List[str], settle: Optional[float] = None) -> List[Optional[str]]:
+        """Fetch urls concurrently; returns HTML (None on failure) in input order"""
+        settle = self.settle if settle is None else settle
+        futures = [asyncio.run_coroutine_threadsafe(self._fetch(url, settle), self._loop) for url in urls]
+
+        results = []
+        for url, future in zip(urls, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"   ⚠️  Browser fetch failed for {url[:60]}: {str(e)[:50]}")
+                results.append(None)
+        return results
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    # ---- Event loop side ----
+
+    async def _start(self):
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(
+            headless=self.headless,
+            args=['--disable-blink-features=AutomationControlled']
+        )
+        self._free = asyncio.Queue()
+        for index in range(self.contexts):
+            slot = _ContextSlot(index)
+            self._slots.append(slot)
+            await self._open_slot(slot)
+
+    async def _close(self):
+        for slot in self._slots:
+            if slot.context:
+                await slot.context.close()
+        if self._browser:
+            await self._browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+
+    async def _open_slot(self, slot: _ContextSlot):
+        slot.context = await self._browser.new_context(user_agent=USER_AGENT)
+        if self.block_resources:
+            await slot.context.route('**/*', self._route)
+        slot.pages = [await slot.context.new_page() for _ in range(self.pages_per_context)]
+        slot.navigations = 0
+        slot.draining = False
+        slot.parked = 0
+        for page_index in range(self.pages_per_context):
+            self._free.put_nowait((slot, page_index))
+
+    async def _route(self, route):
+        request = route.request
+        if (request.resource_type in BLOCKED_RESOURCE_TYPES or
+                any(pattern in request.url for pattern in BLOCKED_URL_PATTERNS)):
+            self.blocked_requests += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _acquire(self):
+        while True:
+            slot, page_index = await self._free.get()
+            if not slot.draining:
+                return slot, page_index
+            await self._park(slot)
+
+    async def _release(self, slot: _ContextSlot, page_index: int):
+        slot.navigations += 1
+        if slot.navigations >= self.recycle_after:
+            slot.draining = True
+
+        if slot.draining:
+            await self._park(slot)
+        else:
+            self._free.put_nowait((slot, page_index))
+
+    async def _park(self, slot: _ContextSlot):
+        # A draining context's pages are held back; the last one to come
+        # back (no navigation in flight) recycles the whole context
+        slot.parked += 1
+        if slot.parked == self.pages_per_context:
+            await slot.context.close()
+            await self._open_slot(slot)
+            self.recycled += 1
+
+    async def _fetch(self, url: str, settle: float) -> Optional[str]:
+        slot, page_index = await self._acquire()
+        try:
+            if self.rate_limiter:
+                await asyncio.get_running_loop().run_in_executor(None, self.rate_limiter.wait)
+            page = slot.pages[page_index]
+            await page.goto(url, wait_until='domcontentloaded', timeout=self.timeout)
+            if settle:
+                await asyncio.sleep(settle)
+            return await page.content()
+        finally:
+            await self._release(slot, page_index)
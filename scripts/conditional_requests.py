@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Conditional HTTP Requests
+Remembers the ETag / Last-Modified of each polled feed or API page and sends
+them back as If-None-Match / If-Modified-Since, so an unchanged resource
+costs one 304 and no parsing.
+
+- Validators are kept per full request URL (query string included) in a
+  JSON state file (data/conditional_requests.json)
+- A response's validators are only recorded once the caller has processed
+  it (remember()), so a run that stops part-way reads the same data again
+  next time instead of getting a 304 for it
+- Safe to share between threads; the state file is replaced atomically on
+  every remember()
+
+State layout:
+    {"<request url>": {"etag": ..., "last_modified": ..., "checked_at": ...}}
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+
+DEFAULT_STATE_FILE = Path('data/conditional_requests.json')
+
+
+def request_key(url: str, params: Optional[Dict] = None) -> str:
+    """The full URL a GET with these params is sent to"""
+    return requests.Request('GET', url, params=params).prepare().url
+
+
+class ConditionalRequests:
+    """GETs that carry the validators of the last processed response"""
+
+    def __init__(self, session: requests.Session, state_file: Optional[Path] = DEFAULT_STATE_FILE,
+                 rate_limiter=None, timeout: int = 30):
+        """
+        Args:
+            session: Shared HTTP session
+            state_file: Validator state (None: never conditional)
+            rate_limiter: Object with wait(), called before every request
+            timeout: Request timeout in seconds
+        """
+        self.session = session
+        self.state_file = Path(state_file) if state_file else None
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.state: Dict[str, Dict] = self._load_state()
+
+        self.stats = {'requests': 0, 'not_modified': 0, 'modified': 0}
+
+    def _load_state(self) -> Dict[str, Dict]:
+        if self.state_file and self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    return json.load(f)
+            except (ValueError, OSError) as e:
+                print(f"⚠️  Ignoring unreadable request state {self.state_file}: {e}")
+        return {}
+
+    def _save_state(self):
+        if not self.state_file:
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    def get(self, url: str, params: Optional[Dict] = None, conditional: bool = True) -> Optional[requests.Response]:
+        """
+        GET url, conditionally if it was processed before
+
+        Args:
+            url: Resource URL
+            params: Query parameters
+            conditional: Send the recorded validators (False: always a full response)
+
+        Returns:
+            The response, or None if the server answered 304 Not Modified
+        """
+        headers = {}
+        if conditional:
+            with self._lock:
+                known = self.state.get(request_key(url, params), {})
+            if known.get('etag'):
+                headers['If-None-Match'] = known['etag']
+            if known.get('last_modified'):
+                headers['If-Modified-Since'] = known['last_modified']
+
+        if self.rate_limiter:
+            self.rate_limiter.wait()
+        response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+
+        with self._lock:
+            self.stats['requests'] += 1
+            if response.status_code == 304:
+                self.stats['not_modified'] += 1
+                return None
+            self.stats['modified'] += 1
+        return response
+
+    def remember(self, url: str, params: Optional[Dict], response: requests.Response):
+        """Record a processed response's validators for the next get() of the same url / params"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not (etag or last_modified):
+            return
+        with self._lock:
+            self.state[request_key(url, params)] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'checked_at': datetime.now().isoformat(),
+            }
+            self._save_state()
+
+    def print_stats(self):
+        print(f"🔁 Conditional requests: {self.stats['requests']} sent, "
+              f"{self.stats['not_modified']} not modified (304), {self.stats['modified']} read")
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Crawl Frontier
+Durable per-URL crawl state and listing-page coverage for the news
+scrapers, kept in an embedded SQLite database (data/crawl_frontier.db).
+
+- Every article URL moves through discovered -> claimed -> parsed -> saved
+  (or failed, retried until max_attempts), so a restarted scraper picks up
+  exactly the URLs that were found but never saved
+- Listing pages are recorded per (source, year, page) with the number of
+  article links found, so completed pages are not walked again
+- The database runs in WAL mode with a busy timeout, and URLs are handed
+  out with claim() inside an immediate transaction, so several scraper
+  processes (and threads; each gets its own connection) can share one
+  frontier without working the same URL. Claims older than the lease are
+  treated as abandoned and can be claimed again.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_DB_FILE = Path('data/crawl_frontier.db')
+
+DISCOVERED = 'discovered'
+CLAIMED = 'claimed'
+PARSED = 'parsed'
+SAVED = 'saved'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    claimed_by TEXT,
+    claimed_at TEXT,
+    error TEXT,
+    discovered_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_urls_source_state ON urls(source, state);
+
+CREATE TABLE IF NOT EXISTS listing_pages (
+    source TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    page INTEGER NOT NULL,
+    urls_found INTEGER NOT NULL,
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (source, year, page)
+);
+"""
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+class CrawlFrontier:
+    """SQLite-backed URL states and listing coverage, shared across threads and processes"""
+
+    def __init__(self, db_file: Path = DEFAULT_DB_FILE, max_attempts: int = 3,
+                 lease_minutes: int = 30, timeout: float = 30.0):
+        """
+        Args:
+            db_file: SQLite database path
+            max_attempts: Claims per URL before it stays failed
+            lease_minutes: Age after which an unfinished claim is reclaimable
+            timeout: Seconds to wait on a locked database
+        """
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self.lease = timedelta(minutes=lease_minutes)
+        self.timeout = timeout
+        self.worker_id = f"{os.uname().nodename}:{os.getpid()}"
+        self._local = threading.local()
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # isolation_level=None: transactions are opened explicitly below
+            conn = sqlite3.connect(self.db_file, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ---- URLs ----
+
+    def add_urls(self, source: str, urls: Iterable[str]) -> int:
+        """Record discovered URLs (already known ones are left as they are); returns new count"""
+        now = _now()
+        conn = self._connect()
+        before = conn.total_changes
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'INSERT OR IGNORE INTO urls (url, source, state, discovered_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+                [(url, source, DISCOVERED, now, now) for url in urls]
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return conn.total_changes - before
+
+    def claim(self, urls: Iterable[str]) -> List[str]:
+        """
+        Claim URLs for this process; returns those claimed, in input order
+
+        A URL is claimable if it was discovered, is unfinished (parsed) or
+        failed with attempts left, or its claim has outlived the lease.
+        Saved URLs are never claimed again.
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return []
+
+        now = datetime.now()
+        stale_before = (now - self.lease).isoformat()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            claimable = set()
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f"""SELECT url FROM urls WHERE url IN ({placeholders}) AND attempts < ? AND (
+                            state IN (?, ?, ?) OR (state = ? AND claimed_at < ?))""",
+                    (*chunk, self.max_attempts, DISCOVERED, PARSED, FAILED, CLAIMED, stale_before)
+                ).fetchall()
+                claimable.update(row[0] for row in rows)
+
+            claimed = [url for url in urls if url in claimable]
+            conn.executemany(
+                'UPDATE urls SET state = ?, attempts = attempts + 1, claimed_by = ?, claimed_at = ?, '
+                'updated_at = ? WHERE url = ?',
+                [(CLAIMED, self.worker_id, now.isoformat(), now.isoformat(), url) for url in claimed]
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return claimed
+
+    def mark(self, url: str, state: str, error: Optional[str] = None):
+        """Move a URL to parsed / saved / failed"""
+        self.mark_many([url], state, error)
+
+    def mark_many(self, urls: Iterable[str], state: str, error: Optional[str] = None):
+        """Move URLs to parsed / saved / failed in one transaction"""
+        now = _now()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'UPDATE urls SET state = ?, error = ?, claimed_by = NULL, updated_at = ? WHERE url = ?',
+                [(state, error, now, url) for url in urls]
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def release(self):
+        """Hand back this process's unfinished claims (e.g. on shutdown) so they are not held for the lease"""
+        self._connect().execute(
+            'UPDATE urls SET state = ?, attempts = MAX(attempts - 1, 0), claimed_by = NULL, updated_at = ? '
+            'WHERE state = ? AND claimed_by = ?',
+            (DISCOVERED, _now(), CLAIMED, self.worker_id)
+        )
+
+    def pending(self, source: str, limit: Optional[int] = None) -> List[str]:
+        """URLs of a source that were discovered but not yet saved (resume candidates)"""
+        stale_before = (datetime.now() - self.lease).isoformat()
+        query = """SELECT url FROM urls WHERE source = ? AND attempts < ? AND (
+                       state IN (?, ?, ?) OR (state = ? AND claimed_at < ?))
+                   ORDER BY discovered_at"""
+        params = [source, self.max_attempts, DISCOVERED, PARSED, FAILED, CLAIMED, stale_before]
+        if limit:
+            query += ' LIMIT ?'
+            params.append(limit)
+        return [row[0] for row in self._connect().execute(query, params)]
+
+    # ---- Listing pages ----
+
+    def mark_listing(self, source: str, year: int, page: int, urls_found: int):
+        """Record a listing page as walked"""
+        self._connect().execute(
+            'INSERT OR REPLACE INTO listing_pages (source, year, page, urls_found, fetched_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (source, year, page, urls_found, _now())
+        )
+
+    def listing_pages(self, source: str, year: int) -> Dict[int, int]:
+        """Walked pages for (source, year) -> article links found on each"""
+        rows = self._connect().execute(
+            'SELECT page, urls_found FROM listing_pages WHERE source = ? AND year = ?', (source, year)
+        )
+        return dict(rows.fetchall())
+
+    def resume_listing(self, source: str, year: int, start: int = 1) -> Tuple[int, int]:
+        """
+        Where to continue walking (source, year)
+
+        Returns:
+            (page, empty_run): first page from start on that has not been
+            walked (coverage is contiguous up to it), and how many empty
+            pages directly precede it
+        """
+        walked = self.listing_pages(source, year)
+        page = start
+        empty_run = 0
+        while page in walked:
+            empty_run = 0 if walked[page] else empty_run + 1
+            page += 1
+        return page, empty_run
+
+    # ---- Reporting ----
+
+    def counts(self, source: Optional[str] = None) -> Dict[str, int]:
+        if source:
+            rows = self._connect().execute(
+                'SELECT state, COUNT(*) FROM urls WHERE source = ? GROUP BY state', (source,))
+        else:
+            rows = self._connect().execute('SELECT state, COUNT(*) FROM urls GROUP BY state')
+        return dict(rows.fetchall())
+
+    def print_stats(self, source: Optional[str] = None):
+        counts = self.counts(source)
+        summary = ', '.join(f"{state}: {counts.get(state, 0):,}"
+                            for state in (DISCOVERED, CLAIMED, PARSED, SAVED, FAILED))
+        print(f"🧭 Frontier{f' ({source})' if source else ''}: {summary}")
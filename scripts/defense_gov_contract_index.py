@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Defense.gov Contract Article Index
+Maps publication date -> URL of defense.gov's daily "Contracts For <date>"
+announcements, built from the paginated listing at
+https://www.defense.gov/News/Contracts/?Page=N and kept in an embedded SQLite
+database (data/defense_gov_contract_index.db).
+
+- The listing is newest first. discover() tops the index up from page 1 until
+  it reaches articles it already has, and only walks deeper when the
+  requested range starts before the oldest date the index covers; that walk
+  starts at the page the index size predicts rather than at page 1
+- Listing pages are fetched a batch at a time on a thread pool, each request
+  spaced by the shared RateLimiter
+- The index keeps the date range it holds completely (covered_from ..
+  covered_to), so a backfill of an already covered range reads no listing
+  pages at all
+"""
+
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+DEFAULT_DB_FILE = Path('data/defense_gov_contract_index.db')
+BASE_URL = 'https://www.defense.gov'
+LISTING_URL = f'{BASE_URL}/News/Contracts/'
+ARTICLE_PATH = '/News/Contracts/Contract/Article/'
+
+# Page 1 fills up over time; deeper walks use the last measured size
+DEFAULT_PAGE_SIZE = 10
+
+TITLE_DATE_RE = re.compile(r'Contracts for ([A-Za-z]+)\.? (\d{1,2}), (\d{4})', re.IGNORECASE)
+ARTICLE_ID_RE = re.compile(r'/Contract/Article/(\d+)')
+MONTHS = {name: number for number, name in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), 1)}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    article_id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    published_date TEXT NOT NULL,
+    title TEXT NOT NULL,
+    discovered_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published_date ON articles(published_date);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def parse_title_date(title: str) -> Optional[date]:
+    """Date of a "Contracts For Sept. 30, 2025" / "Contracts for December 15, 2024" title"""
+    match = TITLE_DATE_RE.search(title or '')
+    if not match:
+        return None
+    month = MONTHS.get(match.group(1)[:3].lower())
+    if not month:
+        return None
+    try:
+        return date(int(match.group(3)), month, int(match.group(2)))
+    except ValueError:
+        return None
+
+
+def parse_listing(html: str) -> List[Tuple[int, str, str, date]]:
+    """(article_id, canonical url, title, published date) of each announcement on a listing page, in page order"""
+    articles = {}
+    for link in BeautifulSoup(html, 'html.parser').find_all('a', href=True):
+        id_match = ARTICLE_ID_RE.search(link['href'])
+        if not id_match:
+            continue
+        title = link.get_text(strip=True)
+        published = parse_title_date(title)
+        if published:
+            article_id = int(id_match.group(1))
+            # Same article under defense.gov / war.gov hosts is stored once
+            articles.setdefault(article_id, (article_id, f"{BASE_URL}{ARTICLE_PATH}{article_id}/", title, published))
+    return list(articles.values())
+
+
+class ContractArticleIndex:
+    """SQLite index of defense.gov contract announcements by publication date"""
+
+    def __init__(self, session, rate_limiter=None, workers: int = 4,
+                 db_file: Path = DEFAULT_DB_FILE, timeout: float = 30.0):
+        """
+        Args:
+            session: requests.Session used for listing pages
+            rate_limiter: Shared limiter (anything with wait()) paced before each request
+            workers: Listing pages fetched at once
+            db_file: SQLite database path
+            timeout: Seconds to wait on a locked database
+        """
+        self.session = session
+        self.rate_limiter = rate_limiter
+        self.workers = workers
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self._local = threading.local()
+        self.pages_fetched = 0
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+            self._local.conn = conn
+        return conn
+
+    # ---- Meta ----
+
+    def _get(self, key: str) -> Optional[str]:
+        row = self._connect().execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value):
+        self._connect().execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, str(value)))
+
+    @property
+    def covered_from(self) -> Optional[date]:
+        value = self._get('covered_from')
+        return date.fromisoformat(value) if value else None
+
+    @property
+    def covered_to(self) -> Optional[date]:
+        value = self._get('covered_to')
+        return date.fromisoformat(value) if value else None
+
+    # ---- Lookups ----
+
+    def articles_between(self, start: date, end: date) -> List[Dict]:
+        """Indexed announcements published from start to end (inclusive), oldest first"""
+        rows = self._connect().execute(
+            'SELECT article_id, url, published_date, title FROM articles '
+            'WHERE published_date BETWEEN ? AND ? ORDER BY published_date, article_id',
+            (start.isoformat(), end.isoformat())
+        )
+        return [{'article_id': article_id, 'url': url, 'published_date': published, 'title': title}
+                for article_id, url, published, title in rows]
+
+    def count(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+
+    # ---- Discovery ----
+
+    def fetch_listing(self, page: int) -> Optional[List[Tuple[int, str, str, date]]]:
+        """Announcements on one listing page ([] past the last page), or None if the page failed"""
+        url = LISTING_URL if page == 1 else f"{LISTING_URL}?Page={page}"
+        try:
+            if self.rate_limiter:
+                self.rate_limiter.wait()
+            response = self.session.get(url, timeout=30)
+            if response.status_code != 200:
+                print(f"  ⚠️  Listing page {page}: HTTP {response.status_code}")
+                return None
+            self.pages_fetched += 1
+            return parse_listing(response.text)
+        except Exception as e:
+            print(f"  ⚠️  Listing page {page}: {str(e)[:80]}")
+            return None
+
+    def _add(self, articles: List[Tuple[int, str, str, date]]) -> int:
+        """Store listing entries; returns how many were new"""
+        now = datetime.now().isoformat()
+        conn = self._connect()
+        before = conn.total_changes
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'INSERT OR IGNORE INTO articles (article_id, url, published_date, title, discovered_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                [(article_id, url, published.isoformat(), title, now) for article_id, url, title, published in articles]
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return conn.total_changes - before
+
+    def _walk(self, page: int, stop) -> Tuple[Optional[date], bool, bool]:
+        """
+        Walk listing pages from page on, a batch at a time, until stop(articles, new) is true
+
+        Returns:
+            (oldest date seen, whether the end of the listing was reached,
+            whether the walk finished); a page that cannot be fetched ends
+            the walk early, so what was walked stays contiguous
+        """
+        oldest = None
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                page_numbers = list(range(page, page + self.workers))
+                for page_number, articles in zip(page_numbers, executor.map(self.fetch_listing, page_numbers)):
+                    if articles is None:
+                        return oldest, False, False
+                    if not articles:
+                        return oldest, True, True
+
+                    new = self._add(articles)
+                    page_oldest = min(published for _, _, _, published in articles)
+                    oldest = page_oldest if oldest is None else min(oldest, page_oldest)
+                    if page_number == 1:
+                        self._set('page_size', len(articles))
+                    print(f"  📄 Listing page {page_number}: {len(articles)} announcements "
+                          f"({new} new, back to {page_oldest})")
+                    if stop(articles, new):
+                        return oldest, False, True
+                page += self.workers
+
+    def _extend_coverage(self, oldest: Optional[date], reached_end: bool):
+        """Lower covered_from to what a contiguous walk reached"""
+        if reached_end:
+            covered_from = date.min
+        elif oldest:
+            # The oldest date seen may continue on the next page
+            covered_from = oldest + timedelta(days=1)
+        else:
+            return
+        current = self.covered_from
+        self._set('covered_from', min(covered_from, current) if current else covered_from)
+
+    def discover(self, start: date, end: date):
+        """
+        Make sure every announcement published from start to end is indexed
+
+        Args:
+            start: Oldest publication date needed
+            end: Newest publication date needed
+        """
+        covered_from, covered_to = self.covered_from, self.covered_to
+        if covered_from and covered_from <= start and covered_to and end <= covered_to:
+            return
+
+        print(f"🔎 Discovering defense.gov contract announcements {start} to {end}...")
+        # Today's announcement may not be posted yet, so coverage ends yesterday
+        yesterday = date.today() - timedelta(days=1)
+
+        if covered_from is None:
+            # Empty index: walk from the newest page down past start
+            oldest, reached_end, finished = self._walk(
+                1, lambda articles, new: min(a[3] for a in articles) < start)
+            self._extend_coverage(oldest, reached_end)
+            if oldest:
+                self._set('covered_to', yesterday)
+            if not finished:
+                print("  ⚠️  Listing walk stopped at a failed page; the next run continues it")
+            return
+
+        # Top up from page 1 until a page holds articles the index already has
+        if not covered_to or end > covered_to:
+            oldest, reached_end, finished = self._walk(1, lambda articles, new: new < len(articles))
+            if not finished:
+                print("  ⚠️  Listing top-up stopped at a failed page; coverage unchanged")
+                return
+            self._set('covered_to', yesterday)
+            if reached_end:
+                self._extend_coverage(oldest, reached_end)
+
+        covered_from = self.covered_from
+        if start >= covered_from:
+            return
+
+        # Deeper than the index reaches: estimate the page holding covered_from
+        # from the index size, backing off until that page overlaps coverage
+        page_size = int(self._get('page_size') or DEFAULT_PAGE_SIZE)
+        page = max(1, self.count() // page_size - 1)
+        while page > 1:
+            articles = self.fetch_listing(page)
+            if articles and max(a[3] for a in articles) >= covered_from:
+                break
+            page = max(1, page - self.workers * 2)
+
+        print(f"  ⏩ Index covers back to {covered_from}; continuing from listing page {page}")
+        oldest, reached_end, finished = self._walk(
+            page, lambda articles, new: min(a[3] for a in articles) < start)
+        self._extend_coverage(oldest, reached_end)
+        if not finished:
+            print("  ⚠️  Listing walk stopped at a failed page; the next run continues it")
+
+    def print_stats(self):
+        covered_from, covered_to = self.covered_from, self.covered_to
+        coverage = f"{covered_from} to {covered_to}" if covered_from else 'nothing yet'
+        if covered_from == date.min:
+            coverage = f"everything to {covered_to}"
+        print(f"🗂️  Contract index: {self.count():,} announcements, covers {coverage}, "
+              f"{self.pages_fetched} listing pages fetched this run")
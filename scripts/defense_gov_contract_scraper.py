@@ -9,7 +9,9 @@ Published daily at approximately 5 PM EST at:
 https://www.defense.gov/News/Contracts/
 
 Features:
-- Historical backfill capability
+- Historical backfill capability: announcements are found through a
+  date -> URL index of the contracts listing (defense_gov_contract_index.py)
+  and fetched by a pool of workers sharing one request interval
 - Contract extraction and parsing
 - Vendor information extraction
 - Financial data parsing
@@ -25,9 +27,12 @@ import time
 import json
 import re
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import threading
 from bs4 import BeautifulSoup
 import argparse
 
@@ -39,27 +44,34 @@ except ImportError:
     print("Install with: pip install supabase")
     sys.exit(1)
 
+from browser_pool import RateLimiter
+from contract_paragraph_parser import parse_contract_paragraph
+from crawl_frontier import CrawlFrontier, FAILED, PARSED, SAVED
+from defense_gov_contract_index import ContractArticleIndex, parse_title_date
+from html_archive import open_archive
+from military_news_sink import MilitaryNewsSink
+
 class DefenseGovContractScraper:
     """Scrapes daily contract awards from defense.gov"""
     
-    def __init__(self, delay_seconds: float = 2.0):
+    def __init__(self, delay_seconds: float = 2.0, workers: int = 4):
         """
         Initialize scraper
         
         Args:
-            delay_seconds: Delay between requests to respect servers
+            delay_seconds: Minimum interval between request starts, shared by all workers
+            workers: Articles / listing pages fetched concurrently
         """
         self.delay_seconds = delay_seconds
+        self.workers = workers
         self.base_url = "https://www.defense.gov"
         self.contracts_url = f"{self.base_url}/News/Contracts/"
         
         # Statistics
         self.articles_found = 0
-        self.articles_new = 0
-        self.articles_updated = 0
-        self.articles_skipped = 0
         self.contracts_extracted = 0
         self.contracts_failed = 0
+        self._stats_lock = threading.Lock()
         
         # Initialize Supabase
         supabase_url = os.environ.get("SUPABASE_URL")
@@ -72,6 +84,11 @@ class DefenseGovContractScraper:
         else:
             self.supabase = create_client(supabase_url, supabase_key)
         
+        # Batched article / contract writes, flushed on exit; raw pages go to
+        # the archive rather than the raw_html column
+        self.archive = open_archive()
+        self.sink = MilitaryNewsSink(self.supabase, raw_html=self.archive is None)
+        
         # Set up session with headers
         self.session = requests.Session()
         self.session.headers.update({
@@ -79,6 +96,13 @@ class DefenseGovContractScraper:
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
         })
+        self.session.mount('https://', HTTPAdapter(pool_connections=workers, pool_maxsize=workers))
+        
+        # Publication date -> announcement URL, from the contracts listing;
+        # per-URL progress lives in the crawl frontier
+        self.rate_limiter = RateLimiter(delay_seconds)
+        self.index = ContractArticleIndex(self.session, rate_limiter=self.rate_limiter, workers=workers)
+        self.frontier = CrawlFrontier()
     
     def fetch_contract_article(self, url: str) -> Optional[Dict]:
         """
@@ -92,66 +116,83 @@ class DefenseGovContractScraper:
         """
         try:
             print(f"  Fetching: {url}")
+            self.rate_limiter.wait()
             response = self.session.get(url, timeout=30)
             
             if response.status_code != 200:
                 print(f"    Error: HTTP {response.status_code}")
                 return None
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract article metadata
-            article = {
-                'url': url,
-                'source': 'defense.gov',
-                'source_category': 'official_dod',
-                'article_types': ['contract_award'],
-                'primary_article_type': 'contract_award',
-                'scraped_at': datetime.now().isoformat()
-            }
-            
-            # Title
-            title_elem = soup.find('h1', class_='maintitle')
-            if title_elem:
-                article['title'] = title_elem.get_text(strip=True)
-            
-            # Date (usually in title like "Contracts for December 15, 2024")
-            date_match = re.search(r'Contracts for ([A-Z][a-z]+ \d{1,2}, \d{4})', article.get('title', ''))
-            if date_match:
-                date_str = date_match.group(1)
-                article['published_date'] = datetime.strptime(date_str, '%B %d, %Y').isoformat()
-            
-            # Content
-            content_elem = soup.find('div', class_='body')
-            if content_elem:
-                article['content'] = content_elem.get_text(strip=True)
-                article['raw_html'] = str(content_elem)
-                
-                # Extract contract paragraphs
-                paragraphs = content_elem.find_all('p')
-                article['contract_paragraphs'] = [p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)]
-            
-            # Article ID from URL (e.g., /News/Contracts/Contract/Article/1234567/)
-            article_id_match = re.search(r'/Article/(\d+)/', url)
-            if article_id_match:
-                article['article_id'] = article_id_match.group(1)
-            
-            self.articles_found += 1
+            if self.archive:
+                try:
+                    self.archive.put(url, response.text, 'defense.gov')
+                except Exception as e:
+                    print(f"    Warning: archive write failed: {e}")
+
+            article = self.parse_contract_article(url, response.text)
+            with self._stats_lock:
+                self.articles_found += 1
             return article
             
         except Exception as e:
             print(f"    Error fetching article: {e}")
             return None
     
-    def parse_contract_paragraph(self, paragraph: str, article_date: str, article_url: str) -> Optional[Dict]:
+    @staticmethod
+    def parse_contract_article(url: str, html: str) -> Dict:
         """
-        Parse a contract award paragraph
+        Parse a contract article page (also used to re-parse archived pages)
+        
+        Args:
+            url: Full URL to contract article
+            html: Article page HTML
+            
+        Returns:
+            Dict with article data
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Extract article metadata
+        article = {
+            'url': url,
+            'source': 'defense.gov',
+            'source_category': 'official_dod',
+            'article_types': ['contract_award'],
+            'primary_article_type': 'contract_award',
+            'scraped_at': datetime.now().isoformat()
+        }
+        
+        # Title
+        title_elem = soup.find('h1', class_='maintitle')
+        if title_elem:
+            article['title'] = title_elem.get_text(strip=True)
+        
+        # Date (in the title, like "Contracts For Sept. 30, 2025")
+        published = parse_title_date(article.get('title', ''))
+        if published:
+            article['published_date'] = datetime.combine(published, datetime.min.time()).isoformat()
+        
+        # Content
+        content_elem = soup.find('div', class_='body')
+        if content_elem:
+            article['content'] = content_elem.get_text(strip=True)
+            article['raw_html'] = str(content_elem)
+            
+            # Extract contract paragraphs
+            paragraphs = content_elem.find_all('p')
+            article['contract_paragraphs'] = [p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)]
         
-        Format typically:
-        "Vendor Name, City, State, was awarded a $X.X million contract...
-        The contract description goes here... Work will be performed in Location...
-        The expected completion date is Month DD, YYYY. Fiscal year YYYY...
-        U.S. Air Force/Army/Navy Contracting Activity, Location, is the contracting activity (Contract Number)."
+        # Article ID from URL (e.g., /News/Contracts/Contract/Article/1234567/)
+        article_id_match = re.search(r'/Article/(\d+)/', url)
+        if article_id_match:
+            article['article_id'] = article_id_match.group(1)
+        
+        return article
+    
+    @staticmethod
+    def parse_contract_paragraph(paragraph: str, article_date: str, article_url: str) -> Optional[Dict]:
+        """
+        Parse a contract award paragraph (see contract_paragraph_parser.py)
         
         Args:
             paragraph: Raw paragraph text
@@ -159,175 +200,10 @@ class DefenseGovContractScraper:
             article_url: URL of source article
             
         Returns:
-            Dict with extracted contract data or None
+            Dict with extracted contract data
         """
-        if len(paragraph) < 100:  # Skip short paragraphs
-            return None
-        
-        # Skip header/footer paragraphs
-        skip_keywords = ['this contract', 'no contract', 'list of contracts', 'follow contracts']
-        if any(keyword in paragraph.lower()[:100] for keyword in skip_keywords):
-            return None
-        
         try:
-            contract = {
-                'article_url': article_url,
-                'published_date': article_date,
-                'raw_paragraph': paragraph,
-                'scraped_at': datetime.now().isoformat()
-            }
-            
-            # Extract vendor name and location (typically first part before "was awarded")
-            vendor_match = re.match(r'^([^,]+),\s+([^,]+),\s+([A-Z]{2}),?\s+(?:was awarded|has been awarded|received)', paragraph)
-            if vendor_match:
-                contract['vendor_name'] = vendor_match.group(1).strip()
-                contract['vendor_city'] = vendor_match.group(2).strip()
-                contract['vendor_state'] = vendor_match.group(3).strip()
-                contract['vendor_location'] = f"{contract['vendor_city']}, {contract['vendor_state']}"
-            else:
-                # Try alternative format: "Company Name* of City, State, was awarded"
-                vendor_match2 = re.match(r'^([^*]+)\*?\s+of\s+([^,]+),\s+([A-Z]{2}),?\s+(?:was awarded|has been awarded)', paragraph)
-                if vendor_match2:
-                    contract['vendor_name'] = vendor_match2.group(1).strip()
-                    contract['vendor_city'] = vendor_match2.group(2).strip()
-                    contract['vendor_state'] = vendor_match2.group(3).strip()
-                    contract['vendor_location'] = f"{contract['vendor_city']}, {contract['vendor_state']}"
-            
-            if not contract.get('vendor_name'):
-                # Last resort: take first entity before "was awarded"
-                first_part = paragraph.split('was awarded')[0] if 'was awarded' in paragraph else paragraph[:200]
-                if ',' in first_part:
-                    contract['vendor_name'] = first_part.split(',')[0].strip()
-            
-            # Extract award amount
-            amount_patterns = [
-                r'\$(\d+(?:,\d{3})*(?:\.\d+)?)\s*(million|billion|thousand)',
-                r'\$(\d+(?:,\d{3})*(?:\.\d+)?)',
-                r'approximately \$(\d+(?:,\d{3})*(?:\.\d+)?)\s*(million|billion)',
-            ]
-            
-            for pattern in amount_patterns:
-                amount_match = re.search(pattern, paragraph, re.IGNORECASE)
-                if amount_match:
-                    amount_str = amount_match.group(1).replace(',', '')
-                    multiplier = 1
-                    if len(amount_match.groups()) > 1:
-                        unit = amount_match.group(2).lower()
-                        if unit == 'million':
-                            multiplier = 1_000_000
-                        elif unit == 'billion':
-                            multiplier = 1_000_000_000
-                        elif unit == 'thousand':
-                            multiplier = 1_000
-                    
-                    contract['award_amount'] = float(amount_str) * multiplier
-                    contract['award_amount_text'] = amount_match.group(0)
-                    break
-            
-            # Extract contract number (usually at end in parentheses)
-            contract_num_patterns = [
-                r'\(([A-Z0-9\-]+)\)\.',  # (CONTRACT-123).
-                r'\(Contract\s+([A-Z0-9\-]+)\)',  # (Contract ABC-123)
-                r'contract\s+(?:number\s+)?([A-Z0-9\-]{8,})',  # contract number ABC-123-456
-            ]
-            
-            for pattern in contract_num_patterns:
-                contract_num_match = re.search(pattern, paragraph)
-                if contract_num_match:
-                    contract['contract_number'] = contract_num_match.group(1)
-                    break
-            
-            # Extract contracting activity (usually mentions the service and location)
-            contracting_patterns = [
-                r'(U\.S\. (?:Army|Navy|Air Force|Marine Corps|Space Force)[^(\.]+)',
-                r'(Defense [^(\.]+)',
-                r'([A-Z][^\.]+Contracting (?:Activity|Office|Command)[^(\.]+)',
-            ]
-            
-            for pattern in contracting_patterns:
-                contracting_match = re.search(pattern, paragraph)
-                if contracting_match:
-                    contract['contracting_activity'] = contracting_match.group(1).strip()
-                    
-                    # Extract service branch
-                    if 'Army' in contract['contracting_activity']:
-                        contract['service_branch'] = 'army'
-                    elif 'Navy' in contract['contracting_activity']:
-                        contract['service_branch'] = 'navy'
-                    elif 'Air Force' in contract['contracting_activity']:
-                        contract['service_branch'] = 'air_force'
-                    elif 'Marine' in contract['contracting_activity']:
-                        contract['service_branch'] = 'marine_corps'
-                    elif 'Space Force' in contract['contracting_activity']:
-                        contract['service_branch'] = 'space_force'
-                    break
-            
-            # Extract completion date
-            completion_patterns = [
-                r'expected completion date is ([A-Z][a-z]+ \d{1,2}, \d{4})',
-                r'completion date of ([A-Z][a-z]+ \d{4})',
-                r'work is expected to be completed by ([A-Z][a-z]+ \d{1,2}, \d{4})',
-            ]
-            
-            for pattern in completion_patterns:
-                completion_match = re.search(pattern, paragraph)
-                if completion_match:
-                    date_str = completion_match.group(1)
-                    try:
-                        if ',' in date_str:
-                            contract['completion_date'] = datetime.strptime(date_str, '%B %d, %Y').date().isoformat()
-                        else:
-                            contract['completion_date'] = datetime.strptime(date_str, '%B %Y').date().isoformat()
-                    except:
-                        pass
-                    break
-            
-            # Extract fiscal year
-            fy_match = re.search(r'[Ff]iscal (?:year )?(\d{4})', paragraph)
-            if fy_match:
-                contract['fiscal_year'] = int(fy_match.group(1))
-            
-            # Extract contract type
-            contract_types = ['firm-fixed-price', 'cost-plus-fixed-fee', 'cost-plus-award-fee', 
-                            'time-and-materials', 'indefinite-delivery/indefinite-quantity', 'IDIQ']
-            for ctype in contract_types:
-                if ctype.lower() in paragraph.lower():
-                    contract['contract_type'] = ctype
-                    break
-            
-            # Small business indicators
-            small_biz_keywords = {
-                'small business': 'small_business',
-                '8(a)': '8a',
-                'service-disabled veteran-owned': 'sdvosb',
-                'woman-owned small business': 'wosb',
-                'HUBZone': 'hubzone'
-            }
-            
-            for keyword, biz_type in small_biz_keywords.items():
-                if keyword.lower() in paragraph.lower():
-                    contract['is_small_business'] = True
-                    contract['small_business_type'] = biz_type
-                    break
-            
-            # Store full description
-            contract['contract_description'] = paragraph
-            
-            # Calculate extraction confidence
-            confidence_score = 0.0
-            if contract.get('vendor_name'): confidence_score += 0.3
-            if contract.get('award_amount'): confidence_score += 0.2
-            if contract.get('contract_number'): confidence_score += 0.2
-            if contract.get('contracting_activity'): confidence_score += 0.15
-            if contract.get('service_branch'): confidence_score += 0.15
-            contract['extraction_confidence'] = confidence_score
-            
-            # Only return if we got minimum viable data
-            if contract.get('vendor_name') and contract.get('contract_description'):
-                return contract
-            
-            return None
-            
+            return parse_contract_paragraph(paragraph, article_date, article_url)
         except Exception as e:
             print(f"    Error parsing contract: {e}")
             return None
@@ -338,18 +214,8 @@ class DefenseGovContractScraper:
             return False
         
         try:
-            # Check if article already exists
-            result = self.supabase.table('military_news_articles')\
-                .select('id')\
-                .eq('article_url', article['url'])\
-                .execute()
-            
-            if result.data:
-                self.articles_skipped += 1
-                return True  # Already exists
-            
-            # Insert article
-            self.supabase.table('military_news_articles').insert({
+            # Queued for a batched upsert; existing URLs are skipped there
+            return self.sink.add_article({
                 'source': article.get('source'),
                 'source_category': article.get('source_category'),
                 'article_url': article.get('url'),
@@ -361,10 +227,7 @@ class DefenseGovContractScraper:
                 'article_types': article.get('article_types'),
                 'primary_article_type': article.get('primary_article_type'),
                 'scraped_at': article.get('scraped_at'),
-            }).execute()
-            
-            self.articles_new += 1
-            return True
+            })
             
         except Exception as e:
             print(f"    Error saving article: {e}")
@@ -376,18 +239,8 @@ class DefenseGovContractScraper:
             return False
         
         try:
-            # Get article_id if not provided
-            if not article_id and contract.get('article_url'):
-                result = self.supabase.table('military_news_articles')\
-                    .select('id')\
-                    .eq('article_url', contract['article_url'])\
-                    .execute()
-                
-                if result.data:
-                    article_id = result.data[0]['id']
-            
-            # Insert contract
-            self.supabase.table('military_contract_awards').insert({
+            # Queued; a missing article_id is resolved from article_url per batch
+            self.sink.add_contract({
                 'article_id': article_id,
                 'article_url': contract.get('article_url'),
                 'published_date': contract.get('published_date'),
@@ -409,7 +262,7 @@ class DefenseGovContractScraper:
                 'raw_paragraph': contract.get('raw_paragraph'),
                 'extraction_confidence': contract.get('extraction_confidence'),
                 'scraped_at': contract.get('scraped_at'),
-            }).execute()
+            })
             
             self.contracts_extracted += 1
             return True
@@ -419,6 +272,89 @@ class DefenseGovContractScraper:
             self.contracts_failed += 1
             return False
     
+    def scrape_article(self, entry: Dict) -> Tuple[Optional[Dict], List[Dict]]:
+        """
+        Fetch and parse one indexed announcement (runs on worker threads)
+        
+        Args:
+            entry: Index row with url and published_date
+            
+        Returns:
+            (article or None, parsed contracts)
+        """
+        article = self.fetch_contract_article(entry['url'])
+        if not article:
+            return None, []
+        
+        # The listing date stands in when the page title has none
+        if not article.get('published_date'):
+            article['published_date'] = f"{entry['published_date']}T00:00:00"
+        
+        contracts = []
+        for para in article.get('contract_paragraphs', []):
+            contract = self.parse_contract_paragraph(para, article['published_date'], entry['url'])
+            if contract:
+                contracts.append(contract)
+        return article, contracts
+    
+    def scrape_articles(self, entries: List[Dict]) -> Dict:
+        """
+        Fetch indexed announcements concurrently and save them here, in order
+        
+        Announcements another process is working on, or already saved, are
+        skipped through the crawl frontier.
+        
+        Args:
+            entries: Index rows (see ContractArticleIndex.articles_between)
+            
+        Returns:
+            Dict with counts
+        """
+        results = {'articles_found': 0, 'contracts_extracted': 0, 'skipped': 0, 'failed': 0}
+        by_url = {entry['url']: entry for entry in entries}
+        
+        self.frontier.add_urls('defense.gov', by_url)
+        claimed = self.frontier.claim(by_url)
+        results['skipped'] = len(by_url) - len(claimed)
+        if not claimed:
+            return results
+        
+        # Chunks bound memory and let progress be recorded as work finishes
+        chunk_size = self.workers * 10
+        started = time.time()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for i in range(0, len(claimed), chunk_size):
+                chunk = claimed[i:i + chunk_size]
+                saved = []
+                for url, (article, contracts) in zip(chunk, executor.map(self.scrape_article, (by_url[url] for url in chunk))):
+                    if not article:
+                        self.frontier.mark(url, FAILED, 'not fetched')
+                        results['failed'] += 1
+                        continue
+                    
+                    results['articles_found'] += 1
+                    if not self.supabase:
+                        # Nothing is written; the claim is released at the end
+                        continue
+                    self.frontier.mark(url, PARSED)
+                    self.save_article_to_db(article)
+                    for contract in contracts:
+                        if self.save_contract_to_db(contract):
+                            results['contracts_extracted'] += 1
+                    saved.append(url)
+                
+                # Only count as saved once the buffered rows are written
+                failed = self.sink.flush()
+                self.frontier.mark_many([url for url in saved if url not in failed], SAVED)
+                self.frontier.mark_many([url for url in saved if url in failed], FAILED, 'not written')
+                
+                done = i + len(chunk)
+                rate = done / max(time.time() - started, 1e-9) * 3600
+                print(f"📊 {done}/{len(claimed)} announcements | {results['contracts_extracted']} contracts | "
+                      f"{rate:,.0f} announcements/hour")
+        
+        return results
+    
     def scrape_date(self, date: datetime) -> Dict:
         """
         Scrape contracts for a specific date
@@ -433,30 +369,22 @@ class DefenseGovContractScraper:
         print(f"Scraping contracts for {date.strftime('%B %d, %Y')}")
         print(f"{'='*70}")
         
-        # Defense.gov URLs are formatted as:
-        # https://www.defense.gov/News/Contracts/Contract/Article/[ID]/
-        # We need to search for articles on this date
-        
-        # Strategy: Try known URL patterns first, then search
-        # Most recent contracts have incrementing IDs
-        
-        # For now, we'll search the main contracts page and filter by date
-        # In production, you'd build a date-based URL discovery system
+        day = date.date() if isinstance(date, datetime) else date
+        self.index.discover(day, day)
+        entries = self.index.articles_between(day, day)
+        if not entries:
+            print("  No contract announcement indexed for this date")
         
-        print("  Note: This is a simplified implementation.")
-        print("  Full implementation requires building article URL discovery.")
-        print("  Consider using sitemap.xml or API if available.")
-        
-        return {
-            'date': date.strftime('%Y-%m-%d'),
-            'articles_found': 0,
-            'contracts_extracted': 0
-        }
+        results = self.scrape_articles(entries)
+        return {'date': day.isoformat(), **results}
     
     def scrape_date_range(self, start_date: datetime, end_date: datetime):
         """
         Scrape contracts for a date range
         
+        Announcements are looked up in the listing index (discovering any
+        not indexed yet), then fetched by a pool of workers.
+        
         Args:
             start_date: Start date
             end_date: End date
@@ -465,26 +393,39 @@ class DefenseGovContractScraper:
         print(f"Defense.gov Contract Scraper - Historical Mode")
         print(f"{'='*70}")
         print(f"Date range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
+        print(f"Workers: {self.workers} | Request interval: {self.delay_seconds}s")
         print(f"{'='*70}\n")
         
-        current_date = start_date
-        while current_date <= end_date:
-            self.scrape_date(current_date)
-            current_date += timedelta(days=1)
-            time.sleep(self.delay_seconds)
+        start, end = start_date.date(), end_date.date()
+        try:
+            self.index.discover(start, end)
+            entries = self.index.articles_between(start, end)
+            print(f"\n📋 {len(entries)} announcements indexed from {start} to {end}\n")
+            
+            results = self.scrape_articles(entries)
+            if results['skipped']:
+                print(f"⏭️  {results['skipped']} announcements already saved or in progress elsewhere")
+        finally:
+            # Hand back claims a stopped run did not finish
+            self.frontier.release()
         
+        self.index.print_stats()
+        self.frontier.print_stats('defense.gov')
         self.print_stats()
     
     def print_stats(self):
         """Print scraper statistics"""
+        # Write anything still buffered so the database counts are final
+        self.sink.flush()
+        
         print(f"\n{'='*70}")
         print("SCRAPING STATISTICS")
         print(f"{'='*70}")
         print(f"Articles found:      {self.articles_found}")
-        print(f"Articles new:        {self.articles_new}")
-        print(f"Articles skipped:    {self.articles_skipped}")
+        print(f"Articles new:        {self.sink.stats['articles_new']}")
+        print(f"Articles skipped:    {self.sink.stats['articles_existing']}")
         print(f"Contracts extracted: {self.contracts_extracted}")
-        print(f"Contracts failed:    {self.contracts_failed}")
+        print(f"Contracts failed:    {self.contracts_failed + self.sink.stats['contracts_failed']}")
         print(f"{'='*70}\n")
 
 
@@ -495,10 +436,12 @@ def main():
     parser.add_argument('--end-date', type=str, help='End date (YYYY-MM-DD)')
     parser.add_argument('--days', type=int, default=7, help='Number of days back from today (default: 7)')
     parser.add_argument('--test', action='store_true', help='Test mode - scrape single article')
+    parser.add_argument('--workers', type=int, default=4, help='Announcements fetched concurrently (default: 4)')
+    parser.add_argument('--delay', type=float, default=1.0, help='Seconds between request starts across all workers (default: 1.0)')
     
     args = parser.parse_args()
     
-    scraper = DefenseGovContractScraper(delay_seconds=2.0)
+    scraper = DefenseGovContractScraper(delay_seconds=args.delay, workers=args.workers)
     
     if args.test:
         # Test with a known article
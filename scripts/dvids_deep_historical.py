@@ -15,19 +15,26 @@ import sys
 import time
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
 try:
-    from playwright.sync_api import sync_playwright
     from bs4 import BeautifulSoup
     from supabase import create_client
 except ImportError as e:
     print(f"Missing dependency: {e}")
     sys.exit(1)
 
+from article_fetcher import TieredFetcher
+from browser_pool import BrowserPagePool, RateLimiter
+from crawl_frontier import CrawlFrontier, FAILED, PARSED, SAVED
+from html_archive import open_archive
+from military_news_sink import MilitaryNewsSink
+from seen_urls import SeenURLIndex
+
 class DVIDSDeepHistoricalScraper:
-    def __init__(self):
+    def __init__(self, pages=4, contexts=2, recycle_after=100, delay=1.0):
         self.supabase = None
         
         supabase_url = os.getenv('SUPABASE_URL')
@@ -37,6 +44,19 @@ class DVIDSDeepHistoricalScraper:
             self.supabase = create_client(supabase_url, supabase_key)
             print("✅ Connected to Supabase")
         
+        self.seen_urls = SeenURLIndex(self.supabase).load()
+        # Raw pages go to the archive rather than the raw_html column
+        self.archive = open_archive()
+        self.sink = MilitaryNewsSink(self.supabase, raw_html=self.archive is None)
+        self.frontier = CrawlFrontier()
+        
+        # One politeness interval shared by the HTTP and browser tiers
+        self.rate_limiter = RateLimiter(delay)
+        self.pool = BrowserPagePool(pages=pages, contexts=contexts, recycle_after=recycle_after,
+                                    rate_limiter=self.rate_limiter, settle=2)
+        self.fetcher = TieredFetcher(self.pool.fetch, rate_limiter=self.rate_limiter, pool_size=pages,
+                                     archive=self.archive)
+        
         self.stats = {
             'total': 0,
             'new': 0,
@@ -45,40 +65,25 @@ class DVIDSDeepHistoricalScraper:
         }
     
     def start_browser(self):
-        """Start browser"""
+        """Start browser page pool"""
         print("🌐 Starting browser...")
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=True)
-        self.context = self.browser.new_context(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        )
-        self.page = self.context.new_page()
-        print("✅ Browser ready\n")
+        self.pool.start()
     
     def stop_browser(self):
-        if self.context:
-            self.context.close()
-        if self.browser:
-            self.browser.close()
-        if hasattr(self, 'playwright'):
-            self.playwright.stop()
+        self.pool.close()
+        print(f"🌐 Browser pool: {self.pool.recycled} context recycles, "
+              f"{self.pool.blocked_requests:,} requests blocked")
     
     def article_exists(self, url):
-        if not self.supabase:
-            return False
-        try:
-            result = self.supabase.table('military_news_articles').select('id').eq('article_url', url).execute()
-            return bool(result.data)
-        except:
-            return False
+        return url in self.seen_urls
     
     def extract_article(self, url):
         """Extract DVIDS article"""
         try:
-            self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
-            time.sleep(2)
+            html = self.fetcher.fetch(url, 'dvids', 'dvids')
+            if not html:
+                return None
             
-            html = self.page.content()
             soup = BeautifulSoup(html, 'html.parser')
             
             article = {
@@ -174,7 +179,7 @@ class DVIDSDeepHistoricalScraper:
             if not article.get('content'):
                 article['content'] = f"Content not extracted"
             
-            self.supabase.table('military_news_articles').insert({
+            self.sink.add_article({
                 'source': article.get('source'),
                 'source_category': article.get('source_category'),
                 'article_url': article.get('article_url'),
@@ -192,81 +197,132 @@ class DVIDSDeepHistoricalScraper:
                 'units_mentioned': article.get('units_mentioned'),
                 'image_urls': article.get('image_urls'),
                 'scraped_at': article.get('scraped_at'),
-            }).execute()
+            })
+            self.seen_urls.add(article.get('article_url'))
             return True
         except:
             return False
     
+    @staticmethod
+    def search_url(year, page):
+        return (f"https://www.dvidshub.net/search/?filter%5Btype%5D=news&filter%5Bdate_published_from%5D={year}-01-01"
+                f"&filter%5Bdate_published_to%5D={year}-12-31&view=grid&page={page}")
+    
+    def process_urls(self, urls, year_stats):
+        """Extract and save article URLs, recording each one's progress in the crawl frontier"""
+        new_urls = []
+        existing = []
+        for url in urls:
+            if self.article_exists(url):
+                existing.append(url)
+                year_stats['existing'] += 1
+                self.stats['existing'] += 1
+            else:
+                new_urls.append(url)
+        
+        self.frontier.add_urls('dvids', urls)
+        self.frontier.mark_many(existing, SAVED)
+        # Skips URLs another process is already working on
+        new_urls = self.frontier.claim(new_urls)
+        
+        # Extract concurrently (paced by the rate limiter), save in order here
+        saved = []
+        with ThreadPoolExecutor(max_workers=self.pool.size) as executor:
+            for url, article in zip(new_urls, executor.map(self.extract_article, new_urls)):
+                if article:
+                    self.frontier.mark(url, PARSED)
+                if article and self.save_article(article):
+                    saved.append(url)
+                    year_stats['new'] += 1
+                    self.stats['new'] += 1
+                else:
+                    self.frontier.mark(url, FAILED, 'not saved' if article else 'not extracted')
+                    year_stats['errors'] += 1
+                    self.stats['errors'] += 1
+                
+                self.stats['total'] += 1
+        
+        # Only count as saved once the buffered rows are written
+        failed = self.sink.flush()
+        self.frontier.mark_many([url for url in saved if url not in failed], SAVED)
+        self.frontier.mark_many([url for url in saved if url in failed], FAILED, 'not written')
+    
     def scrape_year(self, year):
         """Scrape all articles from a specific year"""
         print(f"\n{'='*70}")
         print(f"📅 SCRAPING YEAR: {year}")
         print(f"{'='*70}\n")
         
-        page = 1
         year_stats = {'new': 0, 'existing': 0, 'errors': 0}
-        consecutive_empty = 0
+        
+        # Past years' listings are fixed, so walked pages are skipped; the
+        # current year's pages shift as articles are published
+        if year < datetime.now().year:
+            page, consecutive_empty = self.frontier.resume_listing('dvids', year)
+            if consecutive_empty >= 10:
+                print(f"✅ {year} already fully walked")
+                return year_stats
+            if page > 1:
+                print(f"📍 Resuming {year} at page {page}")
+        else:
+            page, consecutive_empty = 1, 0
         
         while consecutive_empty < 10:
             try:
-                # Restart browser every 50 pages to prevent memory leaks
-                if page > 1 and page % 50 == 0:
-                    print(f"\n🔄 Restarting browser (memory management)...")
-                    self.stop_browser()
-                    time.sleep(2)
-                    self.start_browser()
-                
-                # DVIDS search by year
-                search_url = f"https://www.dvidshub.net/search/?filter%5Btype%5D=news&filter%5Bdate_published_from%5D={year}-01-01&filter%5Bdate_published_to%5D={year}-12-31&view=grid&page={page}"
-                
-                print(f"📄 Year {year}, Page {page}", end=" ")
-                
-                self.page.goto(search_url, wait_until='domcontentloaded', timeout=30000)
-                time.sleep(3)
-                
-                soup = BeautifulSoup(self.page.content(), 'html.parser')
-                links = soup.find_all('a', href=re.compile(r'/news/\d+/'))
-                
-                if not links:
-                    consecutive_empty += 1
-                    print(f"(empty {consecutive_empty}/10)")
-                    page += 1
-                    continue
+                # DVIDS search by year, one listing page per pooled browser page
+                page_numbers = list(range(page, page + self.pool.size))
+                page += len(page_numbers)
+                listings = self.pool.fetch_many([self.search_url(year, n) for n in page_numbers], settle=3)
                 
-                consecutive_empty = 0
-                urls = list(set([f"https://www.dvidshub.net{l['href']}" for l in links]))
-                print(f"- {len(urls)} articles")
-                
-                for url in urls:
-                    if self.article_exists(url):
-                        year_stats['existing'] += 1
-                        self.stats['existing'] += 1
+                urls = {}
+                walked = {}
+                for page_number, html in zip(page_numbers, listings):
+                    if html is None:
+                        print(f"📄 Year {year}, Page {page_number} ❌ failed to load")
                         continue
                     
-                    article = self.extract_article(url)
-                    if article and self.save_article(article):
-                        year_stats['new'] += 1
-                        self.stats['new'] += 1
-                    else:
-                        year_stats['errors'] += 1
-                        self.stats['errors'] += 1
+                    links = BeautifulSoup(html, 'html.parser').find_all('a', href=re.compile(r'/news/\d+/'))
+                    page_urls = set(f"https://www.dvidshub.net{l['href']}" for l in links)
+                    walked[page_number] = len(page_urls)
+                    if not links:
+                        consecutive_empty += 1
+                        print(f"📄 Year {year}, Page {page_number} (empty {consecutive_empty}/10)")
+                        if consecutive_empty >= 10:
+                            break
+                        continue
                     
-                    self.stats['total'] += 1
-                    time.sleep(1.5)
+                    consecutive_empty = 0
+                    print(f"📄 Year {year}, Page {page_number} - {len(page_urls)} articles")
+                    urls.update(dict.fromkeys(page_urls))
+                
+                self.process_urls(list(urls), year_stats)
                 
-                page += 1
+                # A listing page counts as covered once its articles are handled
+                for page_number, urls_found in walked.items():
+                    self.frontier.mark_listing('dvids', year, page_number, urls_found)
                 
             except KeyboardInterrupt:
                 print("\n⚠️  Interrupted")
                 return year_stats
             except Exception as e:
                 print(f"❌ Error: {e}")
-                page += 1
                 time.sleep(5)
         
         print(f"\n✅ {year} COMPLETE: {year_stats['new']} new, {year_stats['existing']} existing")
         return year_stats
     
+    def resume_pending(self):
+        """Finish articles a previous run discovered but did not save"""
+        pending = self.frontier.pending('dvids')
+        if not pending:
+            return
+        
+        print(f"📍 Resuming {len(pending)} articles discovered but not saved last run")
+        resume_stats = {'new': 0, 'existing': 0, 'errors': 0}
+        for i in range(0, len(pending), 100):
+            self.process_urls(pending[i:i + 100], resume_stats)
+        print(f"✅ Resumed: {resume_stats['new']} new, {resume_stats['errors']} errors\n")
+    
     def scrape_all_years(self, start_year, end_year):
         """Scrape all years from start to end"""
         print(f"\n{'='*70}")
@@ -277,6 +333,8 @@ class DVIDSDeepHistoricalScraper:
         
         start_time = datetime.now()
         
+        self.resume_pending()
+        
         # Scrape oldest to newest
         for year in range(start_year, end_year + 1):
             self.scrape_year(year)
@@ -306,16 +364,28 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--start-year', type=int, default=2003)
     parser.add_argument('--end-year', type=int, default=datetime.now().year)
+    parser.add_argument('--pages', type=int, default=4, help='Concurrent browser pages / fetch workers')
+    parser.add_argument('--contexts', type=int, default=2, help='Browser contexts the pages are spread over')
+    parser.add_argument('--recycle-after', type=int, default=100,
+                        help='Navigations before a browser context is recycled')
+    parser.add_argument('--delay', type=float, default=1.0,
+                        help='Minimum seconds between requests across all workers')
     
     args = parser.parse_args()
     
-    scraper = DVIDSDeepHistoricalScraper()
+    scraper = DVIDSDeepHistoricalScraper(pages=args.pages, contexts=args.contexts,
+                                         recycle_after=args.recycle_after, delay=args.delay)
     
     try:
         scraper.start_browser()
         scraper.scrape_all_years(args.start_year, args.end_year)
     finally:
         scraper.stop_browser()
+        scraper.sink.close()
+        scraper.sink.print_stats()
+        scraper.fetcher.print_stats()
+        scraper.frontier.release()
+        scraper.frontier.print_stats('dvids')
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+FPDS Atom Feed Ingester
+Streams task orders placed against an IDV (e.g. a GWAC parent contract)
+from the FPDS ezSearch Atom feed to an NDJSON file.
+
+- Pages are parsed with lxml iterparse and precompiled XPath lookups, one
+  entry at a time, instead of building a full tree per page
+- The first page's rel="last" link gives the result size, so the remaining
+  page offsets are fetched concurrently (paced by a shared rate limiter)
+- Queries are split by signed-date range, and a range whose results exceed
+  the page cap is halved until it fits
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+import logging
+
+import requests
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+FPDS_ATOM_URL = "https://www.fpds.gov/ezsearch/FEEDS/ATOM"
+PAGE_SIZE = 10  # Fixed by the feed
+
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+FPDS_NS = 'https://www.fpds.gov/FPDS'
+NAMESPACES = {'a': ATOM_NS, 'ns1': FPDS_NS}
+
+ENTRY_TAG = f'{{{ATOM_NS}}}entry'
+LINK_TAG = f'{{{ATOM_NS}}}link'
+FEED_TAG = f'{{{ATOM_NS}}}feed'
+
+# Entry field -> XPath relative to <entry>. The award element under <content>
+# is ns1:award for contracts and ns1:IDV for vehicles, hence the wildcard.
+_AWARD = 'a:content/*'
+_VENDOR = f'{_AWARD}/ns1:vendor'
+FIELD_PATHS = {
+    'title': 'a:title',
+    'last_modified': 'a:modified',
+    'award_id': f'{_AWARD}/ns1:awardID/ns1:awardContractID/ns1:PIID',
+    'mod_number': f'{_AWARD}/ns1:awardID/ns1:awardContractID/ns1:modNumber',
+    'referenced_idv_piid': f'{_AWARD}/ns1:awardID/ns1:referencedIDVID/ns1:PIID',
+    'recipient_name': f'{_VENDOR}/ns1:vendorHeader/ns1:vendorName',
+    'recipient_uei': f'{_VENDOR}/ns1:vendorSiteDetails/ns1:entityIdentifiers/ns1:vendorUEIInformation/ns1:UEI',
+    'recipient_city': f'{_VENDOR}/ns1:vendorSiteDetails/ns1:vendorLocation/ns1:city',
+    'recipient_state': f'{_VENDOR}/ns1:vendorSiteDetails/ns1:vendorLocation/ns1:state',
+    'award_date': f'{_AWARD}/ns1:relevantContractDates/ns1:signedDate',
+    'end_date': f'{_AWARD}/ns1:relevantContractDates/ns1:currentCompletionDate',
+    'award_amount': f'{_AWARD}/ns1:dollarValues/ns1:obligatedAmount',
+    'total_obligated': f'{_AWARD}/ns1:totalDollarValues/ns1:totalObligatedAmount',
+    'description': f'{_AWARD}/ns1:contractData/ns1:descriptionOfContractRequirement',
+    'awarding_agency': f'{_AWARD}/ns1:purchaserInformation/ns1:contractingOfficeAgencyID/@name',
+}
+FIELD_XPATHS = {
+    field: etree.XPath(f'string({path})', namespaces=NAMESPACES)
+    for field, path in FIELD_PATHS.items()
+}
+AMOUNT_FIELDS = ('award_amount', 'total_obligated')
+DATE_FIELDS = ('award_date', 'end_date')
+
+
+def parse_entry(entry: etree._Element) -> Dict:
+    """Extract FIELD_PATHS from one <entry> element"""
+    record = {}
+    for field, xpath in FIELD_XPATHS.items():
+        value = xpath(entry).strip() or None
+        if value and field in AMOUNT_FIELDS:
+            try:
+                value = float(value)
+            except ValueError:
+                value = None
+        elif value and field in DATE_FIELDS:
+            value = value[:10]
+        record[field] = value
+    return record
+
+
+def parse_feed(source) -> Tuple[List[Dict], Optional[int]]:
+    """
+    Parse one Atom feed page
+
+    Args:
+        source: File path or binary file-like object (e.g. response.raw)
+
+    Returns:
+        (entries, last_start) where last_start is the start offset of the
+        feed's last page, or None if the feed has no rel="last" link
+    """
+    entries = []
+    last_start = None
+
+    for _, elem in etree.iterparse(source, events=('end',), tag=(ENTRY_TAG, LINK_TAG)):
+        if elem.tag == ENTRY_TAG:
+            entries.append(parse_entry(elem))
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+        elif elem.getparent().tag == FEED_TAG and elem.get('rel') == 'last':
+            start = parse_qs(urlparse(elem.get('href', '')).query).get('start')
+            if start:
+                last_start = int(start[0])
+
+    return entries, last_start
+
+
+def split_date_range(start_date: str, end_date: str, days: int) -> List[Tuple[str, str]]:
+    """Split [start_date, end_date] into consecutive windows of at most `days` days"""
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+
+    windows = []
+    while start <= end:
+        window_end = min(start + timedelta(days=days - 1), end)
+        windows.append((start.strftime('%Y-%m-%d'), window_end.strftime('%Y-%m-%d')))
+        start = window_end + timedelta(days=1)
+    return windows
+
+
+class FPDSAtomIngester:
+    """Concurrent, streaming reader of FPDS Atom results for one IDV at a time"""
+
+    def __init__(self, session: requests.Session, rate_limiter, workers: int = 4,
+                 max_pages_per_query: int = 100, window_days: int = 365):
+        """
+        Args:
+            session: Shared HTTP session
+            rate_limiter: Object with wait(), called before every request
+            workers: Pages fetched at once within a date window
+            max_pages_per_query: Deepest page offset fetched for one query;
+                                 windows with more results are split
+            window_days: Initial date window size
+        """
+        self.session = session
+        self.rate_limiter = rate_limiter
+        self.workers = workers
+        self.max_pages_per_query = max_pages_per_query
+        self.window_days = window_days
+        self.failed_pages = 0
+
+    @staticmethod
+    def build_query(idv_piid: str, start_date: str, end_date: str) -> str:
+        return (f'REF_IDV_PIID:"{idv_piid}" '
+                f'SIGNED_DATE:[{start_date.replace("-", "/")},{end_date.replace("-", "/")}]')
+
+    def fetch_page(self, query: str, start: int) -> Tuple[List[Dict], Optional[int]]:
+        """Fetch and stream-parse one feed page"""
+        params = {'FEEDNAME': 'PUBLIC', 'templateName': '1.5.3', 'q': query, 'start': start}
+
+        self.rate_limiter.wait()
+        with self.session.get(FPDS_ATOM_URL, params=params, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            return parse_feed(response.raw)
+
+    def _fetch_page_safe(self, query: str, start: int) -> Optional[List[Dict]]:
+        try:
+            return self.fetch_page(query, start)[0]
+        except (requests.exceptions.RequestException, etree.XMLSyntaxError) as e:
+            logger.error(f"FPDS page start={start} failed for {query}: {e}")
+            return None
+
+    def ingest_window(self, idv_piid: str, start_date: str, end_date: str,
+                      emit: Callable[[List[Dict]], None]) -> int:
+        """Fetch every entry signed in [start_date, end_date]; returns entries emitted"""
+        query = self.build_query(idv_piid, start_date, end_date)
+        try:
+            entries, last_start = self.fetch_page(query, 0)
+        except (requests.exceptions.RequestException, etree.XMLSyntaxError) as e:
+            logger.error(f"FPDS query failed for {query}: {e}")
+            self.failed_pages += 1
+            return 0
+
+        last_start = last_start or 0
+        pages = last_start // PAGE_SIZE + 1
+
+        if pages > self.max_pages_per_query:
+            start = datetime.strptime(start_date, '%Y-%m-%d')
+            end = datetime.strptime(end_date, '%Y-%m-%d')
+            if start < end:
+                middle = start + (end - start) / 2
+                logger.info(f"  {idv_piid} {start_date}..{end_date}: {pages} pages, splitting window")
+                return (self.ingest_window(idv_piid, start_date, middle.strftime('%Y-%m-%d'), emit) +
+                        self.ingest_window(idv_piid, (middle + timedelta(days=1)).strftime('%Y-%m-%d'),
+                                           end_date, emit))
+
+            logger.warning(f"  {idv_piid} {start_date}: {pages} pages on a single day, "
+                           f"truncated to {self.max_pages_per_query}")
+            last_start = (self.max_pages_per_query - 1) * PAGE_SIZE
+
+        emit(entries)
+        count = len(entries)
+
+        offsets = range(PAGE_SIZE, last_start + 1, PAGE_SIZE)
+        if offsets:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for page_entries in executor.map(lambda offset: self._fetch_page_safe(query, offset), offsets):
+                    if page_entries is None:
+                        self.failed_pages += 1
+                        continue
+                    emit(page_entries)
+                    count += len(page_entries)
+
+        logger.info(f"  {idv_piid} {start_date}..{end_date}: {count} entries ({len(offsets) + 1} pages)")
+        return count
+
+    def ingest(self, idv_piid: str, start_date: str, end_date: str, output_file: Path,
+               extra_fields: Optional[Dict] = None) -> int:
+        """
+        Stream all entries for an IDV and date range to an NDJSON file
+
+        Records are written as each page arrives (pages are consumed in
+        order on this thread); the file is moved into place only when every
+        window has been processed.
+
+        Args:
+            extra_fields: Constant fields added to every record (e.g. gwac_name)
+
+        Returns:
+            Number of records written
+        """
+        output_file = Path(output_file)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = output_file.with_name(output_file.name + '.part')
+        extra_fields = extra_fields or {}
+        total = 0
+
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            def emit(entries: List[Dict]):
+                lines = [json.dumps({**extra_fields, **entry}, default=str) + '\n' for entry in entries]
+                f.writelines(lines)
+
+            for window_start, window_end in split_date_range(start_date, end_date, self.window_days):
+                total += self.ingest_window(idv_piid, window_start, window_end, emit)
+
+        os.replace(tmp_file, output_file)
+        logger.info(f"Wrote {total} FPDS records to {output_file}")
+        return total
@@ -6,8 +6,10 @@ Discovers and downloads ALL GSA MAS SIN contractor lists automatically
 
 import os
 import sys
-import time
 import re
+import json
+import queue
+import threading
 from pathlib import Path
 from datetime import datetime
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
@@ -24,25 +26,83 @@ logger = logging.getLogger(__name__)
 class GSAeLibraryDownloader:
     """Automated downloader for GSA eLibrary contractor lists"""
     
-    def __init__(self, output_dir: str = "data/gsa_schedules"):
+    BASE_URL = "https://www.gsaelibrary.gsa.gov"
+    DEFAULT_WORKERS = 4
+    
+    # Any of these on the downloadInfo / SIN page is the actual file link
+    DOWNLOAD_LINK_SELECTOR = ', '.join([
+        'a:has-text(".XLS File")',
+        'a:has-text("XLS File")',
+        'a:has-text(".CSV File")',
+        'a:has-text("CSV File")',
+        'a[href*="downloadContractorFile"]',
+        'a[href*="download"][href*=".xls"]',
+    ])
+    
+    def __init__(self, output_dir: str = "data/gsa_schedules", workers: int = DEFAULT_WORKERS):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.target_sins = []  # Will be discovered automatically
+        self.workers = workers
+        
+        # Per-SIN record of the last download, used to skip unchanged SINs
+        self.manifest_file = self.output_dir / "sin_manifest.json"
+        self.manifest = self._load_manifest()
+        self._manifest_lock = threading.Lock()
+    
+    def _load_manifest(self) -> dict:
+        """Load the per-SIN download manifest"""
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"Could not read SIN manifest, starting fresh: {e}")
+        return {}
+    
+    def _record_download(self, sin_code: str, contractor_count: int, output_file: Path):
+        """Record a successful SIN download and persist the manifest"""
+        with self._manifest_lock:
+            self.manifest[sin_code] = {
+                'last_download': datetime.now().isoformat(),
+                'contractor_count': contractor_count,
+                'file_name': output_file.name
+            }
+            tmp_file = self.manifest_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(self.manifest, f, indent=2, sort_keys=True)
+            os.replace(tmp_file, self.manifest_file)
+    
+    def _is_unchanged(self, sin_code: str, contractor_count: int) -> bool:
+        """True if the SIN was downloaded before with the same contractor count"""
+        record = self.manifest.get(sin_code)
+        if not record or contractor_count <= 0:
+            return False
+        return (record.get('contractor_count') == contractor_count
+                and (self.output_dir / record.get('file_name', '')).is_file())
+    
+    def _absolute_url(self, href: str) -> str:
+        """Resolve an eLibrary href to an absolute URL"""
+        if href.startswith('/'):
+            return f"{self.BASE_URL}{href}"
+        if href.startswith('http'):
+            return href
+        return f"{self.BASE_URL}/ElibMain/{href}"
     
     def discover_all_sins(self, page):
         """Discover all SIN codes from GSA MAS schedule page"""
         logger.info("Discovering all SINs from GSA MAS schedule...")
         
         # Navigate to MAS schedule summary
-        schedule_url = "https://www.gsaelibrary.gsa.gov/ElibMain/scheduleSummary.do?scheduleNumber=MAS"
+        schedule_url = f"{self.BASE_URL}/ElibMain/scheduleSummary.do?scheduleNumber=MAS"
         page.goto(schedule_url, timeout=60000)
-        page.wait_for_load_state('networkidle')
-        time.sleep(2)
         
         # Extract all SIN links from the page
         sins = []
         
         try:
+            page.wait_for_selector('a[href*="sinDetails.do"]', timeout=60000)
+            
             # Find all links that point to SIN detail pages
             sin_links = page.locator('a[href*="sinDetails.do"]').all()
             
@@ -76,27 +136,74 @@ class GSAeLibraryDownloader:
         
         return sins
     
-    def download_all_sins(self):
-        """Download contractor lists for all discovered SINs"""
+    def download_all_sins(self, force: bool = False):
+        """
+        Download contractor lists for all discovered SINs
+        
+        SINs are split across self.workers browser contexts, each running in
+        its own thread. A SIN whose contractor count matches the manifest from
+        the previous run is skipped unless force is True.
+        """
         print("=" * 70)
         print("GSA eLibrary Automated Full Downloader")
         print("=" * 70)
         print()
         print("This will discover ALL SINs on GSA MAS schedule and download them.")
-        print("This may take several hours depending on the number of SINs.")
-        print("The browser will open automatically. Please don't close it.")
+        print(f"Downloads run in {self.workers} parallel browser contexts.")
+        print("SINs unchanged since the last run are skipped.")
         print()
         
         results = {
             'success': [],
             'failed': [],
             'skipped': [],
-            'no_download': []
+            'no_download': [],
+            'unchanged': []
         }
         
+        # Discover all SINs
+        print("Step 1: Discovering all SINs...")
+        print("-" * 70)
         with sync_playwright() as p:
             # Launch browser in headless mode (no GUI needed)
             logger.info("Launching browser in headless mode...")
+            browser = p.chromium.launch(headless=True)
+            page = browser.new_page()
+            self.target_sins = self.discover_all_sins(page)
+            browser.close()
+        
+        if not self.target_sins:
+            print("ERROR: Could not discover any SINs!")
+            return results
+        
+        print(f"\nFound {len(self.target_sins)} SINs to process")
+        print()
+        print("Step 2: Downloading contractor lists...")
+        print("=" * 70)
+        
+        sin_queue = queue.Queue()
+        for i, (sin_code, sin_name) in enumerate(self.target_sins, 1):
+            sin_queue.put((i, sin_code, sin_name))
+        
+        workers = min(self.workers, len(self.target_sins))
+        threads = [
+            threading.Thread(target=self._worker, args=(n, sin_queue, results, force), daemon=True)
+            for n in range(1, workers + 1)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # Summary
+        self._print_summary(results)
+        
+        return results
+    
+    def _worker(self, worker_id: int, sin_queue: queue.Queue, results: dict, force: bool):
+        """Process SINs from the shared queue in one browser context"""
+        # Each thread needs its own Playwright instance with the sync API
+        with sync_playwright() as p:
             browser = p.chromium.launch(headless=True)
             context = browser.new_context(
                 accept_downloads=True,
@@ -104,138 +211,91 @@ class GSAeLibraryDownloader:
             )
             page = context.new_page()
             
-            # Discover all SINs
-            print("Step 1: Discovering all SINs...")
-            print("-" * 70)
-            self.target_sins = self.discover_all_sins(page)
-            
-            if not self.target_sins:
-                print("ERROR: Could not discover any SINs!")
-                browser.close()
-                return results
-            
-            print(f"\nFound {len(self.target_sins)} SINs to process")
-            print()
-            print("Step 2: Downloading contractor lists...")
-            print("=" * 70)
-            
-            # Process each SIN
-            for i, (sin_code, sin_name) in enumerate(self.target_sins, 1):
-                print()
-                print(f"[{i}/{len(self.target_sins)}] Processing SIN: {sin_code}")
-                print(f"    Name: {sin_name}")
-                print("-" * 70)
+            while True:
+                try:
+                    i, sin_code, sin_name = sin_queue.get_nowait()
+                except queue.Empty:
+                    break
+                
+                logger.info(f"[worker {worker_id}] [{i}/{len(self.target_sins)}] Processing SIN: {sin_code} ({sin_name})")
                 
                 try:
-                    result = self._download_sin(page, context, sin_code, sin_name)
+                    result = self._download_sin(page, sin_code, force)
                     
                     if result == "success":
                         results['success'].append(sin_code)
-                        print(f"    Status: Downloaded")
+                        logger.info(f"    {sin_code} Status: Downloaded")
+                    elif result == "unchanged":
+                        results['unchanged'].append(sin_code)
+                        logger.info(f"    {sin_code} Status: Unchanged since last download")
                     elif result == "no_download":
                         results['no_download'].append(sin_code)
-                        print(f"    Status: No download available")
+                        logger.info(f"    {sin_code} Status: No download available")
+                    elif result == "failed":
+                        results['failed'].append(sin_code)
+                        logger.info(f"    {sin_code} Status: Failed")
                     else:
                         results['skipped'].append(sin_code)
-                        print(f"    Status: Skipped")
-                    
-                    # Brief pause between downloads
-                    time.sleep(2)
+                        logger.info(f"    {sin_code} Status: Skipped")
                     
                 except Exception as e:
                     results['failed'].append(sin_code)
-                    logger.error(f"    Status: Failed - {e}")
-                    continue
+                    logger.error(f"    {sin_code} Status: Failed - {e}")
+                    
+                    # A crashed page can't be reused
+                    try:
+                        page.close()
+                    except Exception:
+                        pass
+                    page = context.new_page()
             
-            # Close browser
             browser.close()
-        
-        # Summary
-        self._print_summary(results)
-        
-        return results
     
-    def _download_sin(self, page, context, sin_code: str, sin_name: str) -> str:
+    def _download_sin(self, page, sin_code: str, force: bool = False) -> str:
         """Download contractor list for a specific SIN
         
         Returns:
             "success": Successfully downloaded
+            "unchanged": Contractor count matches the previous download
             "no_download": No download link available (not all SINs have downloadable lists)
             "failed": Download failed
         """
         
         try:
             # Direct URL to SIN page
-            direct_url = f"https://www.gsaelibrary.gsa.gov/ElibMain/sinDetails.do?scheduleNumber=MAS&specialItemNumber={sin_code}&executeQuery=YES"
+            direct_url = f"{self.BASE_URL}/ElibMain/sinDetails.do?scheduleNumber=MAS&specialItemNumber={sin_code}&executeQuery=YES"
             logger.info(f"Navigating to SIN page: {sin_code}")
-            page.goto(direct_url, timeout=45000)
-            page.wait_for_load_state('networkidle')
-            time.sleep(1)
-            
-            # Look for download link
-            logger.info("Looking for download link...")
+            page.goto(direct_url, timeout=45000, wait_until='domcontentloaded')
             
-            # First, check if there's a "Download Contractors" link that goes to downloadInfo page
-            download_info_link = None
+            # Contractor rows link to contractorInfo pages
             try:
-                elements = page.locator('a:has-text("Download Contractors")').all()
-                for element in elements:
-                    if element.is_visible(timeout=2000):
-                        href = element.get_attribute('href')
-                        if href and 'downloadInfo' in href:
-                            download_info_link = href
-                            logger.info(f"Found downloadInfo link: {href[:100]}")
-                            break
-            except:
+                page.wait_for_selector('a[href*="contractorInfo"], a:has-text("Download Contractors")', timeout=15000)
+            except PlaywrightTimeout:
                 pass
+            contractor_count = page.locator('a[href*="contractorInfo"]').count()
             
-            # If we found a downloadInfo link, navigate to it first
-            if download_info_link:
-                if download_info_link.startswith('/'):
-                    info_url = f"https://www.gsaelibrary.gsa.gov{download_info_link}"
-                elif download_info_link.startswith('http'):
-                    info_url = download_info_link
-                else:
-                    info_url = f"https://www.gsaelibrary.gsa.gov/ElibMain/{download_info_link}"
-                
-                logger.info(f"Navigating to download info page...")
-                page.goto(info_url, timeout=30000)
-                page.wait_for_load_state('networkidle')
-                time.sleep(1)
-            
-            # Now look for the actual .XLS or .CSV download link
-            download_selectors = [
-                'a:has-text(".XLS File")',
-                'a:has-text("XLS File")',
-                'a:has-text(".CSV File")',
-                'a:has-text("CSV File")',
-                'a[href*="downloadContractorFile"]',
-                'a[href*="download"][href*=".xls"]',
-            ]
-            
-            download_link = None
-            download_href = None
+            if not force and self._is_unchanged(sin_code, contractor_count):
+                return "unchanged"
             
-            for selector in download_selectors:
-                try:
-                    elements = page.locator(selector).all()
-                    for element in elements:
-                        if element.is_visible(timeout=2000):
-                            download_link = element
-                            download_href = element.get_attribute('href')
-                            logger.info(f"Found actual download link with selector: {selector}")
-                            if download_href:
-                                logger.info(f"  Download href: {download_href[:100]}")
-                            break
-                    if download_link:
-                        break
-                except:
-                    continue
+            # First, check if there's a "Download Contractors" link that goes to downloadInfo page
+            download_info = page.locator('a:has-text("Download Contractors")[href*="downloadInfo"]')
+            if download_info.count() > 0:
+                href = download_info.first.get_attribute('href')
+                logger.info(f"Navigating to download info page: {href[:100]}")
+                page.goto(self._absolute_url(href), timeout=30000, wait_until='domcontentloaded')
             
-            if not download_link:
+            # Now wait for the actual .XLS or .CSV download link
+            download_link = page.locator(self.DOWNLOAD_LINK_SELECTOR).first
+            try:
+                download_link.wait_for(state='visible', timeout=10000)
+            except PlaywrightTimeout:
                 logger.info(f"No download link found for SIN {sin_code} (this is normal for some SINs)")
                 return "no_download"
             
+            download_href = download_link.get_attribute('href')
+            if download_href:
+                logger.info(f"  Download href: {download_href[:100]}")
+            
             # Set up download handler
             output_file = self.output_dir / f"GSA_MAS_{sin_code}_{datetime.now().strftime('%Y%m%d')}.xlsx"
             
@@ -249,46 +309,40 @@ class GSAeLibraryDownloader:
                 download = download_info.value
                 download.save_as(output_file)
                 
-                # Verify file exists and has content
-                if output_file.exists() and output_file.stat().st_size > 0:
-                    file_size = output_file.stat().st_size / 1024  # KB
-                    logger.info(f"Downloaded successfully: {file_size:.1f} KB")
-                    return "success"
-                else:
-                    logger.error(f"Download failed or file is empty")
-                    return "failed"
-                    
             except PlaywrightTimeout:
                 logger.warning(f"Download timeout on click, trying direct navigation...")
                 
                 # Method 2: If click doesn't work, try navigating to the href directly
-                if download_href:
-                    try:
-                        # Handle relative URLs
-                        if download_href.startswith('/'):
-                            download_url = f"https://www.gsaelibrary.gsa.gov{download_href}"
-                        elif download_href.startswith('http'):
-                            download_url = download_href
-                        else:
-                            download_url = f"https://www.gsaelibrary.gsa.gov/ElibMain/{download_href}"
-                        
-                        logger.info(f"Trying direct URL: {download_url[:100]}")
-                        
-                        with page.expect_download(timeout=30000) as download_info:
-                            page.goto(download_url)
-                        
-                        download = download_info.value
-                        download.save_as(output_file)
-                        
-                        if output_file.exists() and output_file.stat().st_size > 0:
-                            file_size = output_file.stat().st_size / 1024
-                            logger.info(f"Downloaded successfully via direct URL: {file_size:.1f} KB")
-                            return "success"
-                    except:
-                        pass
+                if not download_href:
+                    logger.warning(f"Could not download {sin_code} - may not have downloadable data")
+                    return "no_download"
                 
-                logger.warning(f"Could not download {sin_code} - may not have downloadable data")
-                return "no_download"
+                try:
+                    download_url = self._absolute_url(download_href)
+                    logger.info(f"Trying direct URL: {download_url[:100]}")
+                    
+                    with page.expect_download(timeout=30000) as download_info:
+                        try:
+                            page.goto(download_url)
+                        except Exception:
+                            # goto reports an error when the response is a download
+                            pass
+                    
+                    download = download_info.value
+                    download.save_as(output_file)
+                except Exception:
+                    logger.warning(f"Could not download {sin_code} - may not have downloadable data")
+                    return "no_download"
+            
+            # Verify file exists and has content
+            if output_file.exists() and output_file.stat().st_size > 0:
+                file_size = output_file.stat().st_size / 1024  # KB
+                logger.info(f"Downloaded successfully: {file_size:.1f} KB")
+                self._record_download(sin_code, contractor_count, output_file)
+                return "success"
+            
+            logger.error(f"Download failed or file is empty")
+            return "failed"
                 
         except PlaywrightTimeout as e:
             logger.error(f"Page timeout for {sin_code}: {e}")
@@ -310,6 +364,7 @@ class GSAeLibraryDownloader:
         print(f"Total SINs processed: {total}")
         print()
         print(f"  Downloaded successfully: {len(results['success'])} SINs")
+        print(f"  Unchanged (skipped):     {len(results['unchanged'])} SINs")
         print(f"  No download available:   {len(results['no_download'])} SINs")
         print(f"  Failed:                  {len(results['failed'])} SINs")
         print(f"  Skipped:                 {len(results['skipped'])} SINs")
@@ -379,8 +434,8 @@ def main():
     print("     - Service descriptions and capabilities")
     print()
     print("IMPORTANT:")
-    print("  - This may take 2-4 hours to complete (hundreds of SINs)")
-    print("  - A browser window will open (don't close it)")
+    print("  - SINs are downloaded in parallel browser contexts")
+    print("  - SINs unchanged since the last run are skipped")
     print("  - Not all SINs have downloadable lists (this is normal)")
     print("  - The script will handle timeouts and continue automatically")
     print()
@@ -398,7 +453,7 @@ def main():
     results = downloader.download_all_sins()
     
     # Exit code based on results
-    if len(results['success']) > 0:
+    if len(results['success']) > 0 or len(results['unchanged']) > 0:
         sys.exit(0)
     else:
         sys.exit(1)
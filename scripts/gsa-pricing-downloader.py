@@ -2,18 +2,28 @@
 """
 GSA Pricing Downloader
 Downloads individual contractor price list Excel files from GSA eLibrary
+
+Downloads run on a pool of workers sharing one HTTP session. Each file is
+streamed to a .part file and renamed into place, and status changes are
+written back to gsa_price_lists in batches.
 """
 
 import os
 import sys
-import time
 import logging
+import threading
 import requests
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from supabase import create_client
 
+from browser_pool import RateLimiter
+from price_list_status import PriceListStatusWriter
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -23,7 +33,14 @@ logger = logging.getLogger(__name__)
 
 
 class GSAPricingDownloader:
-    def __init__(self):
+    DEFAULT_WORKERS = 4
+    MIN_REQUEST_INTERVAL = 0.25  # seconds between request starts, across all workers
+    UPSERT_BATCH_SIZE = 500
+    STATUS_BATCH_SIZE = 100
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, workers: int = DEFAULT_WORKERS,
+                 min_request_interval: float = MIN_REQUEST_INTERVAL):
         """Initialize the downloader with Supabase connection"""
         self.supabase_url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
         self.supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
@@ -47,6 +64,14 @@ class GSAPricingDownloader:
             'failed': 0,
             'no_url': 0
         }
+        
+        # Concurrency
+        self.workers = workers
+        self.min_request_interval = min_request_interval
+        self.session = self._build_session()
+        self.rate_limiter = RateLimiter(min_request_interval)
+        self._stats_lock = threading.Lock()
+        self.status = PriceListStatusWriter(self.supabase, batch_size=self.STATUS_BATCH_SIZE)
     
     def extract_price_list_urls(self) -> List[Dict]:
         """
@@ -99,180 +124,217 @@ class GSAPricingDownloader:
         logger.info(f"Total contractors with price list URLs: {len(contractors_with_urls)}")
         return contractors_with_urls
     
-    def _create_price_list_record(self, contractor: Dict) -> Optional[int]:
-        """Create or get existing price list record in database"""
-        try:
-            # Check if already exists
-            existing = self.supabase.table('gsa_price_lists')\
-                .select('id, parse_status')\
-                .eq('contract_number', contractor['contract_number'])\
-                .execute()
-            
-            if existing.data:
-                # Already exists
-                record = existing.data[0]
-                # Skip if already completed
-                if record['parse_status'] == 'completed':
-                    return None  # Skip
-                return record['id']
-            
-            # Create new record
-            new_record = {
+    def _build_session(self) -> requests.Session:
+        """Create a pooled HTTP session shared by all download workers"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.workers,
+            pool_maxsize=self.workers,
+            max_retries=Retry(total=3, backoff_factor=1,
+                              status_forcelist=[429, 500, 502, 503, 504])
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+        })
+        return session
+
+    def _ensure_price_list_records(self, contractors: List[Dict]) -> Dict[str, Dict]:
+        """
+        Pre-create gsa_price_lists rows for every contractor in one bulk upsert,
+        then load the id/status of every row in paged reads.
+        Returns a map of contract_number -> {'id', 'parse_status'}
+        """
+        logger.info(f"Ensuring price list records for {len(contractors)} contractors...")
+
+        rows = {}
+        for contractor in contractors:
+            rows[contractor['contract_number']] = {
                 'contractor_id': contractor['id'],
                 'contract_number': contractor['contract_number'],
                 'price_list_url': contractor['price_list_url'],
                 'parse_status': 'pending'
             }
-            
-            result = self.supabase.table('gsa_price_lists').insert(new_record).execute()
-            return result.data[0]['id']
-        
-        except Exception as e:
-            logger.error(f"Error creating price list record: {e}")
-            return None
-    
-    def _update_price_list_status(self, price_list_id: int, status: str, 
-                                   error: Optional[str] = None,
-                                   file_name: Optional[str] = None):
-        """Update price list record status"""
-        try:
-            update_data = {
-                'parse_status': status,
-                'updated_at': datetime.now().isoformat()
-            }
-            
-            if error:
-                update_data['parse_error'] = error
-            
-            if file_name:
-                update_data['file_name'] = file_name
-                update_data['file_downloaded'] = True
-                update_data['downloaded_at'] = datetime.now().isoformat()
-            
+        rows = list(rows.values())
+
+        # Existing rows are left untouched so completed downloads keep their status
+        for i in range(0, len(rows), self.UPSERT_BATCH_SIZE):
             self.supabase.table('gsa_price_lists')\
-                .update(update_data)\
-                .eq('id', price_list_id)\
+                .upsert(rows[i:i + self.UPSERT_BATCH_SIZE],
+                        on_conflict='contract_number',
+                        ignore_duplicates=True)\
                 .execute()
-        
-        except Exception as e:
-            logger.error(f"Error updating price list status: {e}")
-    
-    def download_price_list(self, contractor: Dict, price_list_id: int) -> bool:
+
+        records = {}
+        offset = 0
+        batch_size = 1000
+
+        while True:
+            result = self.supabase.table('gsa_price_lists')\
+                .select('id, contract_number, parse_status')\
+                .range(offset, offset + batch_size - 1)\
+                .execute()
+
+            if not result.data:
+                break
+
+            for record in result.data:
+                records[record['contract_number']] = record
+
+            if len(result.data) < batch_size:
+                break
+
+            offset += batch_size
+
+        logger.info(f"Loaded {len(records)} price list records")
+        return records
+
+    def _queue_status(self, contract_number: str, status: str,
+                      error: Optional[str] = None,
+                      file_name: Optional[str] = None):
+        """Queue a price list status transition for the next batched write"""
+        fields = {'parse_status': status}
+
+        if error:
+            fields['parse_error'] = error
+
+        if file_name:
+            fields['file_name'] = file_name
+            fields['file_downloaded'] = True
+            fields['downloaded_at'] = datetime.now().isoformat()
+
+        self.status.queue(contract_number, **fields)
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def download_price_list(self, contractor: Dict) -> bool:
         """
-        Download a single price list file
+        Download a single price list file, streaming it to a temp file
+        and renaming it into place once complete
         Returns True if successful, False otherwise
         """
         url = contractor['price_list_url']
         contract_number = contractor['contract_number']
-        
+
         # Create filename
         file_name = f"{contract_number}_pricelist.xlsx"
         file_path = self.download_dir / file_name
-        
+
         # Skip if already downloaded
         if file_path.exists():
             logger.info(f"Already downloaded: {contract_number}")
-            self._update_price_list_status(price_list_id, 'completed', file_name=file_name)
-            self.stats['skipped'] += 1
+            self._queue_status(contract_number, 'completed', file_name=file_name)
+            self._count('skipped')
             return True
-        
+
+        tmp_path = file_path.with_name(file_name + '.part')
+
         try:
-            # Update status to downloading
-            self._update_price_list_status(price_list_id, 'downloading')
-            
-            # Download the file
+            self.rate_limiter.wait()
             logger.info(f"Downloading: {contract_number} from {url}")
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=60, allow_redirects=True)
-            response.raise_for_status()
-            
-            # Save the file
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
-            
-            file_size_kb = len(response.content) / 1024
-            logger.info(f"Downloaded successfully: {contract_number} ({file_size_kb:.1f} KB)")
-            
-            # Update status
-            self._update_price_list_status(price_list_id, 'completed', file_name=file_name)
-            self.stats['downloaded'] += 1
-            
+
+            bytes_written = 0
+            with self.session.get(url, timeout=60, allow_redirects=True, stream=True) as response:
+                response.raise_for_status()
+
+                with open(tmp_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                        f.write(chunk)
+                        bytes_written += len(chunk)
+
+            os.replace(tmp_path, file_path)
+
+            logger.info(f"Downloaded successfully: {contract_number} ({bytes_written / 1024:.1f} KB)")
+
+            self._queue_status(contract_number, 'completed', file_name=file_name)
+            self._count('downloaded')
+
             return True
-        
+
         except requests.exceptions.RequestException as e:
             error_msg = f"Download failed: {str(e)}"
             logger.error(f"{contract_number}: {error_msg}")
-            self._update_price_list_status(price_list_id, 'failed', error=error_msg)
-            self.stats['failed'] += 1
+            self._queue_status(contract_number, 'failed', error=error_msg)
+            self._count('failed')
             return False
-        
+
         except Exception as e:
             error_msg = f"Unexpected error: {str(e)}"
             logger.error(f"{contract_number}: {error_msg}")
-            self._update_price_list_status(price_list_id, 'failed', error=error_msg)
-            self.stats['failed'] += 1
+            self._queue_status(contract_number, 'failed', error=error_msg)
+            self._count('failed')
             return False
-    
+
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
     def download_all(self, limit: Optional[int] = None, resume: bool = True):
         """
         Download all price lists
-        
+
         Args:
             limit: Maximum number to download (None for all)
-            resume: Skip already downloaded files
+            resume: Skip price lists already marked completed
         """
         logger.info("=" * 70)
         logger.info("GSA PRICING DOWNLOADER")
         logger.info("=" * 70)
-        
+
         # Create scraper log entry
         log_entry = self.supabase.table('gsa_pricing_scraper_log').insert({
             'status': 'running',
             'started_at': datetime.now().isoformat()
         }).execute()
         log_id = log_entry.data[0]['id']
-        
+
         try:
             # Get all contractors with price list URLs
             contractors = self.extract_price_list_urls()
+            # gsa_schedule_holders is unique on (contract_number, company_name), so one
+            # contract can come back several times; download its price list once
+            contractors = list({contractor['contract_number']: contractor
+                                for contractor in contractors}.values())
             self.stats['total'] = len(contractors)
-            
+
             if limit:
                 contractors = contractors[:limit]
                 logger.info(f"Limiting to first {limit} price lists")
-            
-            logger.info(f"Total price lists to download: {len(contractors)}")
-            logger.info("")
-            
-            # Download each price list
-            for i, contractor in enumerate(contractors, 1):
-                logger.info(f"[{i}/{len(contractors)}] Processing: {contractor['company_name']}")
-                
-                # Create or get price list record
-                price_list_id = self._create_price_list_record(contractor)
-                
-                if price_list_id is None:
-                    logger.info(f"  Already completed, skipping")
+
+            # Create all price list records up front
+            records = self._ensure_price_list_records(contractors)
+
+            to_download = []
+            for contractor in contractors:
+                record = records.get(contractor['contract_number'])
+                if resume and record and record['parse_status'] == 'completed':
                     self.stats['skipped'] += 1
                     continue
-                
-                # Download the file
-                self.download_price_list(contractor, price_list_id)
-                
-                # Rate limiting
-                time.sleep(0.5)  # Be nice to GSA servers
-                
-                # Progress update every 50 downloads
-                if i % 50 == 0:
-                    logger.info("")
-                    logger.info(f"Progress: {i}/{len(contractors)}")
-                    logger.info(f"Downloaded: {self.stats['downloaded']}, Skipped: {self.stats['skipped']}, Failed: {self.stats['failed']}")
-                    logger.info("")
-            
+                to_download.append(contractor)
+
+            logger.info(f"Total price lists to download: {len(to_download)} "
+                        f"({self.stats['skipped']} already completed)")
+            logger.info(f"Workers: {self.workers}, min request interval: {self.min_request_interval}s")
+            logger.info("")
+
+            try:
+                with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                    futures = [executor.submit(self.download_price_list, contractor)
+                               for contractor in to_download]
+
+                    for i, _ in enumerate(as_completed(futures), 1):
+                        # Progress update every 50 downloads
+                        if i % 50 == 0:
+                            logger.info("")
+                            logger.info(f"Progress: {i}/{len(to_download)}")
+                            logger.info(f"Downloaded: {self.stats['downloaded']}, Skipped: {self.stats['skipped']}, Failed: {self.stats['failed']}")
+                            logger.info("")
+            finally:
+                self.status.flush()
+
             # Final summary
             logger.info("")
             logger.info("=" * 70)
@@ -283,7 +345,7 @@ class GSAPricingDownloader:
             logger.info(f"Skipped: {self.stats['skipped']}")
             logger.info(f"Failed: {self.stats['failed']}")
             logger.info("")
-            
+
             # Update scraper log
             self.supabase.table('gsa_pricing_scraper_log').update({
                 'status': 'completed',
@@ -292,17 +354,17 @@ class GSAPricingDownloader:
                 'downloaded_count': self.stats['downloaded'],
                 'failed_count': self.stats['failed']
             }).eq('id', log_id).execute()
-        
+
         except Exception as e:
             logger.error(f"Download process failed: {e}")
-            
+
             # Update scraper log
             self.supabase.table('gsa_pricing_scraper_log').update({
                 'status': 'failed',
                 'completed_at': datetime.now().isoformat(),
                 'errors': [{'error': str(e)}]
             }).eq('id', log_id).execute()
-            
+
             raise
 
 
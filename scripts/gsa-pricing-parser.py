@@ -15,6 +15,8 @@ from datetime import datetime
 from typing import Optional, Dict, List, Any
 from supabase import create_client
 
+from price_list_status import PriceListStatusWriter
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -24,6 +26,8 @@ logger = logging.getLogger(__name__)
 
 
 class GSAPricingParser:
+    STATUS_FLUSH_EVERY = 500
+    
     def __init__(self):
         """Initialize the parser with Supabase connection"""
         self.supabase_url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
@@ -77,6 +81,9 @@ class GSAPricingParser:
             'failed': 0,
             'labor_categories_found': 0
         }
+        
+        # Status updates buffered for bulk writes, flushed by parse_all_files
+        self.status = PriceListStatusWriter(self.supabase, batch_size=None)
     
     def _find_column(self, df: pd.DataFrame, possible_names: List[str]) -> Optional[str]:
         """Find a column in the DataFrame by checking possible names"""
@@ -247,12 +254,56 @@ class GSAPricingParser:
         
         return labor_categories
     
-    def parse_all_files(self, limit: Optional[int] = None):
+    def _load_id_map(self, table: str) -> Dict[str, int]:
+        """
+        Load a contract_number -> id map for a table with paged bulk reads
+        The first row wins when a contract number appears more than once
+        """
+        logger.info(f"Loading {table} ids...")
+        
+        id_map = {}
+        offset = 0
+        batch_size = 1000
+        
+        while True:
+            result = self.supabase.table(table)\
+                .select('id, contract_number')\
+                .order('id')\
+                .range(offset, offset + batch_size - 1)\
+                .execute()
+            
+            if not result.data:
+                break
+            
+            for row in result.data:
+                id_map.setdefault(row['contract_number'], row['id'])
+            
+            if len(result.data) < batch_size:
+                break
+            
+            offset += batch_size
+        
+        logger.info(f"Loaded {len(id_map)} {table} ids")
+        return id_map
+    
+    def _flush_status_updates(self):
+        """Write the buffered gsa_price_lists status updates"""
+        written = self.status.flush()
+        if written:
+            logger.info(f"  Wrote {written} price list status updates")
+    
+    def parse_all_files(self, limit: Optional[int] = None,
+                        flush_every: int = STATUS_FLUSH_EVERY):
         """
         Parse all downloaded price list files
         
+        contractor_id and price_list_id are resolved from maps preloaded at
+        startup, and status updates are written in bulk every flush_every
+        files and at the end of the run.
+        
         Args:
             limit: Maximum number of files to parse (None for all)
+            flush_every: Number of status updates to buffer before writing
         """
         logger.info("=" * 70)
         logger.info("GSA PRICING PARSER")
@@ -271,101 +322,92 @@ class GSAPricingParser:
         logger.info(f"Total files to parse: {len(excel_files)}")
         logger.info("")
         
-        # Parse each file
-        for i, file_path in enumerate(excel_files, 1):
-            # Extract contract number from filename
-            contract_number = file_path.stem.replace('_pricelist', '')
-            
-            logger.info(f"[{i}/{len(excel_files)}] Parsing: {contract_number}")
-            
-            try:
-                # Get contractor_id and price_list_id from database
-                contractor_result = self.supabase.table('gsa_schedule_holders')\
-                    .select('id')\
-                    .eq('contract_number', contract_number)\
-                    .execute()
-                
-                if not contractor_result.data:
-                    logger.warning(f"  Contractor not found in database: {contract_number}")
-                    self.stats['failed'] += 1
-                    continue
-                
-                contractor_id = contractor_result.data[0]['id']
-                
-                # Get price_list_id
-                price_list_result = self.supabase.table('gsa_price_lists')\
-                    .select('id')\
-                    .eq('contract_number', contract_number)\
-                    .execute()
-                
-                if not price_list_result.data:
-                    logger.warning(f"  Price list record not found: {contract_number}")
-                    self.stats['failed'] += 1
-                    continue
-                
-                price_list_id = price_list_result.data[0]['id']
+        # Preload lookups so parsing never queries per file
+        contractor_ids = self._load_id_map('gsa_schedule_holders')
+        price_list_ids = self._load_id_map('gsa_price_lists')
+        logger.info("")
+        
+        try:
+            # Parse each file
+            for i, file_path in enumerate(excel_files, 1):
+                # Extract contract number from filename
+                contract_number = file_path.stem.replace('_pricelist', '')
                 
-                # Update status to parsing
-                self.supabase.table('gsa_price_lists').update({
-                    'parse_status': 'parsing',
-                    'updated_at': datetime.now().isoformat()
-                }).eq('id', price_list_id).execute()
+                logger.info(f"[{i}/{len(excel_files)}] Parsing: {contract_number}")
                 
-                # Parse the file
-                labor_categories = self.parse_excel_file(file_path, contract_number)
+                try:
+                    contractor_id = contractor_ids.get(contract_number)
+                    
+                    if contractor_id is None:
+                        logger.warning(f"  Contractor not found in database: {contract_number}")
+                        self.stats['failed'] += 1
+                        continue
+                    
+                    price_list_id = price_list_ids.get(contract_number)
+                    
+                    if price_list_id is None:
+                        logger.warning(f"  Price list record not found: {contract_number}")
+                        self.stats['failed'] += 1
+                        continue
+                    
+                    # Parse the file
+                    labor_categories = self.parse_excel_file(file_path, contract_number)
+                    
+                    if not labor_categories:
+                        logger.warning(f"  No labor categories found")
+                        self.status.queue(
+                            contract_number,
+                            parse_status='completed',
+                            labor_categories_count=0,
+                            parsed_at=datetime.now().isoformat()
+                        )
+                        self.stats['failed'] += 1
+                        continue
+                    
+                    # Add contractor_id and price_list_id to each category
+                    for category in labor_categories:
+                        category['contractor_id'] = contractor_id
+                        category['price_list_id'] = price_list_id
+                    
+                    # Save to JSON
+                    output_file = self.parsed_dir / f"{contract_number}_parsed.json"
+                    with open(output_file, 'w') as f:
+                        json.dump({
+                            'contract_number': contract_number,
+                            'contractor_id': contractor_id,
+                            'price_list_id': price_list_id,
+                            'labor_categories': labor_categories,
+                            'parsed_at': datetime.now().isoformat()
+                        }, f, indent=2)
+                    
+                    logger.info(f"  ✓ Found {len(labor_categories)} labor categories")
+                    
+                    self.status.queue(
+                        contract_number,
+                        parse_status='completed',
+                        labor_categories_count=len(labor_categories),
+                        parsed_at=datetime.now().isoformat()
+                    )
+                    
+                    self.stats['parsed'] += 1
+                    self.stats['labor_categories_found'] += len(labor_categories)
                 
-                if not labor_categories:
-                    logger.warning(f"  No labor categories found")
-                    self.supabase.table('gsa_price_lists').update({
-                        'parse_status': 'completed',
-                        'labor_categories_count': 0,
-                        'parsed_at': datetime.now().isoformat()
-                    }).eq('id', price_list_id).execute()
+                except Exception as e:
+                    logger.error(f"  Failed to parse: {e}")
+                    
+                    if contract_number in price_list_ids:
+                        self.status.queue(
+                            contract_number,
+                            parse_status='failed',
+                            parse_error=str(e)
+                        )
+                    
                     self.stats['failed'] += 1
-                    continue
-                
-                # Add contractor_id and price_list_id to each category
-                for category in labor_categories:
-                    category['contractor_id'] = contractor_id
-                    category['price_list_id'] = price_list_id
-                
-                # Save to JSON
-                output_file = self.parsed_dir / f"{contract_number}_parsed.json"
-                with open(output_file, 'w') as f:
-                    json.dump({
-                        'contract_number': contract_number,
-                        'contractor_id': contractor_id,
-                        'price_list_id': price_list_id,
-                        'labor_categories': labor_categories,
-                        'parsed_at': datetime.now().isoformat()
-                    }, f, indent=2)
-                
-                logger.info(f"  ✓ Found {len(labor_categories)} labor categories")
-                
-                # Update database
-                self.supabase.table('gsa_price_lists').update({
-                    'parse_status': 'completed',
-                    'labor_categories_count': len(labor_categories),
-                    'parsed_at': datetime.now().isoformat()
-                }).eq('id', price_list_id).execute()
-                
-                self.stats['parsed'] += 1
-                self.stats['labor_categories_found'] += len(labor_categories)
-            
-            except Exception as e:
-                logger.error(f"  Failed to parse: {e}")
-                
-                # Update status to failed
-                try:
-                    self.supabase.table('gsa_price_lists').update({
-                        'parse_status': 'failed',
-                        'parse_error': str(e),
-                        'updated_at': datetime.now().isoformat()
-                    }).eq('contract_number', contract_number).execute()
-                except:
-                    pass
                 
-                self.stats['failed'] += 1
+                if flush_every and len(self.status) >= flush_every:
+                    self._flush_status_updates()
+        finally:
+            self._flush_status_updates()
         
         # Final summary
         logger.info("")
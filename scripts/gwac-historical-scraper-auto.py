@@ -1,17 +1,23 @@
 #!/usr/bin/env python3
 """
 GWAC Historical Data Scraper - AUTO MODE
-Automatically scrapes last year of data (no interactive prompts)
+Automatically syncs GWAC awards (no interactive prompts)
+
+The first run for a GWAC covers the last year. Later runs only fetch from
+that GWAC's action-date watermark (minus a 7-day overlap) to today, and
+upsert the results into a SQLite award store keyed on award_id. Windows
+deeper than the search endpoint's page limit are split in half rather than
+truncated, so the watermark only advances over fully ingested windows.
 """
 
 import requests
-import json
 import csv
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Tuple
 import logging
 import time
+from gwac_sync_state import AwardStore, GWACWatermarks
 
 # Setup logging
 logging.basicConfig(
@@ -20,6 +26,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+USASPENDING_URL = "https://api.usaspending.gov/api/v2/search/spending_by_award/"
+PAGE_LIMIT = 100  # API maximum per page
+MAX_PAGES_PER_QUERY = 100  # Page depth the search endpoint will serve (10,000 rows)
+
+# Award record columns, in CSV order
+AUTO_AWARD_FIELDS = [
+    'gwac_key', 'gwac_name', 'gwac_parent_contract', 'award_id',
+    'contractor_name', 'contractor_uei', 'contractor_duns', 'contractor_city', 'contractor_state',
+    'award_amount', 'total_outlayed', 'start_date', 'end_date', 'award_description',
+    'awarding_agency', 'awarding_sub_agency', 'award_type', 'data_source', 'scraped_at'
+]
+NUMERIC_FIELDS = {'award_amount', 'total_outlayed'}
+
 # Major GWACs to track
 GWAC_CONTRACTS = {
     'alliant2': {
@@ -56,23 +75,44 @@ GWAC_CONTRACTS = {
     },
 }
 
-def scrape_usaspending_gwac(gwac_key: str, gwac_info: Dict, start_date: str, end_date: str) -> List[Dict]:
-    """Scrape GWAC spending data from USAspending.gov API"""
-    logger.info(f"Scraping {gwac_info['name']}...")
-    
-    all_awards = []
+def _build_award_record(gwac_key: str, gwac_info: Dict, award: Dict) -> Dict:
+    """Map a spending_by_award result to an AUTO_AWARD_FIELDS record"""
+    return {
+        'gwac_key': gwac_key,
+        'gwac_name': gwac_info['name'],
+        'gwac_parent_contract': gwac_info['idv_piid'],
+        'award_id': award.get('Award ID'),
+        'contractor_name': award.get('Recipient Name'),
+        'contractor_uei': award.get('Recipient UEI'),
+        'contractor_duns': award.get('Recipient DUNS'),
+        'contractor_city': award.get('recipient_location_city_name'),
+        'contractor_state': award.get('recipient_location_state_code'),
+        'award_amount': award.get('Award Amount'),
+        'total_outlayed': award.get('Total Outlayed Amount'),
+        'start_date': award.get('Start Date'),
+        'end_date': award.get('End Date'),
+        'award_description': award.get('Description'),
+        'awarding_agency': award.get('Awarding Agency'),
+        'awarding_sub_agency': award.get('Awarding Sub Agency'),
+        'award_type': award.get('Award Type'),
+        'data_source': 'usaspending',
+        'scraped_at': datetime.now().isoformat()
+    }
+
+def fetch_window(session: requests.Session, store: AwardStore, gwac_key: str, gwac_info: Dict,
+                 start_date: str, end_date: str) -> Tuple[int, bool]:
+    """
+    Page through spending_by_award for one date window into the award store
+
+    If the window has more rows than the endpoint's page depth allows, it is
+    split in half and each half is fetched on its own. Returns (awards new
+    to this run, complete); complete is False if a request failed or a
+    single day still had more rows than the page depth.
+    """
+    fetched = 0
     page = 1
-    has_more = True
-    
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'PropShop.AI GWAC Research Tool',
-        'Accept': 'application/json'
-    })
     
-    while has_more and page <= 10:  # Limit to 10 pages per GWAC for speed
-        url = "https://api.usaspending.gov/api/v2/search/spending_by_award/"
-        
+    while True:
         payload = {
             "filters": {
                 "award_type_codes": ["IDV_B", "IDV_B_A", "IDV_B_B", "IDV_B_C"],
@@ -100,81 +140,98 @@ def scrape_usaspending_gwac(gwac_key: str, gwac_info: Dict, start_date: str, end
                 "recipient_location_city_name"
             ],
             "page": page,
-            "limit": 100,
+            "limit": PAGE_LIMIT,
             "order": "desc",
             "sort": "Award Amount"
         }
         
         try:
-            response = session.post(url, json=payload, timeout=30)
+            response = session.post(USASPENDING_URL, json=payload, timeout=30)
             response.raise_for_status()
             data = response.json()
-            
-            results = data.get('results', [])
-            if not results:
-                has_more = False
-                break
-            
-            for award in results:
-                all_awards.append({
-                    'gwac_key': gwac_key,
-                    'gwac_name': gwac_info['name'],
-                    'gwac_parent_contract': gwac_info['idv_piid'],
-                    'award_id': award.get('Award ID'),
-                    'contractor_name': award.get('Recipient Name'),
-                    'contractor_uei': award.get('Recipient UEI'),
-                    'contractor_duns': award.get('Recipient DUNS'),
-                    'contractor_city': award.get('recipient_location_city_name'),
-                    'contractor_state': award.get('recipient_location_state_code'),
-                    'award_amount': award.get('Award Amount'),
-                    'total_outlayed': award.get('Total Outlayed Amount'),
-                    'start_date': award.get('Start Date'),
-                    'end_date': award.get('End Date'),
-                    'award_description': award.get('Description'),
-                    'awarding_agency': award.get('Awarding Agency'),
-                    'awarding_sub_agency': award.get('Awarding Sub Agency'),
-                    'award_type': award.get('Award Type'),
-                    'data_source': 'usaspending',
-                    'scraped_at': datetime.now().isoformat()
-                })
-            
-            logger.info(f"  Page {page}: Found {len(results)} awards (total: {len(all_awards)})")
-            
-            if len(results) < 100:
-                has_more = False
-            else:
-                page += 1
-                time.sleep(0.5)
-            
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching data: {e}")
-            has_more = False
+            return fetched, False
+        
+        results = data.get('results', [])
+        fetched += len(store.upsert([_build_award_record(gwac_key, gwac_info, award) for award in results]))
+        logger.info(f"  {start_date}..{end_date} page {page}: Found {len(results)} awards (new this run: {fetched})")
+        
+        has_next = data.get('page_metadata', {}).get('hasNext', len(results) == PAGE_LIMIT)
+        if not results or not has_next:
+            return fetched, True
+        
+        if page >= MAX_PAGES_PER_QUERY:
+            start = datetime.strptime(start_date, '%Y-%m-%d')
+            end = datetime.strptime(end_date, '%Y-%m-%d')
+            if start >= end:
+                logger.warning(f"  {gwac_info['name']} {start_date}: page depth limit reached on a single day, "
+                               f"window not fully ingested")
+                return fetched, False
+            
+            middle = start + (end - start) / 2
+            logger.info(f"  {gwac_info['name']} {start_date}..{end_date}: page depth limit, splitting window")
+            first, first_complete = fetch_window(session, store, gwac_key, gwac_info,
+                                                 start_date, middle.strftime('%Y-%m-%d'))
+            second, second_complete = fetch_window(session, store, gwac_key, gwac_info,
+                                                   (middle + timedelta(days=1)).strftime('%Y-%m-%d'), end_date)
+            return fetched + first + second, first_complete and second_complete
+        
+        page += 1
+        time.sleep(0.5)
+
+def scrape_usaspending_gwac(store: AwardStore, gwac_key: str, gwac_info: Dict,
+                            start_date: str, end_date: str) -> Tuple[int, bool]:
+    """
+    Scrape GWAC spending data from USAspending.gov API into the award store
+    
+    Returns (awards new to this run, complete); the watermark should only
+    advance when complete is True.
+    """
+    logger.info(f"Scraping {gwac_info['name']} ({start_date} to {end_date})...")
     
-    return all_awards
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'PropShop.AI GWAC Research Tool',
+        'Accept': 'application/json'
+    })
+    
+    return fetch_window(session, store, gwac_key, gwac_info, start_date, end_date)
 
 def main():
-    """Main execution - automatically scrape last year"""
+    """Main execution - sync each GWAC from its watermark (last year on first run)"""
     print("="*70)
     print("GWAC Historical Data Scraper - AUTO MODE")
     print("="*70)
-    print(f"Mode: Last 12 months")
+    print(f"Mode: Incremental (last 12 months on first run)")
     print(f"Target GWACs: {len(GWAC_CONTRACTS)}")
     print()
     
-    # Auto-set to last year
-    start_date = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+    output_dir = Path("data/gwac_historical")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    watermarks = GWACWatermarks(output_dir / "gwac_watermarks_auto.json")
+    store = AwardStore(output_dir / "gwac_historical_awards_auto.db", AUTO_AWARD_FIELDS, NUMERIC_FIELDS,
+                       legacy_master=output_dir / "gwac_historical_awards_auto_master.json")
+    
+    default_start = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
     end_date = datetime.now().strftime('%Y-%m-%d')
     
-    print(f"Date range: {start_date} to {end_date}")
+    print(f"End date: {end_date}")
     print(f"Starting scrape...")
     print()
     
     start_time = time.time()
-    all_awards = []
+    fetched_count = 0
     
     for gwac_key, gwac_info in GWAC_CONTRACTS.items():
-        awards = scrape_usaspending_gwac(gwac_key, gwac_info, start_date, end_date)
-        all_awards.extend(awards)
+        start_date = watermarks.start_date(gwac_key, default_start)
+        fetched, complete = scrape_usaspending_gwac(store, gwac_key, gwac_info, start_date, end_date)
+        fetched_count += fetched
+        
+        if complete:
+            watermarks.advance(gwac_key, start_date, end_date, fetched)
+        else:
+            logger.warning(f"{gwac_info['name']}: window not fully ingested, watermark not advanced")
         time.sleep(2)
     
     elapsed = time.time() - start_time
@@ -182,24 +239,20 @@ def main():
     print(f"\n{'='*70}")
     print("SCRAPING COMPLETE")
     print(f"{'='*70}")
-    print(f"Total awards collected: {len(all_awards):,}")
+    print(f"Awards fetched this run: {fetched_count:,}")
+    print(f"Total awards collected: {store.count():,}")
     print(f"Runtime: {elapsed/60:.1f} minutes")
     print()
     
-    # Save to CSV
-    output_dir = Path("data/gwac_historical")
-    output_dir.mkdir(parents=True, exist_ok=True)
+    # Save this run's awards to CSV (the store keeps the full history)
     output_file = output_dir / f"gwac_historical_awards_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
     
-    if all_awards:
-        all_keys = set()
-        for record in all_awards:
-            all_keys.update(record.keys())
-        
+    if fetched_count:
         with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=sorted(all_keys))
-            writer.writeheader()
-            writer.writerows(all_awards)
+            writer = csv.writer(f)
+            writer.writerow(AUTO_AWARD_FIELDS)
+            for rows in store.iter_chunks(this_run=True):
+                writer.writerows(rows)
         
         file_size_mb = output_file.stat().st_size / (1024 * 1024)
         print(f"Saved to: {output_file}")
@@ -212,24 +265,14 @@ def main():
         print("4. Upload the CSV file")
         print("5. Map columns and import")
         print()
-        
-        # Show top contractors
-        print("Top 10 contractors by spending:")
-        contractor_totals = {}
-        for award in all_awards:
-            name = award.get('contractor_name', 'Unknown')
-            amount = award.get('award_amount', 0)
-            try:
-                contractor_totals[name] = contractor_totals.get(name, 0) + float(amount)
-            except (ValueError, TypeError):
-                pass
-        
-        top_contractors = sorted(contractor_totals.items(), key=lambda x: x[1], reverse=True)[:10]
-        for i, (name, total) in enumerate(top_contractors, 1):
-            print(f"  {i}. {name}: ${total:,.0f}")
     else:
-        print("No awards found!")
+        print("No new awards found!")
+    
+    if store.count():
+        # Show top contractors across everything synced so far
+        print("Top 10 contractors by spending:")
+        for i, (name, total) in enumerate(store.top_totals('contractor_name', 'award_amount'), 1):
+            print(f"  {i}. {name}: ${total or 0:,.0f}")
 
 if __name__ == "__main__":
     main()
-
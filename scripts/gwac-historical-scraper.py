@@ -11,13 +11,21 @@ Output: Ready for Supabase import
 
 import requests
 import json
-import csv
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
+from requests.adapters import HTTPAdapter
+from gwac_sync_state import AwardStore, GWACWatermarks
+from usaspending_bulk import download_idv_archives, iter_archive_awards
+from gwac_aggregation import ContractorAggregator, summary_to_records, write_summary_parquet
+from fpds_atom import FPDSAtomIngester
+from award_sinks import AWARD_FIELDS, NUMERIC_FIELDS, SINKS, AwardSink, open_sink
+from browser_pool import RateLimiter
 
 # Setup logging
 logging.basicConfig(
@@ -90,36 +98,104 @@ class GWACHistoricalScraper:
         },
     }
     
-    def __init__(self, output_dir: str = "data/gwac_historical"):
+    USASPENDING_URL = "https://api.usaspending.gov/api/v2/search/spending_by_award/"
+    PAGE_LIMIT = 100  # API maximum per page
+    MAX_PAGES_PER_QUERY = 100  # Page depth the search endpoint will serve (10,000 rows)
+    SINK_BATCH_SIZE = 1000  # Rows per sink write when reading bulk archives
+    # Award store columns read for the contractor summary, in ContractorAggregator.add_columns order
+    AGGREGATION_FIELDS = ['recipient_name', 'recipient_uei', 'gwac_name', 'award_amount', 'start_date']
+    
+    def __init__(self, output_dir: str = "data/gwac_historical",
+                 max_workers: int = 6, gwac_workers: int = 3,
+                 min_request_interval: float = 0.2, output_format: str = 'csv'):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.output_format = output_format  # csv, ndjson or parquet
+        self.max_workers = max_workers
+        self.gwac_workers = gwac_workers
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers * gwac_workers,
+                              pool_maxsize=max_workers * gwac_workers)
+        self.session.mount('https://', adapter)
         self.session.headers.update({
             'User-Agent': 'PropShop.AI GWAC Research Tool (contact@propshop.ai)',
             'Accept': 'application/json'
         })
+        # Shared by every shard and GWAC worker
+        self.rate_limiter = RateLimiter(min_request_interval)
+        
+        # Incremental sync state
+        self.watermarks = GWACWatermarks(self.output_dir / "gwac_watermarks.json")
+        self.award_store = AwardStore(self.output_dir / "gwac_historical_awards.db", AWARD_FIELDS, NUMERIC_FIELDS,
+                                      legacy_master=self.output_dir / "gwac_historical_awards_master.json")
+        self.failed_shards: Dict[str, int] = {}
+        
+        # Last aggregate_by_contractor result as a DataFrame (for Parquet output)
+        self.contractor_summary = None
     
-    def scrape_usaspending_gwac(self, gwac_key: str, gwac_info: Dict, 
-                                 start_date: str = None, end_date: str = None) -> List[Dict]:
+    @staticmethod
+    def _fiscal_quarter_shards(start_date: str, end_date: str) -> List[tuple]:
         """
-        Scrape GWAC spending data from USAspending.gov API
-        
-        API Docs: https://api.usaspending.gov/
+        Split a date range on federal fiscal quarter boundaries
+        (Oct 1, Jan 1, Apr 1, Jul 1). Returns (start, end) date string pairs.
         """
-        logger.info(f"Scraping USAspending data for {gwac_info['name']}")
-        
-        if not start_date:
-            start_date = gwac_info['start_date']
-        if not end_date:
-            end_date = datetime.now().strftime('%Y-%m-%d')
-        
-        all_awards = []
+        start = datetime.strptime(start_date, '%Y-%m-%d').date()
+        end = datetime.strptime(end_date, '%Y-%m-%d').date()
+
+        shards = []
+        shard_start = start
+        while shard_start <= end:
+            # First day of the next calendar quarter is also a fiscal quarter start
+            quarter_month = ((shard_start.month - 1) // 3 + 1) * 3 + 1
+            if quarter_month > 12:
+                next_start = shard_start.replace(year=shard_start.year + 1, month=1, day=1)
+            else:
+                next_start = shard_start.replace(month=quarter_month, day=1)
+            shard_end = min(next_start - timedelta(days=1), end)
+            shards.append((shard_start.strftime('%Y-%m-%d'), shard_end.strftime('%Y-%m-%d')))
+            shard_start = next_start
+
+        return shards
+
+    def _build_award_record(self, gwac_key: str, gwac_info: Dict, award: Dict) -> Dict:
+        """Map a spending_by_award result to our award record"""
+        return {
+            'gwac_key': gwac_key,
+            'gwac_name': gwac_info['name'],
+            'gwac_parent_contract': gwac_info['idv_piid'],
+            'award_id': award.get('Award ID'),
+            'recipient_name': award.get('Recipient Name'),
+            'recipient_uei': award.get('Recipient UEI'),
+            'recipient_duns': award.get('Recipient DUNS'),
+            'recipient_city': award.get('recipient_location_city_name'),
+            'recipient_state': award.get('recipient_location_state_code'),
+            'award_amount': award.get('Award Amount'),
+            'total_outlayed': award.get('Total Outlayed Amount'),
+            'start_date': award.get('Start Date'),
+            'end_date': award.get('End Date'),
+            'description': award.get('Description'),
+            'awarding_agency': award.get('Awarding Agency'),
+            'awarding_sub_agency': award.get('Awarding Sub Agency'),
+            'award_type': award.get('Award Type'),
+            'data_source': 'USAspending.gov',
+            'scraped_at': datetime.now().isoformat()
+        }
+
+    def _fetch_usaspending_window(self, gwac_key: str, gwac_info: Dict,
+                                  start_date: str, end_date: str,
+                                  on_page: Callable[[List[Dict]], None]) -> int:
+        """
+        Page through spending_by_award for one date window
+
+        If the window has more rows than the endpoint's page depth allows,
+        it is split in half and each half is fetched on its own. on_page is
+        called with each page's records as soon as it arrives; nothing is
+        kept here. Returns the number of records fetched.
+        """
+        fetched = 0
         page = 1
-        has_more = True
-        
-        while has_more:
-            url = "https://api.usaspending.gov/api/v2/search/spending_by_award/"
-            
+
+        while True:
             payload = {
                 "filters": {
                     "award_type_codes": ["IDV_B", "IDV_B_A", "IDV_B_B", "IDV_B_C"],  # IDVs (GWACs)
@@ -132,7 +208,7 @@ class GWACHistoricalScraper:
                 },
                 "fields": [
                     "Award ID",
-                    "Recipient Name", 
+                    "Recipient Name",
                     "Start Date",
                     "End Date",
                     "Award Amount",
@@ -149,247 +225,287 @@ class GWACHistoricalScraper:
                     "recipient_location_city_name"
                 ],
                 "page": page,
-                "limit": 100,
+                "limit": self.PAGE_LIMIT,
                 "order": "desc",
                 "sort": "Award Amount"
             }
-            
-            try:
-                response = self.session.post(url, json=payload, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                
-                results = data.get('results', [])
-                if not results:
-                    has_more = False
+
+            self.rate_limiter.wait()
+            response = self.session.post(self.USASPENDING_URL, json=payload, timeout=30)
+            response.raise_for_status()
+            data = response.json()
+
+            results = data.get('results', [])
+            on_page([self._build_award_record(gwac_key, gwac_info, award) for award in results])
+            fetched += len(results)
+
+            has_next = data.get('page_metadata', {}).get('hasNext', len(results) == self.PAGE_LIMIT)
+            if not results or not has_next:
+                break
+
+            if page >= self.MAX_PAGES_PER_QUERY:
+                start = datetime.strptime(start_date, '%Y-%m-%d')
+                end = datetime.strptime(end_date, '%Y-%m-%d')
+                if start >= end:
+                    logger.warning(f"  {gwac_info['name']} {start_date}: page depth limit reached "
+                                   f"on a single day, results truncated")
                     break
-                
-                for award in results:
-                    all_awards.append({
-                        'gwac_key': gwac_key,
-                        'gwac_name': gwac_info['name'],
-                        'gwac_parent_contract': gwac_info['idv_piid'],
-                        'award_id': award.get('Award ID'),
-                        'recipient_name': award.get('Recipient Name'),
-                        'recipient_uei': award.get('Recipient UEI'),
-                        'recipient_duns': award.get('Recipient DUNS'),
-                        'recipient_city': award.get('recipient_location_city_name'),
-                        'recipient_state': award.get('recipient_location_state_code'),
-                        'award_amount': award.get('Award Amount'),
-                        'total_outlayed': award.get('Total Outlayed Amount'),
-                        'start_date': award.get('Start Date'),
-                        'end_date': award.get('End Date'),
-                        'description': award.get('Description'),
-                        'awarding_agency': award.get('Awarding Agency'),
-                        'awarding_sub_agency': award.get('Awarding Sub Agency'),
-                        'award_type': award.get('Award Type'),
-                        'data_source': 'USAspending.gov',
-                        'scraped_at': datetime.now().isoformat()
-                    })
-                
-                logger.info(f"  Page {page}: Found {len(results)} awards (total: {len(all_awards)})")
-                
-                # Check if there are more pages
-                if len(results) < 100:
-                    has_more = False
-                else:
-                    page += 1
-                    time.sleep(0.5)  # Rate limiting
-                
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Error fetching data: {e}")
-                has_more = False
-        
-        logger.info(f"Total awards found for {gwac_info['name']}: {len(all_awards)}")
-        return all_awards
-    
-    def scrape_fpds_task_orders(self, gwac_piid: str, gwac_name: str) -> List[Dict]:
+
+                middle = start + (end - start) / 2
+                logger.info(f"  {gwac_info['name']} {start_date}..{end_date}: page depth limit, splitting window")
+                return fetched + (self._fetch_usaspending_window(gwac_key, gwac_info, start_date,
+                                                       middle.strftime('%Y-%m-%d'), on_page) +
+                        self._fetch_usaspending_window(gwac_key, gwac_info,
+                                                       (middle + timedelta(days=1)).strftime('%Y-%m-%d'),
+                                                       end_date, on_page))
+
+            page += 1
+
+        return fetched
+
+    def _ingest_awards(self, awards: List[Dict], sink: Optional[AwardSink] = None) -> int:
+        """
+        Upsert a batch of awards into the award store and write the ones new
+        to this run to the sink. Returns how many were new.
+        """
+        new_awards = self.award_store.upsert(awards)
+        if sink is not None:
+            sink.write(new_awards)
+        return len(new_awards)
+
+    def scrape_usaspending_gwac(self, gwac_key: str, gwac_info: Dict,
+                                 start_date: str = None, end_date: str = None,
+                                 sink: Optional[AwardSink] = None) -> int:
         """
-        Scrape FPDS Atom feed for detailed task order data
+        Scrape GWAC spending data from USAspending.gov API
+
+        The date range is split into fiscal quarters fetched concurrently
+        (self.max_workers at a time, paced by the shared rate limiter). Each
+        page is upserted into the award store as it arrives, which also
+        de-duplicates on award_id; awards new to this run go on to the sink.
+        No awards are held in memory past their page.
+
+        Returns:
+            Number of awards new to this run
+
+        API Docs: https://api.usaspending.gov/
+        """
+        logger.info(f"Scraping USAspending data for {gwac_info['name']}")
+
+        if not start_date:
+            start_date = gwac_info['start_date']
+        if not end_date:
+            end_date = datetime.now().strftime('%Y-%m-%d')
+
+        shards = self._fiscal_quarter_shards(start_date, end_date)
+        logger.info(f"  {len(shards)} fiscal-quarter shards from {start_date} to {end_date}")
+
+        new_count = 0
+        count_lock = threading.Lock()
         
-        FPDS provides XML feeds with detailed contract info
+        def on_page(page_awards: List[Dict]):
+            nonlocal new_count
+            added = self._ingest_awards(page_awards, sink)
+            with count_lock:
+                new_count += added
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._fetch_usaspending_window, gwac_key, gwac_info,
+                                shard_start, shard_end, on_page)
+                for shard_start, shard_end in shards
+            ]
+
+            failed = 0
+            for (shard_start, shard_end), future in zip(shards, futures):
+                try:
+                    shard_count = future.result()
+                except requests.exceptions.RequestException as e:
+                    logger.error(f"  {shard_start}..{shard_end}: shard failed: {e}")
+                    failed += 1
+                    continue
+                logger.info(f"  {shard_start}..{shard_end}: {shard_count} awards")
+
+        self.failed_shards[gwac_key] = failed
+        
+        logger.info(f"New awards for {gwac_info['name']}: {new_count}")
+        return new_count
+
+    def scrape_fpds_task_orders(self, gwac_piid: str, gwac_name: str,
+                                start_date: str = None, end_date: str = None) -> Path:
+        """
+        Stream FPDS Atom feed task orders for a GWAC to an NDJSON file
+        
+        FPDS provides XML feeds with detailed contract info (one entry per
+        contract action). Pages are fetched concurrently through the shared
+        rate limiter; see fpds_atom.FPDSAtomIngester.
+        
+        Returns:
+            Path of the NDJSON file (one task order record per line)
         """
         logger.info(f"Scraping FPDS task orders for {gwac_name}")
         
-        # FPDS Atom feed URL
-        # Note: FPDS limits to 10 records per request, need pagination
-        base_url = "https://www.fpds.gov/ezsearch/FEEDS/ATOM"
+        if not start_date:
+            start_date = next((info['start_date'] for info in self.GWAC_CONTRACTS.values()
+                               if info['idv_piid'] == gwac_piid), '2007-10-01')
+        if not end_date:
+            end_date = datetime.now().strftime('%Y-%m-%d')
         
-        task_orders = []
-        start = 0
-        page_size = 10
-        max_pages = 100  # Limit to prevent infinite loops
+        output_file = self.output_dir / "fpds" / f"{gwac_piid}_{start_date}_{end_date}.ndjson"
+        ingester = FPDSAtomIngester(self.session, self.rate_limiter, workers=self.max_workers)
+        total = ingester.ingest(gwac_piid, start_date, end_date, output_file, extra_fields={
+            'gwac_parent_contract': gwac_piid,
+            'gwac_name': gwac_name,
+            'data_source': 'FPDS',
+            'scraped_at': datetime.now().isoformat()
+        })
         
-        try:
-            from bs4 import BeautifulSoup
-            
-            for page in range(max_pages):
-                params = {
-                    'PIID': gwac_piid,
-                    's': 'FPDS.GOV',
-                    'templateName': '1.5.3',
-                    'indexName': 'awardfull',
-                    'q': f'PIID:"{gwac_piid}"',
-                    'start': start
-                }
-                
-                response = self.session.get(base_url, params=params, timeout=30)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.content, 'xml')
-                entries = soup.find_all('entry')
-                
-                if not entries:
-                    break
-                
-                for entry in entries:
-                    # Parse XML entry
-                    task_order = {
-                        'gwac_parent_contract': gwac_piid,
-                        'gwac_name': gwac_name,
-                        'title': entry.find('title').text if entry.find('title') else None,
-                        'award_id': entry.find('piid').text if entry.find('piid') else None,
-                        'recipient_name': entry.find('vendorName').text if entry.find('vendorName') else None,
-                        'award_date': entry.find('signedDate').text if entry.find('signedDate') else None,
-                        'award_amount': entry.find('dollarObligated').text if entry.find('dollarObligated') else None,
-                        'description': entry.find('description').text if entry.find('description') else None,
-                        'data_source': 'FPDS',
-                        'scraped_at': datetime.now().isoformat()
-                    }
-                    task_orders.append(task_order)
-                
-                logger.info(f"  FPDS Page {page + 1}: Found {len(entries)} entries")
-                
-                if len(entries) < page_size:
-                    break
-                
-                start += page_size
-                time.sleep(1)  # Rate limiting
-            
-            logger.info(f"Total FPDS task orders: {len(task_orders)}")
-            return task_orders
-            
-        except ImportError:
-            logger.error("BeautifulSoup not installed. Install with: pip install beautifulsoup4 lxml")
-            return []
-        except Exception as e:
-            logger.error(f"Error scraping FPDS: {e}")
-            return []
+        if ingester.failed_pages:
+            logger.warning(f"{gwac_name}: {ingester.failed_pages} FPDS pages failed")
+        logger.info(f"Total FPDS task orders: {total}")
+        return output_file
     
-    def aggregate_by_contractor(self, awards: List[Dict]) -> List[Dict]:
+    def aggregate_by_contractor(self) -> List[Dict]:
         """
         Aggregate spending by contractor for easy analysis
+        
+        Covers every award in the award store, read back in chunks so the
+        awards are never held as a list. Contractors are keyed on UEI
+        (normalized name when missing). The frame is kept on
+        self.contractor_summary so save_contractor_summary can also write it
+        as Parquet.
         """
         logger.info("Aggregating data by contractor")
         
-        contractor_data = {}
-        
-        for award in awards:
-            recipient = award.get('recipient_name') or 'Unknown'
-            uei = award.get('recipient_uei') or award.get('vendor_uei')
-            
-            if recipient not in contractor_data:
-                contractor_data[recipient] = {
-                    'contractor_name': recipient,
-                    'contractor_uei': uei,
-                    'gwacs': set(),
-                    'total_awards': 0,
-                    'total_value': 0,
-                    'earliest_award': None,
-                    'latest_award': None,
-                    'awards_list': []
-                }
-            
-            # Update aggregates
-            contractor_data[recipient]['gwacs'].add(award.get('gwac_name'))
-            contractor_data[recipient]['total_awards'] += 1
-            
-            amount = award.get('award_amount') or 0
-            try:
-                contractor_data[recipient]['total_value'] += float(amount)
-            except (ValueError, TypeError):
-                pass
-            
-            # Track date range
-            award_date = award.get('start_date') or award.get('award_date')
-            if award_date:
-                if not contractor_data[recipient]['earliest_award'] or award_date < contractor_data[recipient]['earliest_award']:
-                    contractor_data[recipient]['earliest_award'] = award_date
-                if not contractor_data[recipient]['latest_award'] or award_date > contractor_data[recipient]['latest_award']:
-                    contractor_data[recipient]['latest_award'] = award_date
-            
-            contractor_data[recipient]['awards_list'].append(award.get('award_id'))
-        
-        # Convert sets to lists for JSON serialization
-        aggregated = []
-        for contractor, data in contractor_data.items():
-            data['gwacs'] = list(data['gwacs'])
-            data['gwac_count'] = len(data['gwacs'])
-            aggregated.append(data)
-        
-        # Sort by total value
-        aggregated.sort(key=lambda x: x['total_value'], reverse=True)
+        aggregator = ContractorAggregator()
+        for rows in self.award_store.iter_chunks(self.AGGREGATION_FIELDS):
+            aggregator.add_columns(*zip(*rows))
+        self.contractor_summary = aggregator.summary()
+        aggregated = summary_to_records(self.contractor_summary)
         
         logger.info(f"Aggregated data for {len(aggregated)} contractors")
         return aggregated
     
-    def scrape_all_gwacs(self, start_date: str = None, end_date: str = None):
+    def save_contractor_summary(self, aggregated: List[Dict], filename: str = 'gwac_contractor_summary'):
+        """Save the contractor summary as JSON and Parquet"""
+        self.save_to_json(aggregated, filename)
+        
+        if aggregated and self.contractor_summary is not None:
+            output_file = self.output_dir / f"{filename}_{datetime.now().strftime('%Y%m%d')}.parquet"
+            write_summary_parquet(self.contractor_summary, output_file)
+    
+    def scrape_all_gwacs(self, start_date: str = None, end_date: str = None,
+                         incremental: bool = False):
         """
         Scrape historical data for all GWACs
+        
+        Fetched pages are upserted into the award store (SQLite, keyed on
+        award_id) as they arrive, and awards new to this run are streamed to
+        gwac_historical_awards_<date> in self.output_format, so memory stays
+        flat however many awards are fetched. The contractor summary is then
+        built from the whole store. Each GWAC's action-date watermark is advanced once all of
+        its shards succeed. With incremental=True and no start_date, each
+        GWAC only fetches from its watermark minus the overlap window.
+        
+        Returns:
+            (awards new to this run, contractor summary over every stored award)
         """
         logger.info(f"Starting historical scrape for {len(self.GWAC_CONTRACTS)} GWACs")
         
-        all_awards = []
+        if not end_date:
+            end_date = datetime.now().strftime('%Y-%m-%d')
         
+        windows = {}
         for gwac_key, gwac_info in self.GWAC_CONTRACTS.items():
-            logger.info(f"\n{'='*60}")
-            logger.info(f"Processing: {gwac_info['name']}")
-            logger.info(f"{'='*60}")
+            gwac_start = start_date or gwac_info['start_date']
+            if incremental and not start_date:
+                gwac_start = self.watermarks.start_date(gwac_key, gwac_info['start_date'])
+            windows[gwac_key] = gwac_start
+        
+        fetched = 0
+        sink = self._open_award_sink('gwac_historical_awards')
+        
+        def scrape_gwac(gwac_key: str, gwac_info: Dict) -> int:
+            logger.info(f"Processing: {gwac_info['name']} ({windows[gwac_key]} to {end_date})")
             
             # Get USAspending data
-            awards = self.scrape_usaspending_gwac(gwac_key, gwac_info, start_date, end_date)
-            all_awards.extend(awards)
+            new_count = self.scrape_usaspending_gwac(gwac_key, gwac_info, windows[gwac_key], end_date, sink=sink)
             
-            # Optional: Also get FPDS data (more detailed but slower)
-            # task_orders = self.scrape_fpds_task_orders(gwac_info['idv_piid'], gwac_info['name'])
-            # all_awards.extend(task_orders)
+            # Optional: Also stream FPDS action-level data to disk
+            # self.scrape_fpds_task_orders(gwac_info['idv_piid'], gwac_info['name'], windows[gwac_key], end_date)
             
-            time.sleep(2)  # Rate limiting between GWACs
+            return new_count
+        
+        # GWACs run in parallel; request pacing comes from the shared rate limiter
+        try:
+            with ThreadPoolExecutor(max_workers=self.gwac_workers) as executor:
+                futures = {gwac_key: executor.submit(scrape_gwac, gwac_key, gwac_info)
+                           for gwac_key, gwac_info in self.GWAC_CONTRACTS.items()}
+                for gwac_key, future in futures.items():
+                    new_count = future.result()
+                    fetched += new_count
+                    
+                    if self.failed_shards.get(gwac_key):
+                        logger.warning(f"{gwac_key}: {self.failed_shards[gwac_key]} shards failed, watermark not advanced")
+                    else:
+                        self.watermarks.advance(gwac_key, windows[gwac_key], end_date, new_count)
+        finally:
+            # Whatever was fetched before a crash stays readable
+            sink.close()
         
         logger.info(f"\n{'='*60}")
         logger.info(f"SCRAPING COMPLETE")
         logger.info(f"{'='*60}")
-        logger.info(f"Total awards collected: {len(all_awards)}")
-        
-        # Save raw data
-        self.save_to_csv(all_awards, 'gwac_historical_awards')
+        logger.info(f"Awards fetched this run: {fetched}")
+        logger.info(f"Total awards collected: {self.award_store.count()}")
         
         # Save aggregated contractor data
-        aggregated = self.aggregate_by_contractor(all_awards)
-        self.save_to_json(aggregated, 'gwac_contractor_summary')
+        aggregated = self.aggregate_by_contractor()
+        self.save_contractor_summary(aggregated)
         
-        return all_awards, aggregated
+        return fetched, aggregated
     
-    def save_to_csv(self, data: List[Dict], filename: str):
-        """Save data to CSV"""
-        if not data:
-            logger.warning("No data to save")
-            return
+    def scrape_bulk_archive(self, archive_paths: List[str] = None):
+        """
+        Ingest GWAC awards from USAspending award archives
+        
+        Uses the local zips in archive_paths, or starts one IDV download job
+        per GWAC parent contract and downloads those archives first (each
+        holds only that GWAC's orders). Records have the same shape as
+        scrape_usaspending_gwac; the archives are read one after another and
+        ingested in batches like a regular scrape's pages, so an award found
+        in more than one archive is only counted once.
         
-        output_file = self.output_dir / f"{filename}_{datetime.now().strftime('%Y%m%d')}.csv"
+        Returns:
+            (awards new to this run, contractor summary over every stored award)
+        """
+        if not archive_paths:
+            archive_paths = download_idv_archives(self.session, self.GWAC_CONTRACTS, self.output_dir / "bulk")
         
-        # Get all keys
-        all_keys = set()
-        for record in data:
-            all_keys.update(record.keys())
+        fetched = 0
+        with self._open_award_sink('gwac_historical_awards') as sink:
+            for archive_path in archive_paths:
+                logger.info(f"Ingesting award archive: {archive_path}")
+                batch = []
+                for award in iter_archive_awards(Path(archive_path), self.GWAC_CONTRACTS):
+                    batch.append(award)
+                    if len(batch) >= self.SINK_BATCH_SIZE:
+                        fetched += self._ingest_awards(batch, sink)
+                        batch = []
+                fetched += self._ingest_awards(batch, sink)
         
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=sorted(all_keys))
-            writer.writeheader()
-            writer.writerows(data)
+        logger.info(f"Awards read from {len(archive_paths)} archives: {fetched}")
+        logger.info(f"Total awards collected: {self.award_store.count()}")
         
-        file_size_mb = output_file.stat().st_size / (1024 * 1024)
-        logger.info(f"Saved {len(data)} records to {output_file} ({file_size_mb:.2f} MB)")
+        aggregated = self.aggregate_by_contractor()
+        self.save_contractor_summary(aggregated)
+        
+        return fetched, aggregated
+    
+    def _open_award_sink(self, filename: str) -> AwardSink:
+        """Open a fixed-schema award sink in self.output_format for today's run"""
+        return open_sink(self.output_format,
+                         self.output_dir / f"{filename}_{datetime.now().strftime('%Y%m%d')}")
     
     def save_to_json(self, data: List[Dict], filename: str):
         """Save data to JSON"""
@@ -424,11 +540,20 @@ def main():
     print("2. Last 5 years - Takes 3-5 minutes")
     print("3. Last year - Takes 1-2 minutes")
     print("4. Custom date range")
+    print("5. Incremental - only new actions since the last sync (default)")
+    print("6. Award archives (local zips or one IDV download job per GWAC)")
+    
+    choice = input("\nEnter choice (1-6): ").strip() or '5'
     
-    choice = input("\nEnter choice (1-4): ").strip()
+    output_format = input("Award output format - csv, ndjson or parquet (default csv): ").strip().lower() or 'csv'
+    if output_format not in SINKS:
+        print(f"Unknown format '{output_format}', using csv")
+        output_format = 'csv'
+    scraper.output_format = output_format
     
     start_date = None
     end_date = None
+    incremental = choice == '5'
     
     if choice == '2':
         start_date = (datetime.now() - timedelta(days=365*5)).strftime('%Y-%m-%d')
@@ -437,23 +562,37 @@ def main():
     elif choice == '4':
         start_date = input("Start date (YYYY-MM-DD): ").strip()
         end_date = input("End date (YYYY-MM-DD): ").strip()
+    elif choice == '6':
+        archive_paths = input("Archive zip paths, comma separated (blank to request IDV downloads): ").strip()
+        start_time = time.time()
+        fetched, aggregated = scraper.scrape_bulk_archive(
+            [path.strip() for path in archive_paths.split(',') if path.strip()] or None)
+        print(f"\nAwards ingested: {fetched:,}")
+        print(f"Awards in store: {scraper.award_store.count():,}")
+        print(f"Unique contractors: {len(aggregated):,}")
+        print(f"Runtime: {(time.time() - start_time)/60:.1f} minutes")
+        print(f"\nOutput directory: {scraper.output_dir}")
+        return
     
     print(f"\nStarting scrape...")
     if start_date:
         print(f"Date range: {start_date} to {end_date or 'present'}")
+    elif incremental:
+        print(f"Date range: Since each GWAC's last sync")
     else:
         print(f"Date range: Full historical")
     
     start_time = time.time()
     
-    awards, aggregated = scraper.scrape_all_gwacs(start_date, end_date)
+    fetched, aggregated = scraper.scrape_all_gwacs(start_date, end_date, incremental=incremental)
     
     elapsed = time.time() - start_time
     
     print(f"\n{'='*70}")
     print("SUMMARY")
     print(f"{'='*70}")
-    print(f"Total awards scraped: {len(awards):,}")
+    print(f"Total awards scraped: {fetched:,}")
+    print(f"Awards in store: {scraper.award_store.count():,}")
     print(f"Unique contractors: {len(aggregated):,}")
     print(f"Runtime: {elapsed/60:.1f} minutes")
     print(f"\nTop 10 contractors by spending:")
@@ -14,6 +14,7 @@ from typing import List, Dict, Optional
 import logging
 from bs4 import BeautifulSoup
 import re
+from pdf_page_text import extract_pages
 
 # Setup logging
 logging.basicConfig(
@@ -22,12 +23,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Holder list line classifiers (compiled once, used for every PDF line)
+CONTRACT_NUMBER_RE = re.compile(r'\d{3}-\d{2}-\d{4}-\d{4}')
+EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+PHONE_RE = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+WEBSITE_RE = re.compile(r'www\.|http', re.IGNORECASE)
+
 class GWACScraper:
     """Scrapes GWAC holder lists from various sources"""
     
     def __init__(self, output_dir: str = "data/gwac_holders"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.pdf_text_cache_dir = self.output_dir / "pdf_text_cache"
         
         # GWAC configurations
         self.gwacs = {
@@ -99,65 +107,23 @@ class GWACScraper:
         logger.warning("NITAAC scraping requires Selenium - use manual download for now")
         return []
     
-    def parse_gsa_gwac_pdf(self, pdf_path: Path, gwac_name: str) -> List[Dict]:
+    def parse_gsa_gwac_pdf(self, pdf_path: Path, gwac_name: str, workers: Optional[int] = None) -> List[Dict]:
         """
         Parse GSA GWAC holder list from PDF
         
         GSA GWACs typically provide PDF lists of holders.
-        This requires PDF parsing (PyPDF2 or pdfplumber)
+        Page text is extracted with pdfplumber across worker processes and
+        cached by PDF hash and page number (self.pdf_text_cache_dir), so the
+        line parsing below can be re-tuned without re-extracting.
         """
         logger.info(f"Parsing PDF for {gwac_name}: {pdf_path}")
         
         try:
-            import pdfplumber
+            page_texts = extract_pages(pdf_path, cache_dir=self.pdf_text_cache_dir, workers=workers)
             
             holders = []
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    
-                    # Parse company information from text
-                    # Format varies by GWAC, but typically includes:
-                    # - Company name
-                    # - Contract number
-                    # - Address
-                    # - Contact info
-                    
-                    # Example parsing (adjust based on actual format)
-                    lines = text.split('\n')
-                    current_company = {}
-                    
-                    for line in lines:
-                        line = line.strip()
-                        
-                        # Detect company name (usually all caps or starts line)
-                        if line and line[0].isupper() and not current_company:
-                            current_company['company_name'] = line
-                        
-                        # Detect contract number (format: XXX-XX-XXXX-XXXX)
-                        contract_match = re.search(r'\d{3}-\d{2}-\d{4}-\d{4}', line)
-                        if contract_match:
-                            current_company['contract_number'] = contract_match.group()
-                        
-                        # Detect email
-                        email_match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', line)
-                        if email_match:
-                            current_company['primary_contact_email'] = email_match.group()
-                        
-                        # Detect phone
-                        phone_match = re.search(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', line)
-                        if phone_match:
-                            current_company['primary_contact_phone'] = phone_match.group()
-                        
-                        # Detect website
-                        if 'www.' in line.lower() or 'http' in line.lower():
-                            current_company['website'] = line
-                        
-                        # If we have enough info, save and reset
-                        if current_company and 'contract_number' in current_company:
-                            current_company['gwac_name'] = gwac_name
-                            holders.append(current_company.copy())
-                            current_company = {}
+            for text in page_texts:
+                holders.extend(self._parse_holder_page(text, gwac_name))
             
             logger.info(f"Parsed {len(holders)} holders from PDF")
             return holders
@@ -169,6 +135,50 @@ class GWACScraper:
             logger.error(f"Error parsing PDF: {e}")
             return []
     
+    def _parse_holder_page(self, text: str, gwac_name: str) -> List[Dict]:
+        """Parse company information from one page of holder list text"""
+        # Format varies by GWAC, but typically includes:
+        # - Company name
+        # - Contract number
+        # - Address
+        # - Contact info
+        holders = []
+        current_company = {}
+        
+        for line in text.split('\n'):
+            line = line.strip()
+            
+            # Detect company name (usually all caps or starts line)
+            if line and line[0].isupper() and not current_company:
+                current_company['company_name'] = line
+            
+            # Detect contract number (format: XXX-XX-XXXX-XXXX)
+            contract_match = CONTRACT_NUMBER_RE.search(line)
+            if contract_match:
+                current_company['contract_number'] = contract_match.group()
+            
+            # Detect email
+            email_match = EMAIL_RE.search(line)
+            if email_match:
+                current_company['primary_contact_email'] = email_match.group()
+            
+            # Detect phone
+            phone_match = PHONE_RE.search(line)
+            if phone_match:
+                current_company['primary_contact_phone'] = phone_match.group()
+            
+            # Detect website
+            if WEBSITE_RE.search(line):
+                current_company['website'] = line
+            
+            # If we have enough info, save and reset
+            if current_company and 'contract_number' in current_company:
+                current_company['gwac_name'] = gwac_name
+                holders.append(current_company)
+                current_company = {}
+        
+        return holders
+    
     def parse_manual_csv(self, csv_path: Path, gwac_name: str) -> List[Dict]:
         """Parse manually created CSV of GWAC holders"""
         import pandas as pd
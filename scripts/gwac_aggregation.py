@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+GWAC Contractor Aggregation
+Columnar (pandas) roll-up of GWAC award records by contractor.
+
+Contractors are keyed on recipient UEI, falling back to a normalized
+recipient name when the UEI is missing, so "ACME CORP" and "Acme Corp." on
+awards without a UEI land in the same group. Totals, counts, date ranges
+and GWAC membership are computed with groupby rather than per-award Python
+loops. ContractorAggregator reduces awards one chunk at a time as pages
+arrive, so a run never needs to hold its awards as a list.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Sequence
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Trailing corporate suffixes dropped when normalizing names
+NAME_SUFFIX_PATTERN = r'\b(?:INCORPORATED|INC|LLC|L L C|CORPORATION|CORP|CO|COMPANY|LTD|LP|LLP|PLLC|PC)$'
+
+SUMMARY_COLUMNS = [
+    'contractor_key', 'contractor_name', 'contractor_uei', 'gwacs', 'gwac_count',
+    'total_awards', 'total_value', 'earliest_award', 'latest_award'
+]
+
+
+def normalize_contractor_names(names: pd.Series) -> pd.Series:
+    """Uppercase, strip punctuation and corporate suffixes, collapse whitespace"""
+    normalized = (
+        names.fillna('').astype(str).str.upper()
+        .str.replace(r'[^\w\s]', ' ', regex=True)
+        .str.replace(r'\s+', ' ', regex=True)
+        .str.strip()
+    )
+    # Suffixes can stack ("ACME CO INC"), so strip twice
+    for _ in range(2):
+        normalized = normalized.str.replace(NAME_SUFFIX_PATTERN, '', regex=True).str.strip()
+    return normalized
+
+
+def _factorize(values) -> tuple:
+    """
+    Integer codes plus uniques, with one extra slot appended to the uniques
+
+    Missing values get code -1, so indexing the uniques with the codes picks
+    the appended slot; callers fill it with their missing-value default.
+    """
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    return codes, np.append(np.asarray(uniques, dtype=object), None)
+
+
+class ContractorAggregator:
+    """
+    Incremental contractor roll-up
+
+    Awards are fed in as they arrive (add_awards, e.g. from a scraper's
+    on_page callback) and buffered as columns; every chunk_size awards the
+    buffer is reduced to per-contractor partial totals, and summary()
+    combines the partials. Memory is bounded by chunk size and contractor
+    count, not by award count.
+
+    String work (UEI cleanup, name normalization, date parsing) runs once
+    per distinct value in a chunk rather than once per award. Contractors
+    and GWACs get integer ids that are stable across chunks, so partials
+    and GWAC membership are combined on integers only. add_awards is
+    thread-safe.
+    """
+
+    def __init__(self, chunk_size: int = 250000):
+        self.chunk_size = chunk_size
+        self.awards_added = 0
+        self._lock = threading.Lock()
+        self._pending = self._empty_columns()
+
+        # Per contractor id, in order of first appearance
+        self._contractor_ids: Dict[str, int] = {}
+        self._contractor_names: List = []
+        self._contractor_ueis: List = []
+        self._gwac_ids: Dict[str, int] = {}
+
+        self._partials: List[pd.DataFrame] = []
+        self._memberships: List[np.ndarray] = []  # contractor id * GWAC_ID_SPAN + GWAC id
+
+    GWAC_ID_SPAN = 1 << 20
+
+    @staticmethod
+    def _empty_columns() -> Dict[str, List]:
+        return {column: [] for column in ('recipient_name', 'uei', 'gwac_name', 'award_amount', 'award_date')}
+
+    def add_awards(self, awards: List[Dict]):
+        """Buffer award records (award_sinks.AWARD_FIELDS keys)"""
+        if not awards:
+            return
+        self.add_columns([award.get('recipient_name') for award in awards],
+                         [award.get('recipient_uei') for award in awards],
+                         [award.get('gwac_name') for award in awards],
+                         [award.get('award_amount') for award in awards],
+                         [award.get('start_date') for award in awards])
+
+    def add_columns(self, recipient_name: Sequence, recipient_uei: Sequence, gwac_name: Sequence,
+                    award_amount: Sequence, start_date: Sequence):
+        """Buffer awards given as equal-length columns, e.g. rows read back from an AwardStore"""
+        with self._lock:
+            pending = self._pending
+            pending['recipient_name'].extend(recipient_name)
+            pending['uei'].extend(recipient_uei)
+            pending['gwac_name'].extend(gwac_name)
+            pending['award_amount'].extend(award_amount)
+            pending['award_date'].extend(start_date)
+            self.awards_added += len(award_amount)
+            if len(pending['award_amount']) >= self.chunk_size:
+                self._reduce_pending()
+
+    def _reduce_pending(self):
+        columns, self._pending = self._pending, self._empty_columns()
+        self._reduce(**columns)
+        self._combine_partials()
+
+    def _combine_partials(self):
+        """Fold the chunk partials into one, so they don't grow with the chunk count"""
+        if len(self._partials) > 1:
+            self._partials = [pd.concat(self._partials).groupby(level=0).agg(
+                total_awards=('total_awards', 'sum'),
+                total_value=('total_value', 'sum'),
+                earliest_award=('earliest_award', 'min'),
+                latest_award=('latest_award', 'max')
+            )]
+        if len(self._memberships) > 1:
+            self._memberships = [pd.unique(np.concatenate(self._memberships))]
+
+    def _reduce(self, recipient_name: Sequence, uei: Sequence, gwac_name: Sequence,
+                award_amount: Sequence, award_date: Sequence):
+        """Reduce one chunk of awards, given as equal-length columns, to partials"""
+        if not len(award_amount):
+            return
+
+        uei_codes, ueis = _factorize(uei)
+        gwac_codes, gwac_names = _factorize(gwac_name)
+        date_codes, dates = _factorize(award_date)
+        recipient_name = np.asarray(recipient_name, dtype=object)
+
+        # Clean each distinct UEI; blank ones count as missing
+        clean_uei_ids, uei_keys = _factorize([str(value).strip().upper() or None if value is not None else None
+                                              for value in ueis])
+        row_uei_ids = clean_uei_ids[uei_codes]
+
+        # Normalize each distinct name once, and only where there is no UEI
+        keyed_by_name = row_uei_ids < 0
+        name_codes, names = _factorize(recipient_name[keyed_by_name])
+        names[-1] = 'Unknown'
+        name_ids, name_keys = pd.factorize('NAME:' + normalize_contractor_names(pd.Series(names, dtype=object)))
+        row_keys = row_uei_ids.astype(np.int64)
+        row_keys[keyed_by_name] = len(uei_keys) + name_ids[name_codes]
+
+        # Chunk-local contractor codes follow first appearance; map them to
+        # stable ids, recording name and UEI from each contractor's first
+        # award (every award under a UEI key has that UEI, name keys have none)
+        key_codes, key_ids = pd.factorize(row_keys)
+        keys = np.concatenate([uei_keys, np.asarray(name_keys, dtype=object)])[key_ids]
+        first_rows = np.flatnonzero(~pd.Series(key_codes).duplicated().to_numpy())
+        first_names = recipient_name[first_rows]
+        first_ueis = uei_keys[row_uei_ids[first_rows]]
+        contractor_ids = np.empty(len(keys), dtype=np.int64)
+        for code, key in enumerate(keys):
+            contractor_id = self._contractor_ids.get(key)
+            if contractor_id is None:
+                contractor_id = self._contractor_ids[key] = len(self._contractor_ids)
+                name = first_names[code]
+                self._contractor_names.append('Unknown' if name is None or name != name else name)
+                self._contractor_ueis.append(first_ueis[code])
+            contractor_ids[code] = contractor_id
+        row_contractors = contractor_ids[key_codes]
+
+        day_values = pd.to_datetime(pd.Series([str(value)[:10] if value is not None else None for value in dates],
+                                              dtype=object),
+                                    errors='coerce', format='%Y-%m-%d').to_numpy()
+        try:
+            # Numbers, numeric strings and None (as NaN) convert directly
+            amounts = np.asarray(award_amount, dtype=float)
+        except (TypeError, ValueError):
+            amounts = pd.to_numeric(pd.Series(award_amount, dtype=object), errors='coerce').to_numpy(dtype=float)
+        amounts = np.nan_to_num(amounts, nan=0.0)
+
+        self._partials.append(
+            pd.DataFrame({'award_amount': amounts, 'award_date': day_values[date_codes]}).groupby(row_contractors).agg(
+                total_awards=('award_amount', 'size'),
+                total_value=('award_amount', 'sum'),
+                earliest_award=('award_date', 'min'),
+                latest_award=('award_date', 'max')
+            )
+        )
+
+        # Distinct (contractor, GWAC) pairs
+        gwac_ids = np.array([self._gwac_ids.setdefault(name, len(self._gwac_ids)) for name in gwac_names[:-1]],
+                            dtype=np.int64)
+        has_gwac = gwac_codes >= 0
+        self._memberships.append(pd.unique(row_contractors[has_gwac] * self.GWAC_ID_SPAN +
+                                           gwac_ids[gwac_codes[has_gwac]]))
+
+    def summary(self) -> pd.DataFrame:
+        """One row per contractor (SUMMARY_COLUMNS), sorted by total_value desc"""
+        with self._lock:
+            self._reduce_pending()
+        if not self._partials:
+            return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+        totals = self._partials[0].sort_index()
+
+        summary = pd.DataFrame({
+            'contractor_key': np.asarray(list(self._contractor_ids), dtype=object),
+            'contractor_name': np.asarray(self._contractor_names, dtype=object),
+            'contractor_uei': np.asarray(self._contractor_ueis, dtype=object)
+        })
+        for column in ('total_awards', 'total_value'):
+            summary[column] = totals[column].to_numpy()
+        for column in ('earliest_award', 'latest_award'):
+            summary[column] = totals[column].dt.strftime('%Y-%m-%d').to_numpy()
+
+        # GWAC membership as a contractor x GWAC boolean matrix (GWACs are few),
+        # with columns in GWAC name order
+        gwac_names = np.asarray(sorted(self._gwac_ids), dtype=object)
+        gwac_columns = np.empty(len(gwac_names), dtype=np.int64)
+        gwac_columns[[self._gwac_ids[name] for name in gwac_names]] = np.arange(len(gwac_names))
+        pairs = self._memberships[0]
+        matrix = np.zeros((len(summary), len(gwac_names)), dtype=bool)
+        matrix[pairs // self.GWAC_ID_SPAN, gwac_columns[pairs % self.GWAC_ID_SPAN]] = True
+        summary['gwacs'] = [gwac_names[row].tolist() for row in matrix]
+        summary['gwac_count'] = matrix.sum(axis=1)
+
+        summary = summary.sort_values('total_value', ascending=False, kind='stable')
+        return summary[SUMMARY_COLUMNS].reset_index(drop=True)
+
+
+def aggregate_awards(awards: List[Dict]) -> pd.DataFrame:
+    """
+    Aggregate a list of award dicts by contractor
+
+    Returns:
+        One row per contractor (SUMMARY_COLUMNS), sorted by total_value desc
+    """
+    aggregator = ContractorAggregator()
+    aggregator.add_awards(awards)
+    return aggregator.summary()
+
+
+def summary_to_records(summary: pd.DataFrame) -> List[Dict]:
+    """Convert an aggregate_awards frame into JSON-serializable dicts"""
+    # Column by column: astype(object) yields Python scalars without per-cell boxing
+    names = summary.columns.tolist()
+    columns = [summary[name].astype(object).where(summary[name].notna(), None).tolist()
+               for name in names]
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def write_summary_parquet(summary: pd.DataFrame, output_file: Path) -> bool:
+    """Write the contractor summary to Parquet (needs pyarrow)"""
+    try:
+        summary.to_parquet(output_file, index=False)
+    except ImportError:
+        logger.warning("pyarrow not installed, skipping Parquet output. Install with: pip install pyarrow")
+        return False
+
+    file_size_mb = Path(output_file).stat().st_size / (1024 * 1024)
+    logger.info(f"Saved {len(summary)} contractors to {output_file} ({file_size_mb:.2f} MB)")
+    return True
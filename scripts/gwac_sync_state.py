@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+GWAC Sync State
+Per-GWAC action-date watermarks and award merging for incremental
+USAspending syncs.
+
+Each gwac_key stores the last action_date that was fully ingested. The next
+run asks only for [watermark - overlap, today], and the new awards are
+upserted into an AwardStore (SQLite, keyed on award_id), so a run writes
+only what it fetched.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class GWACWatermarks:
+    """Persisted last-ingested action_date per gwac_key"""
+
+    def __init__(self, state_file: Path, overlap_days: int = 7):
+        """
+        Args:
+            state_file: JSON file holding the watermarks
+            overlap_days: Days re-fetched before each watermark to pick up
+                          late-reported or modified actions
+        """
+        self.state_file = Path(state_file)
+        self.overlap_days = overlap_days
+        self.state: Dict[str, Dict] = {}
+
+        if self.state_file.exists():
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+
+    def get(self, gwac_key: str) -> Optional[str]:
+        """Last fully ingested action_date (YYYY-MM-DD) or None"""
+        return self.state.get(gwac_key, {}).get('last_action_date')
+
+    def start_date(self, gwac_key: str, default: str) -> str:
+        """Start of the next window: watermark minus overlap, or default if never synced"""
+        watermark = self.get(gwac_key)
+        if not watermark:
+            return default
+
+        start = datetime.strptime(watermark, '%Y-%m-%d') - timedelta(days=self.overlap_days)
+        return start.strftime('%Y-%m-%d')
+
+    def advance(self, gwac_key: str, start_date: str, end_date: str, award_count: int):
+        """
+        Record that [start_date, end_date] has been fully ingested, and save
+
+        The watermark only moves forward, and only when the window connects
+        to what was already ingested (no gap after the current watermark).
+        """
+        watermark = self.get(gwac_key)
+        if watermark and (watermark >= end_date or start_date > watermark):
+            return
+
+        self.state[gwac_key] = {
+            'last_action_date': end_date,
+            'last_award_count': award_count,
+            'updated_at': datetime.now().isoformat()
+        }
+        self.save()
+
+    def save(self):
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.state_file)
+
+
+class AwardStore:
+    """
+    Every GWAC award synced so far, keyed on award_id, in SQLite
+
+    Replaces the master JSON file: a run upserts only the awards it fetched
+    instead of loading and rewriting the whole history, and readers stream
+    rows back in chunks.
+    """
+
+    def __init__(self, db_file: Path, fields: List[str], numeric_fields: Iterable[str] = (),
+                 legacy_master: Optional[Path] = None, timeout: float = 30.0):
+        """
+        Args:
+            db_file: SQLite database path
+            fields: Award record keys stored as columns (must include award_id)
+            numeric_fields: Fields stored as REAL
+            legacy_master: Master JSON file from before the store; imported
+                           once, when the store is still empty
+            timeout: Seconds to wait on a locked database
+        """
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.fields = list(fields)
+        self.timeout = timeout
+        # Rows upserted by this run carry its run_id
+        self.run_id = datetime.now().isoformat()
+        self._local = threading.local()
+
+        numeric_fields = set(numeric_fields)
+        columns = ', '.join(
+            f"{field} {'REAL' if field in numeric_fields else 'TEXT'}{' PRIMARY KEY' if field == 'award_id' else ''}"
+            for field in self.fields
+        )
+        conn = self._connect()
+        conn.execute(f'CREATE TABLE IF NOT EXISTS awards ({columns}, run_id TEXT NOT NULL)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_awards_run_id ON awards(run_id)')
+
+        if legacy_master and Path(legacy_master).exists() and not self.count():
+            with open(legacy_master, 'r', encoding='utf-8') as f:
+                imported = self.upsert(json.load(f))
+            logger.info(f"Imported {len(imported)} awards from {Path(legacy_master).name} into {self.db_file.name}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # isolation_level=None: transactions are opened explicitly below
+            conn = sqlite3.connect(self.db_file, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+            self._local.conn = conn
+        return conn
+
+    def upsert(self, awards: List[Dict]) -> List[Dict]:
+        """
+        Insert or replace awards on award_id
+
+        Returns the awards that were not already stored by this run (the
+        first copy of each award_id wins within a run), so callers can pass
+        them on to a per-run sink without keeping their own set of ids.
+        """
+        batch: Dict = {}
+        for award in awards:
+            batch.setdefault(award.get('award_id'), award)
+        if not batch:
+            return []
+
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            ids = list(batch)
+            seen = set()
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                # Look up by primary key; filtering on run_id in SQL lets the
+                # planner scan this run's rows through the run_id index instead
+                rows = conn.execute(
+                    f"SELECT award_id, run_id FROM awards WHERE award_id IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+                seen.update(award_id for award_id, run_id in rows if run_id == self.run_id)
+
+            new_awards = [award for award_id, award in batch.items() if award_id not in seen]
+            conn.executemany(
+                f"INSERT OR REPLACE INTO awards ({', '.join(self.fields)}, run_id) "
+                f"VALUES ({', '.join('?' * (len(self.fields) + 1))})",
+                [(*(_column_value(award.get(field)) for field in self.fields), self.run_id)
+                 for award in new_awards]
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return new_awards
+
+    def count(self, this_run: bool = False) -> int:
+        """Stored awards (or only those upserted by this run)"""
+        if this_run:
+            return self._connect().execute('SELECT COUNT(*) FROM awards WHERE run_id = ?',
+                                           (self.run_id,)).fetchone()[0]
+        return self._connect().execute('SELECT COUNT(*) FROM awards').fetchone()[0]
+
+    def iter_chunks(self, columns: Optional[List[str]] = None, this_run: bool = False,
+                    chunk_size: int = 100000) -> Iterator[List[tuple]]:
+        """Yield stored awards as lists of row tuples (columns in the given order)"""
+        columns = columns or self.fields
+        query = f"SELECT {', '.join(columns)} FROM awards"
+        params: tuple = ()
+        if this_run:
+            query += ' WHERE run_id = ?'
+            params = (self.run_id,)
+
+        cursor = self._connect().execute(query, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows
+
+    def top_totals(self, group_field: str, value_field: str, limit: int = 10) -> List[tuple]:
+        """(group value, summed value) for the largest groups across every stored award"""
+        return self._connect().execute(
+            f"SELECT COALESCE({group_field}, 'Unknown'), SUM({value_field}) AS total FROM awards "
+            f"GROUP BY 1 ORDER BY total DESC LIMIT ?", (limit,)
+        ).fetchall()
+
+
+def _column_value(value):
+    """SQLite can't bind lists or dicts; store them as JSON"""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=str)
+    return value
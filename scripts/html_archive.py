@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Raw HTML Archive
+Keeps every fetched article page, zstd-compressed and content-addressed, so
+extractors can be improved and re-run offline (see replay_html_archive.py)
+instead of re-scraping the web.
+
+- Pages are appended to one shard file per fetch date
+  (data/html_archive/YYYY-MM-DD.zst), each page as its own zstd frame, so a
+  single page is read back with one seek and one decompress
+- Pages are addressed by the sha256 of their HTML; a page fetched again
+  unchanged (or the same body under another URL) is stored once
+- index.db (SQLite, WAL) maps sha256 -> (shard, offset, length) and
+  URL -> sha256 / source / fetch time; appends take an exclusive file lock,
+  so several scraper processes can write to the same archive
+
+Requires the zstandard package; open_archive() returns None without it, so
+scrapers keep working (and keep raw_html in the database) when it is missing.
+"""
+
+import fcntl
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_ROOT = Path('data/html_archive')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    sha256 TEXT PRIMARY KEY,
+    shard TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    source TEXT NOT NULL,
+    fetched_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_source ON pages(source);
+"""
+
+
+def read_frame(path: Path, offset: int, length: int) -> str:
+    """Decompress one archived page from a shard file"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read(length)
+    return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+
+
+class HTMLArchive:
+    """Append-only, date-sharded zstd store of page HTML with a SQLite index"""
+
+    def __init__(self, root: Path = DEFAULT_ROOT, level: int = 9, timeout: float = 30.0):
+        """
+        Args:
+            root: Directory holding the shards and index.db
+            level: zstd compression level
+            timeout: Seconds to wait on a locked index
+        """
+        if zstandard is None:
+            raise ImportError("zstandard not installed. Install with: pip install zstandard")
+
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.level = level
+        self.timeout = timeout
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.root / 'index.db', timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+            self._local.conn = conn
+        return conn
+
+    def _compressor(self):
+        # ZstdCompressor instances are not thread-safe
+        compressor = getattr(self._local, 'compressor', None)
+        if compressor is None:
+            compressor = zstandard.ZstdCompressor(level=self.level)
+            self._local.compressor = compressor
+        return compressor
+
+    def put(self, url: str, html: str, source: str, fetched_at: Optional[datetime] = None) -> str:
+        """
+        Archive a fetched page; returns its sha256
+
+        Args:
+            url: Page URL (the latest fetch of a URL wins)
+            html: Page HTML as fetched
+            source: Source the page belongs to (e.g. 'dvids', 'armytimes')
+            fetched_at: Fetch time (default: now, UTC); picks the shard
+        """
+        fetched_at = fetched_at or datetime.now(timezone.utc)
+        body = html.encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()
+        conn = self._connect()
+
+        known = conn.execute('SELECT 1 FROM documents WHERE sha256 = ?', (digest,)).fetchone()
+        if not known:
+            frame = self._compressor().compress(body)
+            shard = f"{fetched_at:%Y-%m-%d}.zst"
+            with self._write_lock, open(self.root / shard, 'ab') as f:
+                # Other processes append to the same shard
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    offset = f.seek(0, 2)
+                    f.write(frame)
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+            conn.execute('INSERT OR IGNORE INTO documents (sha256, shard, offset, length, size) '
+                         'VALUES (?, ?, ?, ?, ?)', (digest, shard, offset, len(frame), len(body)))
+
+        conn.execute('INSERT OR REPLACE INTO pages (url, sha256, source, fetched_at) VALUES (?, ?, ?, ?)',
+                     (url, digest, source, fetched_at.isoformat()))
+        return digest
+
+    def locate(self, url: str) -> Optional[Tuple[Path, int, int]]:
+        """(shard path, offset, length) of a URL's latest page, or None"""
+        row = self._connect().execute(
+            'SELECT d.shard, d.offset, d.length FROM pages p JOIN documents d ON d.sha256 = p.sha256 '
+            'WHERE p.url = ?', (url,)
+        ).fetchone()
+        if not row:
+            return None
+        return self.root / row[0], row[1], row[2]
+
+    def get(self, url: str) -> Optional[str]:
+        """Latest archived HTML for a URL, or None"""
+        location = self.locate(url)
+        return read_frame(*location) if location else None
+
+    def __contains__(self, url: str) -> bool:
+        return self._connect().execute('SELECT 1 FROM pages WHERE url = ?', (url,)).fetchone() is not None
+
+    def iter_pages(self, sources: Optional[List[str]] = None,
+                   since: Optional[str] = None) -> Iterator[Tuple[str, str, Path, int, int]]:
+        """
+        Yield (url, source, shard path, offset, length) for archived pages,
+        in shard / offset order so shards are read sequentially
+
+        Args:
+            sources: Only these sources (None: all)
+            since: Only pages fetched on or after this ISO date
+        """
+        query = ('SELECT p.url, p.source, d.shard, d.offset, d.length FROM pages p '
+                 'JOIN documents d ON d.sha256 = p.sha256 WHERE 1 = 1')
+        params = []
+        if sources:
+            query += f" AND p.source IN ({','.join('?' * len(sources))})"
+            params.extend(sources)
+        if since:
+            query += ' AND p.fetched_at >= ?'
+            params.append(since)
+        query += ' ORDER BY d.shard, d.offset'
+
+        for url, source, shard, offset, length in self._connect().execute(query, params):
+            yield url, source, self.root / shard, offset, length
+
+    def counts(self) -> Dict[str, int]:
+        """Pages archived per source"""
+        rows = self._connect().execute('SELECT source, COUNT(*) FROM pages GROUP BY source ORDER BY source')
+        return dict(rows.fetchall())
+
+    def print_stats(self):
+        documents, size, length = self._connect().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(length), 0) FROM documents'
+        ).fetchone()
+        pages = sum(self.counts().values())
+        ratio = size / length if length else 0
+        print(f"🗄️  HTML archive: {pages:,} pages, {documents:,} unique documents, "
+              f"{size / 1e6:,.1f} MB -> {length / 1e6:,.1f} MB ({ratio:.1f}x)")
+
+
+def open_archive(root: Path = DEFAULT_ROOT) -> Optional[HTMLArchive]:
+    """The HTML archive, or None (with a warning) if zstandard is not installed"""
+    try:
+        return HTMLArchive(root)
+    except ImportError as e:
+        print(f"⚠️  HTML archive disabled: {e}")
+        return None
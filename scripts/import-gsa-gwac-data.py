@@ -7,8 +7,9 @@ Imports scraped GSA Schedule and GWAC holder data into Supabase
 import os
 import json
 import sys
+import time
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Set
 from datetime import datetime
 import logging
 
@@ -29,6 +30,9 @@ except ImportError:
 class GSAGWACImporter:
     """Imports GSA Schedule and GWAC data into Supabase"""
     
+    MERGE_BATCH_SIZE = 2000
+    LINK_BATCH_SIZE = 1000
+    
     def __init__(self):
         # Get Supabase credentials from environment
         self.supabase_url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
@@ -47,54 +51,62 @@ class GSAGWACImporter:
             'gwac_updated': 0,
             'gwac_errors': 0,
         }
+        
+        self._gwac_info_cache: Dict[str, Dict] = {}
+        
+        # Vendor UEIs written by this run, for incremental linking
+        self.touched_ueis: Set[str] = set()
     
-    def import_gsa_schedules(self, json_files: List[Path], sin_code: str):
-        """Import GSA Schedule holders from JSON files"""
-        logger.info(f"Importing GSA Schedule holders for SIN: {sin_code}")
+    def import_gsa_schedules(self, json_files: List[Path], sin_code: Optional[str] = None):
+        """
+        Import GSA Schedule holders from JSON files
+        
+        Args:
+            json_files: Parsed SIN files (GSA_MAS_<SIN>_parsed.json)
+            sin_code: SIN to apply to every file; by default each file's own
+                      sin_code (or the SIN in its filename) is used
+        """
+        logger.info(f"Importing GSA Schedule holders for SIN: {sin_code or 'all'}")
         
         # Start scraper log
-        log_id = self._start_scraper_log('gsa_schedule', sin_code)
+        log_id = self._start_scraper_log('gsa_schedule', sin_code or 'all')
         
+        rows = []
         for json_file in json_files:
             try:
                 with open(json_file, 'r') as f:
                     data = json.load(f)
                 
+                # Extract SIN from filename: GSA_MAS_54151S_parsed.json
+                parts = json_file.stem.split('_')
+                file_sin = sin_code or (parts[2] if len(parts) >= 3 else None)
+                
                 # Handle new parser format with 'contractors' key
                 if isinstance(data, dict) and 'contractors' in data:
                     contractors = data['contractors']
-                    sin_code = data.get('sin_code', sin_code)
+                    file_sin = sin_code or data.get('sin_code') or file_sin
                 else:
                     contractors = data
                 
                 logger.info(f"Processing {len(contractors)} contractors from {json_file}")
                 
                 for contractor in contractors:
-                    try:
-                        # Add SIN code
-                        if sin_code:
-                            contractor['sin_codes'] = [sin_code]
-                            contractor['primary_sin'] = sin_code
-                        
-                        # Set metadata
-                        contractor['data_source'] = 'gsa_elibrary'
-                        contractor['last_scraped'] = datetime.now().isoformat()
-                        
-                        # Upsert to database
-                        result = self._upsert_gsa_holder(contractor)
-                        
-                        if result == 'inserted':
-                            self.stats['gsa_inserted'] += 1
-                        elif result == 'updated':
-                            self.stats['gsa_updated'] += 1
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing contractor {contractor.get('company_name')}: {e}")
-                        self.stats['gsa_errors'] += 1
+                    # Add SIN code
+                    if file_sin:
+                        contractor['sin_codes'] = [file_sin]
+                        contractor['primary_sin'] = file_sin
+                    
+                    # Set metadata
+                    contractor['data_source'] = 'gsa_elibrary'
+                    contractor['last_scraped'] = datetime.now().isoformat()
+                    
+                    rows.append(contractor)
                 
             except Exception as e:
                 logger.error(f"Error reading file {json_file}: {e}")
         
+        self._bulk_merge('merge_gsa_schedule_holders', rows, 'gsa')
+        
         # Complete scraper log
         self._complete_scraper_log(log_id, 'gsa_schedule')
         
@@ -107,6 +119,7 @@ class GSAGWACImporter:
         # Start scraper log
         log_id = self._start_scraper_log('gwac', 'all')
         
+        rows = []
         for json_file in json_files:
             try:
                 with open(json_file, 'r') as f:
@@ -117,122 +130,88 @@ class GSAGWACImporter:
                 logger.info(f"Processing {len(holders)} holders for {gwac_name}")
                 
                 for holder in holders:
-                    try:
-                        # Get GWAC info from catalog
-                        gwac_info = self._get_gwac_info(holder['gwac_name'])
-                        
-                        # Add GWAC metadata
-                        if gwac_info:
-                            holder['gwac_type'] = gwac_info.get('gwac_type')
-                            holder['managing_agency'] = gwac_info.get('managing_agency')
-                        
-                        # Set metadata
-                        holder['data_source'] = 'gwac_website'
-                        holder['last_scraped'] = datetime.now().isoformat()
-                        holder['is_active'] = True
-                        
-                        # Upsert to database
-                        result = self._upsert_gwac_holder(holder)
-                        
-                        if result == 'inserted':
-                            self.stats['gwac_inserted'] += 1
-                        elif result == 'updated':
-                            self.stats['gwac_updated'] += 1
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing holder {holder.get('company_name')}: {e}")
-                        self.stats['gwac_errors'] += 1
+                    # Get GWAC info from catalog
+                    gwac_info = self._get_gwac_info(holder.get('gwac_name'))
+                    
+                    # Add GWAC metadata
+                    if gwac_info:
+                        holder['gwac_type'] = gwac_info.get('gwac_type')
+                        holder['managing_agency'] = gwac_info.get('managing_agency')
+                    
+                    # Set metadata
+                    holder['data_source'] = 'gwac_website'
+                    holder['last_scraped'] = datetime.now().isoformat()
+                    holder['is_active'] = True
+                    
+                    rows.append(holder)
                 
             except Exception as e:
                 logger.error(f"Error reading file {json_file}: {e}")
         
+        self._bulk_merge('merge_gwac_holders', rows, 'gwac')
+        
         # Complete scraper log
         self._complete_scraper_log(log_id, 'gwac')
         
         logger.info(f"GWAC import completed: {self.stats['gwac_inserted']} inserted, {self.stats['gwac_updated']} updated, {self.stats['gwac_errors']} errors")
     
-    def _upsert_gsa_holder(self, contractor: Dict) -> str:
-        """Upsert GSA schedule holder to database"""
-        try:
-            # Check if exists - need to get full record to merge SINs
-            existing = self.supabase.table('gsa_schedule_holders').select('id, sin_codes').eq(
-                'contract_number', contractor.get('contract_number')
-            ).eq(
-                'company_name', contractor.get('company_name')
-            ).execute()
-            
-            if existing.data:
-                # MERGE SINs instead of overwriting
-                existing_sins = existing.data[0].get('sin_codes', []) or []
-                new_sins = contractor.get('sin_codes', [])
-                
-                # Combine and deduplicate SINs
-                merged_sins = list(set(existing_sins + new_sins))
-                contractor['sin_codes'] = merged_sins
-                
-                # Keep the first SIN as primary if not set
-                if not contractor.get('primary_sin') and merged_sins:
-                    contractor['primary_sin'] = merged_sins[0]
-                
-                # Update existing record with merged data
-                self.supabase.table('gsa_schedule_holders').update(
-                    contractor
-                ).eq('id', existing.data[0]['id']).execute()
-                return 'updated'
-            else:
-                # Insert new record
-                self.supabase.table('gsa_schedule_holders').insert(
-                    contractor
-                ).execute()
-                return 'inserted'
-                
-        except Exception as e:
-            logger.error(f"Database error for {contractor.get('company_name')}: {e}")
-            raise
-    
-    def _upsert_gwac_holder(self, holder: Dict) -> str:
-        """Upsert GWAC holder to database"""
-        try:
-            # Check if exists
-            existing = self.supabase.table('gwac_holders').select('id').eq(
-                'gwac_name', holder.get('gwac_name')
-            ).eq(
-                'contract_number', holder.get('contract_number')
-            ).eq(
-                'company_name', holder.get('company_name')
-            ).execute()
-            
-            if existing.data:
-                # Update existing record
-                self.supabase.table('gwac_holders').update(
-                    holder
-                ).eq('id', existing.data[0]['id']).execute()
-                return 'updated'
-            else:
-                # Insert new record
-                self.supabase.table('gwac_holders').insert(
-                    holder
-                ).execute()
-                return 'inserted'
-                
-        except Exception as e:
-            logger.error(f"Database error for {holder.get('company_name')}: {e}")
-            raise
+    def _bulk_merge(self, function_name: str, rows: List[Dict], stats_prefix: str):
+        """
+        Merge holder rows through a set-based Postgres function over RPC
+        
+        Rows are sent in batches of MERGE_BATCH_SIZE; each batch is
+        de-duplicated and upserted by one statement on the database side
+        (see supabase/migrations/create_gsa_gwac_merge_functions.sql).
+        If the first batch fails, the function itself is missing or broken,
+        so the remaining batches are not sent.
+        """
+        valid_rows = []
+        for row in rows:
+            if not row.get('contract_number') or not row.get('company_name'):
+                logger.error(f"Skipping holder without contract number or company name: {row.get('company_name')}")
+                self.stats[f'{stats_prefix}_errors'] += 1
+                continue
+            valid_rows.append(row)
+            if row.get('vendor_uei'):
+                self.touched_ueis.add(row['vendor_uei'])
+        
+        logger.info(f"Merging {len(valid_rows)} rows via {function_name}")
+        
+        for i in range(0, len(valid_rows), self.MERGE_BATCH_SIZE):
+            batch = valid_rows[i:i + self.MERGE_BATCH_SIZE]
+            try:
+                result = self.supabase.rpc(function_name, {'holders': batch}).execute()
+                counts = result.data[0] if result.data else {}
+                self.stats[f'{stats_prefix}_inserted'] += counts.get('inserted_count') or 0
+                self.stats[f'{stats_prefix}_updated'] += counts.get('updated_count') or 0
+                logger.info(f"  Merged rows {i + 1}-{i + len(batch)}: {counts}")
+            except Exception as e:
+                logger.error(f"Database error merging rows {i + 1}-{i + len(batch)}: {e}")
+                if i == 0:
+                    logger.error(f"{function_name} failed on the first batch; is "
+                                 f"create_gsa_gwac_merge_functions.sql applied? Skipping the remaining rows")
+                    self.stats[f'{stats_prefix}_errors'] += len(valid_rows)
+                    return
+                self.stats[f'{stats_prefix}_errors'] += len(batch)
     
     def _get_gwac_info(self, gwac_name: str) -> Dict:
-        """Get GWAC information from catalog"""
+        """Get GWAC information from catalog (cached per GWAC)"""
+        if gwac_name in self._gwac_info_cache:
+            return self._gwac_info_cache[gwac_name]
+        
         try:
             result = self.supabase.table('gwac_catalog').select('*').eq(
                 'gwac_name', gwac_name
             ).execute()
             
-            if result.data:
-                return result.data[0]
-            return {}
+            info = result.data[0] if result.data else {}
             
         except Exception as e:
             logger.warning(f"Could not find GWAC info for {gwac_name}: {e}")
-            return {}
+            info = {}
+        
+        self._gwac_info_cache[gwac_name] = info
+        return info
     
     def _start_scraper_log(self, scrape_type: str, target: str) -> int:
         """Create scraper log entry"""
@@ -278,38 +257,42 @@ class GSAGWACImporter:
         except Exception as e:
             logger.warning(f"Could not update scraper log: {e}")
     
-    def link_to_company_intelligence(self):
-        """Link GSA/GWAC data to company_intelligence table via UEI"""
-        logger.info("Linking GSA/GWAC data to company intelligence...")
+    def link_to_company_intelligence(self, vendor_ueis: Optional[List[str]] = None) -> int:
+        """
+        Link GSA/GWAC data to company_intelligence table via UEI
         
-        try:
-            # This would be done via SQL for efficiency
-            # Execute the linking query
-            query = """
-            UPDATE company_intelligence ci
-            SET 
-              gsa_schedules = (
-                SELECT ARRAY_AGG(DISTINCT schedule_number)
-                FROM gsa_schedule_holders gsh
-                WHERE gsh.vendor_uei = ci.vendor_uei
-                  AND gsh.is_active = true
-              ),
-              gwacs = (
-                SELECT ARRAY_AGG(DISTINCT gwac_name)
-                FROM gwac_holders gh
-                WHERE gh.vendor_uei = ci.vendor_uei
-                  AND gh.is_active = true
-              )
-            WHERE ci.vendor_uei IS NOT NULL
-            """
-            
-            # Note: Direct SQL execution would require psycopg2
-            # For now, log the query
-            logger.info("Execute this SQL to link data:")
-            logger.info(query)
-            
-        except Exception as e:
-            logger.error(f"Error linking data: {e}")
+        Only the given UEIs are recomputed (default: every UEI touched by
+        this importer's run), in batches of LINK_BATCH_SIZE, through the
+        link_gsa_gwac_to_company_intelligence function
+        (see supabase/migrations/create_gsa_gwac_company_linking_function.sql).
+        
+        Returns number of company_intelligence rows updated
+        """
+        ueis = sorted(set(vendor_ueis if vendor_ueis is not None else self.touched_ueis))
+        
+        if not ueis:
+            logger.info("No vendor UEIs touched by this import, nothing to link")
+            return 0
+        
+        logger.info(f"Linking GSA/GWAC data to company intelligence for {len(ueis)} UEIs...")
+        
+        start_time = time.time()
+        rows_updated = 0
+        
+        for i in range(0, len(ueis), self.LINK_BATCH_SIZE):
+            batch = ueis[i:i + self.LINK_BATCH_SIZE]
+            try:
+                result = self.supabase.rpc(
+                    'link_gsa_gwac_to_company_intelligence', {'ueis': batch}
+                ).execute()
+                rows_updated += result.data or 0
+            except Exception as e:
+                logger.error(f"Error linking UEIs {i + 1}-{i + len(batch)}: {e}")
+        
+        elapsed = time.time() - start_time
+        logger.info(f"Linked company intelligence: {rows_updated} rows updated in {elapsed:.1f}s")
+        
+        return rows_updated
 
 
 def main():
@@ -335,19 +318,9 @@ def main():
             print(f"\nFound {len(json_files)} GSA Schedule JSON files")
             response = input("Import GSA Schedule data? (y/n): ")
             if response.lower() == 'y':
-                # Group files by SIN
-                sin_files = {}
-                for f in json_files:
-                    # Extract SIN from filename: GSA_MAS_54151S_parsed.json
-                    parts = f.stem.split('_')
-                    if len(parts) >= 3:
-                        sin = parts[2]
-                        if sin not in sin_files:
-                            sin_files[sin] = []
-                        sin_files[sin].append(f)
-                
-                for sin, files in sin_files.items():
-                    importer.import_gsa_schedules(files, sin)
+                # All SIN files go through one bulk merge; the SIN for each
+                # file comes from its contents or filename
+                importer.import_gsa_schedules(json_files)
     
     # Import GWAC Holders
     gwac_data_dir = Path("data/gwac_holders")
@@ -374,7 +347,7 @@ def main():
     print()
     
     # Offer to link data
-    if importer.stats['gsa_inserted'] > 0 or importer.stats['gwac_inserted'] > 0:
+    if importer.touched_ueis:
         response = input("Link to company_intelligence table? (y/n): ")
         if response.lower() == 'y':
             importer.link_to_company_intelligence()
@@ -41,6 +41,9 @@ except ImportError:
 from bs4 import BeautifulSoup
 import argparse
 
+from contract_paragraph_parser import parse_contract_paragraph
+from military_news_sink import MilitaryNewsSink
+
 
 class MilitaryNewsBrowserScraper:
     """Browser-based scraper that bypasses bot detection"""
@@ -59,8 +62,6 @@ class MilitaryNewsBrowserScraper:
         # Stats
         self.stats = {
             'articles_found': 0,
-            'articles_new': 0,
-            'articles_skipped': 0,
             'contracts_extracted': 0,
         }
         
@@ -74,6 +75,9 @@ class MilitaryNewsBrowserScraper:
         else:
             self.supabase = create_client(supabase_url, supabase_key)
         
+        # Batched article / contract writes, flushed on exit
+        self.sink = MilitaryNewsSink(self.supabase)
+        
         # Output directory
         self.output_dir = Path('data/military_news_browser')
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -238,59 +242,15 @@ class MilitaryNewsBrowserScraper:
             return None
     
     def parse_contract_paragraph(self, paragraph: str, article: Dict) -> Optional[Dict]:
-        """Parse contract paragraph (simplified version)"""
-        if len(paragraph) < 100:
-            return None
-        
+        """Parse contract paragraph (see contract_paragraph_parser.py)"""
         try:
-            contract = {
-                'article_url': article.get('article_url'),
-                'published_date': article.get('published_date'),
-                'raw_paragraph': paragraph,
-                'contract_description': paragraph,
-                'scraped_at': datetime.now().isoformat(),
-            }
-            
-            # Extract vendor name (first entity before "was awarded")
-            vendor_match = re.match(r'^([^,]+),\s+([^,]+),\s+([A-Z]{2}),?\s+(?:was awarded|has been awarded)', paragraph)
-            if vendor_match:
-                contract['vendor_name'] = vendor_match.group(1).strip()
-                contract['vendor_city'] = vendor_match.group(2).strip()
-                contract['vendor_state'] = vendor_match.group(3).strip()
-            
-            # Extract award amount
-            amount_match = re.search(r'\$(\d+(?:,\d{3})*(?:\.\d+)?)\s*(million|billion)?', paragraph)
-            if amount_match:
-                amount = float(amount_match.group(1).replace(',', ''))
-                if amount_match.group(2) == 'million':
-                    amount *= 1_000_000
-                elif amount_match.group(2) == 'billion':
-                    amount *= 1_000_000_000
-                contract['award_amount'] = amount
-            
-            # Extract contract number
-            contract_num_match = re.search(r'\(([A-Z0-9\-]{8,})\)', paragraph)
-            if contract_num_match:
-                contract['contract_number'] = contract_num_match.group(1)
-            
-            # Extract service branch
-            if 'Army' in paragraph:
-                contract['service_branch'] = 'army'
-            elif 'Navy' in paragraph:
-                contract['service_branch'] = 'navy'
-            elif 'Air Force' in paragraph:
-                contract['service_branch'] = 'air_force'
-            elif 'Marine' in paragraph:
-                contract['service_branch'] = 'marine_corps'
-            
-            if contract.get('vendor_name'):
-                self.stats['contracts_extracted'] += 1
-                return contract
-            
-            return None
-            
+            contract = parse_contract_paragraph(paragraph, article.get('published_date'), article.get('article_url'))
         except Exception as e:
             return None
+        
+        if contract:
+            self.stats['contracts_extracted'] += 1
+        return contract
     
     # ========================================
     # DVIDS SCRAPER
@@ -426,35 +386,21 @@ class MilitaryNewsBrowserScraper:
             with open(json_file, 'a') as f:
                 f.write(json.dumps(article) + '\n')
             
-            # Save to Supabase
+            # Save to Supabase (batched upsert; existing URLs are skipped there)
             if self.supabase and article.get('article_url'):
-                try:
-                    # Check if exists
-                    result = self.supabase.table('military_news_articles')\
-                        .select('id')\
-                        .eq('article_url', article['article_url'])\
-                        .execute()
-                    
-                    if not result.data:
-                        self.supabase.table('military_news_articles').insert({
-                            'source': article.get('source'),
-                            'source_category': article.get('source_category'),
-                            'article_url': article.get('article_url'),
-                            'title': article.get('title'),
-                            'content': article.get('content'),
-                            'raw_html': article.get('raw_html'),
-                            'published_date': article.get('published_date'),
-                            'article_types': article.get('article_types'),
-                            'primary_article_type': article.get('primary_article_type'),
-                            'scraped_at': article.get('scraped_at'),
-                        }).execute()
-                        self.stats['articles_new'] += 1
-                        print("    ✅ Saved to database")
-                    else:
-                        self.stats['articles_skipped'] += 1
-                        print("    ⏭️  Already exists")
-                except Exception as e:
-                    print(f"    ⚠️  DB error: {e}")
+                self.sink.add_article({
+                    'source': article.get('source'),
+                    'source_category': article.get('source_category'),
+                    'article_url': article.get('article_url'),
+                    'title': article.get('title'),
+                    'content': article.get('content'),
+                    'raw_html': article.get('raw_html'),
+                    'published_date': article.get('published_date'),
+                    'article_types': article.get('article_types'),
+                    'primary_article_type': article.get('primary_article_type'),
+                    'scraped_at': article.get('scraped_at'),
+                })
+                print("    ✅ Queued for database")
             
             return True
             
@@ -468,7 +414,7 @@ class MilitaryNewsBrowserScraper:
             return False
         
         try:
-            self.supabase.table('military_contract_awards').insert({
+            self.sink.add_contract({
                 'article_url': contract.get('article_url'),
                 'published_date': contract.get('published_date'),
                 'vendor_name': contract.get('vendor_name'),
@@ -480,8 +426,8 @@ class MilitaryNewsBrowserScraper:
                 'service_branch': contract.get('service_branch'),
                 'raw_paragraph': contract.get('raw_paragraph'),
                 'scraped_at': contract.get('scraped_at'),
-            }).execute()
-            print(f"    💰 Contract saved: {contract.get('vendor_name')} - ${contract.get('award_amount', 0):,.0f}")
+            })
+            print(f"    💰 Contract queued: {contract.get('vendor_name')} - ${contract.get('award_amount', 0):,.0f}")
             return True
         except Exception as e:
             return False
@@ -528,6 +474,8 @@ def main():
     
     finally:
         scraper.stop_browser()
+        scraper.sink.close()
+        scraper.sink.print_stats()
 
 
 if __name__ == "__main__":
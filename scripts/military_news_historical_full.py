@@ -4,7 +4,7 @@ Military News Historical Scraper - Full Backfill
 ================================================
 
 Scrapes ALL historical data from DVIDS and Military Times with:
-- Automatic checkpointing (can resume after interruption)
+- Automatic checkpointing in the crawl frontier (can resume after interruption)
 - Retry logic with exponential backoff
 - Rate limiting protection
 - Progress tracking
@@ -28,11 +28,11 @@ import sys
 import time
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
 try:
-    from playwright.sync_api import sync_playwright
     from bs4 import BeautifulSoup
     from supabase import create_client
 except ImportError as e:
@@ -41,8 +41,18 @@ except ImportError as e:
     print("  pip install playwright beautifulsoup4 supabase")
     sys.exit(1)
 
+from article_fetcher import TieredFetcher
+from browser_pool import BrowserPagePool, RateLimiter
+from crawl_frontier import CrawlFrontier, FAILED, PARSED, SAVED
+from html_archive import open_archive
+from military_news_sink import MilitaryNewsSink
+from seen_urls import SeenURLIndex
+
+# Listing coverage key for the unfiltered (all years) DVIDS search
+LISTING_SOURCE = 'dvids_all'
+
 class HistoricalMilitaryNewsScraper:
-    def __init__(self):
+    def __init__(self, pages=4, contexts=2, recycle_after=100, delay=2.0):
         self.supabase = None
         self.checkpoint_file = Path('data/military_news_checkpoint.json')
         self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
@@ -66,55 +76,40 @@ class HistoricalMilitaryNewsScraper:
         else:
             print("⚠️  No Supabase credentials - will save to JSON only")
         
-        self.browser = None
-        self.context = None
-        self.page = None
+        self.seen_urls = SeenURLIndex(self.supabase).load()
+        # Raw pages go to the archive rather than the raw_html column
+        self.archive = open_archive()
+        self.sink = MilitaryNewsSink(self.supabase, raw_html=self.archive is None)
+        self.frontier = CrawlFrontier()
+        
+        # Pooled browser pages; one politeness interval shared by HTTP and browser fetches
+        self.rate_limiter = RateLimiter(delay)
+        self.pool = BrowserPagePool(pages=pages, contexts=contexts, recycle_after=recycle_after,
+                                    rate_limiter=self.rate_limiter, settle=2)
+        self.fetcher = TieredFetcher(self.pool.fetch, rate_limiter=self.rate_limiter, pool_size=pages,
+                                     archive=self.archive)
     
     def start_browser(self):
-        """Start Playwright browser"""
+        """Start Playwright browser page pool"""
         print("🌐 Starting browser...")
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=True)
-        self.context = self.browser.new_context(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        )
-        self.page = self.context.new_page()
-        print("✅ Browser ready\n")
+        self.pool.start()
     
     def stop_browser(self):
         """Stop browser"""
-        if self.context:
-            self.context.close()
-        if self.browser:
-            self.browser.close()
-        if hasattr(self, 'playwright'):
-            self.playwright.stop()
+        self.pool.close()
+        print(f"🌐 Browser pool: {self.pool.recycled} context recycles, "
+              f"{self.pool.blocked_requests:,} requests blocked")
     
     def load_checkpoint(self):
-        """Load last checkpoint"""
+        """Load the legacy JSON checkpoint (superseded by the crawl frontier)"""
         if self.checkpoint_file.exists():
             with open(self.checkpoint_file, 'r') as f:
                 return json.load(f)
         return None
     
-    def save_checkpoint(self, data):
-        """Save checkpoint"""
-        with open(self.checkpoint_file, 'w') as f:
-            json.dump(data, f, indent=2)
-    
     def article_exists(self, url):
         """Check if article already in database"""
-        if not self.supabase:
-            return False
-        
-        try:
-            result = self.supabase.table('military_news_articles')\
-                .select('id')\
-                .eq('article_url', url)\
-                .execute()
-            return bool(result.data)
-        except:
-            return False
+        return url in self.seen_urls
     
     def save_article(self, article):
         """Save article to Supabase"""
@@ -132,7 +127,7 @@ class HistoricalMilitaryNewsScraper:
             if not article.get('source'):
                 article['source'] = 'unknown'
             
-            self.supabase.table('military_news_articles').insert({
+            self.sink.add_article({
                 'source': article.get('source'),
                 'source_category': article.get('source_category'),
                 'article_url': article.get('article_url'),
@@ -162,7 +157,8 @@ class HistoricalMilitaryNewsScraper:
                 'video_urls': article.get('video_urls'),
                 'document_urls': article.get('document_urls'),
                 'scraped_at': article.get('scraped_at'),
-            }).execute()
+            })
+            self.seen_urls.add(article.get('article_url'))
             return True
         except Exception as e:
             print(f"      ⚠️  DB error: {str(e)[:50]}")
@@ -172,109 +168,11 @@ class HistoricalMilitaryNewsScraper:
         """Extract DVIDS article with retry logic"""
         for attempt in range(retries):
             try:
-                self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
-                time.sleep(2)  # Let content load
-                
-                html_content = self.page.content()
-                soup = BeautifulSoup(html_content, 'html.parser')
-                
-                article = {
-                    'source': 'dvids',
-                    'source_category': 'dvids',
-                    'article_url': url,
-                    'scraped_at': datetime.now().isoformat(),
-                }
-                
-                # Title
-                title = soup.find('h1', class_='asset-title') or soup.find('h1')
-                if title:
-                    article['title'] = title.get_text(strip=True)
-                
-                # Content
-                content_div = soup.find('div', class_=['asset_container', 'asset_news_container'])
-                if content_div:
-                    main_p = content_div.find('p', recursive=False)
-                    if main_p:
-                        text = main_p.get_text(separator='\n')
-                        lines = [line.strip() for line in text.split('\n') if line.strip()]
-                        article['content'] = '\n\n'.join(lines)
-                        article['raw_html'] = str(main_p)
-                
-                # Metadata
-                info_div = soup.find('div', class_='asset_information')
-                if info_div:
-                    h3_tags = info_div.find_all('h3')
-                    if h3_tags:
-                        # Location
-                        location_text = h3_tags[0].get_text(strip=True)
-                        if location_text and not location_text.startswith('Story by'):
-                            article['locations'] = [location_text]
-                            article['primary_location'] = location_text
-                            if ',' in location_text:
-                                parts = [p.strip() for p in location_text.split(',')]
-                                for part in parts:
-                                    if len(part) == 2 and part.isupper():
-                                        article['states'] = [part]
-                                    elif len(part) > 2 and not article.get('countries'):
-                                        article['countries'] = [parts[-1]]
-                        
-                        # Author
-                        for h3 in h3_tags:
-                            if 'Story by' in h3.get_text() or 'Photo By' in h3.get_text():
-                                author_link = h3.find('a')
-                                if author_link:
-                                    article['author'] = author_link.get_text(strip=True)
-                                    article['byline'] = f"Story by {article['author']}"
-                        
-                        # Unit
-                        unit_h3 = info_div.find('h3', class_='the_unit')
-                        if unit_h3:
-                            unit_link = unit_h3.find('a')
-                            if unit_link:
-                                article['units_mentioned'] = [unit_link.get_text(strip=True)]
-                
-                # Date
-                date_elem = soup.find('time')
-                if date_elem:
-                    date_str = date_elem.get('datetime')
-                    if date_str:
-                        article['published_date'] = date_str
+                html_content = self.fetcher.fetch(url, 'dvids', 'dvids')
+                if not html_content:
+                    raise ValueError("no article content")
                 
-                # Article ID
-                article_id_match = re.search(r'/news/(\d+)/', url)
-                if article_id_match:
-                    article['article_id'] = article_id_match.group(1)
-                
-                # Images
-                image_urls = []
-                related_img = soup.find('div', class_='relatedimage')
-                if related_img:
-                    img = related_img.find('img', src=True)
-                    if img:
-                        image_urls.append(img['src'])
-                
-                if image_urls:
-                    article['image_urls'] = image_urls[:10]
-                
-                # Classification
-                content_lower = article.get('content', '').lower()
-                title_lower = article.get('title', '').lower()
-                
-                article_types = []
-                if any(kw in content_lower or kw in title_lower for kw in ['training', 'exercise', 'drill']):
-                    article_types.append('training_exercise')
-                if any(kw in content_lower or kw in title_lower for kw in ['deploy', 'deployment']):
-                    article_types.append('deployment')
-                if any(kw in content_lower or kw in title_lower for kw in ['change of command', 'assumes command']):
-                    article_types.append('change_of_command')
-                if any(kw in content_lower or kw in title_lower for kw in ['promotion', 'promoted']):
-                    article_types.append('promotion')
-                
-                if article_types:
-                    article['article_types'] = article_types
-                    article['primary_article_type'] = article_types[0]
-                
-                return article
+                return self.parse_dvids_article(url, html_content)
                 
             except Exception as e:
                 if attempt < retries - 1:
@@ -283,11 +181,164 @@ class HistoricalMilitaryNewsScraper:
                     time.sleep(wait_time)
                 else:
                     print(f"      ❌ Failed after {retries} attempts: {str(e)[:50]}")
-                    self.stats['errors'] += 1
                     return None
         
         return None
     
+    @staticmethod
+    def parse_dvids_article(url, html):
+        """Parse a DVIDS article page (also used to re-parse archived pages)"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        article = {
+            'source': 'dvids',
+            'source_category': 'dvids',
+            'article_url': url,
+            'scraped_at': datetime.now().isoformat(),
+        }
+        
+        # Title
+        title = soup.find('h1', class_='asset-title') or soup.find('h1')
+        if title:
+            article['title'] = title.get_text(strip=True)
+        
+        # Content
+        content_div = soup.find('div', class_=['asset_container', 'asset_news_container'])
+        if content_div:
+            main_p = content_div.find('p', recursive=False)
+            if main_p:
+                text = main_p.get_text(separator='\n')
+                lines = [line.strip() for line in text.split('\n') if line.strip()]
+                article['content'] = '\n\n'.join(lines)
+                article['raw_html'] = str(main_p)
+        
+        # Metadata
+        info_div = soup.find('div', class_='asset_information')
+        if info_div:
+            h3_tags = info_div.find_all('h3')
+            if h3_tags:
+                # Location
+                location_text = h3_tags[0].get_text(strip=True)
+                if location_text and not location_text.startswith('Story by'):
+                    article['locations'] = [location_text]
+                    article['primary_location'] = location_text
+                    if ',' in location_text:
+                        parts = [p.strip() for p in location_text.split(',')]
+                        for part in parts:
+                            if len(part) == 2 and part.isupper():
+                                article['states'] = [part]
+                            elif len(part) > 2 and not article.get('countries'):
+                                article['countries'] = [parts[-1]]
+        
+                # Author
+                for h3 in h3_tags:
+                    if 'Story by' in h3.get_text() or 'Photo By' in h3.get_text():
+                        author_link = h3.find('a')
+                        if author_link:
+                            article['author'] = author_link.get_text(strip=True)
+                            article['byline'] = f"Story by {article['author']}"
+        
+                # Unit
+                unit_h3 = info_div.find('h3', class_='the_unit')
+                if unit_h3:
+                    unit_link = unit_h3.find('a')
+                    if unit_link:
+                        article['units_mentioned'] = [unit_link.get_text(strip=True)]
+        
+        # Date
+        date_elem = soup.find('time')
+        if date_elem:
+            date_str = date_elem.get('datetime')
+            if date_str:
+                article['published_date'] = date_str
+        
+        # Article ID
+        article_id_match = re.search(r'/news/(\d+)/', url)
+        if article_id_match:
+            article['article_id'] = article_id_match.group(1)
+        
+        # Images
+        image_urls = []
+        related_img = soup.find('div', class_='relatedimage')
+        if related_img:
+            img = related_img.find('img', src=True)
+            if img:
+                image_urls.append(img['src'])
+        
+        if image_urls:
+            article['image_urls'] = image_urls[:10]
+        
+        # Classification
+        content_lower = article.get('content', '').lower()
+        title_lower = article.get('title', '').lower()
+        
+        article_types = []
+        if any(kw in content_lower or kw in title_lower for kw in ['training', 'exercise', 'drill']):
+            article_types.append('training_exercise')
+        if any(kw in content_lower or kw in title_lower for kw in ['deploy', 'deployment']):
+            article_types.append('deployment')
+        if any(kw in content_lower or kw in title_lower for kw in ['change of command', 'assumes command']):
+            article_types.append('change_of_command')
+        if any(kw in content_lower or kw in title_lower for kw in ['promotion', 'promoted']):
+            article_types.append('promotion')
+        
+        if article_types:
+            article['article_types'] = article_types
+            article['primary_article_type'] = article_types[0]
+        
+        return article
+    
+    def process_urls(self, urls):
+        """Extract and save DVIDS article URLs, recording each one's progress in the crawl frontier"""
+        new_urls = []
+        existing = []
+        for url in urls:
+            if self.article_exists(url):
+                existing.append(url)
+                self.stats['existing_articles'] += 1
+            else:
+                new_urls.append(url)
+        
+        self.frontier.add_urls('dvids', urls)
+        self.frontier.mark_many(existing, SAVED)
+        # Skips URLs another process is already working on
+        new_urls = self.frontier.claim(new_urls)
+        print(f"   {len(existing)} existing, {len(new_urls)} to extract")
+        
+        # Extract concurrently (paced by the shared rate limiter), save here in order
+        saved = []
+        with ThreadPoolExecutor(max_workers=self.pool.size) as executor:
+            for i, (url, article) in enumerate(zip(new_urls, executor.map(self.extract_dvids_article, new_urls)), 1):
+                print(f"   [{i}/{len(new_urls)}] 🔍 {url[:60]}...")
+                if article:
+                    self.frontier.mark(url, PARSED)
+                if article and self.save_article(article):
+                    print(f"      ✅ Saved")
+                    self.stats['new_articles'] += 1
+                    saved.append(url)
+                else:
+                    self.frontier.mark(url, FAILED, 'not saved' if article else 'not extracted')
+                    if not article:
+                        self.stats['errors'] += 1
+                
+                self.stats['total_articles'] += 1
+        
+        # Only count as saved once the buffered rows are written
+        failed = self.sink.flush()
+        self.frontier.mark_many([url for url in saved if url not in failed], SAVED)
+        self.frontier.mark_many([url for url in saved if url in failed], FAILED, 'not written')
+        return len(saved) - len(failed.intersection(saved))
+    
+    def resume_pending(self):
+        """Finish articles a previous run discovered but did not save"""
+        pending = self.frontier.pending('dvids')
+        if not pending:
+            return
+        
+        print(f"📍 Resuming {len(pending)} articles discovered but not saved last run")
+        for i in range(0, len(pending), 100):
+            self.process_urls(pending[i:i + 100])
+    
     def scrape_dvids_historical(self, start_year=2015, end_year=None):
         """Scrape all DVIDS history year by year"""
         if not end_year:
@@ -299,111 +350,81 @@ class HistoricalMilitaryNewsScraper:
         print(f"Scraping: {start_year} to {end_year}")
         print(f"{'='*70}\n")
         
-        # Load checkpoint
+        self.resume_pending()
+        
+        # Listing coverage lives in the crawl frontier; the old JSON checkpoint
+        # only says where coverage began
         checkpoint = self.load_checkpoint()
-        if checkpoint and checkpoint.get('source') == 'dvids':
-            print(f"📍 Resuming from checkpoint: Page {checkpoint.get('page', 1)}")
-            start_page = checkpoint.get('page', 1)
-        else:
-            start_page = 1
+        first_page = checkpoint.get('page', 1) if checkpoint and checkpoint.get('source') == 'dvids' else 1
+        start_page, consecutive_empty = self.frontier.resume_listing(LISTING_SOURCE, 0, start=first_page)
+        if start_page > 1:
+            print(f"📍 Resuming from page {start_page}")
         
         page_num = start_page
-        consecutive_empty = 0
         max_consecutive_empty = 20  # Stop after 20 empty pages (DVIDS pagination has gaps)
         
         while consecutive_empty < max_consecutive_empty:
             try:
-                # Restart browser every 50 pages to prevent memory leaks
-                if page_num > 1 and page_num % 50 == 0:
-                    print(f"\n🔄 Restarting browser (memory management)...")
-                    self.stop_browser()
-                    time.sleep(2)
-                    self.start_browser()
-                
-                print(f"\n📄 Page {page_num}")
+                # One listing page per pooled browser page, fetched together
+                batch = list(range(page_num, page_num + self.pool.size))
+                print(f"\n📄 Pages {batch[0]}-{batch[-1]}")
                 
                 # DVIDS search endpoint
-                search_url = f"https://www.dvidshub.net/search/?filter%5Btype%5D=news&view=grid&page={page_num}"
-                
-                self.page.goto(search_url, wait_until='domcontentloaded', timeout=30000)
-                time.sleep(3)
+                search_urls = [f"https://www.dvidshub.net/search/?filter%5Btype%5D=news&view=grid&page={n}"
+                               for n in batch]
+                listings = self.pool.fetch_many(search_urls, settle=3)
                 
                 # Find article links
-                soup = BeautifulSoup(self.page.content(), 'html.parser')
-                article_links = soup.find_all('a', href=re.compile(r'/news/\d+/'))
-                
-                if not article_links:
-                    consecutive_empty += 1
-                    print(f"   No articles found (empty {consecutive_empty}/{max_consecutive_empty})")
-                    page_num += 1
-                    continue
-                
-                consecutive_empty = 0  # Reset counter
-                
-                # Get unique URLs
-                urls = list(set([f"https://www.dvidshub.net{link['href']}" for link in article_links]))
-                print(f"   Found {len(urls)} articles")
-                
-                articles_this_page = 0
-                for i, url in enumerate(urls, 1):
-                    # Check if already exists
-                    if self.article_exists(url):
-                        print(f"   [{i}/{len(urls)}] ⏭️  Exists: {url[:60]}...")
-                        self.stats['existing_articles'] += 1
+                urls = {}
+                walked = {}
+                for n, html in zip(batch, listings):
+                    if html is None:
+                        print(f"   Page {n}: ❌ failed to load")
+                        self.stats['errors'] += 1
                         continue
                     
-                    print(f"   [{i}/{len(urls)}] 🔍 {url[:60]}...")
-                    article = self.extract_dvids_article(url)
-                    
-                    if article and self.save_article(article):
-                        print(f"      ✅ Saved")
-                        self.stats['new_articles'] += 1
-                        articles_this_page += 1
-                    
-                    self.stats['total_articles'] += 1
-                    
-                    # Rate limiting
-                    time.sleep(2)
+                    article_links = BeautifulSoup(html, 'html.parser').find_all('a', href=re.compile(r'/news/\d+/'))
+                    page_urls = set(f"https://www.dvidshub.net{link['href']}" for link in article_links)
+                    walked[n] = len(page_urls)
+                    if not article_links:
+                        consecutive_empty += 1
+                        print(f"   Page {n}: no articles found (empty {consecutive_empty}/{max_consecutive_empty})")
+                        if consecutive_empty >= max_consecutive_empty:
+                            break
+                        continue
                     
-                    # Save checkpoint every 10 articles
-                    if self.stats['total_articles'] % 10 == 0:
-                        self.save_checkpoint({
-                            'source': 'dvids',
-                            'page': page_num,
-                            'stats': self.stats,
-                            'timestamp': datetime.now().isoformat()
-                        })
+                    consecutive_empty = 0  # Reset counter
+                    print(f"   Page {n}: found {len(page_urls)} articles")
+                    urls.update(dict.fromkeys(page_urls))
+                
+                articles_this_batch = self.process_urls(list(urls))
+                print(f"   ✅ Pages {batch[0]}-{batch[-1]} complete: {articles_this_batch} new articles")
                 
-                print(f"   ✅ Page {page_num} complete: {articles_this_page} new articles")
+                # A listing page counts as covered once its articles are written
+                for n, urls_found in walked.items():
+                    self.frontier.mark_listing(LISTING_SOURCE, 0, n, urls_found)
+                page_num += len(batch)
                 
-                # Progress report every 5 pages
-                if page_num % 5 == 0:
+                # Progress report every 5 batches
+                if (page_num - start_page) % (5 * self.pool.size) == 0:
                     elapsed = (datetime.now() - datetime.fromisoformat(self.stats['start_time'])).total_seconds() / 60
                     print(f"\n{'='*70}")
                     print(f"📊 PROGRESS REPORT")
                     print(f"{'='*70}")
-                    print(f"Pages processed: {page_num}")
+                    print(f"Pages processed: {page_num - 1}")
                     print(f"New articles: {self.stats['new_articles']}")
                     print(f"Already existing: {self.stats['existing_articles']}")
                     print(f"Errors: {self.stats['errors']}")
                     print(f"Runtime: {elapsed:.1f} minutes")
                     print(f"{'='*70}\n")
                 
-                page_num += 1
-                
             except KeyboardInterrupt:
-                print("\n\n⚠️  Interrupted by user - saving checkpoint...")
-                self.save_checkpoint({
-                    'source': 'dvids',
-                    'page': page_num,
-                    'stats': self.stats,
-                    'timestamp': datetime.now().isoformat()
-                })
+                print("\n\n⚠️  Interrupted by user - progress is in the crawl frontier")
                 break
             except Exception as e:
                 print(f"   ❌ Page error: {e}")
                 self.stats['errors'] += 1
-                page_num += 1
+                page_num += self.pool.size
                 time.sleep(5)
         
         print(f"\n{'='*70}")
@@ -430,11 +451,18 @@ def main():
     parser.add_argument('--resume', action='store_true',
                       help='Resume from last checkpoint')
     parser.add_argument('--delay', type=float, default=2.0,
-                      help='Delay between requests (seconds)')
+                      help='Minimum delay between requests across all workers (seconds)')
+    parser.add_argument('--pages', type=int, default=4,
+                      help='Concurrent browser pages / fetch workers')
+    parser.add_argument('--contexts', type=int, default=2,
+                      help='Browser contexts the pages are spread over')
+    parser.add_argument('--recycle-after', type=int, default=100,
+                      help='Navigations before a browser context is recycled')
     
     args = parser.parse_args()
     
-    scraper = HistoricalMilitaryNewsScraper()
+    scraper = HistoricalMilitaryNewsScraper(pages=args.pages, contexts=args.contexts,
+                                            recycle_after=args.recycle_after, delay=args.delay)
     
     try:
         scraper.start_browser()
@@ -449,6 +477,11 @@ def main():
         print("\n\n⚠️  Interrupted by user")
     finally:
         scraper.stop_browser()
+        scraper.sink.close()
+        scraper.sink.print_stats()
+        scraper.fetcher.print_stats()
+        scraper.frontier.release()
+        scraper.frontier.print_stats('dvids')
 
 if __name__ == '__main__':
     main()
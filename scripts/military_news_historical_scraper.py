@@ -21,9 +21,11 @@ import time
 import json
 import re
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from bs4 import BeautifulSoup
 import argparse
 from urllib.parse import urljoin, urlparse
@@ -36,14 +38,36 @@ except ImportError:
     print("Install with: pip install supabase")
     sys.exit(1)
 
+from browser_pool import RateLimiter
+from conditional_requests import ConditionalRequests
+from fpds_atom import split_date_range
+from military_news_sink import MilitaryNewsSink
+from seen_urls import SeenURLIndex
+
+DVIDS_SEARCH_URL = "https://www.dvidshub.net/search"
+DVIDS_PAGE_SIZE = 100
+# A shard needing more pages than this is split in half
+DVIDS_MAX_PAGES_PER_SHARD = 50
+# Shards ending this many days ago or earlier are closed: once fetched
+# completely they are not requested again
+DVIDS_SETTLE_DAYS = 3
+DVIDS_SHARD_STATE_FILE = Path('data/dvids_api_shards.json')
+
 class MilitaryNewsHistoricalScraper:
     """
     Historical scraper for military news from multiple sources
     """
     
-    def __init__(self, delay_seconds: float = 2.0):
-        """Initialize scraper"""
+    def __init__(self, delay_seconds: float = 2.0, workers: int = 4):
+        """
+        Initialize scraper
+        
+        Args:
+            delay_seconds: Minimum interval between request starts, shared by all workers
+            workers: DVIDS date shards fetched concurrently
+        """
         self.delay_seconds = delay_seconds
+        self.workers = workers
         
         # Statistics
         self.stats = {
@@ -70,12 +94,22 @@ class MilitaryNewsHistoricalScraper:
         else:
             self.supabase = create_client(supabase_url, supabase_key)
         
+        # Batched article writes, flushed on exit
+        self.sink = MilitaryNewsSink(self.supabase)
+        
         # Set up session
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
         })
+        self.session.mount('https://', HTTPAdapter(pool_connections=workers, pool_maxsize=workers))
+        
+        # Feeds and API pages are polled with If-None-Match / If-Modified-Since
+        self.rate_limiter = RateLimiter(delay_seconds)
+        self.http = ConditionalRequests(self.session, rate_limiter=self.rate_limiter)
+        self.seen_urls = SeenURLIndex(self.supabase).load()
+        self.dvids_shards = self._load_dvids_shards()
         
         # Output directory for JSON backups
         self.output_dir = Path('data/military_news_historical')
@@ -85,83 +119,194 @@ class MilitaryNewsHistoricalScraper:
     # DVIDS API SCRAPER
     # ========================================
     
-    def scrape_dvids_api(self, start_date: datetime, end_date: datetime, source_type: str = 'news'):
+    def _load_dvids_shards(self) -> Dict[str, Dict]:
+        if DVIDS_SHARD_STATE_FILE.exists():
+            try:
+                with open(DVIDS_SHARD_STATE_FILE, 'r') as f:
+                    return json.load(f)
+            except (ValueError, OSError) as e:
+                print(f"Warning: ignoring unreadable {DVIDS_SHARD_STATE_FILE}: {e}")
+        return {}
+    
+    def _save_dvids_shards(self):
+        DVIDS_SHARD_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = DVIDS_SHARD_STATE_FILE.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self.dvids_shards, f, indent=2)
+        os.replace(tmp_file, DVIDS_SHARD_STATE_FILE)
+    
+    @staticmethod
+    def dvids_params(source_type: str, start: str, end: str, page: int) -> Dict:
+        """Search parameters for one page of a date shard (dates inclusive, YYYY-MM-DD)"""
+        return {
+            'page': page,
+            'max': DVIDS_PAGE_SIZE,
+            'filter[type]': source_type,
+            'filter[date_published_from]': start,
+            'filter[date_published_to]': end,
+        }
+    
+    def fetch_dvids_shard(self, source_type: str, start: str, end: str) -> List[Dict]:
+        """
+        Fetch every result of one date shard (runs on worker threads)
+        
+        Page 1 is a conditional request, so an open shard with no new items
+        costs one 304. Shards with more results than the search pages through
+        are split in half.
+        
+        Returns:
+            One dict per shard fetched (several if split) with start, end,
+            total, items, the page-1 response, and unchanged / error flags
+        """
+        shard = {'start': start, 'end': end, 'total': 0, 'items': [], 'response': None,
+                 'unchanged': False, 'error': None}
+        params = self.dvids_params(source_type, start, end, 1)
+        try:
+            response = self.http.get(DVIDS_SEARCH_URL, params=params)
+            if response is None:
+                shard['unchanged'] = True
+                return [shard]
+            response.raise_for_status()
+            data = response.json()
+            
+            total = int(data.get('total', 0))
+            pages = -(-total // DVIDS_PAGE_SIZE)
+            if pages > DVIDS_MAX_PAGES_PER_SHARD and start != end:
+                middle = datetime.strptime(start, '%Y-%m-%d') + (
+                    datetime.strptime(end, '%Y-%m-%d') - datetime.strptime(start, '%Y-%m-%d')) / 2
+                first_end = middle.strftime('%Y-%m-%d')
+                second_start = (middle + timedelta(days=1)).strftime('%Y-%m-%d')
+                return (self.fetch_dvids_shard(source_type, start, first_end)
+                        + self.fetch_dvids_shard(source_type, second_start, end))
+            
+            items = {}
+            for item in data.get('results', []):
+                items[item.get('id') or item.get('url')] = item
+            for page in range(2, min(pages, DVIDS_MAX_PAGES_PER_SHARD) + 1):
+                self.rate_limiter.wait()
+                page_response = self.session.get(DVIDS_SEARCH_URL, timeout=30,
+                                                 params=self.dvids_params(source_type, start, end, page))
+                page_response.raise_for_status()
+                results = page_response.json().get('results', [])
+                if not results:
+                    break
+                for item in results:
+                    items[item.get('id') or item.get('url')] = item
+            
+            shard.update(total=total, items=list(items.values()), response=response)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            shard['error'] = str(e)[:100]
+        return [shard]
+    
+    def scrape_dvids_api(self, start_date: datetime, end_date: datetime, source_type: str = 'news',
+                         shard_days: int = 7, full: bool = False):
         """
         Scrape DVIDS using their official API
         
         API Docs: https://www.dvidshub.net/api
         
+        The date range is split into shards of shard_days, fetched by a pool
+        of workers. Each shard's result count is checked against the total
+        the API reports; closed shards fetched completely are skipped on
+        later runs, and open (recent) shards are re-polled conditionally.
+        
         Args:
             start_date: Start date for scraping
             end_date: End date for scraping
             source_type: 'news', 'images', or 'video'
+            shard_days: Days per date shard
+            full: Refetch shards already fetched completely
         """
         print(f"\n{'='*70}")
         print(f"DVIDS API Scraper - {source_type.upper()}")
         print(f"{'='*70}")
         print(f"Date range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
+        print(f"Shards: {shard_days} days | Workers: {self.workers}")
         print(f"{'='*70}\n")
         
-        base_url = "https://www.dvidshub.net"
+        shards = split_date_range(start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'), shard_days)
+        closed_before = (datetime.now() - timedelta(days=DVIDS_SETTLE_DAYS)).strftime('%Y-%m-%d')
         
-        # DVIDS API pagination
-        page = 1
-        max_results = 100  # Per page
+        def shard_key(start, end):
+            return f"{source_type}:{start}:{end}"
         
-        while True:
-            # Build API request
-            # DVIDS API uses 'resources' endpoint for news/images/video
-            params = {
-                'page': page,
-                'max': max_results,
-            }
-            
-            # DVIDS API endpoint format
-            if source_type == 'news':
-                api_url = f"{base_url}/search"
-                params['filter[type]'] = 'news'
-            else:
-                api_url = f"{base_url}/search"
-                params['filter[type]'] = source_type
-            
-            try:
-                print(f"Fetching page {page}...")
-                response = self.session.get(api_url, params=params, timeout=30)
-                
-                if response.status_code != 200:
-                    print(f"  Error: HTTP {response.status_code}")
-                    break
-                
-                data = response.json()
-                
-                # DVIDS returns results in 'results' array
-                results = data.get('results', [])
-                
-                if not results:
-                    print(f"  No more results")
-                    break
-                
-                print(f"  Found {len(results)} items")
-                
-                # Process each item
-                for item in results:
-                    article = self.parse_dvids_article(item, source_type)
-                    if article:
-                        self.save_article(article)
-                
-                # Check if there are more pages
-                total_results = data.get('total', 0)
-                if page * max_results >= total_results:
-                    break
-                
-                page += 1
-                time.sleep(self.delay_seconds)
+        todo = [(start, end) for start, end in shards
+                if full or not self.dvids_shards.get(shard_key(start, end), {}).get('complete')]
+        print(f"{len(shards)} shards, {len(shards) - len(todo)} already fetched completely\n")
+        
+        counts = {'complete': 0, 'short': 0, 'unchanged': 0, 'failed': 0, 'items': 0, 'new': 0}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.fetch_dvids_shard, source_type, start, end): (start, end)
+                       for start, end in todo}
+            for future in as_completed(futures):
+                start, end = futures[future]
+                # A shard split by fetch_dvids_shard comes back as several
+                complete = True
+                total = 0
+                for shard in future.result():
+                    label = f"{shard['start']} to {shard['end']}"
+                    if shard['unchanged']:
+                        counts['unchanged'] += 1
+                        print(f"  {label}: not modified")
+                        continue
+                    if shard['error']:
+                        counts['failed'] += 1
+                        complete = False
+                        print(f"  {label}: error {shard['error']}")
+                        continue
+                    
+                    # Only items not stored yet are parsed and saved
+                    saved = []
+                    for item in shard['items']:
+                        if item.get('url') in self.seen_urls:
+                            continue
+                        article = self.parse_dvids_article(item, source_type)
+                        if article and self.save_article(article):
+                            self.seen_urls.add(article.get('article_url'))
+                            saved.append(article.get('article_url'))
+                    
+                    # Rows that failed to write are retried next run, so the
+                    # shard is neither remembered nor marked complete
+                    failed = self.sink.flush()
+                    not_written = [url for url in saved if url in failed]
+                    self.seen_urls.difference_update(not_written)
+                    new = len(saved) - len(not_written)
+                    counts['items'] += len(shard['items'])
+                    counts['new'] += new
+                    total += shard['total']
+                    
+                    if not_written:
+                        counts['failed'] += 1
+                        complete = False
+                        print(f"  {label}: {len(shard['items'])}/{shard['total']} items, {new} new, "
+                              f"{len(not_written)} not written (refetched next run)")
+                        continue
+                    
+                    shard_complete = len(shard['items']) >= shard['total']
+                    print(f"  {label}: {len(shard['items'])}/{shard['total']} items, {new} new"
+                          f"{'' if shard_complete else ' (short, refetched next run)'}")
+                    if not shard_complete:
+                        counts['short'] += 1
+                        complete = False
+                        continue
+                    
+                    counts['complete'] += 1
+                    self.http.remember(DVIDS_SEARCH_URL, self.dvids_params(source_type, shard['start'], shard['end'], 1),
+                                       shard['response'])
                 
-            except Exception as e:
-                print(f"  Error fetching DVIDS data: {e}")
-                break
+                if complete:
+                    key = shard_key(start, end)
+                    self.dvids_shards[key] = {
+                        'total': total or self.dvids_shards.get(key, {}).get('total', 0),
+                        'complete': end < closed_before,
+                        'fetched_at': datetime.now().isoformat(),
+                    }
+                    self._save_dvids_shards()
         
-        print(f"\nDVIDS scraping completed: {self.stats['articles_found']} articles found")
+        print(f"\nDVIDS scraping completed: {counts['complete']} shards complete, {counts['short']} short, "
+              f"{counts['unchanged']} not modified, {counts['failed']} failed - "
+              f"{counts['items']:,} items, {counts['new']:,} new")
+        self.http.print_stats()
     
     def parse_dvids_article(self, item: Dict, source_type: str) -> Optional[Dict]:
         """Parse DVIDS API response into article format"""
@@ -305,7 +450,10 @@ class MilitaryNewsHistoricalScraper:
         print(f"{'='*70}\n")
         
         try:
-            response = self.session.get(rss_url, timeout=30)
+            response = self.http.get(rss_url)
+            if response is None:
+                print("Feed not modified since the last run")
+                return
             if response.status_code != 200:
                 print(f"Error: HTTP {response.status_code}")
                 return
@@ -316,9 +464,11 @@ class MilitaryNewsHistoricalScraper:
             
             # RSS feeds typically have <item> elements
             items = root.findall('.//item')
-            print(f"Found {len(items)} articles in RSS feed")
+            new_items = [item for item in items if (item.findtext('link') or '').strip() not in self.seen_urls]
+            print(f"Found {len(items)} articles in RSS feed, {len(new_items)} new")
             
-            for item in items:
+            saved = []
+            for item in new_items:
                 article = {
                     'source': f"{service}.mil",
                     'source_category': 'service_branch',
@@ -333,8 +483,8 @@ class MilitaryNewsHistoricalScraper:
                     article['title'] = title_elem.text
                 
                 link_elem = item.find('link')
-                if link_elem is not None:
-                    article['article_url'] = link_elem.text
+                if link_elem is not None and link_elem.text:
+                    article['article_url'] = link_elem.text.strip()
                 
                 description_elem = item.find('description')
                 if description_elem is not None:
@@ -356,8 +506,19 @@ class MilitaryNewsHistoricalScraper:
                         article['content'] = full_article.get('content', '')
                         article['raw_html'] = full_article.get('raw_html', '')
                 
-                self.save_article(article)
-                time.sleep(self.delay_seconds)
+                if self.save_article(article):
+                    self.seen_urls.add(article.get('article_url'))
+                    saved.append(article.get('article_url'))
+            
+            # Validators are kept only once every new item has been written;
+            # otherwise the next run would get a 304 and miss the failed ones
+            failed = self.sink.flush()
+            not_written = [url for url in saved if url in failed]
+            if not_written:
+                self.seen_urls.difference_update(not_written)
+                print(f"{len(not_written)} articles not written, feed is refetched next run")
+                return
+            self.http.remember(rss_url, None, response)
                 
         except Exception as e:
             print(f"Error scraping RSS feed: {e}")
@@ -365,6 +526,7 @@ class MilitaryNewsHistoricalScraper:
     def fetch_article_content(self, url: str) -> Optional[Dict]:
         """Fetch full article content from URL"""
         try:
+            self.rate_limiter.wait()
             response = self.session.get(url, timeout=30)
             if response.status_code != 200:
                 return None
@@ -426,20 +588,9 @@ class MilitaryNewsHistoricalScraper:
             return False
     
     def save_article_to_db(self, article: Dict) -> bool:
-        """Save article to Supabase database"""
+        """Queue article for the batched Supabase upsert (new / skipped counts come from the sink)"""
         try:
-            # Check if article already exists
-            result = self.supabase.table('military_news_articles')\
-                .select('id')\
-                .eq('article_url', article.get('article_url'))\
-                .execute()
-            
-            if result.data:
-                self.stats['articles_skipped'] += 1
-                return True
-            
-            # Insert article
-            self.supabase.table('military_news_articles').insert({
+            return self.sink.add_article({
                 'source': article.get('source'),
                 'source_category': article.get('source_category'),
                 'article_url': article.get('article_url'),
@@ -460,10 +611,7 @@ class MilitaryNewsHistoricalScraper:
                 'units_mentioned': article.get('units_mentioned'),
                 'image_urls': article.get('image_urls'),
                 'scraped_at': article.get('scraped_at'),
-            }).execute()
-            
-            self.stats['articles_new'] += 1
-            return True
+            })
             
         except Exception as e:
             print(f"    Error saving article to DB: {e}")
@@ -479,6 +627,9 @@ class MilitaryNewsHistoricalScraper:
             return
         
         try:
+            # Buffered articles count towards this run
+            self.sink.flush()
+            
             completed_at = datetime.now()
             duration = None
             if started_at:
@@ -491,10 +642,10 @@ class MilitaryNewsHistoricalScraper:
                 'date_from': date_from.date().isoformat() if date_from else None,
                 'date_to': date_to.date().isoformat() if date_to else None,
                 'articles_found': self.stats['articles_found'],
-                'articles_new': self.stats['articles_new'],
+                'articles_new': self.stats['articles_new'] + self.sink.stats['articles_new'],
                 'articles_updated': self.stats['articles_updated'],
-                'articles_skipped': self.stats['articles_skipped'],
-                'articles_failed': self.stats['articles_failed'],
+                'articles_skipped': self.stats['articles_skipped'] + self.sink.stats['articles_existing'],
+                'articles_failed': self.stats['articles_failed'] + self.sink.stats['articles_failed'],
                 'contracts_extracted': self.stats['contracts_extracted'],
                 'personnel_changes_extracted': self.stats['personnel_changes_extracted'],
                 'units_identified': self.stats['units_identified'],
@@ -517,6 +668,8 @@ class MilitaryNewsHistoricalScraper:
         print(f"{'='*70}")
         for key, value in self.stats.items():
             print(f"{key.replace('_', ' ').title():30} {value:>10,}")
+        if self.supabase:
+            self.sink.print_stats()
         print(f"{'='*70}\n")
 
 
@@ -529,7 +682,10 @@ def main():
                        help='Source to scrape')
     parser.add_argument('--start-date', type=str, required=True, help='Start date (YYYY-MM-DD)')
     parser.add_argument('--end-date', type=str, help='End date (YYYY-MM-DD), default: today')
-    parser.add_argument('--delay', type=float, default=2.0, help='Delay between requests (seconds)')
+    parser.add_argument('--delay', type=float, default=2.0, help='Seconds between request starts across all workers')
+    parser.add_argument('--workers', type=int, default=4, help='DVIDS date shards fetched concurrently (default: 4)')
+    parser.add_argument('--shard-days', type=int, default=7, help='Days per DVIDS date shard (default: 7)')
+    parser.add_argument('--full', action='store_true', help='Refetch DVIDS shards already fetched completely')
     
     args = parser.parse_args()
     
@@ -538,13 +694,14 @@ def main():
     end_date = datetime.strptime(args.end_date, '%Y-%m-%d') if args.end_date else datetime.now()
     
     # Initialize scraper
-    scraper = MilitaryNewsHistoricalScraper(delay_seconds=args.delay)
+    scraper = MilitaryNewsHistoricalScraper(delay_seconds=args.delay, workers=args.workers)
     scraper_start = datetime.now()
     
     try:
         # Run appropriate scraper
         if args.source == 'dvids':
-            scraper.scrape_dvids_api(start_date, end_date, source_type='news')
+            scraper.scrape_dvids_api(start_date, end_date, source_type='news',
+                                     shard_days=args.shard_days, full=args.full)
         
         elif args.source in ['armytimes', 'navytimes', 'airforcetimes', 'marinecorpstimes']:
             scraper.scrape_military_times(args.source, start_date, end_date)
@@ -587,6 +744,7 @@ def main():
         )
     
     finally:
+        scraper.sink.close()
         scraper.print_stats()
 
 
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Batched Military News Writer
+Buffers military_news_articles and military_contract_awards rows and writes
+them to Supabase in batches, instead of a SELECT plus a single-row INSERT
+per record.
+
+- Articles are upserted with on_conflict=article_url (existing rows are left
+  untouched by default), so no existence check is needed first
+- Contracts without an article_id get it from one bulk article_url lookup
+  per batch, after the batch's articles have been written
+- raw_html can be left out of article rows when the page is kept in the
+  HTML archive instead (html_archive.py)
+- flush() returns the article_urls whose rows could not be written since
+  the previous flush() (automatic flushes included), so callers only record
+  the rest as saved
+- close() (also run at interpreter exit) flushes whatever is buffered, so
+  scrapers call it from their finally / KeyboardInterrupt handlers
+"""
+
+import atexit
+import threading
+from typing import Dict, List, Set
+
+ARTICLES_TABLE = 'military_news_articles'
+CONTRACTS_TABLE = 'military_contract_awards'
+LOOKUP_CHUNK = 50  # article_url values per in_() filter, keeps the query string short
+
+
+def _uniform(rows: List[Dict]) -> List[Dict]:
+    """PostgREST bulk writes need every object to carry the same keys"""
+    columns = []
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+    return [{column: row.get(column) for column in columns} for row in rows]
+
+
+class MilitaryNewsSink:
+    """Thread-safe buffered writer for news articles and contract awards"""
+
+    def __init__(self, supabase, batch_size: int = 100, update_existing: bool = False,
+                 raw_html: bool = True):
+        """
+        Args:
+            supabase: Supabase client (None: rows are dropped)
+            batch_size: Rows buffered per table before a flush
+            update_existing: Overwrite articles whose article_url already
+                             exists instead of skipping them
+            raw_html: Keep the raw_html column in article rows
+        """
+        self.supabase = supabase
+        self.batch_size = batch_size
+        self.update_existing = update_existing
+        self.raw_html = raw_html
+
+        self._articles: Dict[str, Dict] = {}
+        self._contracts: List[Dict] = []
+        self._failed_urls: Set[str] = set()
+        self._lock = threading.RLock()
+        self._closed = False
+
+        self.stats = {
+            'articles_new': 0,
+            'articles_existing': 0,
+            'articles_failed': 0,
+            'contracts_saved': 0,
+            'contracts_failed': 0,
+        }
+        atexit.register(self.close)
+
+    def add_article(self, row: Dict) -> bool:
+        """Queue an article row (military_news_articles columns); False if it can't be written"""
+        if not self.supabase or not row.get('article_url'):
+            return False
+        if not self.raw_html and 'raw_html' in row:
+            row = {key: value for key, value in row.items() if key != 'raw_html'}
+        with self._lock:
+            # Last write for a URL wins within a batch
+            self._articles[row['article_url']] = row
+            if len(self._articles) >= self.batch_size:
+                self._write_buffered()
+        return True
+
+    def add_contract(self, row: Dict) -> bool:
+        """Queue a contract row; article_id is resolved from article_url when missing"""
+        if not self.supabase:
+            return False
+        with self._lock:
+            self._contracts.append(row)
+            if len(self._contracts) >= self.batch_size:
+                self._write_buffered()
+        return True
+
+    def flush(self) -> Set[str]:
+        """
+        Write buffered articles, then buffered contracts
+
+        Returns:
+            article_urls of the article rows that failed to write since the
+            last flush() call, including rows from automatic flushes
+        """
+        with self._lock:
+            self._write_buffered()
+            failed, self._failed_urls = self._failed_urls, set()
+            return failed
+
+    def _write_buffered(self):
+        with self._lock:
+            articles = list(self._articles.values())
+            contracts = self._contracts
+            self._articles = {}
+            self._contracts = []
+
+            if articles:
+                self._write_articles(articles)
+            if contracts:
+                self._write_contracts(contracts)
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self.flush()
+            self._closed = True
+        atexit.unregister(self.close)
+
+    # ---- Articles ----
+
+    def _upsert_articles(self, rows: List[Dict]) -> int:
+        result = self.supabase.table(ARTICLES_TABLE).upsert(
+            _uniform(rows), on_conflict='article_url', ignore_duplicates=not self.update_existing
+        ).execute()
+        return len(result.data or [])
+
+    def _write_articles(self, rows: List[Dict]):
+        try:
+            written = self._upsert_articles(rows)
+            self.stats['articles_new'] += written
+            if not self.update_existing:
+                self.stats['articles_existing'] += len(rows) - written
+            return
+        except Exception as e:
+            print(f"    ⚠️  Article batch of {len(rows)} failed ({str(e)[:60]}), retrying one by one")
+
+        # One bad row shouldn't lose the whole batch
+        for row in rows:
+            try:
+                written = self._upsert_articles([row])
+                self.stats['articles_new'] += written
+                if not self.update_existing:
+                    self.stats['articles_existing'] += 1 - written
+            except Exception as e:
+                print(f"    ⚠️  Article failed: {row.get('article_url', '')[:60]}: {str(e)[:60]}")
+                self.stats['articles_failed'] += 1
+                self._failed_urls.add(row['article_url'])
+
+    # ---- Contracts ----
+
+    def _article_ids(self, urls: List[str]) -> Dict[str, int]:
+        ids = {}
+        for i in range(0, len(urls), LOOKUP_CHUNK):
+            result = self.supabase.table(ARTICLES_TABLE)\
+                .select('id, article_url')\
+                .in_('article_url', urls[i:i + LOOKUP_CHUNK])\
+                .execute()
+            for row in result.data or []:
+                ids[row['article_url']] = row['id']
+        return ids
+
+    def _write_contracts(self, rows: List[Dict]):
+        missing = sorted({row['article_url'] for row in rows
+                          if not row.get('article_id') and row.get('article_url')})
+        if missing:
+            try:
+                ids = self._article_ids(missing)
+            except Exception as e:
+                print(f"    ⚠️  Article id lookup failed: {str(e)[:60]}")
+                ids = {}
+            for row in rows:
+                if not row.get('article_id') and row.get('article_url') in ids:
+                    row['article_id'] = ids[row['article_url']]
+
+        try:
+            self.supabase.table(CONTRACTS_TABLE).insert(_uniform(rows)).execute()
+            self.stats['contracts_saved'] += len(rows)
+            return
+        except Exception as e:
+            print(f"    ⚠️  Contract batch of {len(rows)} failed ({str(e)[:60]}), retrying one by one")
+
+        for row in rows:
+            try:
+                self.supabase.table(CONTRACTS_TABLE).insert(row).execute()
+                self.stats['contracts_saved'] += 1
+            except Exception as e:
+                print(f"    ⚠️  Contract failed: {row.get('vendor_name')}: {str(e)[:60]}")
+                self.stats['contracts_failed'] += 1
+
+    def print_stats(self):
+        print(f"💾 Database: {self.stats['articles_new']:,} articles new, "
+              f"{self.stats['articles_existing']:,} existing, {self.stats['articles_failed']:,} failed; "
+              f"{self.stats['contracts_saved']:,} contracts saved, {self.stats['contracts_failed']:,} failed")
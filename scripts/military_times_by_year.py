@@ -25,6 +25,12 @@ except ImportError as e:
     print(f"Missing dependency: {e}")
     sys.exit(1)
 
+from article_fetcher import TieredFetcher
+from crawl_frontier import CrawlFrontier, FAILED, PARSED, SAVED
+from html_archive import open_archive
+from military_news_sink import MilitaryNewsSink
+from seen_urls import SeenURLIndex
+
 class MilitaryTimesByYearScraper:
     def __init__(self):
         self.supabase = None
@@ -36,6 +42,13 @@ class MilitaryTimesByYearScraper:
             self.supabase = create_client(supabase_url, supabase_key)
             print("✅ Connected to Supabase")
         
+        self.seen_urls = SeenURLIndex(self.supabase).load()
+        # Raw pages go to the archive rather than the raw_html column
+        self.archive = open_archive()
+        self.sink = MilitaryNewsSink(self.supabase, raw_html=self.archive is None)
+        self.frontier = CrawlFrontier()
+        self.fetcher = TieredFetcher(self.fetch_with_browser, archive=self.archive)
+        
         self.stats = {'total': 0, 'new': 0, 'existing': 0, 'errors': 0}
         self.start_time = datetime.now()
     
@@ -60,22 +73,23 @@ class MilitaryTimesByYearScraper:
         except:
             pass
     
+    def fetch_with_browser(self, url):
+        """Browser tier for the article fetcher"""
+        self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
+        time.sleep(2)
+        return self.page.content()
+    
     def article_exists(self, url):
-        if not self.supabase:
-            return False
-        try:
-            result = self.supabase.table('military_news_articles').select('id').eq('article_url', url).execute()
-            return bool(result.data)
-        except:
-            return False
+        return url in self.seen_urls
     
     def extract_article(self, url, outlet):
         """Extract Military Times article"""
         try:
-            self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
-            time.sleep(2)
+            html = self.fetcher.fetch(url, outlet, 'military_times')
+            if not html:
+                return None
             
-            soup = BeautifulSoup(self.page.content(), 'html.parser')
+            soup = BeautifulSoup(html, 'html.parser')
             
             service_map = {
                 'armytimes': 'army',
@@ -141,7 +155,7 @@ class MilitaryTimesByYearScraper:
             if not article.get('content'):
                 article['content'] = 'Content not extracted'
             
-            self.supabase.table('military_news_articles').insert({
+            self.sink.add_article({
                 'source': article.get('source'),
                 'source_category': article.get('source_category'),
                 'article_url': article.get('article_url'),
@@ -154,11 +168,43 @@ class MilitaryTimesByYearScraper:
                 'primary_service_branch': article.get('primary_service_branch'),
                 'image_urls': article.get('image_urls'),
                 'scraped_at': article.get('scraped_at'),
-            }).execute()
+            })
+            self.seen_urls.add(article.get('article_url'))
             return True
         except Exception as e:
             return False
     
+    def process_urls(self, urls, outlet, year_stats):
+        """Extract and save article URLs, recording each one's progress in the crawl frontier"""
+        self.frontier.add_urls(outlet, urls)
+        
+        saved = []
+        for url in urls:
+            if self.article_exists(url):
+                year_stats['existing'] += 1
+                saved.append(url)
+                continue
+            # Another process may already be working on it
+            if not self.frontier.claim([url]):
+                continue
+            
+            article = self.extract_article(url, outlet)
+            if article:
+                self.frontier.mark(url, PARSED)
+            if article and self.save_article(article):
+                year_stats['new'] += 1
+                saved.append(url)
+            else:
+                self.frontier.mark(url, FAILED, 'not saved' if article else 'not extracted')
+                year_stats['errors'] += 1
+            
+            time.sleep(1.5)
+        
+        # Only count as saved once the buffered rows are written
+        failed = self.sink.flush()
+        self.frontier.mark_many([url for url in saved if url not in failed], SAVED)
+        self.frontier.mark_many([url for url in saved if url in failed], FAILED, 'not written')
+    
     def scrape_outlet_year(self, outlet, year):
         """Scrape one outlet for one year"""
         
@@ -180,9 +226,15 @@ class MilitaryTimesByYearScraper:
         
         year_stats = {'new': 0, 'existing': 0, 'errors': 0}
         
+        # Months already walked are skipped unless they are still in progress
+        walked = self.frontier.listing_pages(outlet, year)
+        today = datetime.now()
+        
         # Try searching by year in their search/archive
         # Most Military Times sites have a search function
         for month in range(1, 13):
+            if month in walked and (year, month) < (today.year, today.month):
+                continue
             try:
                 # Search URL format (may need adjustment based on actual site)
                 search_url = f"{base_url}/search/?q=*&d1={year}-{month:02d}-01&d2={year}-{month:02d}-28"
@@ -199,23 +251,16 @@ class MilitaryTimesByYearScraper:
                 
                 if not article_links:
                     print("(no articles)")
+                    self.frontier.mark_listing(outlet, year, month, 0)
                     continue
                 
                 urls = list(set([link['href'] if link['href'].startswith('http') else f"{base_url}{link['href']}" for link in article_links]))
                 print(f"- {len(urls)} articles")
                 
-                for url in urls:
-                    if self.article_exists(url):
-                        year_stats['existing'] += 1
-                        continue
-                    
-                    article = self.extract_article(url, outlet)
-                    if article and self.save_article(article):
-                        year_stats['new'] += 1
-                    else:
-                        year_stats['errors'] += 1
-                    
-                    time.sleep(1.5)
+                self.process_urls(urls, outlet, year_stats)
+                
+                # The month counts as covered once its articles are written
+                self.frontier.mark_listing(outlet, year, month, len(urls))
                 
             except Exception as e:
                 print(f"❌ Error: {str(e)[:50]}")
@@ -241,6 +286,16 @@ class MilitaryTimesByYearScraper:
         print(f"Outlets: {len(outlets)}")
         print(f"{'='*70}\n")
         
+        # Finish articles a previous run discovered but did not save
+        for outlet in outlets:
+            pending = self.frontier.pending(outlet)
+            if pending:
+                print(f"📍 Resuming {len(pending)} {outlet} articles discovered but not saved last run")
+                resume_stats = {'new': 0, 'existing': 0, 'errors': 0}
+                self.process_urls(pending, outlet, resume_stats)
+                self.stats['new'] += resume_stats['new']
+                self.stats['errors'] += resume_stats['errors']
+        
         for year in range(start_year, end_year + 1):
             # Restart browser every year to prevent memory leaks
             if year > start_year:
@@ -286,6 +341,11 @@ def main():
         scraper.scrape_all(args.start_year, args.end_year)
     finally:
         scraper.stop_browser()
+        scraper.sink.close()
+        scraper.sink.print_stats()
+        scraper.fetcher.print_stats()
+        scraper.frontier.release()
+        scraper.frontier.print_stats()
 
 if __name__ == '__main__':
     main()
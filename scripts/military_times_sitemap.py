@@ -16,21 +16,27 @@ import sys
 import time
 import re
 from datetime import datetime
+from itertools import chain, islice
 from pathlib import Path
-import xml.etree.ElementTree as ET
 
 try:
     from playwright.sync_api import sync_playwright
     from bs4 import BeautifulSoup
     from supabase import create_client
-    import requests
 except ImportError as e:
     print(f"Missing dependency: {e}")
     print("Install: pip install requests")
     sys.exit(1)
 
+from article_fetcher import TieredFetcher
+from crawl_frontier import CrawlFrontier, FAILED, PARSED, SAVED
+from html_archive import open_archive
+from military_news_sink import MilitaryNewsSink
+from seen_urls import SeenURLIndex
+from sitemap_harvester import SitemapHarvester
+
 class MilitaryTimesSitemapScraper:
-    def __init__(self):
+    def __init__(self, full=False):
         self.supabase = None
         
         supabase_url = os.getenv('SUPABASE_URL')
@@ -40,6 +46,16 @@ class MilitaryTimesSitemapScraper:
             self.supabase = create_client(supabase_url, supabase_key)
             print("✅ Connected to Supabase")
         
+        self.seen_urls = SeenURLIndex(self.supabase).load()
+        # Raw pages go to the archive rather than the raw_html column
+        self.archive = open_archive()
+        self.sink = MilitaryNewsSink(self.supabase, raw_html=self.archive is None)
+        self.fetcher = TieredFetcher(self.fetch_with_browser, archive=self.archive)
+        self.harvester = SitemapHarvester(session=self.fetcher.session)
+        # A child sitemap is skipped once harvested, so URLs that fail are retried from here
+        self.frontier = CrawlFrontier()
+        self.full = full
+        
         self.stats = {'total': 0, 'new': 0, 'existing': 0, 'errors': 0}
         self.start_time = datetime.now()
     
@@ -65,7 +81,7 @@ class MilitaryTimesSitemapScraper:
             pass
     
     def get_sitemap_urls(self, outlet):
-        """Get article URLs from sitemap"""
+        """Lazily yield new article URLs from the outlet's sitemaps"""
         
         base_urls = {
             'armytimes': 'https://www.armytimes.com',
@@ -80,8 +96,6 @@ class MilitaryTimesSitemapScraper:
         print(f"📰 {outlet.upper()} - Finding Articles via Sitemap")
         print(f"{'='*70}\n")
         
-        article_urls = []
-        
         # Try common sitemap locations
         sitemap_urls = [
             f"{base_url}/sitemap.xml",
@@ -90,125 +104,85 @@ class MilitaryTimesSitemapScraper:
             f"{base_url}/arc/outboundfeeds/sitemap/",
         ]
         
-        for sitemap_url in sitemap_urls:
-            try:
-                print(f"🔍 Checking: {sitemap_url}")
-                response = requests.get(sitemap_url, timeout=10)
-                
-                if response.status_code == 200:
-                    print(f"   ✅ Found sitemap!")
-                    
-                    # Parse XML
-                    root = ET.fromstring(response.content)
-                    
-                    # Handle sitemap index (points to other sitemaps)
-                    namespace = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-                    
-                    # Check if it's a sitemap index
-                    sitemaps = root.findall('.//ns:sitemap/ns:loc', namespace)
-                    if sitemaps:
-                        print(f"   📋 Found sitemap index with {len(sitemaps)} sitemaps")
-                        print(f"   🔄 Loading all sitemaps to get complete history...")
-                        for idx, sitemap_loc in enumerate(sitemaps, 1):  # Load ALL sitemaps
-                            try:
-                                print(f"      [{idx}/{len(sitemaps)}] {sitemap_loc.text[-50:]}")
-                                sub_response = requests.get(sitemap_loc.text, timeout=10)
-                                if sub_response.status_code == 200:
-                                    sub_root = ET.fromstring(sub_response.content)
-                                    urls = sub_root.findall('.//ns:url/ns:loc', namespace)
-                                    news_urls = [url.text for url in urls if '/news/' in url.text]
-                                    article_urls.extend(news_urls)
-                                    print(f"         ✅ {len(news_urls)} articles")
-                                time.sleep(0.5)  # Be nice to their server
-                            except Exception as e:
-                                print(f"         ⚠️  Error: {str(e)[:40]}")
-                                continue
-                    else:
-                        # Direct sitemap with URLs
-                        urls = root.findall('.//ns:url/ns:loc', namespace)
-                        news_urls = [url.text for url in urls if '/news/' in url.text]
-                        article_urls.extend(news_urls)
-                        print(f"   📄 Found {len(news_urls)} news articles")
-                    
-                    break  # Found a working sitemap
-                    
-            except Exception as e:
-                print(f"   ⚠️  Not found or error: {str(e)[:40]}")
-                continue
-        
-        print(f"\n✅ Total article URLs found: {len(article_urls)}")
-        return list(set(article_urls))  # Remove duplicates
+        # Only child sitemaps changed since the last run are read
+        return self.harvester.iter_urls(sitemap_urls, url_filter=lambda url: '/news/' in url, full=self.full)
+    
+    def fetch_with_browser(self, url):
+        """Browser tier for the article fetcher"""
+        self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
+        time.sleep(2)
+        return self.page.content()
     
     def article_exists(self, url):
-        if not self.supabase:
-            return False
-        try:
-            result = self.supabase.table('military_news_articles').select('id').eq('article_url', url).execute()
-            return bool(result.data)
-        except:
-            return False
+        return url in self.seen_urls
     
     def extract_article(self, url, outlet):
         """Extract Military Times article"""
         try:
-            self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
-            time.sleep(2)
-            
-            soup = BeautifulSoup(self.page.content(), 'html.parser')
-            
-            service_map = {
-                'armytimes': 'army',
-                'navytimes': 'navy',
-                'airforcetimes': 'air_force',
-                'marinecorpstimes': 'marine_corps',
-            }
-            
-            article = {
-                'source': outlet,
-                'source_category': 'military_times',
-                'article_url': url,
-                'service_branches': [service_map.get(outlet, 'unknown')],
-                'primary_service_branch': service_map.get(outlet),
-                'scraped_at': datetime.now().isoformat(),
-            }
-            
-            # Title
-            title = soup.find('h1')
-            if title:
-                article['title'] = title.get_text(strip=True)
-            
-            # Content
-            content_div = soup.find('div', class_=['article-content', 'entry-content']) or soup.find('article')
-            if content_div:
-                paragraphs = content_div.find_all('p')
-                if paragraphs:
-                    text_parts = [p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)]
-                    article['content'] = '\n\n'.join(text_parts)
-                    article['raw_html'] = str(content_div)
+            html = self.fetcher.fetch(url, outlet, 'military_times')
+            if not html:
+                return None
             
-            # Date
-            date_elem = soup.find('time')
-            if date_elem:
-                date_str = date_elem.get('datetime')
-                if date_str:
-                    article['published_date'] = date_str
-            
-            # Author
-            author = soup.find('span', class_='author-name') or soup.find('a', class_='author')
-            if author:
-                article['author'] = author.get_text(strip=True).replace('By ', '')
-            
-            # Images
-            images = soup.find_all('img', src=True)
-            if images:
-                img_urls = [img['src'] for img in images if 'http' in img['src'] and 'logo' not in img['src'].lower()][:5]
-                if img_urls:
-                    article['image_urls'] = img_urls
-            
-            return article
+            return self.parse_article(url, html, outlet)
         except Exception as e:
             return None
     
+    @staticmethod
+    def parse_article(url, html, outlet):
+        """Parse a Military Times article page (also used to re-parse archived pages)"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        service_map = {
+            'armytimes': 'army',
+            'navytimes': 'navy',
+            'airforcetimes': 'air_force',
+            'marinecorpstimes': 'marine_corps',
+        }
+        
+        article = {
+            'source': outlet,
+            'source_category': 'military_times',
+            'article_url': url,
+            'service_branches': [service_map.get(outlet, 'unknown')],
+            'primary_service_branch': service_map.get(outlet),
+            'scraped_at': datetime.now().isoformat(),
+        }
+        
+        # Title
+        title = soup.find('h1')
+        if title:
+            article['title'] = title.get_text(strip=True)
+        
+        # Content
+        content_div = soup.find('div', class_=['article-content', 'entry-content']) or soup.find('article')
+        if content_div:
+            paragraphs = content_div.find_all('p')
+            if paragraphs:
+                text_parts = [p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)]
+                article['content'] = '\n\n'.join(text_parts)
+                article['raw_html'] = str(content_div)
+        
+        # Date
+        date_elem = soup.find('time')
+        if date_elem:
+            date_str = date_elem.get('datetime')
+            if date_str:
+                article['published_date'] = date_str
+        
+        # Author
+        author = soup.find('span', class_='author-name') or soup.find('a', class_='author')
+        if author:
+            article['author'] = author.get_text(strip=True).replace('By ', '')
+        
+        # Images
+        images = soup.find_all('img', src=True)
+        if images:
+            img_urls = [img['src'] for img in images if 'http' in img['src'] and 'logo' not in img['src'].lower()][:5]
+            if img_urls:
+                article['image_urls'] = img_urls
+        
+        return article
+    
     def save_article(self, article):
         if not self.supabase:
             return False
@@ -220,7 +194,7 @@ class MilitaryTimesSitemapScraper:
             if not article.get('content'):
                 article['content'] = 'Content not extracted'
             
-            self.supabase.table('military_news_articles').insert({
+            self.sink.add_article({
                 'source': article.get('source'),
                 'source_category': article.get('source_category'),
                 'article_url': article.get('article_url'),
@@ -233,28 +207,40 @@ class MilitaryTimesSitemapScraper:
                 'primary_service_branch': article.get('primary_service_branch'),
                 'image_urls': article.get('image_urls'),
                 'scraped_at': article.get('scraped_at'),
-            }).execute()
+            })
+            self.seen_urls.add(article.get('article_url'))
             return True
         except Exception as e:
             return False
     
+    def record_saved(self, saved):
+        """Mark URLs saved in the frontier once the sink has written them"""
+        failed = self.sink.flush()
+        self.frontier.mark_many([url for url in saved if url not in failed], SAVED)
+        self.frontier.mark_many([url for url in saved if url in failed], FAILED, 'not written')
+    
     def scrape_outlet(self, outlet, max_articles=None):
         """Scrape one outlet using sitemap"""
         
-        # Get all article URLs from sitemap
-        article_urls = self.get_sitemap_urls(outlet)
+        # Articles earlier runs found but did not save come first; their
+        # child sitemaps were already harvested and will not list them again
+        pending = self.frontier.pending(outlet)
+        if pending:
+            print(f"📍 Retrying {len(pending)} articles not saved by earlier runs")
         
-        if not article_urls:
-            print(f"\n⚠️  No articles found in sitemap for {outlet}")
-            return
+        # Article URLs arrive as each child sitemap is harvested
+        retrying = set(pending)
+        article_urls = chain(pending, (url for url in self.get_sitemap_urls(outlet) if url not in retrying))
         
         # Limit if specified
         if max_articles:
-            article_urls = article_urls[:max_articles]
+            article_urls = islice(article_urls, max_articles)
             print(f"\n📊 Limiting to {max_articles} articles")
         
-        print(f"\n🔍 Starting to scrape {len(article_urls)} articles...\n")
+        print(f"\n🔍 Scraping articles as sitemaps are read...\n")
         
+        i = 0
+        saved = []
         for i, url in enumerate(article_urls, 1):
             try:
                 # Restart browser every 100 articles
@@ -265,27 +251,42 @@ class MilitaryTimesSitemapScraper:
                     self.start_browser()
                 
                 if self.article_exists(url):
-                    print(f"[{i}/{len(article_urls)}] ⏭️  Exists")
+                    print(f"[{i}] ⏭️  Exists")
                     self.stats['existing'] += 1
+                    if url in retrying:
+                        # Saved some other way since it failed here
+                        saved.append(url)
+                    continue
+                
+                # Recorded before the harvester moves past its child sitemap
+                self.frontier.add_urls(outlet, [url])
+                # Another process may already be working on it
+                if not self.frontier.claim([url]):
                     continue
                 
-                print(f"[{i}/{len(article_urls)}] 🔍 {url[:70]}...")
+                print(f"[{i}] 🔍 {url[:70]}...")
                 article = self.extract_article(url, outlet)
+                if article:
+                    self.frontier.mark(url, PARSED)
                 
                 if article and self.save_article(article):
                     print(f"   ✅ Saved")
                     self.stats['new'] += 1
+                    saved.append(url)
                 else:
+                    self.frontier.mark(url, FAILED, 'not saved' if article else 'not extracted')
                     self.stats['errors'] += 1
                 
                 self.stats['total'] += 1
                 time.sleep(1.5)
                 
-                # Progress report every 50 articles
+                # Progress report (and saved articles recorded) every 50 articles
                 if i % 50 == 0:
+                    self.record_saved(saved)
+                    saved = []
                     elapsed = (datetime.now() - self.start_time).total_seconds() / 60
                     print(f"\n{'='*70}")
-                    print(f"📊 Progress: {i}/{len(article_urls)} | New: {self.stats['new']} | Time: {elapsed:.1f}m")
+                    print(f"📊 Progress: {i} | New: {self.stats['new']} | Time: {elapsed:.1f}m")
                     print(f"{'='*70}\n")
                 
             except KeyboardInterrupt:
@@ -293,9 +294,15 @@ class MilitaryTimesSitemapScraper:
                 raise
             except Exception as e:
                 print(f"   ❌ Error: {str(e)[:50]}")
+                self.frontier.mark(url, FAILED, str(e)[:200])
                 self.stats['errors'] += 1
                 continue
         
+        self.record_saved(saved)
+        if not i:
+            print(f"\n⚠️  No new articles found in sitemap for {outlet}")
+        self.harvester.print_stats()
+        
         elapsed = (datetime.now() - self.start_time).total_seconds() / 60
         print(f"\n{'='*70}")
         print(f"✅ {outlet.upper()} COMPLETE")
@@ -312,10 +319,11 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--source', choices=['armytimes', 'navytimes', 'airforcetimes', 'marinecorpstimes', 'all'], default='all')
     parser.add_argument('--max-articles', type=int, default=None, help='Max articles per outlet (for testing)')
+    parser.add_argument('--full', action='store_true', help='Re-read every child sitemap, ignoring saved lastmod/ETag state')
     
     args = parser.parse_args()
     
-    scraper = MilitaryTimesSitemapScraper()
+    scraper = MilitaryTimesSitemapScraper(full=args.full)
     
     try:
         scraper.start_browser()
@@ -327,6 +335,12 @@ def main():
         
     finally:
         scraper.stop_browser()
+        scraper.sink.close()
+        scraper.sink.print_stats()
+        scraper.fetcher.print_stats()
+        # Unfinished claims go back to the frontier for the next run
+        scraper.frontier.release()
+        scraper.frontier.print_stats()
 
 if __name__ == '__main__':
     main()
@@ -11,14 +11,17 @@ Features:
 - Timeout handling
 - Retry logic
 - Progress tracking
+- Safe to share between download threads (pooled session, atomic cache writes)
 
 Phase 1 of PDF Parser Implementation
 ============================================
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import os
 import sys
+import threading
 from pathlib import Path
 from typing import Optional
 import hashlib
@@ -27,17 +30,24 @@ import time
 class PDFDownloader:
     """Download and cache PDF files"""
     
-    def __init__(self, cache_dir: str = './pdf_cache'):
+    def __init__(self, cache_dir: str = './pdf_cache', pool_size: int = 10):
         """
         Initialize downloader with cache directory
         
         Args:
             cache_dir: Directory to store downloaded PDFs
+            pool_size: Connections kept open (at least the number of download threads)
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         # Stats
+        self._stats_lock = threading.Lock()
         self.downloaded = 0
         self.cached = 0
         self.failed = 0
@@ -64,7 +74,8 @@ class PDFDownloader:
         if cache_path.exists():
             file_size = cache_path.stat().st_size
             if file_size > 0:  # Valid file
-                self.cached += 1
+                with self._stats_lock:
+                    self.cached += 1
                 print(f"  📄 Cached: {filename} ({file_size:,} bytes)", file=sys.stderr)
                 return cache_path
         
@@ -73,7 +84,7 @@ class PDFDownloader:
             try:
                 print(f"  ⬇️  Downloading: {filename} (attempt {attempt + 1}/{retry})", file=sys.stderr)
                 
-                response = requests.get(
+                response = self.session.get(
                     url,
                     timeout=30,
                     headers={
@@ -87,14 +98,17 @@ class PDFDownloader:
                 if 'pdf' not in content_type.lower() and not url.endswith('.pdf'):
                     print(f"  ⚠️  Warning: Not a PDF? Content-Type: {content_type}", file=sys.stderr)
                 
-                # Write to cache
-                with open(cache_path, 'wb') as f:
+                # Write to cache; readers never see a partial file
+                tmp_path = cache_path.with_name(f"{filename}.{threading.get_ident()}.tmp")
+                with open(tmp_path, 'wb') as f:
                     f.write(response.content)
+                os.replace(tmp_path, cache_path)
                 
                 file_size = len(response.content)
                 print(f"  ✅ Downloaded: {filename} ({file_size:,} bytes)", file=sys.stderr)
                 
-                self.downloaded += 1
+                with self._stats_lock:
+                    self.downloaded += 1
                 return cache_path
                 
             except requests.exceptions.Timeout:
@@ -112,7 +126,8 @@ class PDFDownloader:
                 break
         
         # All retries failed
-        self.failed += 1
+        with self._stats_lock:
+            self.failed += 1
         print(f"  ❌ Failed to download: {filename}", file=sys.stderr)
         return None
     
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+PDF Page Text Extraction
+Extracts text page by page with pdfplumber across worker processes, and
+caches each page's text keyed by the PDF's SHA-256 and page number.
+
+The cache lets a parser be re-tuned and re-run without re-extracting: only
+pages missing from the cache are extracted, in contiguous page ranges, one
+range per task.
+
+Cache layout: <cache_dir>/<sha256>/page_00001.txt (plus page_count)
+"""
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGES_PER_TASK = 20
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _page_file(cache_dir: Path, pdf_hash: str, page_number: int) -> Path:
+    return cache_dir / pdf_hash / f"page_{page_number:05d}.txt"
+
+
+def _extract_page_range(pdf_path: str, page_numbers: List[int]) -> List[Tuple[int, str]]:
+    """Worker: extract text for 1-based page numbers from one PDF"""
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        return [(n, pdf.pages[n - 1].extract_text() or '') for n in page_numbers]
+
+
+def _chunks(items: List[int], size: int) -> List[List[int]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def extract_pages(pdf_path: Path, cache_dir: Optional[Path] = None, workers: Optional[int] = None,
+                  pages_per_task: int = DEFAULT_PAGES_PER_TASK) -> List[str]:
+    """
+    Return the text of every page of a PDF, in page order
+
+    Args:
+        pdf_path: PDF to read
+        cache_dir: Page text cache directory (no caching if None)
+        workers: Worker processes (default: CPU count); ranges run in this
+                 process when there is only one
+        pages_per_task: Pages extracted per worker task
+    """
+    import pdfplumber
+
+    pdf_path = Path(pdf_path)
+    pdf_hash = None
+    page_count = None
+
+    if cache_dir is not None:
+        cache_dir = Path(cache_dir)
+        pdf_hash = file_sha256(pdf_path)
+        count_file = cache_dir / pdf_hash / "page_count"
+        if count_file.exists():
+            page_count = int(count_file.read_text())
+
+    if page_count is None:
+        with pdfplumber.open(pdf_path) as pdf:
+            page_count = len(pdf.pages)
+        if pdf_hash:
+            count_file.parent.mkdir(parents=True, exist_ok=True)
+            count_file.write_text(str(page_count))
+
+    texts: List[Optional[str]] = [None] * page_count
+
+    if pdf_hash:
+        for n in range(1, page_count + 1):
+            page_file = _page_file(cache_dir, pdf_hash, n)
+            if page_file.exists():
+                texts[n - 1] = page_file.read_text(encoding='utf-8')
+
+    missing = [n for n in range(1, page_count + 1) if texts[n - 1] is None]
+    logger.info(f"{pdf_path.name}: {page_count} pages, {page_count - len(missing)} cached, "
+                f"{len(missing)} to extract")
+
+    if missing:
+        tasks = _chunks(missing, pages_per_task)
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(_extract_page_range, [str(pdf_path)] * len(tasks), tasks)
+                extracted = [page for result in results for page in result]
+        else:
+            # Single worker: open the PDF once for every missing page
+            extracted = _extract_page_range(str(pdf_path), missing)
+
+        for n, text in extracted:
+            texts[n - 1] = text
+            if pdf_hash:
+                page_file = _page_file(cache_dir, pdf_hash, n)
+                page_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = page_file.with_suffix('.tmp')
+                tmp_file.write_text(text, encoding='utf-8')
+                os.replace(tmp_file, page_file)
+
+    return texts
@@ -7,28 +7,112 @@ PDF Table Parser
 Parses congressional PTR PDFs to extract stock trades.
 
 Features:
-- Table extraction using pdfplumber
+- Page triage on the text layer: scanned pages, cover pages and
+  certification pages are skipped before any table extraction
+- Streaming text-layer parser for the transaction lines of filed PTRs
+- Table extraction using pdfplumber for layouts the text parser cannot read
 - Multiple format support
 - Ticker extraction with regex
 - Date normalization
 - Transaction type normalization
+- Optional parse cache keyed by PDF content hash and parser version
 
 Phase 2 of PDF Parser Implementation
 ============================================
 """
 
 import pdfplumber
+from pdfminer.pdftypes import resolve1
 import re
 import sys
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
+from pdf_page_text import file_sha256
+
+# Page triage results
+NO_TEXT_LAYER = 'no_text_layer'        # Scanned image; nothing to extract without OCR
+NON_TRANSACTION_PAGE = 'non_transaction'  # Cover, certification, asset-class notes
+TRANSACTION_PAGE = 'transactions'      # Transaction lines readable from the text layer
+TABLE_PAGE = 'table'                   # Amounts but no readable lines: try tables
+
+# Fewer characters than this is a stamp or page number on a scan
+MIN_TEXT_CHARS = 20
+
+# "[SP|JT|DC] <asset start> <P|S|S (partial)|E> <trans date> <notified date> <amount>"
+TEXT_TRANSACTION_RE = re.compile(
+    r'^(?:(?:SP|JT|DC)\s+)?(?:(?P<asset>.*?)\s+)?'
+    r'(?P<type>[PSE](?:\s*\((?:partial|full)\))?)\s+'
+    r'(?P<date>\d{1,2}/\d{1,2}/\d{2,4})\s+\d{1,2}/\d{1,2}/\d{2,4}'
+    r'(?:\s+(?P<amount>.*?))?$',
+    re.IGNORECASE
+)
+# Cap. Gains > $200? checkbox glyphs at the end of transaction lines
+CHECKBOX_RE = re.compile(r'\s*gfedcb?$')
+# Upper bound of an amount range that wrapped onto a continuation line
+AMOUNT_TAIL_RE = re.compile(r'\s*(\$[\d,]+(?:\.\d{2})?)$')
+# Detail lines under each transaction ("FILING STATUS: New", "F S: New", "SUBHOLDING OF: ...")
+DETAIL_LABEL_RE = re.compile(r'^([A-Za-z][A-Za-z ]{0,30}?)\s*:')
+DETAIL_LABELS = {'filingstatus', 'subholdingof', 'description', 'comments', 'location',
+                 'fs', 'so', 'd', 'c', 'l'}
+# Column headings repeated at the top of every transactions page, and the
+# checkbox of a transaction carried over from the previous page
+PAGE_HEADER_RE = re.compile(r'^(?:ID Owner Asset|Type Date|\$200\?$|gfedcb?$)', re.IGNORECASE)
+# Amount-range text anywhere on a page
+AMOUNT_SIGNAL_RE = re.compile(r'\$\d{1,3},\d{3}\s*-')
+
+
+def clean_text(text: str) -> str:
+    """Drop null bytes and control characters (small caps come through as NULs in newer PTRs)"""
+    return ''.join(char for char in text if ord(char) >= 32 or char == '\n')
+
+
+def is_detail_label(line: str) -> bool:
+    """Whether a line is one of the labelled detail lines that follow a transaction"""
+    match = DETAIL_LABEL_RE.match(line)
+    return bool(match) and match.group(1).replace(' ', '').lower() in DETAIL_LABELS
+
+
+def classify_page_text(text: str) -> str:
+    """
+    Triage a page by its text layer
+    
+    Returns:
+        TRANSACTION_PAGE if any line reads as a transaction, TABLE_PAGE if the
+        page shows amount ranges but no readable transaction line, else
+        NON_TRANSACTION_PAGE
+    """
+    if any(TEXT_TRANSACTION_RE.match(line.strip()) for line in text.split('\n')):
+        return TRANSACTION_PAGE
+    if AMOUNT_SIGNAL_RE.search(text):
+        return TABLE_PAGE
+    return NON_TRANSACTION_PAGE
+
+
+def has_text_resources(page) -> bool:
+    """False when a page's only resources are images (a scan), decided without interpreting the page"""
+    resources = resolve1(page.page_obj.resources) or {}
+    if resources.get('Font'):
+        return True
+    # Text can sit in a form XObject with its own fonts
+    for xobject in (resolve1(resources.get('XObject')) or {}).values():
+        subtype = resolve1(xobject).get('Subtype')
+        if getattr(subtype, 'name', None) != 'Image':
+            return True
+    return False
+
+
 class PTRParser:
     """Parse Periodic Transaction Reports (PTRs)"""
     
+    # Bump whenever a change alters the trades parsed from a PDF; cached
+    # parses from other versions are discarded
+    VERSION = 2
+    
     # Regex patterns for ticker extraction
     TICKER_PATTERNS = [
+        r'\(([A-Za-z]{1,5})\)\s*\[[A-Z]{2}\]',     # (aBT) [ST]: asset-type code follows; some fonts lowercase A, G, L, U
         r'\(([A-Z]{1,5})\)',                    # (MSFT)
         r'\s-\s([A-Z]{1,5})\s',                 # - MSFT 
         r'\s-\s([A-Z]{1,5})$',                  # - MSFT at end
@@ -48,6 +132,9 @@ class PTRParser:
         r'[Oo]ver.*?\$5,000,000': 'Over $5,000,000',
     }
     
+    # Transaction type codes in the text layer
+    TEXT_TRANSACTION_TYPES = {'P': 'purchase', 'S': 'sale', 'E': 'exchange'}
+    
     # Transaction type mappings
     TRANSACTION_TYPES = {
         'purchase': ['purchase', 'buy', 'p', 'purchased'],
@@ -55,11 +142,22 @@ class PTRParser:
         'exchange': ['exchange', 'ex', 'exchanged'],
     }
     
-    def __init__(self):
-        """Initialize parser"""
+    def __init__(self, cache=None):
+        """
+        Initialize parser
+        
+        Args:
+            cache: Optional PTRParseCache; PDFs already parsed by this
+                   parser version are answered from it
+        """
+        self.cache = cache
         self.trades_found = 0
         self.errors = 0
         self.pages_parsed = 0
+        self.pages_skipped = 0
+        self.pages_without_text = 0
+        self.cache_hits = 0
+        self._open_transaction = None
     
     def parse_pdf(self, pdf_path: str) -> List[Dict]:
         """
@@ -78,16 +176,55 @@ class PTRParser:
             print(f"  ❌ PDF not found: {pdf_path}", file=sys.stderr)
             return trades
         
+        pdf_hash = None
+        if self.cache is not None:
+            pdf_hash = file_sha256(pdf_path)
+            cached = self.cache.get(pdf_hash, self.VERSION)
+            if cached is not None:
+                self.cache_hits += 1
+                self.trades_found = len(cached)
+                print(f"  📦 Cached parse: {pdf_path.name} ({len(cached)} trade(s))", file=sys.stderr)
+                return cached
+        
+        errors_before = self.errors
         try:
             print(f"  📖 Parsing PDF: {pdf_path.name}", file=sys.stderr)
             
             with pdfplumber.open(pdf_path) as pdf:
                 print(f"  📄 Pages: {len(pdf.pages)}", file=sys.stderr)
                 
+                # Transaction still open at a page break (its asset name or
+                # amount continues on the next page)
+                self._open_transaction = None
+                
                 for page_num, page in enumerate(pdf.pages, 1):
                     self.pages_parsed += 1
                     
-                    # Extract tables
+                    # Triage on the text layer before any table extraction
+                    page_type, text = self._classify_page(page)
+                    
+                    if page_type == TRANSACTION_PAGE:
+                        page_trades = self._parse_text(text, page_num)
+                        print(f"    Page {page_num}: {len(page_trades)} trade(s) from text layer", file=sys.stderr)
+                        trades.extend(page_trades)
+                        continue
+                    
+                    # The last transaction may end on this page
+                    if self._open_transaction and page_type == NON_TRANSACTION_PAGE:
+                        trades.extend(self._parse_text(text, page_num))
+                    trades.extend(self._close_text())
+                    
+                    if page_type == NO_TEXT_LAYER:
+                        self.pages_without_text += 1
+                        print(f"    Page {page_num}: No text layer (scanned), skipped", file=sys.stderr)
+                        continue
+                    
+                    if page_type == NON_TRANSACTION_PAGE:
+                        self.pages_skipped += 1
+                        print(f"    Page {page_num}: No transactions, skipped", file=sys.stderr)
+                        continue
+                    
+                    # Layouts the text parser cannot read: extract tables
                     tables = page.extract_tables()
                     
                     if tables:
@@ -98,13 +235,10 @@ class PTRParser:
                                 page_trades = self._parse_table(table, page_num, table_idx)
                                 trades.extend(page_trades)
                     
-                    # Fallback: try text extraction if no tables
                     if not tables:
-                        print(f"    Page {page_num}: No tables, trying text extraction", file=sys.stderr)
-                        text = page.extract_text()
-                        if text:
-                            page_trades = self._parse_text(text, page_num)
-                            trades.extend(page_trades)
+                        print(f"    Page {page_num}: No tables", file=sys.stderr)
+                
+                trades.extend(self._close_text())
             
             self.trades_found = len(trades)
             print(f"  ✅ Extracted {len(trades)} trade(s)", file=sys.stderr)
@@ -113,8 +247,24 @@ class PTRParser:
             print(f"  ❌ Error parsing PDF: {str(e)}", file=sys.stderr)
             self.errors += 1
         
+        # Only clean parses are cached, so a failed PDF is retried next run
+        if pdf_hash and self.errors == errors_before:
+            self.cache.put(pdf_hash, self.VERSION, trades)
+        
         return trades
     
+    def _classify_page(self, page) -> Tuple[str, str]:
+        """
+        Cheap page triage: (page type, cleaned text layer)
+        
+        Image-only pages are recognized from their resources; other pages
+        are checked for character density, then for transaction lines.
+        """
+        if not has_text_resources(page) or len(page.chars) < MIN_TEXT_CHARS:
+            return NO_TEXT_LAYER, ''
+        text = clean_text(page.extract_text() or '')
+        return classify_page_text(text), text
+    
     def _parse_table(self, table: List[List[str]], page_num: int, table_idx: int) -> List[Dict]:
         """
         Parse structured table data
@@ -185,6 +335,10 @@ class PTRParser:
             if not asset or len(asset) < 3 or asset.lower() in ['none', 'n/a', 'na']:
                 return None
             
+            # Filing status / subholding lines under a transaction are not trades
+            if is_detail_label(asset):
+                return None
+            
             # Extract ticker
             ticker = self._extract_ticker(asset)
             
@@ -243,10 +397,20 @@ class PTRParser:
         
         text_lower = text.lower().strip()
         
+        # Whole-value matches first, so the 'p' code cannot match inside "s (partial)"
+        for normalized, variations in self.TRANSACTION_TYPES.items():
+            if text_lower in variations:
+                return normalized
+        
         for normalized, variations in self.TRANSACTION_TYPES.items():
-            if any(var in text_lower for var in variations):
+            if any(len(var) > 2 and var in text_lower for var in variations):
                 return normalized
         
+        # Code with a qualifier: "S (partial)"
+        code = re.match(r'([pse])\b', text_lower)
+        if code:
+            return self.TEXT_TRANSACTION_TYPES[code.group(1).upper()]
+        
         return 'unknown'
     
     def _normalize_amount(self, text: str) -> str:
@@ -317,21 +481,136 @@ class PTRParser:
     
     def _parse_text(self, text: str, page_num: int) -> List[Dict]:
         """
-        Fallback: parse unstructured text
+        Parse the transaction lines of a page's text layer
         
-        This is for PDFs that don't have proper tables.
-        Uses pattern matching to find trades in free text.
+        Args:
+            text: Cleaned page text (see clean_text)
+            page_num: Page number
+            
+        Returns:
+            List of parsed trades
+        """
+        return list(self._iter_text_trades(text.split('\n'), page_num))
+    
+    def _iter_text_trades(self, lines: List[str], page_num: int):
         """
-        # TODO: Implement text-based parsing
-        # For now, return empty list
-        return []
+        Stream trades out of text-layer lines, one per transaction line
+        
+        A transaction line holds the start of the asset name, type, dates and
+        amount. The asset continues on the following lines (where a wrapped
+        amount range also ends) until a detail line such as FILING STATUS,
+        the next transaction, or a footnote. Each trade is yielded as soon
+        as its transaction ends; the page's last transaction stays open in
+        self._open_transaction, since it may continue on the next page.
+        """
+        for line_num, line in enumerate(lines, 1):
+            line = line.strip()
+            match = TEXT_TRANSACTION_RE.match(line)
+            if match:
+                yield from self._close_text()
+                self._open_transaction = {'match': match, 'page_num': page_num, 'line_num': line_num,
+                                          'asset_lines': []}
+                continue
+            
+            current = self._open_transaction
+            if current is None or not line or PAGE_HEADER_RE.match(line):
+                continue
+            if is_detail_label(line) or line.startswith('*'):
+                # Details follow; nothing more belongs to the asset or amount
+                yield from self._close_text()
+                continue
+            current['asset_lines'].append(line)
+    
+    def _close_text(self) -> List[Dict]:
+        """The open text-layer transaction as a trade ([] if none is open)"""
+        current, self._open_transaction = self._open_transaction, None
+        return [self._text_trade(current)] if current else []
+    
+    def _text_trade(self, current: Dict) -> Dict:
+        """Build a trade from a transaction line and its continuation lines"""
+        match = current['match']
+        amount = CHECKBOX_RE.sub('', match.group('amount') or '').strip()
+        asset_lines = [match.group('asset') or ''] + current['asset_lines']
+        
+        # "$15,001 -" on the transaction line: the upper bound ends a later line
+        if not amount or amount.endswith('-'):
+            for i, line in enumerate(asset_lines[1:], 1):
+                tail = AMOUNT_TAIL_RE.search(line)
+                if tail:
+                    amount = f"{amount} {tail.group(1)}".strip()
+                    asset_lines[i] = line[:tail.start()]
+                    break
+        
+        asset = '\n'.join(line for line in asset_lines if line.strip())
+        type_code = match.group('type')[0].upper()
+        
+        return {
+            'asset_description': asset,
+            'ticker': self._extract_ticker(asset),
+            'transaction_type': self.TEXT_TRANSACTION_TYPES[type_code],
+            'transaction_date': self._parse_date(match.group('date')),
+            'amount_range': self._normalize_amount(amount),
+            'page_num': current['page_num'],
+            'table_idx': None,
+            'row_idx': current['line_num'],
+        }
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Counters, for merging the stats of parsers in other processes"""
+        return {
+            'pages_parsed': self.pages_parsed,
+            'trades_found': self.trades_found,
+            'errors': self.errors,
+            'pages_skipped': self.pages_skipped,
+            'pages_without_text': self.pages_without_text,
+            'cache_hits': self.cache_hits,
+        }
+    
+    def add_stats(self, stats: Dict[str, int]):
+        """Add another parser's get_stats() to this parser's counters"""
+        self.pages_parsed += stats.get('pages_parsed', 0)
+        self.trades_found += stats.get('trades_found', 0)
+        self.errors += stats.get('errors', 0)
+        self.pages_skipped += stats.get('pages_skipped', 0)
+        self.pages_without_text += stats.get('pages_without_text', 0)
+        self.cache_hits += stats.get('cache_hits', 0)
     
     def print_stats(self):
         """Print parsing statistics"""
         print(f"\n📊 Parsing Stats:", file=sys.stderr)
         print(f"  Pages parsed: {self.pages_parsed}", file=sys.stderr)
+        print(f"  Pages skipped (no transactions): {self.pages_skipped}", file=sys.stderr)
+        print(f"  Pages without text layer (scanned): {self.pages_without_text}", file=sys.stderr)
         print(f"  Trades found: {self.trades_found}", file=sys.stderr)
         print(f"  Errors: {self.errors}", file=sys.stderr)
+        if self.cache is not None:
+            print(f"  Cached parses used: {self.cache_hits}", file=sys.stderr)
+
+
+# Parse cache per database file, opened once per worker process
+_worker_caches = {}
+
+
+def parse_pdf_file(pdf_path: str, cache_file: Optional[str] = None) -> Tuple[List[Dict], Dict[str, int]]:
+    """
+    Process-pool entry point: parse one PDF with a fresh PTRParser
+    
+    Args:
+        pdf_path: Path to PDF file
+        cache_file: PTRParseCache database to consult and fill (None: no cache)
+        
+    Returns:
+        (parsed trades, parser stats for PTRParser.add_stats)
+    """
+    cache = None
+    if cache_file:
+        cache = _worker_caches.get(cache_file)
+        if cache is None:
+            from ptr_parse_cache import PTRParseCache
+            cache = _worker_caches[cache_file] = PTRParseCache(Path(cache_file))
+    parser = PTRParser(cache=cache)
+    trades = parser.parse_pdf(pdf_path)
+    return trades, parser.get_stats()
 
 
 # Test function
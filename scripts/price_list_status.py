@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Price List Status Writer
+Buffers gsa_price_lists status updates (download and parse progress) and
+writes them as bulk upserts on contract_number, instead of one UPDATE per
+price list. Shared by gsa-pricing-downloader.py and gsa-pricing-parser.py.
+
+- queue() is thread-safe and flushes on its own once batch_size updates
+  are buffered; callers flush() at the end of a run (and in finally blocks)
+- Updates queued for the same contract_number are merged (later values
+  win) before a flush, since one upsert can't touch a row twice
+- PostgREST bulk upserts need every row to carry the same columns, so a
+  flush sends one upsert per distinct set of columns
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PRICE_LISTS_TABLE = 'gsa_price_lists'
+
+
+class PriceListStatusWriter:
+    """Batched status updates for gsa_price_lists rows"""
+
+    def __init__(self, supabase, batch_size: Optional[int] = 100):
+        """
+        Args:
+            supabase: Supabase client
+            batch_size: Updates buffered before an automatic flush (None: only on flush())
+        """
+        self.supabase = supabase
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending: List[Dict] = []
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def queue(self, contract_number: str, **fields):
+        """Queue an update of the price list's columns; updated_at is set here"""
+        update_data = {
+            'contract_number': contract_number,
+            'updated_at': datetime.now().isoformat(),
+            **fields
+        }
+        with self._lock:
+            self._pending.append(update_data)
+            should_flush = self.batch_size and len(self._pending) >= self.batch_size
+
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write all queued updates; returns how many rows were sent"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+
+        if not pending:
+            return 0
+
+        # One row per contract_number (later values win): Postgres rejects an
+        # upsert that touches the same row twice
+        merged: Dict[str, Dict] = {}
+        for update_data in pending:
+            merged.setdefault(update_data['contract_number'], {}).update(update_data)
+
+        groups: Dict[tuple, List[Dict]] = {}
+        for update_data in merged.values():
+            groups.setdefault(tuple(sorted(update_data)), []).append(update_data)
+
+        for group in groups.values():
+            try:
+                self.supabase.table(PRICE_LISTS_TABLE)\
+                    .upsert(group, on_conflict='contract_number')\
+                    .execute()
+            except Exception as e:
+                logger.error(f"Error writing {len(group)} price list status updates: {e}")
+
+        return len(merged)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+PTR Parse Cache
+Sidecar to pdf_cache that maps (SHA-256 of a PDF's bytes, parser version) to
+the trades PTRParser extracted from it, in an embedded SQLite database
+(pdf_cache/parsed_trades.db).
+
+- An unchanged filing is answered from the cache without opening it in
+  pdfplumber; a re-downloaded PDF with different bytes misses
+- Bumping PTRParser.VERSION invalidates every entry: rows are keyed by
+  version, and rows for other versions are dropped when the cache is opened
+- Trades are stored as compact JSON, one row per PDF
+- WAL mode with a busy timeout; each thread and parse process gets its own
+  connection, so the parse process pool can share one cache
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_DB_FILE = Path('pdf_cache/parsed_trades.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parsed_pdfs (
+    sha256 TEXT NOT NULL,
+    parser_version INTEGER NOT NULL,
+    trade_count INTEGER NOT NULL,
+    trades TEXT NOT NULL,
+    parsed_at TEXT NOT NULL,
+    PRIMARY KEY (sha256, parser_version)
+);
+"""
+
+
+class PTRParseCache:
+    """Parsed trades per (PDF content hash, parser version)"""
+
+    def __init__(self, db_file: Path = DEFAULT_DB_FILE, parser_version: Optional[int] = None,
+                 timeout: float = 30.0):
+        """
+        Args:
+            db_file: SQLite database path
+            parser_version: If given, entries for every other version are dropped
+            timeout: Seconds to wait on a locked database
+        """
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        if parser_version is not None:
+            stale = conn.execute('DELETE FROM parsed_pdfs WHERE parser_version != ?', (parser_version,)).rowcount
+            if stale:
+                print(f"  🗑️  Dropped {stale} cached parse(s) from older parser versions", file=sys.stderr)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+            self._local.conn = conn
+        return conn
+
+    def get(self, sha256: str, parser_version: int) -> Optional[List[Dict]]:
+        """Cached trades for this PDF and parser version, or None"""
+        row = self._connect().execute(
+            'SELECT trades FROM parsed_pdfs WHERE sha256 = ? AND parser_version = ?',
+            (sha256, parser_version)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, sha256: str, parser_version: int, trades: List[Dict]):
+        """Record the trades parsed from this PDF"""
+        self._connect().execute(
+            'INSERT OR REPLACE INTO parsed_pdfs (sha256, parser_version, trade_count, trades, parsed_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (sha256, parser_version, len(trades), json.dumps(trades, separators=(',', ':')),
+             datetime.now().isoformat())
+        )
+
+    def count(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM parsed_pdfs').fetchone()[0]
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+House PTR Pipeline
+Downloads and parses Periodic Transaction Report PDFs as discovery finds
+them, in three stages connected by bounded queues:
+
+  discovery (caller's thread) -> download threads -> parse processes
+
+- submit() blocks while the download queue is full, so discovery never runs
+  far ahead of the downloads
+- Downloads run on a thread pool through one shared PDFDownloader (cache
+  hits return immediately)
+- pdfplumber parsing is CPU bound and runs on a process pool, one PDF per
+  task; at most two tasks per process are in flight, so downloaded PDFs wait
+  on disk rather than piling up in memory
+- Results come back in submission order, each with the job that was
+  submitted alongside its URL, whatever order the stages finished in
+
+Usage:
+    with PTRPipeline(PDFDownloader(), PTRParser()) as pipeline:
+        for ptr in discovered:
+            pipeline.submit(ptr['pdf_url'], {'ptr': ptr, ...})
+    for job, trades in pipeline.results:
+        ...
+"""
+
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from pdf_parser import parse_pdf_file
+
+DEFAULT_DOWNLOAD_WORKERS = 4
+
+# End-of-stage marker
+_DONE = None
+
+
+class PTRPipeline:
+    """Concurrent download + process-pool parse of PTR PDFs"""
+
+    def __init__(self, downloader, parser, download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+                 parse_workers: Optional[int] = None, queue_size: Optional[int] = None):
+        """
+        Args:
+            downloader: PDFDownloader shared by the download threads
+            parser: PTRParser that collects the parse processes' stats; its
+                    cache (if any) is used by the parse processes too
+            download_workers: Download threads
+            parse_workers: Parse processes (default: CPU count)
+            queue_size: Capacity of each stage's queue (default: 4 per download thread)
+        """
+        self.downloader = downloader
+        self.parser = parser
+        self.download_workers = max(1, download_workers)
+        self.parse_workers = max(1, parse_workers or os.cpu_count() or 1)
+        queue_size = queue_size or self.download_workers * 4
+
+        self._download_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._parse_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._in_flight = threading.BoundedSemaphore(self.parse_workers * 2)
+        self._lock = threading.Lock()
+        self._results: Dict[int, Tuple[Any, List[Dict]]] = {}
+        self._submitted = 0
+        self._threads: List[threading.Thread] = []
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Parse processes open the parser's cache database themselves
+        cache = getattr(parser, 'cache', None)
+        self._cache_file = str(cache.db_file) if cache is not None else None
+
+        self.stats = {'submitted': 0, 'download_failed': 0, 'parse_failed': 0, 'parsed': 0}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def start(self):
+        """Start the parse processes, then the download and dispatch threads"""
+        self._pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+        # Fork every parse process now, before the download threads exist
+        list(self._pool.map(int, range(self.parse_workers)))
+
+        for n in range(self.download_workers):
+            thread = threading.Thread(target=self._download_loop, name=f"ptr-download-{n + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="ptr-dispatch", daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, pdf_url: str, job: Any):
+        """
+        Queue one PTR; blocks while the download stage is full
+
+        Args:
+            pdf_url: PDF to download and parse
+            job: Caller's metadata, returned with the PDF's trades
+        """
+        with self._lock:
+            seq = self._submitted
+            self._submitted += 1
+            self.stats['submitted'] += 1
+        self._download_queue.put((seq, pdf_url, job))
+
+    # ---- Stages ----
+
+    def _download_loop(self):
+        while True:
+            item = self._download_queue.get()
+            if item is _DONE:
+                return
+            seq, pdf_url, job = item
+            try:
+                pdf_path = self.downloader.download_pdf(pdf_url)
+            except Exception as e:
+                print(f"    ⚠️  Download error {pdf_url}: {str(e)[:80]}", file=sys.stderr)
+                pdf_path = None
+            if not pdf_path:
+                print(f"    ⚠️  Failed to download {pdf_url}", file=sys.stderr)
+                self._finish(seq, job, [], 'download_failed')
+                continue
+            self._parse_queue.put((seq, str(pdf_path), job))
+
+    def _dispatch_loop(self):
+        """Hand downloaded PDFs to the process pool, at most two per process at a time"""
+        while True:
+            item = self._parse_queue.get()
+            if item is _DONE:
+                return
+            seq, pdf_path, job = item
+            self._in_flight.acquire()
+            try:
+                future = self._pool.submit(parse_pdf_file, pdf_path, self._cache_file)
+            except Exception as e:
+                self._in_flight.release()
+                print(f"    ❌ Could not queue {pdf_path} for parsing: {str(e)[:80]}", file=sys.stderr)
+                self._finish(seq, job, [], 'parse_failed')
+                continue
+            future.add_done_callback(
+                lambda f, seq=seq, pdf_path=pdf_path, job=job: self._parsed(f, seq, pdf_path, job))
+
+    def _parsed(self, future, seq: int, pdf_path: str, job: Any):
+        self._in_flight.release()
+        try:
+            trades, parser_stats = future.result()
+        except Exception as e:
+            print(f"    ❌ Parse process failed on {pdf_path}: {str(e)[:80]}", file=sys.stderr)
+            self._finish(seq, job, [], 'parse_failed')
+            return
+        with self._lock:
+            self.parser.add_stats(parser_stats)
+        self._finish(seq, job, trades, 'parsed')
+
+    def _finish(self, seq: int, job: Any, trades: List[Dict], outcome: str):
+        with self._lock:
+            self._results[seq] = (job, trades)
+            self.stats[outcome] += 1
+
+    # ---- Shutdown ----
+
+    def close(self):
+        """Wait for every submitted PTR to be downloaded and parsed"""
+        if self._pool is None:
+            return
+        for _ in self._threads:
+            self._download_queue.put(_DONE)
+        for thread in self._threads:
+            thread.join()
+        self._parse_queue.put(_DONE)
+        self._dispatcher.join()
+        # Waits for the parses still in flight
+        self._pool.shutdown(wait=True)
+        self._pool = None
+        self._threads = []
+
+    @property
+    def results(self) -> List[Tuple[Any, List[Dict]]]:
+        """(job, trades) for every submitted PTR, in submission order"""
+        with self._lock:
+            return [self._results[seq] for seq in sorted(self._results)]
+
+    def print_stats(self):
+        print(f"\n🔀 PTR pipeline: {self.stats['submitted']} submitted, {self.stats['parsed']} parsed, "
+              f"{self.stats['download_failed']} download failures, {self.stats['parse_failed']} parse failures "
+              f"({self.download_workers} download threads, {self.parse_workers} parse processes)",
+              file=sys.stderr)
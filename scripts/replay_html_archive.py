@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+HTML Archive Replay
+===================
+
+Re-runs the current article extractors over pages in the HTML archive
+(data/html_archive, filled by the scrapers) and writes back only what
+changed - no re-scraping.
+
+- Pages are decompressed and parsed in a process pool across all cores;
+  the main process diffs the results against military_news_articles in
+  batches and updates only the changed columns of changed rows
+- defense.gov pages also re-run parse_contract_paragraph: contract rows are
+  matched to their article by raw_paragraph, changed ones are updated and
+  paragraphs that now parse are inserted
+- Columns an extractor no longer produces are left as they are, and
+  raw_html / scraped_at are never compared
+
+Usage:
+  # Show what a parser change would update, without writing
+  python3 scripts/replay_html_archive.py --source dvids --dry-run
+
+  # Apply it
+  python3 scripts/replay_html_archive.py --source dvids
+
+  # Only pages archived since a date, all sources
+  python3 scripts/replay_html_archive.py --since 2025-11-01
+"""
+
+import importlib
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from html_archive import DEFAULT_ROOT, HTMLArchive, read_frame
+from military_news_sink import ARTICLES_TABLE, CONTRACTS_TABLE, LOOKUP_CHUNK, MilitaryNewsSink
+
+MILITARY_TIMES_OUTLETS = ('armytimes', 'navytimes', 'airforcetimes', 'marinecorpstimes')
+
+# Archive source -> (module, class, static parse method) of the extractor the scrapers use
+PARSERS = {
+    'dvids': ('military_news_historical_full', 'HistoricalMilitaryNewsScraper', 'parse_dvids_article'),
+    'defense.gov': ('defense_gov_contract_scraper', 'DefenseGovContractScraper', 'parse_contract_article'),
+}
+for _outlet in MILITARY_TIMES_OUTLETS:
+    PARSERS[_outlet] = ('military_times_sitemap', 'MilitaryTimesSitemapScraper', 'parse_article')
+
+ARTICLE_COLUMNS = {
+    'source', 'source_category', 'article_id', 'title', 'subtitle', 'author', 'byline', 'summary',
+    'content', 'published_date', 'updated_date', 'article_types', 'primary_article_type',
+    'service_branches', 'primary_service_branch', 'dod_components', 'locations', 'primary_location',
+    'countries', 'states', 'bases', 'personnel_mentioned', 'ranks_mentioned', 'units_mentioned',
+    'image_urls', 'video_urls', 'document_urls',
+}
+CONTRACT_COLUMNS = {
+    'published_date', 'vendor_name', 'vendor_location', 'vendor_city', 'vendor_state',
+    'contract_number', 'award_amount', 'award_amount_text', 'contract_type', 'contract_description',
+    'completion_date', 'fiscal_year', 'contracting_activity', 'service_branch', 'small_business_type',
+    'is_small_business', 'extraction_confidence',
+}
+REQUIRED_ARTICLE_COLUMNS = ('title', 'content', 'published_date')
+
+WINDOW = 2000  # pages handed to the pool at a time
+
+_methods = {}
+
+
+def _method(source: str, name: Optional[str] = None):
+    """Resolve (and cache, per worker process) a static method of a source's scraper class"""
+    module, cls, parse = PARSERS[source]
+    key = (module, cls, name or parse)
+    if key not in _methods:
+        _methods[key] = getattr(getattr(importlib.import_module(module), cls), name or parse)
+    return _methods[key]
+
+
+def parse_page(task: Tuple[str, str, Path, int, int]) -> Tuple[str, str, Optional[Dict], List[Dict], Optional[str]]:
+    """
+    Worker: decompress and parse one archived page
+
+    Returns:
+        (url, source, article row, contract rows, error)
+    """
+    url, source, shard, offset, length = task
+    try:
+        html = read_frame(shard, offset, length)
+        parse = _method(source)
+        parsed = parse(url, html, source) if source in MILITARY_TIMES_OUTLETS else parse(url, html)
+        if not parsed:
+            return url, source, None, [], 'no article'
+
+        row = {key: value for key, value in parsed.items() if key in ARTICLE_COLUMNS and value is not None}
+
+        contracts = []
+        if source == 'defense.gov':
+            parse_paragraph = _method(source, 'parse_contract_paragraph')
+            for paragraph in parsed.get('contract_paragraphs', []):
+                contract = parse_paragraph(paragraph, parsed.get('published_date'), url)
+                if contract:
+                    contracts.append(contract)
+        return url, source, row, contracts, None
+    except Exception as e:
+        return url, source, None, [], f"{type(e).__name__}: {str(e)[:80]}"
+
+
+def _timestamp(value: str) -> Optional[datetime]:
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def same_value(old, new) -> bool:
+    """Equal as stored: timestamps by instant, numbers by value"""
+    if old == new:
+        return True
+    if old is None or new is None:
+        return False
+    if isinstance(old, str) and isinstance(new, str):
+        old_ts = _timestamp(old)
+        return old_ts is not None and old_ts == _timestamp(new)
+    try:
+        return float(old) == float(new)
+    except (TypeError, ValueError):
+        return False
+
+
+class ArchiveReplayer:
+    """Diffs re-parsed rows against the database and writes the changes"""
+
+    def __init__(self, supabase, dry_run: bool = False):
+        """
+        Args:
+            supabase: Supabase client (None: parse only and report)
+            dry_run: Compute and report changes without writing them
+        """
+        self.supabase = supabase
+        self.dry_run = dry_run
+        self.sink = MilitaryNewsSink(supabase) if supabase and not dry_run else None
+
+        self.stats = Counter()
+        self.changed_fields = Counter()
+
+    def apply(self, results: List[Tuple]):
+        """Handle one batch of parse_page results"""
+        rows = {}
+        contracts = {}
+        for url, source, row, contract_rows, error in results:
+            self.stats['pages'] += 1
+            if error:
+                self.stats['parse_failed'] += 1
+                continue
+            rows[url] = row
+            if contract_rows:
+                contracts[url] = contract_rows
+
+        if not self.supabase or not rows:
+            return
+
+        self._apply_articles(rows)
+        if contracts:
+            self._apply_contracts(contracts)
+
+    def _apply_articles(self, rows: Dict[str, Dict]):
+        columns = sorted(set().union(*rows.values()))
+        current = {}
+        urls = list(rows)
+        for i in range(0, len(urls), LOOKUP_CHUNK):
+            result = self.supabase.table(ARTICLES_TABLE)\
+                .select(','.join(['id', 'article_url'] + columns))\
+                .in_('article_url', urls[i:i + LOOKUP_CHUNK])\
+                .execute()
+            for existing in result.data or []:
+                current[existing['article_url']] = existing
+
+        for url, row in rows.items():
+            existing = current.get(url)
+            if existing is None:
+                # Archived but never saved; insert it if it now has the required fields
+                if all(row.get(column) for column in REQUIRED_ARTICLE_COLUMNS):
+                    self.stats['articles_added'] += 1
+                    if self.sink:
+                        self.sink.add_article(dict(row, article_url=url))
+                else:
+                    self.stats['articles_missing'] += 1
+                continue
+
+            changes = {column: value for column, value in row.items() if not same_value(existing.get(column), value)}
+            if not changes:
+                self.stats['articles_unchanged'] += 1
+                continue
+
+            self.stats['articles_updated'] += 1
+            self.changed_fields.update(list(changes))
+            if not self.dry_run:
+                try:
+                    self.supabase.table(ARTICLES_TABLE).update(changes).eq('id', existing['id']).execute()
+                except Exception as e:
+                    print(f"   ⚠️  Update failed for {url[:60]}: {str(e)[:60]}")
+                    self.stats['articles_failed'] += 1
+
+    def _apply_contracts(self, contracts: Dict[str, List[Dict]]):
+        current = {}
+        urls = list(contracts)
+        for i in range(0, len(urls), LOOKUP_CHUNK):
+            result = self.supabase.table(CONTRACTS_TABLE)\
+                .select(','.join(['id', 'article_url', 'raw_paragraph'] + sorted(CONTRACT_COLUMNS)))\
+                .in_('article_url', urls[i:i + LOOKUP_CHUNK])\
+                .execute()
+            for existing in result.data or []:
+                current[(existing['article_url'], existing['raw_paragraph'])] = existing
+
+        for url, contract_rows in contracts.items():
+            for contract in contract_rows:
+                row = {key: value for key, value in contract.items() if key in CONTRACT_COLUMNS and value is not None}
+                existing = current.get((url, contract.get('raw_paragraph')))
+                if existing is None:
+                    self.stats['contracts_added'] += 1
+                    if self.sink:
+                        self.sink.add_contract(dict(row, article_url=url, raw_paragraph=contract['raw_paragraph']))
+                    continue
+
+                changes = {column: value for column, value in row.items()
+                           if not same_value(existing.get(column), value)}
+                if not changes:
+                    continue
+
+                self.stats['contracts_updated'] += 1
+                self.changed_fields.update(f"contract.{column}" for column in changes)
+                if not self.dry_run:
+                    try:
+                        self.supabase.table(CONTRACTS_TABLE).update(changes).eq('id', existing['id']).execute()
+                    except Exception as e:
+                        print(f"   ⚠️  Contract update failed ({url[:50]}): {str(e)[:60]}")
+                        self.stats['contracts_failed'] += 1
+
+    def close(self):
+        if self.sink:
+            self.sink.close()
+
+    def print_stats(self, elapsed: float):
+        print(f"\n{'='*70}")
+        print(f"📊 REPLAY {'(DRY RUN) ' if self.dry_run else ''}RESULTS")
+        print(f"{'='*70}")
+        for key in ('pages', 'parse_failed', 'articles_unchanged', 'articles_updated', 'articles_added',
+                    'articles_missing', 'articles_failed', 'contracts_updated', 'contracts_added',
+                    'contracts_failed'):
+            print(f"{key.replace('_', ' ').title():30} {self.stats[key]:>10,}")
+        if self.changed_fields:
+            print("\nChanged fields:")
+            for field, count in self.changed_fields.most_common():
+                print(f"  {field:40} {count:>10,}")
+        rate = self.stats['pages'] / elapsed if elapsed else 0
+        print(f"\nRuntime: {elapsed / 60:.1f} minutes ({rate:,.0f} pages/s)")
+        print(f"{'='*70}\n")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Re-parse archived article HTML and update changed fields')
+    parser.add_argument('--source', action='append', choices=sorted(PARSERS),
+                        help='Source to replay (repeatable; default: all with a parser)')
+    parser.add_argument('--since', help='Only pages fetched on or after this date (YYYY-MM-DD)')
+    parser.add_argument('--limit', type=int, default=None, help='Max pages to replay (for testing)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Parse processes (default: all cores)')
+    parser.add_argument('--batch-size', type=int, default=200, help='Pages diffed against the database at a time')
+    parser.add_argument('--archive', type=Path, default=DEFAULT_ROOT, help='Archive directory')
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without writing them')
+
+    args = parser.parse_args()
+
+    supabase = None
+    supabase_url = os.getenv('SUPABASE_URL')
+    supabase_key = os.getenv('SUPABASE_SERVICE_KEY')
+    if supabase_url and supabase_key:
+        from supabase import create_client
+        supabase = create_client(supabase_url, supabase_key)
+        print("✅ Connected to Supabase")
+    else:
+        print("⚠️  No Supabase credentials - parsing only")
+
+    archive = HTMLArchive(args.archive)
+    archive.print_stats()
+    sources = args.source or sorted(PARSERS)
+
+    print(f"\n{'='*70}")
+    print(f"🔁 REPLAYING ARCHIVE: {', '.join(sources)}")
+    print(f"{'='*70}")
+    print(f"Workers: {args.workers}{' - DRY RUN' if args.dry_run else ''}")
+    print(f"{'='*70}\n")
+
+    replayer = ArchiveReplayer(supabase, dry_run=args.dry_run)
+    tasks = archive.iter_pages(sources, since=args.since)
+    if args.limit:
+        tasks = islice(tasks, args.limit)
+
+    start = time.time()
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            while True:
+                window = list(islice(tasks, WINDOW))
+                if not window:
+                    break
+                results = list(pool.map(parse_page, window, chunksize=16))
+                for i in range(0, len(results), args.batch_size):
+                    replayer.apply(results[i:i + args.batch_size])
+                print(f"   {replayer.stats['pages']:,} pages - {replayer.stats['articles_updated']:,} updated, "
+                      f"{replayer.stats['parse_failed']:,} failed to parse")
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted")
+    finally:
+        replayer.close()
+        if replayer.sink:
+            replayer.sink.print_stats()
+        replayer.print_stats(time.time() - start)
+
+
+if __name__ == '__main__':
+    main()
@@ -36,9 +36,11 @@ except ImportError:
 try:
     from pdf_downloader import PDFDownloader
     from pdf_parser import PTRParser
+    from ptr_pipeline import PTRPipeline, DEFAULT_DOWNLOAD_WORKERS
+    from ptr_parse_cache import PTRParseCache
 except ImportError:
     print("ERROR: PDF parsing modules not found.", file=sys.stderr)
-    print("Make sure pdf_downloader.py and pdf_parser.py are in the scripts directory.", file=sys.stderr)
+    print("Make sure pdf_downloader.py, pdf_parser.py, ptr_pipeline.py and ptr_parse_cache.py are in the scripts directory.", file=sys.stderr)
     sys.exit(1)
 
 # Import HTML parsing modules (for Senate)
@@ -234,85 +236,85 @@ def safe_date(date_obj) -> str:
 # Main Scraping Functions
 # ============================================
 
-def scrape_house_trades(start_year: int, end_year: int, upload_per_member: bool = False) -> List[Dict[str, Any]]:
-    """Scrape House financial disclosures and parse PDFs"""
+def scrape_house_trades(start_year: int, end_year: int,
+                        download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+                        parse_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Scrape House financial disclosures and parse PDFs
+    
+    CapitolGains discovery runs here, on one browser; each PTR it finds goes
+    to a PTRPipeline that downloads on download_workers threads and parses on
+    parse_workers processes while discovery continues.
+    """
     trades = []
     members = get_defense_house_members()
     
-    # Initialize PDF tools
-    downloader = PDFDownloader()
-    parser = PTRParser()
+    # Initialize PDF tools; unchanged PDFs reuse their cached parse
+    downloader = PDFDownloader(pool_size=download_workers)
+    parse_cache = PTRParseCache(downloader.cache_dir / 'parsed_trades.db', parser_version=PTRParser.VERSION)
+    parser = PTRParser(cache=parse_cache)
     
     print(f"Scraping House: {len(members)} members, years {start_year}-{end_year}", 
           file=sys.stderr)
     
-    with HouseDisclosureScraper() as scraper:
-        for idx, member in enumerate(members, 1):
-            member_name = f"{member['name']} ({member['state']}-{member['district']})"
-            print(f"[{idx}/{len(members)}] House: {member_name}", file=sys.stderr)
-            
-            for year in range(start_year, end_year + 1):
-                try:
-                    rep = Representative(
-                        member["name"], 
-                        state=member["state"], 
-                        district=member["district"]
-                    )
-                    
-                    # Get PDF URLs from CapitolGains
-                    disclosures_dict = rep.get_disclosures(scraper, year=str(year))
-                    ptr_list = disclosures_dict.get('trades', []) if isinstance(disclosures_dict, dict) else []
-                    
-                    if ptr_list:
-                        print(f"  {year}: {len(ptr_list)} PTR(s) found", file=sys.stderr)
-                    
-                    # Download and parse each PDF
-                    for ptr in ptr_list:
-                        pdf_url = ptr.get('pdf_url', '')
-                        if not pdf_url:
-                            continue
+    # Parse processes are started before the browser
+    with PTRPipeline(downloader, parser, download_workers=download_workers,
+                     parse_workers=parse_workers) as pipeline:
+        with HouseDisclosureScraper() as scraper:
+            for idx, member in enumerate(members, 1):
+                member_name = f"{member['name']} ({member['state']}-{member['district']})"
+                print(f"[{idx}/{len(members)}] House: {member_name}", file=sys.stderr)
+                
+                for year in range(start_year, end_year + 1):
+                    try:
+                        rep = Representative(
+                            member["name"], 
+                            state=member["state"], 
+                            district=member["district"]
+                        )
                         
-                        # Download PDF
-                        pdf_path = downloader.download_pdf(pdf_url)
-                        if not pdf_path:
-                            print(f"    ⚠️  Failed to download PDF", file=sys.stderr)
-                            continue
+                        # Get PDF URLs from CapitolGains
+                        disclosures_dict = rep.get_disclosures(scraper, year=str(year))
+                        ptr_list = disclosures_dict.get('trades', []) if isinstance(disclosures_dict, dict) else []
                         
-                        # Parse PDF to extract trades
-                        parsed_trades = parser.parse_pdf(str(pdf_path))
+                        if ptr_list:
+                            print(f"  {year}: {len(ptr_list)} PTR(s) found", file=sys.stderr)
                         
-                        # Add metadata to each trade
-                        for trade in parsed_trades:
-                            trade['member_name'] = rep.full_name if hasattr(rep, 'full_name') else member['name']
-                            trade['chamber'] = 'House'
-                            trade['filing_url'] = pdf_url
-                            
-                            # Set disclosure_date (required field)
-                            # Use transaction_date as fallback if no specific disclosure date
-                            if not trade.get('transaction_date'):
-                                # If no transaction date, use year from PTR as fallback
-                                trade['disclosure_date'] = f"{ptr.get('year', year)}-01-01"
-                                trade['transaction_date'] = f"{ptr.get('year', year)}-01-01"
-                            else:
-                                # Disclosure is typically same as or after transaction
-                                trade['disclosure_date'] = trade['transaction_date']
-                            
-                            trades.append(trade)
-                    
-                except Exception as e:
-                    print(f"  Error {year}: {str(e)}", file=sys.stderr)
-                    continue
+                        # Queue each PDF for download and parsing
+                        full_name = rep.full_name if hasattr(rep, 'full_name') else member['name']
+                        for ptr in ptr_list:
+                            pdf_url = ptr.get('pdf_url', '')
+                            if not pdf_url:
+                                continue
+                            pipeline.submit(pdf_url, (full_name, ptr, year))
+                        
+                    except Exception as e:
+                        print(f"  Error {year}: {str(e)}", file=sys.stderr)
+                        continue
+    
+    # Add metadata to each trade, in discovery order
+    for (full_name, ptr, year), parsed_trades in pipeline.results:
+        for trade in parsed_trades:
+            trade['member_name'] = full_name
+            trade['chamber'] = 'House'
+            trade['filing_url'] = ptr['pdf_url']
+            
+            # Set disclosure_date (required field)
+            # Use transaction_date as fallback if no specific disclosure date
+            if not trade.get('transaction_date'):
+                # If no transaction date, use year from PTR as fallback
+                trade['disclosure_date'] = f"{ptr.get('year', year)}-01-01"
+                trade['transaction_date'] = f"{ptr.get('year', year)}-01-01"
+            else:
+                # Disclosure is typically same as or after transaction
+                trade['disclosure_date'] = trade['transaction_date']
             
-            # Upload this member's trades immediately
-            if upload_per_member and len(trades) > 0:
-                member_trades = trades[len(trades) - sum(len(t) for t in []):]  # Get recent trades
-                if member_trades:
-                    print(f"  📤 Uploading {len(member_trades)} trades to database...", file=sys.stderr)
-                    upload_to_supabase(member_trades)
+            trades.append(trade)
     
     print(f"House complete: {len(trades)} trades", file=sys.stderr)
     
-    # Print downloader and parser stats
+    # Print pipeline, downloader and parser stats
+    pipeline.print_stats()
     downloader.print_stats()
     parser.print_stats()
     
@@ -403,7 +405,8 @@ def scrape_senate_trades(start_year: int, end_year: int, upload_per_member: bool
     return trades
 
 
-def scrape_all_trades(start_year: int, end_year: int) -> List[Dict[str, Any]]:
+def scrape_all_trades(start_year: int, end_year: int, download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+                      parse_workers: Optional[int] = None) -> List[Dict[str, Any]]:
     """Scrape both House and Senate trades"""
     print(f"\n{'='*60}", file=sys.stderr)
     print(f"Congressional Trades Scraper", file=sys.stderr)
@@ -414,7 +417,8 @@ def scrape_all_trades(start_year: int, end_year: int) -> List[Dict[str, Any]]:
     
     # Scrape House
     try:
-        house_trades = scrape_house_trades(start_year, end_year)
+        house_trades = scrape_house_trades(start_year, end_year, download_workers=download_workers,
+                                           parse_workers=parse_workers)
         all_trades.extend(house_trades)
     except Exception as e:
         print(f"ERROR scraping House: {str(e)}", file=sys.stderr)
@@ -461,6 +465,18 @@ def main():
         default='daily',
         help='Scraping mode: historical (2012-present) or daily (current year only)'
     )
+    parser.add_argument(
+        '--download-workers',
+        type=int,
+        default=DEFAULT_DOWNLOAD_WORKERS,
+        help=f'Concurrent House PDF downloads (default: {DEFAULT_DOWNLOAD_WORKERS})'
+    )
+    parser.add_argument(
+        '--parse-workers',
+        type=int,
+        default=None,
+        help='Processes parsing House PDFs (default: CPU count)'
+    )
     
     args = parser.parse_args()
     
@@ -475,7 +491,8 @@ def main():
         end_year = current_year
     
     # Run scraper
-    trades = scrape_all_trades(start_year, end_year)
+    trades = scrape_all_trades(start_year, end_year, download_workers=args.download_workers,
+                               parse_workers=args.parse_workers)
     
     # Output JSON to stdout (stderr used for logging)
     print(json.dumps(trades, indent=2))
@@ -34,6 +34,10 @@ except ImportError as e:
 
 import argparse
 
+from html_archive import open_archive
+from military_news_sink import MilitaryNewsSink
+from seen_urls import SeenURLIndex
+
 
 class DVIDSMilitaryTimesScraper:
     """Focused scraper for DVIDS and Military Times"""
@@ -61,9 +65,15 @@ class DVIDSMilitaryTimesScraper:
             print("⚠️  No Supabase credentials - saving to JSON only")
             self.supabase = None
         
-        # Output
+        self.seen_urls = SeenURLIndex(self.supabase).load()
+        # Raw pages go to the archive rather than the raw_html column
+        self.archive = open_archive()
+        self.sink = MilitaryNewsSink(self.supabase, raw_html=self.archive is None)
+        
+        # Output (JSONL backups, one open handle per file for the whole run)
         self.output_dir = Path('data/military_news_focused')
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.json_files = {}
     
     def start_browser(self):
         """Start browser"""
@@ -80,6 +90,20 @@ class DVIDSMilitaryTimesScraper:
         self.page = self.context.new_page()
         print("✅ Browser ready\n")
     
+    def archive_page(self, url, html, source):
+        """Keep the fetched page for offline re-parsing"""
+        if not self.archive:
+            return
+        try:
+            self.archive.put(url, html, source)
+        except Exception as e:
+            print(f"      ⚠️  Archive: {str(e)[:30]}")
+    
+    def close_json_files(self):
+        for f in self.json_files.values():
+            f.close()
+        self.json_files = {}
+    
     def stop_browser(self):
         """Stop browser"""
         if self.context:
@@ -195,6 +219,7 @@ class DVIDSMilitaryTimesScraper:
         """Extract DVIDS article data"""
         try:
             html_content = self.page.content()
+            self.archive_page(url, html_content, 'dvids')
             soup = BeautifulSoup(html_content, 'html.parser')
             
             article = {
@@ -469,6 +494,7 @@ class DVIDSMilitaryTimesScraper:
         """Extract Military Times article"""
         try:
             html_content = self.page.content()
+            self.archive_page(url, html_content, outlet)
             soup = BeautifulSoup(html_content, 'html.parser')
             
             service_map = {
@@ -609,23 +635,19 @@ class DVIDSMilitaryTimesScraper:
             if not article.get('source'):
                 article['source'] = 'unknown'
             
-            # JSON backup
+            # JSON backup (the page itself is in the archive when enabled)
             date_str = datetime.now().strftime('%Y%m%d')
             json_file = self.output_dir / f"{article['source']}_{date_str}.jsonl"
-            
-            with open(json_file, 'a') as f:
-                f.write(json.dumps(article) + '\n')
+            if json_file not in self.json_files:
+                self.json_files[json_file] = open(json_file, 'a')
+            backup = article if self.archive is None else {k: v for k, v in article.items() if k != 'raw_html'}
+            self.json_files[json_file].write(json.dumps(backup) + '\n')
             
             # Supabase
             if self.supabase and article.get('article_url'):
                 try:
-                    result = self.supabase.table('military_news_articles')\
-                        .select('id')\
-                        .eq('article_url', article['article_url'])\
-                        .execute()
-                    
-                    if not result.data:
-                        self.supabase.table('military_news_articles').insert({
+                    if article['article_url'] not in self.seen_urls:
+                        self.sink.add_article({
                             'source': article.get('source'),
                             'source_category': article.get('source_category'),
                             'article_url': article.get('article_url'),
@@ -655,8 +677,9 @@ class DVIDSMilitaryTimesScraper:
                             'video_urls': article.get('video_urls'),
                             'document_urls': article.get('document_urls'),
                             'scraped_at': article.get('scraped_at'),
-                        }).execute()
-                        print("      ✅ Saved to DB")
+                        })
+                        self.seen_urls.add(article['article_url'])
+                        print("      ✅ Queued for DB")
                     else:
                         print("      ⏭️  Exists")
                 except Exception as e:
@@ -726,6 +749,9 @@ def main():
     
     finally:
         scraper.stop_browser()
+        scraper.close_json_files()
+        scraper.sink.close()
+        scraper.sink.print_stats()
 
 
 if __name__ == "__main__":
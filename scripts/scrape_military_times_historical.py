@@ -26,6 +26,11 @@ except ImportError as e:
     print(f"Missing dependency: {e}")
     sys.exit(1)
 
+from article_fetcher import TieredFetcher
+from html_archive import open_archive
+from military_news_sink import MilitaryNewsSink
+from seen_urls import SeenURLIndex
+
 class MilitaryTimesHistoricalScraper:
     def __init__(self):
         self.supabase = None
@@ -47,6 +52,12 @@ class MilitaryTimesHistoricalScraper:
             self.supabase = create_client(supabase_url, supabase_key)
             print("✅ Connected to Supabase")
         
+        self.seen_urls = SeenURLIndex(self.supabase).load()
+        # Raw pages go to the archive rather than the raw_html column
+        self.archive = open_archive()
+        self.sink = MilitaryNewsSink(self.supabase, raw_html=self.archive is None)
+        self.fetcher = TieredFetcher(self.fetch_with_browser, archive=self.archive)
+        
         self.browser = None
         self.context = None
         self.page = None
@@ -71,26 +82,23 @@ class MilitaryTimesHistoricalScraper:
         if hasattr(self, 'playwright'):
             self.playwright.stop()
     
+    def fetch_with_browser(self, url):
+        """Browser tier for the article fetcher"""
+        self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
+        time.sleep(2)
+        return self.page.content()
+    
     def article_exists(self, url):
         """Check if article exists"""
-        if not self.supabase:
-            return False
-        try:
-            result = self.supabase.table('military_news_articles')\
-                .select('id')\
-                .eq('article_url', url)\
-                .execute()
-            return bool(result.data)
-        except:
-            return False
+        return url in self.seen_urls
     
     def extract_military_times_article(self, url, outlet):
         """Extract Military Times article"""
         try:
-            self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
-            time.sleep(2)
+            html_content = self.fetcher.fetch(url, outlet, 'military_times')
+            if not html_content:
+                return None
             
-            html_content = self.page.content()
             soup = BeautifulSoup(html_content, 'html.parser')
             
             service_map = {
@@ -214,7 +222,7 @@ class MilitaryTimesHistoricalScraper:
             if not article.get('content'):
                 article['content'] = f"Content not extracted. Source: {article.get('article_url', 'unknown')}"
             
-            self.supabase.table('military_news_articles').insert({
+            self.sink.add_article({
                 'source': article.get('source'),
                 'source_category': article.get('source_category'),
                 'article_url': article.get('article_url'),
@@ -233,7 +241,8 @@ class MilitaryTimesHistoricalScraper:
                 'primary_service_branch': article.get('primary_service_branch'),
                 'image_urls': article.get('image_urls'),
                 'scraped_at': article.get('scraped_at'),
-            }).execute()
+            })
+            self.seen_urls.add(article.get('article_url'))
             return True
         except Exception as e:
             print(f"      ⚠️  DB Error: {str(e)[:100]}")
@@ -378,6 +387,9 @@ def main():
         
     finally:
         scraper.stop_browser()
+        scraper.sink.close()
+        scraper.sink.print_stats()
+        scraper.fetcher.print_stats()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Seen Article URL Index
+Keeps every article_url already in military_news_articles in memory, so the
+news scrapers can skip known links without a Supabase query per link.
+
+The index is built once per run and saved as a local snapshot
+(data/military_news_seen_urls.json) together with the highest row id it
+covers. Later runs load the snapshot and only page in rows with a larger id
+(article_url is UNIQUE and rows are append-only, so that is the full delta).
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_SNAPSHOT_FILE = Path('data/military_news_seen_urls.json')
+PAGE_SIZE = 1000  # PostgREST max rows per request
+
+
+class SeenURLIndex:
+    """In-memory set of article URLs already stored in Supabase"""
+
+    def __init__(self, supabase=None, snapshot_file: Optional[Path] = DEFAULT_SNAPSHOT_FILE,
+                 table: str = 'military_news_articles', page_size: int = PAGE_SIZE):
+        """
+        Args:
+            supabase: Supabase client (None: snapshot only, no refresh)
+            snapshot_file: Local snapshot path (None: no snapshot)
+            table: Table holding the article_url column
+            page_size: Rows per keyset page when refreshing
+        """
+        self.supabase = supabase
+        self.snapshot_file = Path(snapshot_file) if snapshot_file else None
+        self.table = table
+        self.page_size = page_size
+        self.urls = set()
+        self.last_id = 0
+
+    def __contains__(self, url) -> bool:
+        return url in self.urls
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def add(self, url):
+        """Record a URL saved during this run"""
+        if url:
+            self.urls.add(url)
+
+    def load(self) -> 'SeenURLIndex':
+        """Load the snapshot, page in newer rows and save the snapshot back"""
+        self._load_snapshot()
+        snapshot_size = len(self.urls)
+
+        if self.supabase:
+            try:
+                added = self._refresh()
+            except Exception as e:
+                print(f"⚠️  Could not refresh seen-URL index ({str(e)[:60]}), using snapshot only")
+            else:
+                print(f"📇 Seen-URL index: {len(self.urls):,} URLs "
+                      f"({snapshot_size:,} from snapshot, {added:,} new from database)")
+                self._save_snapshot()
+
+        return self
+
+    def _refresh(self) -> int:
+        added = 0
+        while True:
+            result = self.supabase.table(self.table)\
+                .select('id, article_url')\
+                .gt('id', self.last_id)\
+                .order('id')\
+                .limit(self.page_size)\
+                .execute()
+            rows = result.data or []
+
+            for row in rows:
+                if row.get('article_url'):
+                    self.urls.add(row['article_url'])
+            added += len(rows)
+
+            if rows:
+                self.last_id = rows[-1]['id']
+            if len(rows) < self.page_size:
+                return added
+
+    def _load_snapshot(self):
+        if not self.snapshot_file or not self.snapshot_file.exists():
+            return
+        try:
+            with open(self.snapshot_file, 'r') as f:
+                snapshot = json.load(f)
+            self.urls = set(snapshot.get('urls', []))
+            self.last_id = snapshot.get('last_id', 0)
+        except (ValueError, OSError) as e:
+            print(f"⚠️  Ignoring unreadable seen-URL snapshot {self.snapshot_file}: {e}")
+            self.urls = set()
+            self.last_id = 0
+
+    def _save_snapshot(self):
+        if not self.snapshot_file:
+            return
+        self.snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.snapshot_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump({'last_id': self.last_id, 'urls': sorted(self.urls)}, f)
+        os.replace(tmp_file, self.snapshot_file)
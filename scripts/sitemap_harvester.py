@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Incremental Sitemap Harvester
+Yields article URLs from a site's sitemap index, reading only the child
+sitemaps that changed since the last run.
+
+- Child sitemaps are fetched concurrently and streamed through lxml
+  iterparse (gzip children included), never held as a full tree
+- Each child's <lastmod> from the index and its ETag / Last-Modified
+  response headers are recorded in a state file; later runs skip children
+  whose lastmod is unchanged and send conditional requests for the rest
+  (304 Not Modified means nothing to read)
+- URLs are yielded lazily as each child arrives, and a child is only marked
+  harvested once every URL from it has been consumed, so a run stopped
+  part-way re-reads the unfinished children next time
+- Consumed is not saved: a harvested child is not read again, so callers
+  keep URLs they failed to save themselves (military_times_sitemap.py
+  records each new URL in the crawl frontier and retries failures from it)
+
+State layout (data/sitemap_state.json):
+    {"<child sitemap url>": {"lastmod": ..., "etag": ..., "last_modified": ...,
+                             "urls": <count>, "harvested_at": ...}}
+"""
+
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import etree
+
+DEFAULT_STATE_FILE = Path('data/sitemap_state.json')
+USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+
+def _child_text(elem, name: str) -> Optional[str]:
+    for child in elem:
+        if isinstance(child.tag, str) and etree.QName(child).localname == name:
+            return (child.text or '').strip() or None
+    return None
+
+
+def parse_sitemap(source) -> Tuple[List[Tuple[str, Optional[str]]], List[str]]:
+    """
+    Stream-parse a sitemap or sitemap index
+
+    Args:
+        source: File path or binary file-like object (e.g. response.raw)
+
+    Returns:
+        (children, urls): (loc, lastmod) of each <sitemap> entry, and the
+        <loc> of each <url> entry
+    """
+    children = []
+    urls = []
+
+    for _, elem in etree.iterparse(source, events=('end',)):
+        if not isinstance(elem.tag, str):
+            continue
+        name = etree.QName(elem).localname
+        if name not in ('url', 'sitemap'):
+            continue
+
+        loc = _child_text(elem, 'loc')
+        if loc:
+            if name == 'url':
+                urls.append(loc)
+            else:
+                children.append((loc, _child_text(elem, 'lastmod')))
+
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+    return children, urls
+
+
+class SitemapHarvester:
+    """Concurrent, incremental reader of sitemap indexes"""
+
+    def __init__(self, session: Optional[requests.Session] = None, workers: int = 4,
+                 state_file: Optional[Path] = DEFAULT_STATE_FILE, rate_limiter=None, timeout: int = 30):
+        """
+        Args:
+            session: Shared HTTP session (a pooled one is created if None)
+            workers: Child sitemaps fetched at once
+            state_file: Per-child lastmod / ETag state (None: always full)
+            rate_limiter: Object with wait(), called before every request
+            timeout: Request timeout in seconds
+        """
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({'User-Agent': USER_AGENT})
+        self.session = session
+        self.workers = workers
+        self.state_file = Path(state_file) if state_file else None
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.state: Dict[str, Dict] = self._load_state()
+
+        self.stats = {'children': 0, 'unchanged': 0, 'not_modified': 0, 'read': 0, 'failed': 0, 'urls': 0}
+
+    def _load_state(self) -> Dict[str, Dict]:
+        if self.state_file and self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    return json.load(f)
+            except (ValueError, OSError) as e:
+                print(f"⚠️  Ignoring unreadable sitemap state {self.state_file}: {e}")
+        return {}
+
+    def _save_state(self):
+        if not self.state_file:
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    def _fetch(self, url: str, headers: Optional[Dict] = None):
+        """Returns (children, urls, response headers), or None on 304 / 404"""
+        if self.rate_limiter:
+            self.rate_limiter.wait()
+        with self.session.get(url, headers=headers or {}, stream=True, timeout=self.timeout) as response:
+            if response.status_code in (304, 404):
+                return None
+            response.raise_for_status()
+            response.raw.decode_content = True
+            source = gzip.GzipFile(fileobj=response.raw) if url.endswith('.gz') else response.raw
+            children, urls = parse_sitemap(source)
+            return children, urls, response.headers
+
+    def _fetch_child(self, url: str):
+        known = self.state.get(url, {})
+        headers = {}
+        if known.get('etag'):
+            headers['If-None-Match'] = known['etag']
+        if known.get('last_modified'):
+            headers['If-Modified-Since'] = known['last_modified']
+        return self._fetch(url, headers)
+
+    def iter_urls(self, index_urls: List[str], url_filter: Optional[Callable[[str], bool]] = None,
+                  full: bool = False) -> Iterator[str]:
+        """
+        Yield matching URLs from the first sitemap in index_urls that loads
+
+        Args:
+            index_urls: Candidate sitemap / sitemap index locations, in order
+            url_filter: Keep only URLs for which this returns True
+            full: Ignore recorded state and re-read every child
+        """
+        seen = set()
+
+        def select(urls: List[str]) -> List[str]:
+            selected = []
+            for url in urls:
+                if url not in seen and (url_filter is None or url_filter(url)):
+                    seen.add(url)
+                    selected.append(url)
+            return selected
+
+        for index_url in index_urls:
+            try:
+                print(f"🔍 Checking: {index_url}")
+                result = self._fetch(index_url)
+            except (requests.exceptions.RequestException, etree.XMLSyntaxError, OSError) as e:
+                print(f"   ⚠️  Not found or error: {str(e)[:40]}")
+                continue
+            if result is None:
+                print("   ⚠️  Not found")
+                continue
+
+            children, urls, _ = result
+            if not children:
+                # Plain sitemap: no children to track
+                urls = select(urls)
+                self.stats['urls'] += len(urls)
+                print(f"   📄 Found {len(urls)} matching URLs")
+                yield from urls
+                return
+
+            yield from self._iter_children(children, select, full)
+            return
+
+    def _iter_children(self, children: List[Tuple[str, Optional[str]]], select, full: bool) -> Iterator[str]:
+        self.stats['children'] += len(children)
+
+        stale = []
+        for loc, lastmod in children:
+            known = self.state.get(loc)
+            if not full and known and lastmod and known.get('lastmod') == lastmod:
+                self.stats['unchanged'] += 1
+            else:
+                stale.append((loc, lastmod))
+
+        print(f"   📋 Sitemap index with {len(children)} sitemaps: "
+              f"{len(stale)} to read, {len(children) - len(stale)} unchanged since last run")
+
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            futures = {executor.submit(self._fetch_child, loc): (loc, lastmod) for loc, lastmod in stale}
+            for future in as_completed(futures):
+                loc, lastmod = futures[future]
+                try:
+                    result = future.result()
+                except (requests.exceptions.RequestException, etree.XMLSyntaxError, OSError) as e:
+                    print(f"      ⚠️  {loc[-50:]}: {str(e)[:40]}")
+                    self.stats['failed'] += 1
+                    continue
+
+                entry = dict(self.state.get(loc, {}), lastmod=lastmod)
+                if result is None:
+                    self.stats['not_modified'] += 1
+                else:
+                    _, urls, headers = result
+                    urls = select(urls)
+                    self.stats['read'] += 1
+                    self.stats['urls'] += len(urls)
+                    print(f"      ✅ {loc[-50:]}: {len(urls)} URLs")
+
+                    yield from urls
+
+                    entry.update(etag=headers.get('ETag'), last_modified=headers.get('Last-Modified'),
+                                 urls=len(urls))
+
+                # Every URL from this child has been consumed
+                entry['harvested_at'] = datetime.now().isoformat()
+                self.state[loc] = entry
+                self._save_state()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def print_stats(self):
+        print(f"🗺️  Sitemaps: {self.stats['read']} read, {self.stats['unchanged']} unchanged (lastmod), "
+              f"{self.stats['not_modified']} not modified (304), {self.stats['failed']} failed - "
+              f"{self.stats['urls']:,} URLs")
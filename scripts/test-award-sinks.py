@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test Award Sinks
+Writes award rows through each award_sinks format and reads them back,
+including output left behind by a sink that was never closed. Runs offline.
+
+Usage: python3 scripts/test-award-sinks.py
+"""
+
+import csv
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from award_sinks import AWARD_FIELDS, ParquetSink, open_sink
+
+
+def make_rows(count: int, offset: int = 0):
+    return [{
+        'gwac_key': 'alliant2',
+        'gwac_name': 'Alliant 2',
+        'award_id': f"AWD{offset + i:05d}",
+        'recipient_name': 'ACME, "THE" CORP',
+        'award_amount': '1500.25' if i % 2 else 99,
+        'total_outlayed': None,
+        'unexpected_field': 'dropped'
+    } for i in range(count)]
+
+
+def read_back(path: Path):
+    if path.suffix == '.csv':
+        with open(path, newline='', encoding='utf-8') as f:
+            return list(csv.DictReader(f))
+    if path.suffix == '.ndjson':
+        with open(path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+    import pandas as pd
+    return pd.read_parquet(path).to_dict('records')
+
+
+def test_formats(tmp: Path):
+    for output_format in ('csv', 'ndjson', 'parquet'):
+        with open_sink(output_format, tmp / 'awards') as sink:
+            sink.write(make_rows(3))
+            sink.write([])
+            sink.write(make_rows(2, offset=3))
+
+        rows = read_back(sink.path)
+        assert len(rows) == 5, (output_format, len(rows))
+        assert list(rows[0].keys()) == AWARD_FIELDS, output_format
+        assert [row['award_id'] for row in rows] == [f"AWD{i:05d}" for i in range(5)]
+        assert rows[1]['recipient_name'] == 'ACME, "THE" CORP'
+        print(f"✓ {output_format}: {len(rows)} rows, fixed schema")
+
+
+def test_partial_output(tmp: Path):
+    # Sinks left open (e.g. the process died) still leave readable output
+    for output_format in ('csv', 'ndjson'):
+        sink = open_sink(output_format, tmp / 'partial')
+        sink.write(make_rows(4))
+        assert len(read_back(sink.path)) == 4, output_format
+
+    sink = ParquetSink(tmp / 'partial.parquet', row_group_size=3)
+    sink.write(make_rows(4))
+    rows = read_back(sink.path)
+    assert len(rows) == 3 and rows[0]['award_amount'] == 99.0, rows
+    sink.close()
+    assert len(read_back(sink.path)) == 4
+    print("✓ Partial output readable before close (CSV/NDJSON rows, Parquet row groups)")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        test_formats(Path(tmp))
+        test_partial_output(Path(tmp))
+
+
+if __name__ == "__main__":
+    main()
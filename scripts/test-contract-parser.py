@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test Contract Paragraph Parser
+Runs contract_paragraph_parser over the award paragraphs of the saved
+defense.gov article (dod-article-4319114.html) and the TS scraper's
+extracted-contracts-1764682796375.json, and compares every parsed row with
+scripts/fixtures/contracts/golden_contracts.json (minus scraped_at and the
+two columns that repeat the paragraph itself).
+
+Usage: python3 scripts/test-contract-parser.py [--update]   (--update rewrites the golden file)
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).parent))
+from contract_paragraph_parser import VENDOR_RE, _has_vendor_tail, parse_contract_paragraph
+
+REPO_ROOT = Path(__file__).parent.parent
+ARTICLE_HTML = REPO_ROOT / "dod-article-4319114.html"
+EXTRACTED_JSON = REPO_ROOT / "extracted-contracts-1764682796375.json"
+GOLDEN = Path(__file__).parent / "fixtures" / "contracts" / "golden_contracts.json"
+
+ARTICLE_DATE = '2025-01-01T00:00:00'
+
+# Same tail VENDOR_RE and VENDOR_OF_RE end with
+VENDOR_TAIL_RE = re.compile(r'[A-Z]{2},?\s+(?:was awarded|has been awarded|received)')
+
+
+def load_paragraphs():
+    """(article_url, paragraph) pairs from both fixtures, in file order"""
+    soup = BeautifulSoup(ARTICLE_HTML.read_text(encoding='utf-8'), 'html.parser')
+    body = soup.find('div', class_='body')
+    paragraphs = [('https://www.defense.gov/News/Contracts/Contract/Article/4319114/', p.get_text(strip=True))
+                  for p in body.find_all('p') if p.get_text(strip=True)]
+
+    with open(EXTRACTED_JSON, 'r', encoding='utf-8') as f:
+        extracted = json.load(f)
+    paragraphs.extend((c['article_url'], c['rawParagraph']) for c in extracted if c.get('rawParagraph'))
+    return paragraphs
+
+
+def parse_all(paragraphs):
+    results = []
+    for article_url, paragraph in paragraphs:
+        contract = parse_contract_paragraph(paragraph, ARTICLE_DATE, article_url)
+        if contract:
+            assert contract.pop('raw_paragraph') == contract.pop('contract_description') == paragraph
+            contract.pop('scraped_at')
+        results.append(contract)
+    return results
+
+
+def test_vendor_tail():
+    cases = [
+        "Acme Widgets Inc., Reston, VA, was awarded a contract",
+        "Acme Widgets Inc.* of Reston, VA  has been awarded a contract",
+        "Acme, Dayton, OH,\n received a contract",
+        "Acme, Dayton, Oh, received a contract",
+        "Acme, Dayton, OHwas awarded",
+        "AB,  was awarded",
+        "Acme, Dayton, Ohio, was awarded a contract",
+    ]
+    for case in cases:
+        assert _has_vendor_tail(case) == bool(VENDOR_TAIL_RE.search(case)), case
+    assert VENDOR_RE.match(cases[0]) and _has_vendor_tail(cases[0])
+    print(f"✓ _has_vendor_tail agrees with the vendor pattern tail on {len(cases)} cases")
+
+
+def test_golden(update: bool):
+    paragraphs = load_paragraphs()
+    results = parse_all(paragraphs)
+
+    if update:
+        GOLDEN.parent.mkdir(parents=True, exist_ok=True)
+        with open(GOLDEN, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        print(f"✓ Wrote {GOLDEN.name}: {len(results)} paragraphs")
+        return
+
+    with open(GOLDEN, 'r', encoding='utf-8') as f:
+        golden = json.load(f)
+    assert len(results) == len(golden), (len(results), len(golden))
+    for i, (result, expected) in enumerate(zip(results, golden)):
+        assert result == expected, f"paragraph {i}: {paragraphs[i][1][:80]}\n  got      {result}\n  expected {expected}"
+
+    contracts = [r for r in results if r]
+    print(f"✓ Golden output: {len(contracts)} contracts from {len(results)} paragraphs match")
+
+
+def main():
+    test_vendor_tail()
+    test_golden('--update' in sys.argv)
+
+
+if __name__ == "__main__":
+    main()
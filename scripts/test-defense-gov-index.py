@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test Defense.gov Contract Article Index
+Runs ContractArticleIndex discovery against a synthetic contracts listing
+(one announcement per weekday, 10 per page, newest first) and checks
+coverage, top-ups and deep walks. Runs offline.
+
+Usage: python3 scripts/test-defense-gov-index.py
+"""
+
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from defense_gov_contract_index import ContractArticleIndex, parse_listing, parse_title_date
+
+PAGE_SIZE = 10
+MONTH_NAMES = ['Jan.', 'Feb.', 'March', 'April', 'May', 'June', 'July', 'Aug.', 'Sept.', 'Oct.', 'Nov.', 'Dec.']
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.status_code = 200
+        self.text = text
+
+
+class ListingSession:
+    """Serves ?Page=N of a listing with one announcement per weekday back to oldest"""
+
+    def __init__(self, oldest: date):
+        self.days = []
+        day = date.today()
+        while day >= oldest:
+            if day.weekday() < 5:
+                self.days.append(day)
+            day -= timedelta(days=1)
+        self.pages = []
+
+    def article_id(self, day: date) -> int:
+        return 3000000 + (day - date(2000, 1, 1)).days
+
+    def get(self, url, timeout=None):
+        page = int(url.split('Page=')[1]) if 'Page=' in url else 1
+        self.pages.append(page)
+        links = ''.join(
+            f'<a href="/News/Contracts/Contract/Article/{self.article_id(day)}/">'
+            f'Contracts For {MONTH_NAMES[day.month - 1]} {day.day}, {day.year}</a>'
+            # Card image link with no title, skipped
+            f'<a href="https://www.war.gov/News/Contracts/Contract/Article/{self.article_id(day)}/"></a>'
+            for day in self.days[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+        )
+        return FakeResponse(f'<html><body><a href="/News/Contracts/">Contracts</a>{links}</body></html>')
+
+
+def test_parse_title_date():
+    assert parse_title_date('Contracts For Sept. 30, 2025') == date(2025, 9, 30)
+    assert parse_title_date('Contracts for December 15, 2024') == date(2024, 12, 15)
+    assert parse_title_date('Contracts For June 3, 2019') == date(2019, 6, 3)
+    assert parse_title_date('DOD Announces 2024 Defense Acquisition Awards') is None
+    assert parse_title_date('Contracts For Feb. 30, 2024') is None
+
+    session = ListingSession(date.today() - timedelta(days=30))
+    articles = parse_listing(session.get('https://www.defense.gov/News/Contracts/').text)
+    assert len(articles) == PAGE_SIZE, len(articles)
+    article_id, url, title, published = articles[0]
+    assert url == f'https://www.defense.gov/News/Contracts/Contract/Article/{article_id}/'
+    assert published == session.days[0]
+    print("✓ parse_title_date / parse_listing")
+
+
+def test_discover():
+    today = date.today()
+    session = ListingSession(today - timedelta(days=3 * 365))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = ContractArticleIndex(session, workers=3, db_file=Path(tmp) / 'index.db')
+
+        # Empty index: walks from page 1 just past the start date
+        start = today - timedelta(days=60)
+        index.discover(start, today)
+        expected = [d for d in session.days if start <= d <= today]
+        assert [a['published_date'] for a in index.articles_between(start, today)] == \
+            [d.isoformat() for d in reversed(expected)]
+        assert index.covered_from <= start and index.covered_to == today - timedelta(days=1)
+        walked = len(session.pages)
+        assert walked <= len(expected) // PAGE_SIZE + 1 + index.workers, walked
+
+        # Covered range: no listing requests at all
+        session.pages.clear()
+        index.discover(start + timedelta(days=7), today - timedelta(days=7))
+        assert session.pages == []
+
+        # Older range: top-up from page 1, then a deep walk starting near the
+        # edge of coverage rather than at page 1 again
+        start = today - timedelta(days=2 * 365)
+        index.discover(start, today - timedelta(days=365))
+        deep_pages = [p for p in session.pages if p > index.workers]
+        assert deep_pages and min(deep_pages) >= walked - 2 * index.workers - 1, session.pages
+        expected = [d for d in session.days if start <= d <= today]
+        assert len(index.articles_between(start, today)) == len(expected)
+
+        # Past the end of the listing: everything is covered
+        session.pages.clear()
+        index.discover(date(2000, 1, 1), today)
+        assert index.covered_from == date.min
+        assert index.count() == len(session.days)
+
+    print(f"✓ discover: {len(session.days)} announcements, covered ranges skip the listing")
+
+
+def main():
+    test_parse_title_date()
+    test_discover()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test FPDS Atom Ingester
+Checks fpds_atom parsing and paging against the saved Atom pages in
+scripts/fixtures/fpds/. Runs offline; pass --live to also fetch one page
+of Alliant 2 task orders from fpds.gov.
+
+Usage: python3 scripts/test-fpds-atom.py [--live]
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from fpds_atom import FPDSAtomIngester, parse_feed, split_date_range
+
+FIXTURES = Path(__file__).parent / "fixtures" / "fpds"
+
+
+class NoWait:
+    def wait(self):
+        pass
+
+
+class FixtureResponse:
+    def __init__(self, path: Path):
+        self.raw = open(path, 'rb')
+
+    def raise_for_status(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.raw.close()
+
+
+class FixtureSession:
+    """Serves idv_orders_start_<start>.xml for the requested start offset"""
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, params=None, **kwargs):
+        self.requests.append(params)
+        return FixtureResponse(FIXTURES / f"idv_orders_start_{params['start']}.xml")
+
+
+def test_parse_feed():
+    entries, last_start = parse_feed(str(FIXTURES / "idv_orders_start_0.xml"))
+    assert len(entries) == 10, len(entries)
+    assert last_start == 10, last_start
+
+    first = entries[0]
+    assert first['award_id'] == '47QTCK18F0001'
+    assert first['referenced_idv_piid'] == 'GS00Q17GWD2003'
+    assert first['recipient_name'] == 'VENDOR 1 LLC'
+    assert first['recipient_uei'] == 'UEI000000001'
+    assert first['recipient_state'] == 'VA'
+    assert first['award_date'] == '2024-01-11'
+    assert first['award_amount'] == 1000.0
+    assert first['total_obligated'] == 5000.0
+    assert first['description'] == 'IT SERVICES & SUPPORT TASK 1'
+    assert first['awarding_agency'] == 'DEPT OF THE ARMY'
+
+    entries, last_start = parse_feed(str(FIXTURES / "empty.xml"))
+    assert entries == [] and last_start is None
+
+    print("✓ parse_feed: fields, rel=last offset and empty feed")
+
+
+def test_split_date_range():
+    windows = split_date_range('2024-01-01', '2024-03-31', 31)
+    assert windows[0] == ('2024-01-01', '2024-01-31')
+    assert windows[-1] == ('2024-03-03', '2024-03-31')
+    assert len(windows) == 3
+    print("✓ split_date_range")
+
+
+def test_ingest_to_ndjson():
+    session = FixtureSession()
+    ingester = FPDSAtomIngester(session, NoWait(), workers=2, window_days=366)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_file = Path(tmp) / "orders.ndjson"
+        total = ingester.ingest('GS00Q17GWD2003', '2024-01-01', '2024-03-31', output_file,
+                                extra_fields={'gwac_name': 'Alliant 2', 'data_source': 'FPDS'})
+
+        with open(output_file, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+
+    assert total == 13 and len(records) == 13, (total, len(records))
+    assert [r['award_id'] for r in records] == [f"47QTCK18F{i:04d}" for i in range(1, 14)]
+    assert all(r['gwac_name'] == 'Alliant 2' for r in records)
+    assert [p['start'] for p in session.requests] == [0, 10]
+    assert session.requests[0]['q'] == 'REF_IDV_PIID:"GS00Q17GWD2003" SIGNED_DATE:[2024/01/01,2024/03/31]'
+    assert ingester.failed_pages == 0
+
+    print(f"✓ FPDSAtomIngester: {total} records streamed to NDJSON in page order")
+
+
+def test_window_split():
+    session = FixtureSession()
+    ingester = FPDSAtomIngester(session, NoWait(), max_pages_per_query=1, window_days=366)
+    emitted = []
+
+    # Two pages exceed the cap of one, so the window is halved until a single
+    # day remains, then truncated to one page
+    total = ingester.ingest_window('GS00Q17GWD2003', '2024-01-01', '2024-01-02', emitted.extend)
+    queries = [p['q'] for p in session.requests]
+    assert queries[1].endswith('SIGNED_DATE:[2024/01/01,2024/01/01]'), queries
+    assert total == 20 and len(emitted) == 20, total
+
+    print("✓ FPDSAtomIngester: windows over the page cap are split")
+
+
+def test_live():
+    import requests
+    with requests.Session() as session:
+        ingester = FPDSAtomIngester(session, NoWait())
+        entries, last_start = ingester.fetch_page(
+            ingester.build_query('GS00Q17GWD2003', '2024-01-01', '2024-03-31'), 0)
+    print(f"✓ Live: {len(entries)} entries on the first page, last page start={last_start}")
+
+
+def main():
+    test_parse_feed()
+    test_split_date_range()
+    test_ingest_to_ndjson()
+    test_window_split()
+
+    if '--live' in sys.argv:
+        test_live()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test GSA/GWAC Merge Functions
+Loads create_gsa_gwac_tables.sql, FIX_GSA_TABLE_SCHEMA.sql and
+create_gsa_gwac_merge_functions.sql into a scratch schema of a real Postgres
+database, then calls merge_gsa_schedule_holders and merge_gwac_holders with
+rows shaped like the ones import-gsa-gwac-data.py sends. Checks insert and
+update counts, in-batch duplicates, SIN union and that existing values
+survive a row without them. The scratch schema is dropped afterwards.
+
+Usage: DATABASE_URL=postgresql://... python3 scripts/test-gsa-gwac-merge-functions.py
+       python3 scripts/test-gsa-gwac-merge-functions.py --database-url postgresql://...
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+try:
+    import psycopg2
+except ImportError:
+    print("❌ psycopg2 not installed. Install with: pip install psycopg2-binary")
+    sys.exit(1)
+
+REPO_ROOT = Path(__file__).parent.parent
+SQL_FILES = [
+    REPO_ROOT / "supabase/migrations/create_gsa_gwac_tables.sql",
+    REPO_ROOT / "FIX_GSA_TABLE_SCHEMA.sql",
+    REPO_ROOT / "supabase/migrations/create_gsa_gwac_merge_functions.sql",
+]
+SCHEMA = "merge_functions_test"
+
+
+def merge(cur, function_name, rows):
+    cur.execute(f"SELECT inserted_count, updated_count FROM {function_name}(%s::jsonb)", (json.dumps(rows),))
+    return cur.fetchone()
+
+
+def test_gsa(cur):
+    rows = [
+        {'contract_number': 'GS-35F-0001A', 'company_name': 'ACME CORP', 'sin_codes': ['54151S'],
+         'primary_sin': '54151S', 'company_state': 'VA', 'vendor_uei': 'UEI000000001',
+         'data_source': 'gsa_elibrary', 'last_scraped': '2024-01-01T00:00:00',
+         'unexpected_field': 'ignored'},
+        # Same contractor under a second SIN in the same batch
+        {'contract_number': 'GS-35F-0001A', 'company_name': 'ACME CORP', 'sin_codes': ['54151HACS'],
+         'primary_sin': '54151HACS', 'company_state': 'VA', 'vendor_uei': 'UEI000000001',
+         'data_source': 'gsa_elibrary', 'last_scraped': '2024-01-02T00:00:00'},
+        {'contract_number': '47QRAA21D0002', 'company_name': 'BETA LLC', 'sin_codes': ['541611'],
+         'additional_data': {'Socio-Economic': 'WOSB'}, 'data_source': 'gsa_elibrary'},
+    ]
+    assert merge(cur, 'merge_gsa_schedule_holders', rows) == (2, 0)
+
+    cur.execute("SELECT sin_codes, company_state, vendor_uei, id IS NOT NULL, created_at IS NOT NULL "
+                "FROM gsa_schedule_holders WHERE contract_number = 'GS-35F-0001A'")
+    assert cur.fetchone() == (['54151HACS', '54151S'], 'VA', 'UEI000000001', True, True)
+
+    # A later SIN file: the SIN is added, missing fields keep their value
+    later = [{'contract_number': 'GS-35F-0001A', 'company_name': 'ACME CORP', 'sin_codes': ['518210C'],
+              'primary_sin': '518210C', 'data_source': 'gsa_elibrary'}]
+    assert merge(cur, 'merge_gsa_schedule_holders', later) == (0, 1)
+    cur.execute("SELECT sin_codes, company_state, vendor_uei FROM gsa_schedule_holders "
+                "WHERE contract_number = 'GS-35F-0001A'")
+    assert cur.fetchone() == (['518210C', '54151HACS', '54151S'], 'VA', 'UEI000000001')
+
+    cur.execute("SELECT COUNT(*) FROM gsa_schedule_holders")
+    assert cur.fetchone()[0] == 2
+    print("✓ merge_gsa_schedule_holders: inserts, in-batch duplicates, SIN union, updates")
+
+
+def test_gwac(cur):
+    rows = [
+        {'gwac_name': 'Alliant 2 Unrestricted', 'contract_number': '47QTCK18D0001', 'company_name': 'ACME CORP',
+         'gwac_type': 'IT', 'managing_agency': 'GSA', 'small_business': True,
+         'data_source': 'gwac_website', 'is_active': True, 'last_scraped': '2024-01-01T00:00:00'},
+        {'gwac_name': 'Alliant 2 Unrestricted', 'contract_number': '47QTCK18D0001', 'company_name': 'ACME CORP',
+         'company_city': 'Reston', 'data_source': 'gwac_website', 'last_scraped': '2024-01-02T00:00:00'},
+        {'gwac_name': 'SEWP VI', 'contract_number': 'NNG15SC01B', 'company_name': 'BETA LLC',
+         'data_source': 'gwac_website'},
+    ]
+    assert merge(cur, 'merge_gwac_holders', rows) == (2, 0)
+
+    # The latest row in the batch wins
+    cur.execute("SELECT company_city, small_business, is_active FROM gwac_holders "
+                "WHERE contract_number = '47QTCK18D0001'")
+    assert cur.fetchone() == ('Reston', False, True)
+
+    again = [{'gwac_name': 'Alliant 2 Unrestricted', 'contract_number': '47QTCK18D0001',
+              'company_name': 'ACME CORP', 'small_business': True, 'data_source': 'gwac_website'}]
+    assert merge(cur, 'merge_gwac_holders', again) == (0, 1)
+    cur.execute("SELECT company_city, small_business FROM gwac_holders WHERE contract_number = '47QTCK18D0001'")
+    assert cur.fetchone() == ('Reston', True)
+    print("✓ merge_gwac_holders: inserts, latest row per batch, updates keep existing values")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--database-url', default=os.getenv('DATABASE_URL'))
+    args = arg_parser.parse_args()
+
+    if not args.database_url:
+        print("❌ Set DATABASE_URL or pass --database-url")
+        sys.exit(1)
+
+    conn = psycopg2.connect(args.database_url)
+    conn.autocommit = True
+    cur = conn.cursor()
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    cur.execute(f"CREATE SCHEMA {SCHEMA}")
+    try:
+        cur.execute(f"SET search_path TO {SCHEMA}, public")
+        for sql_file in SQL_FILES:
+            cur.execute(sql_file.read_text())
+        test_gsa(cur)
+        test_gwac(cur)
+    finally:
+        cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
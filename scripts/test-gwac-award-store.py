@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test GWAC Award Store
+Checks gwac_sync_state.AwardStore (per-run de-duplication, legacy master
+import, chunked reads), that gwac-historical-scraper-auto.py splits a
+window deeper than the search endpoint's page limit instead of truncating
+it, and that gwac-historical-scraper.py streams each page to the store and
+sink without keeping the awards, then summarizes the whole store. Uses
+fake sessions, so it runs offline.
+
+Usage: python3 scripts/test-gwac-award-store.py
+"""
+
+import importlib.util
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from award_sinks import AWARD_FIELDS, NUMERIC_FIELDS
+from gwac_sync_state import AwardStore
+
+spec = importlib.util.spec_from_file_location("gwac_historical_scraper_auto",
+    Path(__file__).parent / "gwac-historical-scraper-auto.py")
+auto_scraper = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(auto_scraper)
+
+spec = importlib.util.spec_from_file_location("gwac_historical_scraper",
+    Path(__file__).parent / "gwac-historical-scraper.py")
+historical_scraper = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(historical_scraper)
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    """Serves one award per day; a window can only be paged 2 rows deep"""
+
+    def __init__(self, days: int):
+        self.days = days
+        self.requests = []
+
+    def post(self, url, json=None, timeout=None):
+        period = json['filters']['time_period'][0]
+        start, end = int(period['start_date'][-2:]), int(period['end_date'][-2:])
+        rows = [{'Award ID': f"AWD{day:02d}", 'Recipient Name': 'ACME CORP', 'Award Amount': day}
+                for day in range(start, min(end, self.days) + 1)]
+        page, limit = json['page'], json['limit']
+        self.requests.append((period['start_date'], period['end_date'], page))
+        results = rows[(page - 1) * limit:page * limit]
+        return FakeResponse({'results': results,
+                             'page_metadata': {'hasNext': page * limit < len(rows)}})
+
+
+def test_store():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        legacy = tmp / "master.json"
+        legacy.write_text(json.dumps([{'award_id': 'A', 'recipient_name': 'ACME', 'award_amount': '5'}]))
+
+        store = AwardStore(tmp / "awards.db", AWARD_FIELDS, NUMERIC_FIELDS, legacy_master=legacy)
+        assert store.count() == 1
+
+        # Reopening a non-empty store does not import the master again
+        store = AwardStore(tmp / "awards.db", AWARD_FIELDS, NUMERIC_FIELDS, legacy_master=legacy)
+        new = store.upsert([{'award_id': 'A', 'recipient_name': 'ACME', 'award_amount': 7},
+                            {'award_id': 'B', 'recipient_name': 'BETA', 'award_amount': '3'},
+                            {'award_id': 'B', 'recipient_name': 'BETA', 'award_amount': 4}])
+        assert [award['award_id'] for award in new] == ['A', 'B']
+        assert store.upsert([{'award_id': 'A', 'recipient_name': 'ACME', 'award_amount': 9}]) == []
+        assert store.count() == 2 and store.count(this_run=True) == 2
+
+        rows = [row for chunk in store.iter_chunks(['award_id', 'award_amount'], chunk_size=1) for row in chunk]
+        assert sorted(rows) == [('A', 7.0), ('B', 3.0)]
+        assert store.top_totals('recipient_name', 'award_amount', limit=1) == [('ACME', 7.0)]
+    print("✓ AwardStore: per-run de-duplication, legacy import, chunked reads")
+
+
+def test_window_split():
+    auto_scraper.PAGE_LIMIT = 1
+    auto_scraper.MAX_PAGES_PER_QUERY = 2
+    auto_scraper.time.sleep = lambda seconds: None
+    gwac_info = auto_scraper.GWAC_CONTRACTS['alliant2']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AwardStore(Path(tmp) / "awards.db", auto_scraper.AUTO_AWARD_FIELDS, auto_scraper.NUMERIC_FIELDS)
+        session = FakeSession(days=7)
+        fetched, complete = auto_scraper.fetch_window(session, store, 'alliant2', gwac_info,
+                                                      '2024-01-01', '2024-01-07')
+        assert complete and fetched == 7 and store.count() == 7
+        assert ('2024-01-01', '2024-01-04', 1) in session.requests
+
+        # A single day deeper than the page limit can't be split further
+        session = FakeSession(days=31)
+        session.post = lambda url, json=None, timeout=None: FakeResponse({
+            'results': [{'Award ID': f"DAY{json['page']}"}], 'page_metadata': {'hasNext': True}})
+        fetched, complete = auto_scraper.fetch_window(session, store, 'alliant2', gwac_info,
+                                                      '2024-02-01', '2024-02-01')
+        assert not complete and fetched == 2
+    print("✓ Auto scraper splits deep windows and reports truncated days as incomplete")
+
+
+def test_page_ingestion():
+    with tempfile.TemporaryDirectory() as tmp:
+        # An award stored by an earlier run
+        (Path(tmp) / "gwac_historical_awards_master.json").write_text(json.dumps(
+            [{'award_id': 'OLD01', 'recipient_name': 'BETA LLC', 'gwac_name': 'Alliant 2', 'award_amount': 10}]))
+        scraper = historical_scraper.GWACHistoricalScraper(output_dir=tmp, max_workers=2, min_request_interval=0)
+        gwac_info = scraper.GWAC_CONTRACTS['alliant2']
+        # Both fiscal quarters serve the same awards; only the first copies are new
+        scraper.session = FakeSession(days=3)
+        with scraper._open_award_sink('awards') as sink:
+            new_count = scraper.scrape_usaspending_gwac('alliant2', gwac_info, '2024-01-01', '2024-06-30', sink=sink)
+        assert new_count == 3 and sink.rows_written == 3 and scraper.award_store.count() == 4
+        assert len(scraper.session.requests) == 2
+
+        # The summary covers the whole store, not just this run
+        aggregated = scraper.aggregate_by_contractor()
+        assert [(c['contractor_name'], c['total_awards'], c['total_value']) for c in aggregated] == \
+            [('BETA LLC', 1, 10.0), ('ACME CORP', 3, 6.0)]
+    print("✓ Historical scraper streams pages to the store and sink, summarizes the whole store")
+
+
+def main():
+    test_store()
+    test_window_split()
+    test_page_ingestion()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test House PTR Pipeline
+Runs PTRPipeline over the PDFs already in pdf_cache (served as cache hits,
+so nothing is downloaded) and checks that every PTR comes back in
+submission order with the same trades and parser stats as parsing the PDFs
+one by one with PTRParser. Then runs it twice more against an empty
+PTRParseCache: the second run must answer every PDF from the cache, and a
+parser version bump must miss.
+
+Usage: python3 scripts/test-ptr-pipeline.py [--limit N] [--parse-workers N]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from pdf_downloader import PDFDownloader
+from pdf_parser import PTRParser
+from ptr_parse_cache import PTRParseCache
+from ptr_pipeline import PTRPipeline
+
+REPO_ROOT = Path(__file__).parent.parent
+PDF_CACHE = REPO_ROOT / "pdf_cache"
+PTR_URL = "https://disclosures-clerk.house.gov/public_disc/ptr-pdfs/2024/{}"
+
+
+class MissingDownloader(PDFDownloader):
+    """Cache-only downloader: anything not in the cache fails without a request"""
+
+    def download_pdf(self, url, filename=None, retry=3):
+        if not (self.cache_dir / self._url_to_filename(url)).exists():
+            with self._stats_lock:
+                self.failed += 1
+            return None
+        return super().download_pdf(url, filename, retry)
+
+
+def run_pipeline(urls, parser, parse_workers=None):
+    downloader = MissingDownloader(cache_dir=str(PDF_CACHE))
+    start = time.time()
+    with PTRPipeline(downloader, parser, download_workers=3, parse_workers=parse_workers,
+                     queue_size=4) as pipeline:
+        for n, url in enumerate(urls):
+            pipeline.submit(url, {'n': n, 'pdf_url': url})
+    return pipeline, downloader, time.time() - start
+
+
+def test_parse_cache(urls, expected, parse_workers):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = Path(tmp) / 'parsed_trades.db'
+
+        cold = PTRParser(cache=PTRParseCache(db_file, parser_version=PTRParser.VERSION))
+        pipeline, _, cold_seconds = run_pipeline(urls, cold, parse_workers)
+        assert [trades for _, trades in pipeline.results] == expected
+        assert cold.cache_hits == 0
+
+        warm = PTRParser(cache=PTRParseCache(db_file, parser_version=PTRParser.VERSION))
+        assert warm.cache.count() == len(urls) - 1
+        pipeline, _, warm_seconds = run_pipeline(urls, warm, parse_workers)
+        assert [trades for _, trades in pipeline.results] == expected
+        assert warm.cache_hits == len(urls) - 1 and warm.pages_parsed == 0, warm.get_stats()
+        assert warm.trades_found == cold.trades_found
+
+        # A new parser version drops the old entries, so every PDF is parsed again
+        bumped = PTRParser(cache=PTRParseCache(db_file, parser_version=PTRParser.VERSION + 1))
+        assert bumped.cache.count() == 0
+        pdf_path = PDF_CACHE / urls[0].rsplit('/', 1)[1]
+        bumped.VERSION = PTRParser.VERSION + 1
+        assert bumped.parse_pdf(str(pdf_path)) == expected[0] and bumped.cache_hits == 0
+
+    print(f"✓ Parse cache: cold {cold_seconds:.1f}s, warm {warm_seconds:.1f}s "
+          f"({warm.cache_hits} PDFs answered from the cache), version bump invalidates")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--limit', type=int, default=20)
+    arg_parser.add_argument('--parse-workers', type=int, default=None)
+    args = arg_parser.parse_args()
+
+    pdfs = sorted(PDF_CACHE.glob('*.pdf'))[:args.limit]
+    if not pdfs:
+        print(f"❌ No PDFs in {PDF_CACHE}")
+        sys.exit(1)
+
+    start = time.time()
+    sequential = PTRParser()
+    expected = [sequential.parse_pdf(str(pdf)) for pdf in pdfs]
+    sequential_seconds = time.time() - start
+
+    urls = [PTR_URL.format(pdf.name) for pdf in pdfs]
+    # One PTR that is not in the cache: comes back empty, in its place
+    urls.insert(len(urls) // 2, PTR_URL.format('missing-ptr.pdf'))
+    expected.insert(len(expected) // 2, [])
+
+    parser = PTRParser()
+    pipeline, downloader, pipeline_seconds = run_pipeline(urls, parser, args.parse_workers)
+
+    results = pipeline.results
+    assert [job['n'] for job, _ in results] == list(range(len(urls)))
+    for (job, trades), expected_trades in zip(results, expected):
+        assert trades == expected_trades, job['pdf_url']
+
+    assert pipeline.stats['parsed'] == len(pdfs) and pipeline.stats['download_failed'] == 1, pipeline.stats
+    assert parser.pages_parsed == sequential.pages_parsed, (parser.pages_parsed, sequential.pages_parsed)
+    assert parser.trades_found == sum(len(t) for t in expected)
+    assert downloader.cached == len(pdfs) and downloader.downloaded == 0
+
+    print(f"\n✓ {len(urls)} PTRs through the pipeline match sequential parsing "
+          f"({parser.trades_found} trades, {parser.pages_parsed} pages)")
+    print(f"✓ Sequential {sequential_seconds:.1f}s, pipeline {pipeline_seconds:.1f}s "
+          f"with {pipeline.parse_workers} parse processes")
+
+    test_parse_cache(urls, expected, args.parse_workers)
+
+
+if __name__ == "__main__":
+    main()
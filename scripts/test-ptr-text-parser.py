@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test PTR Text-Layer Parser
+Feeds PTRParser's page triage and text-layer parser lines in the layouts
+found in pdf_cache (2016 owner-code rows, 2019-2020 small-caps fonts, 2022+
+NUL-padded detail labels), including wrapped amount ranges and a
+transaction split across a page break. Runs offline.
+
+Usage: python3 scripts/test-ptr-text-parser.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from pdf_parser import (NON_TRANSACTION_PAGE, TABLE_PAGE, TRANSACTION_PAGE, PTRParser,
+                        classify_page_text, clean_text, is_detail_label)
+
+PAGE_2016 = """Filing Id #20005757
+TrANSAcTIONS
+ID Owner Asset Transaction Date Notification Amount
+Type Date
+SP CaPE FEaR PUb UTIL aUTH N C WTR P 05/13/2016 08/23/2016 $1,001 - $15,000
+& SWR SYS REV RF JUN16 5.00%
+aUg01 2023
+FILINg STaTUS: New
+SUbHoLdINg oF: Spouse Muni account 176
+SP dISTRICT CoLUMbIa SER a JUN16 P 06/8/2016 08/23/2016 $1,001 - $15,000
+5.00% JUN01 2022
+FILINg STaTUS: New"""
+
+PAGE_2020 = """ID Owner Asset Transaction Date Notification Amount Cap.
+Type Date Gains >
+$200?
+abbott laboratories (aBT) [ST] S 02/20/2020 03/03/2020 $1,001 - $15,000 gfedc
+FIlINg STaTuS: New
+alibaba group Holding limited S 02/20/2020 03/03/2020 $15,001 - gfedcb
+american Depositary Shares each $50,000
+representing eight Ordinary share
+(BaBa) [ST]
+FIlINg STaTuS: New
+Microsoft Corporation (MSFT) S 02/20/2020 03/03/2020 $15,001 - gfedcb"""
+
+# Next page: column headings, then the rest of the Microsoft row
+PAGE_2020_NEXT = """ID Owner Asset Transaction Date Notification Amount Cap.
+Type Date Gains >
+$200?
+gfedcb
+[ST] $50,000
+FIlINg STaTuS: New"""
+
+PAGE_2023 = clean_text("""JT Berkshire Hathaway Inc. New S (partial) 02/15/2023 02/22/2023 $50,001 -
+(BRK.B) [ST] $100,000
+F\x00\x00\x00\x00\x00 S\x00\x00\x00\x00\x00: New
+S\x00\x00\x00\x00\x00\x00\x00\x00\x00 O\x00: Fidelity Joint TBE
+JT Apple Inc. (AAPL) [ST] S (partial) 02/15/2023 02/22/2023 $15,001 -
+$50,000
+F\x00\x00\x00\x00\x00 S\x00\x00\x00\x00\x00: New
+* For the complete list of asset type abbreviations, please visit https://fd.house.gov/reference/asset-type-codes.aspx.""")
+
+CERTIFICATION = """gfedcb I CERTIFY that the statements I have made on the attached Periodic Transaction Report are true, complete, and correct to the
+best of my knowledge and belief.
+Digitally Signed: Hon. Michael R. Turner , 03/16/2017"""
+
+
+def parse_pages(*pages):
+    parser = PTRParser()
+    trades = []
+    for page_num, text in enumerate(pages, 1):
+        trades.extend(parser._parse_text(text, page_num))
+    return trades + parser._close_text()
+
+
+def test_triage():
+    assert classify_page_text(PAGE_2016) == TRANSACTION_PAGE
+    assert classify_page_text(PAGE_2023) == TRANSACTION_PAGE
+    assert classify_page_text(CERTIFICATION) == NON_TRANSACTION_PAGE
+    assert classify_page_text("Asset Owner Amount\nSome Fund 5/1/2020 $1,001 - $15,000") == TABLE_PAGE
+    assert is_detail_label("F S: New") and is_detail_label("SUbHoLdINg oF: Spouse Muni account 176")
+    assert not is_detail_label("Shares (UBS) [ST] $250,000")
+    print("✓ Page triage")
+
+
+def test_owner_and_continuation():
+    first, second = parse_pages(PAGE_2016)
+    assert first['asset_description'] == 'CaPE FEaR PUb UTIL aUTH N C WTR\n& SWR SYS REV RF JUN16 5.00%\naUg01 2023'
+    assert first['transaction_type'] == 'purchase' and first['transaction_date'] == '2016-05-13'
+    assert first['amount_range'] == '$1,001 - $15,000' and first['ticker'] is None
+    assert second['transaction_date'] == '2016-06-08'
+    print("✓ Owner codes and wrapped asset names")
+
+
+def test_wrapped_amounts_and_page_breaks():
+    abbott, alibaba, microsoft = parse_pages(PAGE_2020, PAGE_2020_NEXT)
+    assert abbott['ticker'] == 'ABT' and abbott['transaction_type'] == 'sale'
+    assert alibaba['amount_range'] == '$15,001 - $50,000'
+    assert alibaba['asset_description'].split('\n')[1] == 'american Depositary Shares each'
+    assert alibaba['ticker'] == 'BABA'
+    assert microsoft['asset_description'] == 'Microsoft Corporation (MSFT)\n[ST]'
+    assert microsoft['amount_range'] == '$15,001 - $50,000' and microsoft['page_num'] == 1
+
+    berkshire, apple = parse_pages(PAGE_2023)
+    assert berkshire['transaction_type'] == 'sale' and berkshire['amount_range'] == '$50,001 - $100,000'
+    assert berkshire['asset_description'] == 'Berkshire Hathaway Inc. New\n(BRK.B) [ST]'
+    assert apple['ticker'] == 'AAPL' and apple['amount_range'] == '$15,001 - $50,000'
+    print("✓ Wrapped amount ranges, NUL-padded labels and page breaks")
+
+
+def test_transaction_types():
+    parser = PTRParser()
+    for raw, expected in [('P', 'purchase'), ('S', 'sale'), ('S (partial)', 'sale'),
+                          ('Sale (Full)', 'sale'), ('E', 'exchange'), ('Purchase', 'purchase')]:
+        assert parser._normalize_transaction_type(raw) == expected, raw
+    print("✓ Transaction types")
+
+
+def main():
+    test_triage()
+    test_owner_and_continuation()
+    test_wrapped_amounts_and_page_breaks()
+    test_transaction_types()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Test USAspending Bulk Archive Ingestion
+Builds a small fixture zip shaped like a USAspending contracts archive and
+checks that iter_archive_awards filters it and maps each row to the
+scrape_usaspending_gwac record shape. Also runs download_idv_archives
+against a fake session (one job per GWAC, failures skipped) and checks that
+GWACHistoricalScraper merges several archives into one run. Runs offline.
+
+Usage: python3 scripts/test-usaspending-bulk.py [path/to/archive.zip]
+"""
+
+import csv
+import importlib.util
+import io
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from usaspending_bulk import download_idv_archives, iter_archive_awards
+
+GWACS = {
+    'alliant2': {'name': 'Alliant 2', 'idv_piid': 'GS00Q17GWD2003'},
+    'oasis': {'name': 'OASIS Unrestricted', 'idv_piid': 'GS00Q14OADU130'},
+}
+
+RECORD_KEYS = {
+    'gwac_key', 'gwac_name', 'gwac_parent_contract', 'award_id',
+    'recipient_name', 'recipient_uei', 'recipient_duns', 'recipient_city',
+    'recipient_state', 'award_amount', 'total_outlayed', 'start_date',
+    'end_date', 'description', 'awarding_agency', 'awarding_sub_agency',
+    'award_type', 'data_source', 'scraped_at'
+}
+
+FIELDS = [
+    'award_id_piid', 'parent_award_id_piid', 'recipient_name', 'recipient_uei',
+    'recipient_duns', 'recipient_city_name', 'recipient_state_code',
+    'total_dollars_obligated', 'total_outlayed_amount_for_overall_award',
+    'period_of_performance_start_date', 'period_of_performance_current_end_date',
+    'prime_award_base_transaction_description', 'awarding_agency_name',
+    'awarding_sub_agency_name', 'award_type'
+]
+
+ROWS = [
+    # Alliant 2 task order, listed twice (two transactions)
+    ['47QTCK18F0001', 'GS00Q17GWD2003', 'ACME CORP', 'ABC123DEF456', '', 'RESTON', 'VA',
+     '1500000.50', '1200000', '2018-03-01 00:00:00', '2023-02-28', 'IT SUPPORT', 'DEPARTMENT OF DEFENSE',
+     'DEPARTMENT OF THE ARMY', 'DELIVERY ORDER'],
+    ['47QTCK18F0001', 'GS00Q17GWD2003', 'ACME CORP', 'ABC123DEF456', '', 'RESTON', 'VA',
+     '1500000.50', '1200000', '2018-03-01 00:00:00', '2023-02-28', 'IT SUPPORT', 'DEPARTMENT OF DEFENSE',
+     'DEPARTMENT OF THE ARMY', 'DELIVERY ORDER'],
+    # OASIS task order with a long description and no outlay
+    ['GS00Q14OADU130-0042', 'GS00Q14OADU130', 'BETA LLC', 'XYZ987', '', 'ARLINGTON', 'VA',
+     '250000', '', '2019-10-01', '2020-09-30', 'PROGRAM SUPPORT, "PHASE 2"\n' + 'X' * 200000,
+     'GENERAL SERVICES ADMINISTRATION', 'FEDERAL ACQUISITION SERVICE', 'DELIVERY ORDER'],
+    # Unrelated contract
+    ['W91CRB20C0001', 'W91CRB19D0001', 'GAMMA INC', 'QQQ111', '', 'AUSTIN', 'TX',
+     '99', '', '2020-01-01', '2020-12-31', 'WIDGETS', 'DEPARTMENT OF DEFENSE',
+     'DEPARTMENT OF THE ARMY', 'DEFINITIVE CONTRACT'],
+]
+
+
+def build_fixture(path: Path):
+    """Write a two-member archive like FY20XX_All_Contracts_Full_*.zip"""
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for i, rows in enumerate([ROWS[:2], ROWS[2:]], 1):
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(FIELDS)
+            writer.writerows(rows)
+            archive.writestr(f"FY2020_All_Contracts_Full_20240101_{i}.csv", buffer.getvalue())
+        archive.writestr("Data_Dictionary_Crosswalk.txt", "not a csv")
+
+
+def test_fixture_archive(archive_path: Path):
+    awards = list(iter_archive_awards(archive_path, GWACS))
+
+    # Repeated transaction rows are left for the award store to collapse
+    assert len(awards) == 3, f"expected 3 GWAC rows, got {len(awards)}"
+    assert all(set(award) == RECORD_KEYS for award in awards), "record shape differs from scrape_usaspending_gwac"
+
+    alliant, alliant_again, oasis = awards
+    assert alliant_again == alliant
+    assert alliant['gwac_key'] == 'alliant2'
+    assert alliant['award_id'] == '47QTCK18F0001'
+    assert alliant['award_amount'] == 1500000.50
+    assert alliant['start_date'] == '2018-03-01'
+    assert alliant['recipient_duns'] is None
+
+    assert oasis['gwac_name'] == 'OASIS Unrestricted'
+    assert oasis['total_outlayed'] is None
+    assert oasis['description'].startswith('PROGRAM SUPPORT, "PHASE 2"')
+
+    print(f"✓ Fixture archive: {len(awards)} GWAC rows, shape and values match")
+
+
+class FakeResponse:
+    def __init__(self, data=None, content=b''):
+        self.data = data
+        self.content = content
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+    def iter_content(self, chunk_size):
+        yield self.content
+
+
+class FakeDownloadSession:
+    """Alliant 2 has an IDV whose job runs once before finishing; OASIS has none"""
+
+    def __init__(self):
+        self.polls = 0
+        self.started = []
+
+    def post(self, url, json=None, timeout=None):
+        if url.endswith('/spending_by_award/'):
+            piid = json['filters']['award_ids'][0]
+            results = [{'Award ID': piid, 'generated_internal_id': f"CONT_IDV_{piid}_4732"}]
+            return FakeResponse({'results': results if piid == 'GS00Q17GWD2003' else []})
+        self.started.append(json['award_id'])
+        return FakeResponse({'file_name': f"{json['award_id']}.zip"})
+
+    def get(self, url, params=None, timeout=None, stream=False):
+        if url.endswith('/download/status'):
+            self.polls += 1
+            if self.polls == 1:
+                return FakeResponse({'status': 'running', 'total_rows': 10})
+            return FakeResponse({'status': 'finished', 'file_url': f"https://files.example/{params['file_name']}"})
+        return FakeResponse(content=b'zip bytes')
+
+
+def test_idv_downloads(tmp: Path):
+    session = FakeDownloadSession()
+    archives = download_idv_archives(session, GWACS, tmp / "bulk", poll_interval=0)
+
+    assert session.started == ['CONT_IDV_GS00Q17GWD2003_4732']
+    assert archives == [tmp / "bulk" / "alliant2_CONT_IDV_GS00Q17GWD2003_4732.zip"]
+    assert archives[0].read_bytes() == b'zip bytes'
+    print("✓ IDV downloads: one job per GWAC, GWACs without an IDV skipped")
+
+
+def test_archive_merge(tmp: Path, archive_path: Path):
+    spec = importlib.util.spec_from_file_location("gwac_historical_scraper",
+        Path(__file__).parent / "gwac-historical-scraper.py")
+    historical_scraper = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(historical_scraper)
+
+    scraper = historical_scraper.GWACHistoricalScraper(output_dir=str(tmp / "out"))
+    scraper.GWAC_CONTRACTS = GWACS
+    # The same orders in two archives count once
+    fetched, aggregated = scraper.scrape_bulk_archive([archive_path, archive_path])
+    assert fetched == 2 and scraper.award_store.count() == 2
+    assert sorted(c['contractor_name'] for c in aggregated) == ['ACME CORP', 'BETA LLC']
+    print("✓ Archives merged into one run")
+
+
+def main():
+    if len(sys.argv) > 1:
+        awards = list(iter_archive_awards(Path(sys.argv[1]), GWACS))
+        print(f"Read {len(awards)} GWAC awards from {sys.argv[1]}")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive_path = Path(tmp) / "fixture_contracts.zip"
+        build_fixture(archive_path)
+        test_fixture_archive(archive_path)
+        test_idv_downloads(Path(tmp))
+        test_archive_merge(Path(tmp), archive_path)
+
+
+if __name__ == "__main__":
+    main()
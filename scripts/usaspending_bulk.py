@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+USAspending Bulk Award Archive Ingestion
+Reads USAspending bulk award downloads (zipped CSVs) and emits GWAC task
+order records in the same shape as GWACHistoricalScraper.scrape_usaspending_gwac.
+
+Archives can come from:
+1. An IDV download job (/api/v2/download/idv/), one per GWAC parent
+   contract, polled until ready. Each archive holds only that IDV's orders,
+   not every federal contract in the date range.
+2. A local file, e.g. an Award Data Archive zip from files.usaspending.gov
+
+CSV members are decompressed and parsed as a stream, one row at a time, so
+memory stays constant regardless of archive size. Rows are kept only when
+their parent_award_id_piid is one of the configured GWAC parent PIIDs; an
+award listed once per transaction is de-duplicated downstream, by the award
+store, rather than tracked here.
+"""
+
+import csv
+import io
+import sys
+import time
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import logging
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+SPENDING_BY_AWARD_URL = "https://api.usaspending.gov/api/v2/search/spending_by_award/"
+IDV_DOWNLOAD_URL = "https://api.usaspending.gov/api/v2/download/idv/"
+DOWNLOAD_STATUS_URL = "https://api.usaspending.gov/api/v2/download/status"
+IDV_AWARD_TYPE_CODES = ["IDV_A", "IDV_B", "IDV_B_A", "IDV_B_B", "IDV_B_C", "IDV_C", "IDV_D", "IDV_E"]
+
+# Contract descriptions can exceed the csv module's default field limit
+csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+
+
+def _amount(value: Optional[str]) -> Optional[float]:
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _date(value: Optional[str]) -> Optional[str]:
+    return value[:10] if value else None
+
+
+def find_idv_award_id(session: requests.Session, piid: str) -> Optional[str]:
+    """
+    Look up the generated award id (e.g. CONT_IDV_<PIID>_<agency>) that the
+    download endpoints expect for an IDV's PIID. Returns None if not found.
+    """
+    payload = {
+        "filters": {"award_type_codes": IDV_AWARD_TYPE_CODES, "award_ids": [piid]},
+        "fields": ["Award ID"],
+        "page": 1,
+        "limit": 10
+    }
+    response = session.post(SPENDING_BY_AWARD_URL, json=payload, timeout=30)
+    response.raise_for_status()
+
+    for result in response.json().get('results', []):
+        if result.get('Award ID') == piid:
+            return result.get('generated_internal_id')
+    return None
+
+
+def start_idv_download(session: requests.Session, idv_award_id: str) -> str:
+    """Start a download job for one IDV's orders; returns the job's file name"""
+    response = session.post(IDV_DOWNLOAD_URL, json={"award_id": idv_award_id, "file_format": "csv"}, timeout=60)
+    response.raise_for_status()
+    file_name = response.json()['file_name']
+    logger.info(f"IDV download job started for {idv_award_id}: {file_name}")
+    return file_name
+
+
+def wait_for_download(session: requests.Session, file_name: str,
+                      poll_interval: float = 10, timeout: float = 3 * 3600) -> str:
+    """Poll a download job until it finishes; returns the URL of its zip archive"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status_response = session.get(DOWNLOAD_STATUS_URL, params={'file_name': file_name}, timeout=30)
+        status_response.raise_for_status()
+        status = status_response.json()
+
+        if status.get('status') == 'finished':
+            logger.info(f"Download ready: {status['file_url']}")
+            return status['file_url']
+        if status.get('status') == 'failed':
+            raise RuntimeError(f"Download {file_name} failed: {status.get('message')}")
+
+        logger.info(f"  {file_name}: {status.get('status')} ({status.get('total_rows') or 0} rows so far)")
+        time.sleep(poll_interval)
+
+    raise TimeoutError(f"Download {file_name} not ready after {timeout:.0f}s")
+
+
+def download_idv_archives(session: requests.Session, gwacs: Dict[str, Dict], dest_dir: Path,
+                          poll_interval: float = 10, timeout: float = 3 * 3600) -> List[Path]:
+    """
+    Download one archive per GWAC parent contract
+
+    All jobs are started before any is polled, so they are generated server
+    side in parallel. A GWAC whose lookup or job fails is logged and skipped.
+
+    Args:
+        gwacs: gwac_key -> gwac_info (needs 'name' and 'idv_piid')
+        dest_dir: Directory for the zips (<gwac_key>_<job file name>)
+
+    Returns:
+        Paths of the downloaded archives, in gwacs order
+    """
+    jobs = {}
+    for gwac_key, gwac_info in gwacs.items():
+        try:
+            idv_award_id = find_idv_award_id(session, gwac_info['idv_piid'])
+            if not idv_award_id:
+                logger.warning(f"{gwac_info['name']}: no IDV found for {gwac_info['idv_piid']}, skipping")
+                continue
+            jobs[gwac_key] = start_idv_download(session, idv_award_id)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"{gwac_info['name']}: could not start download: {e}")
+
+    archives = []
+    for gwac_key, file_name in jobs.items():
+        try:
+            file_url = wait_for_download(session, file_name, poll_interval, timeout)
+            archives.append(download_archive(session, file_url, Path(dest_dir) / f"{gwac_key}_{Path(file_url).name}"))
+        except (requests.exceptions.RequestException, RuntimeError, TimeoutError) as e:
+            logger.error(f"{gwacs[gwac_key]['name']}: download failed: {e}")
+
+    return archives
+
+
+def download_archive(session: requests.Session, url: str, dest: Path) -> Path:
+    """Stream an archive to disk without holding it in memory"""
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest.with_name(dest.name + '.part')
+
+    with session.get(url, stream=True, timeout=120) as response:
+        response.raise_for_status()
+        with open(tmp_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=1024 * 1024):
+                f.write(chunk)
+
+    tmp_path.replace(dest)
+    logger.info(f"Downloaded archive to {dest} ({dest.stat().st_size / (1024 * 1024):.1f} MB)")
+    return dest
+
+
+def iter_archive_awards(archive_path: Path, gwacs: Dict[str, Dict]) -> Iterator[Dict]:
+    """
+    Yield GWAC award records from a bulk award archive
+
+    Args:
+        archive_path: Zip file containing USAspending contract CSVs
+        gwacs: gwac_key -> gwac_info (needs 'name' and 'idv_piid')
+
+    Transaction-level archives list an award once per action, and each row
+    is yielded; nothing is remembered between rows, so memory stays
+    constant. Callers collapse repeats on award_id (AwardStore.upsert keeps
+    the first copy per run).
+    """
+    by_parent = {info['idv_piid']: (key, info) for key, info in gwacs.items()}
+    scraped_at = datetime.now().isoformat()
+
+    with zipfile.ZipFile(archive_path) as archive:
+        members = [name for name in archive.namelist() if name.lower().endswith('.csv')]
+
+        for member in members:
+            logger.info(f"Reading {member} from {Path(archive_path).name}")
+            matched = 0
+
+            with archive.open(member) as raw:
+                reader = csv.DictReader(io.TextIOWrapper(raw, encoding='utf-8-sig', newline=''))
+
+                for row in reader:
+                    parent = by_parent.get(row.get('parent_award_id_piid'))
+                    if not parent:
+                        continue
+
+                    gwac_key, gwac_info = parent
+                    matched += 1
+
+                    yield {
+                        'gwac_key': gwac_key,
+                        'gwac_name': gwac_info['name'],
+                        'gwac_parent_contract': gwac_info['idv_piid'],
+                        'award_id': row.get('award_id_piid'),
+                        'recipient_name': row.get('recipient_name') or None,
+                        'recipient_uei': row.get('recipient_uei') or None,
+                        'recipient_duns': row.get('recipient_duns') or None,
+                        'recipient_city': row.get('recipient_city_name') or None,
+                        'recipient_state': row.get('recipient_state_code') or None,
+                        'award_amount': _amount(row.get('total_dollars_obligated')
+                                                or row.get('federal_action_obligation')),
+                        'total_outlayed': _amount(row.get('total_outlayed_amount_for_overall_award')),
+                        'start_date': _date(row.get('period_of_performance_start_date')),
+                        'end_date': _date(row.get('period_of_performance_current_end_date')),
+                        'description': (row.get('prime_award_base_transaction_description')
+                                        or row.get('transaction_description') or None),
+                        'awarding_agency': row.get('awarding_agency_name') or None,
+                        'awarding_sub_agency': row.get('awarding_sub_agency_name') or None,
+                        'award_type': row.get('award_type') or None,
+                        'data_source': 'USAspending.gov',
+                        'scraped_at': scraped_at
+                    }
+
+            logger.info(f"  {member}: {matched} GWAC rows")
@@ -0,0 +1,70 @@
+-- =====================================================
+-- Function to Link GSA/GWAC Holders to Company Intelligence
+-- =====================================================
+-- Recomputes company_intelligence.gsa_schedules and gwacs for the given
+-- vendor UEIs only. scripts/import-gsa-gwac-data.py passes the UEIs touched
+-- by the current import in batches, so a run never rescans every holder
+-- for every company. Rows whose arrays are unchanged are not rewritten.
+-- =====================================================
+
+ALTER TABLE company_intelligence
+  ADD COLUMN IF NOT EXISTS gsa_schedules TEXT[],
+  ADD COLUMN IF NOT EXISTS gwacs TEXT[];
+
+-- Lookups below join on vendor_uei for active holders only
+CREATE INDEX IF NOT EXISTS idx_gsa_schedule_active_uei
+  ON gsa_schedule_holders(vendor_uei) WHERE is_active = true;
+CREATE INDEX IF NOT EXISTS idx_gwac_holders_active_uei
+  ON gwac_holders(vendor_uei) WHERE is_active = true;
+CREATE INDEX IF NOT EXISTS idx_ci_uei ON company_intelligence(vendor_uei);
+
+CREATE OR REPLACE FUNCTION link_gsa_gwac_to_company_intelligence(ueis TEXT[])
+RETURNS INTEGER AS $$
+DECLARE
+  updated_count INTEGER;
+BEGIN
+  WITH touched AS (
+    SELECT DISTINCT u AS vendor_uei
+    FROM UNNEST(ueis) AS u
+    WHERE u IS NOT NULL AND u != ''
+  ),
+  gsa AS (
+    SELECT
+      gsh.vendor_uei,
+      ARRAY_AGG(DISTINCT gsh.schedule_number ORDER BY gsh.schedule_number)
+        FILTER (WHERE gsh.schedule_number IS NOT NULL) AS gsa_schedules
+    FROM gsa_schedule_holders gsh
+    INNER JOIN touched t ON t.vendor_uei = gsh.vendor_uei
+    WHERE gsh.is_active = true
+    GROUP BY gsh.vendor_uei
+  ),
+  gwac AS (
+    SELECT
+      gh.vendor_uei,
+      ARRAY_AGG(DISTINCT gh.gwac_name ORDER BY gh.gwac_name) AS gwacs
+    FROM gwac_holders gh
+    INNER JOIN touched t ON t.vendor_uei = gh.vendor_uei
+    WHERE gh.is_active = true
+    GROUP BY gh.vendor_uei
+  ),
+  linked AS (
+    SELECT t.vendor_uei, gsa.gsa_schedules, gwac.gwacs
+    FROM touched t
+    LEFT JOIN gsa ON gsa.vendor_uei = t.vendor_uei
+    LEFT JOIN gwac ON gwac.vendor_uei = t.vendor_uei
+  )
+  UPDATE company_intelligence ci
+  SET
+    gsa_schedules = l.gsa_schedules,
+    gwacs = l.gwacs,
+    updated_at = NOW()
+  FROM linked l
+  WHERE ci.vendor_uei = l.vendor_uei
+    AND (ci.gsa_schedules IS DISTINCT FROM l.gsa_schedules
+         OR ci.gwacs IS DISTINCT FROM l.gwacs);
+
+  GET DIAGNOSTICS updated_count = ROW_COUNT;
+
+  RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,169 @@
+-- =====================================================
+-- Bulk Merge Functions for GSA Schedule & GWAC Holders
+-- =====================================================
+-- Called over RPC by scripts/import-gsa-gwac-data.py with a JSON array of
+-- parsed holder rows. Each call reads the rows with jsonb_populate_recordset,
+-- collapses duplicates inside the batch, and upserts them in one
+-- INSERT ... ON CONFLICT statement. The insert names its columns, so id and
+-- the timestamps come from the table defaults.
+--
+-- GSA holders: sin_codes are unioned with the existing row instead of
+-- overwritten, so importing one SIN file never drops another SIN.
+-- Other columns keep their existing value when the new row has none.
+--
+-- Requires gsa_schedule_holders.additional_data (FIX_GSA_TABLE_SCHEMA.sql)
+-- =====================================================
+
+CREATE OR REPLACE FUNCTION merge_gsa_schedule_holders(holders JSONB)
+RETURNS TABLE(inserted_count INTEGER, updated_count INTEGER) AS $$
+BEGIN
+  RETURN QUERY
+  WITH staged AS (
+    SELECT * FROM jsonb_populate_recordset(NULL::gsa_schedule_holders, holders)
+  ),
+  sins AS (
+    -- Union of every SIN seen for a contractor in this batch
+    SELECT
+      st.contract_number,
+      st.company_name,
+      ARRAY_AGG(DISTINCT sin ORDER BY sin) AS sin_codes
+    FROM staged st,
+         UNNEST(COALESCE(st.sin_codes, '{}'::TEXT[])) AS sin
+    GROUP BY st.contract_number, st.company_name
+  ),
+  latest AS (
+    SELECT DISTINCT ON (st.contract_number, st.company_name) st.*
+    FROM staged st
+    ORDER BY st.contract_number, st.company_name, st.last_scraped DESC NULLS LAST
+  ),
+  upserted AS (
+    INSERT INTO gsa_schedule_holders AS t (
+      contract_number, schedule_number, sin_codes, primary_sin,
+      company_name, vendor_duns, vendor_uei, vendor_cage_code,
+      company_address, company_city, company_state, company_zip, company_country,
+      primary_contact_name, primary_contact_phone, primary_contact_email, website,
+      contract_start_date, contract_expiration_date,
+      additional_data, data_source, source_url, last_scraped
+    )
+    SELECT
+      l.contract_number, l.schedule_number, s.sin_codes, COALESCE(l.primary_sin, s.sin_codes[1]),
+      l.company_name, l.vendor_duns, l.vendor_uei, l.vendor_cage_code,
+      l.company_address, l.company_city, l.company_state, l.company_zip, COALESCE(l.company_country, 'USA'),
+      l.primary_contact_name, l.primary_contact_phone, l.primary_contact_email, l.website,
+      l.contract_start_date, l.contract_expiration_date,
+      l.additional_data, COALESCE(l.data_source, 'gsa_elibrary'), l.source_url, COALESCE(l.last_scraped, NOW())
+    FROM latest l
+    LEFT JOIN sins s
+      ON s.contract_number = l.contract_number
+     AND s.company_name = l.company_name
+    ON CONFLICT (contract_number, company_name) DO UPDATE SET
+      sin_codes = ARRAY(
+        SELECT DISTINCT x
+        FROM UNNEST(COALESCE(t.sin_codes, '{}'::TEXT[]) || COALESCE(EXCLUDED.sin_codes, '{}'::TEXT[])) AS x
+        ORDER BY x
+      ),
+      primary_sin = COALESCE(EXCLUDED.primary_sin, t.primary_sin),
+      schedule_number = COALESCE(EXCLUDED.schedule_number, t.schedule_number),
+      vendor_duns = COALESCE(EXCLUDED.vendor_duns, t.vendor_duns),
+      vendor_uei = COALESCE(EXCLUDED.vendor_uei, t.vendor_uei),
+      vendor_cage_code = COALESCE(EXCLUDED.vendor_cage_code, t.vendor_cage_code),
+      company_address = COALESCE(EXCLUDED.company_address, t.company_address),
+      company_city = COALESCE(EXCLUDED.company_city, t.company_city),
+      company_state = COALESCE(EXCLUDED.company_state, t.company_state),
+      company_zip = COALESCE(EXCLUDED.company_zip, t.company_zip),
+      company_country = COALESCE(EXCLUDED.company_country, t.company_country),
+      primary_contact_name = COALESCE(EXCLUDED.primary_contact_name, t.primary_contact_name),
+      primary_contact_phone = COALESCE(EXCLUDED.primary_contact_phone, t.primary_contact_phone),
+      primary_contact_email = COALESCE(EXCLUDED.primary_contact_email, t.primary_contact_email),
+      website = COALESCE(EXCLUDED.website, t.website),
+      contract_start_date = COALESCE(EXCLUDED.contract_start_date, t.contract_start_date),
+      contract_expiration_date = COALESCE(EXCLUDED.contract_expiration_date, t.contract_expiration_date),
+      additional_data = COALESCE(EXCLUDED.additional_data, t.additional_data),
+      data_source = EXCLUDED.data_source,
+      source_url = COALESCE(EXCLUDED.source_url, t.source_url),
+      last_scraped = EXCLUDED.last_scraped,
+      updated_at = NOW()
+    RETURNING (xmax = 0) AS was_inserted
+  )
+  SELECT
+    COUNT(*) FILTER (WHERE was_inserted)::INTEGER,
+    COUNT(*) FILTER (WHERE NOT was_inserted)::INTEGER
+  FROM upserted;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION merge_gwac_holders(holders JSONB)
+RETURNS TABLE(inserted_count INTEGER, updated_count INTEGER) AS $$
+BEGIN
+  RETURN QUERY
+  WITH staged AS (
+    SELECT * FROM jsonb_populate_recordset(NULL::gwac_holders, holders)
+  ),
+  latest AS (
+    SELECT DISTINCT ON (st.gwac_name, st.contract_number, st.company_name) st.*
+    FROM staged st
+    ORDER BY st.gwac_name, st.contract_number, st.company_name, st.last_scraped DESC NULLS LAST
+  ),
+  upserted AS (
+    INSERT INTO gwac_holders AS t (
+      gwac_name, gwac_type, managing_agency,
+      contract_number, task_order_ceiling, ordering_period_start, ordering_period_end, is_active,
+      company_name, vendor_duns, vendor_uei, vendor_cage_code,
+      company_address, company_city, company_state, company_zip, company_country,
+      primary_contact_name, primary_contact_phone, primary_contact_email, website,
+      small_business, woman_owned, veteran_owned, service_disabled_veteran_owned, hubzone, eight_a_program,
+      core_competencies, technical_areas, naics_codes, primary_naics,
+      data_source, source_url, last_scraped
+    )
+    SELECT
+      l.gwac_name, l.gwac_type, l.managing_agency,
+      l.contract_number, l.task_order_ceiling, l.ordering_period_start, l.ordering_period_end, COALESCE(l.is_active, true),
+      l.company_name, l.vendor_duns, l.vendor_uei, l.vendor_cage_code,
+      l.company_address, l.company_city, l.company_state, l.company_zip, COALESCE(l.company_country, 'USA'),
+      l.primary_contact_name, l.primary_contact_phone, l.primary_contact_email, l.website,
+      COALESCE(l.small_business, false), COALESCE(l.woman_owned, false), COALESCE(l.veteran_owned, false),
+      COALESCE(l.service_disabled_veteran_owned, false), COALESCE(l.hubzone, false), COALESCE(l.eight_a_program, false),
+      l.core_competencies, l.technical_areas, l.naics_codes, l.primary_naics,
+      COALESCE(l.data_source, 'gwac_website'), l.source_url, COALESCE(l.last_scraped, NOW())
+    FROM latest l
+    ON CONFLICT (gwac_name, contract_number, company_name) DO UPDATE SET
+      gwac_type = COALESCE(EXCLUDED.gwac_type, t.gwac_type),
+      managing_agency = COALESCE(EXCLUDED.managing_agency, t.managing_agency),
+      task_order_ceiling = COALESCE(EXCLUDED.task_order_ceiling, t.task_order_ceiling),
+      ordering_period_start = COALESCE(EXCLUDED.ordering_period_start, t.ordering_period_start),
+      ordering_period_end = COALESCE(EXCLUDED.ordering_period_end, t.ordering_period_end),
+      is_active = EXCLUDED.is_active,
+      vendor_duns = COALESCE(EXCLUDED.vendor_duns, t.vendor_duns),
+      vendor_uei = COALESCE(EXCLUDED.vendor_uei, t.vendor_uei),
+      vendor_cage_code = COALESCE(EXCLUDED.vendor_cage_code, t.vendor_cage_code),
+      company_address = COALESCE(EXCLUDED.company_address, t.company_address),
+      company_city = COALESCE(EXCLUDED.company_city, t.company_city),
+      company_state = COALESCE(EXCLUDED.company_state, t.company_state),
+      company_zip = COALESCE(EXCLUDED.company_zip, t.company_zip),
+      company_country = COALESCE(EXCLUDED.company_country, t.company_country),
+      primary_contact_name = COALESCE(EXCLUDED.primary_contact_name, t.primary_contact_name),
+      primary_contact_phone = COALESCE(EXCLUDED.primary_contact_phone, t.primary_contact_phone),
+      primary_contact_email = COALESCE(EXCLUDED.primary_contact_email, t.primary_contact_email),
+      website = COALESCE(EXCLUDED.website, t.website),
+      small_business = EXCLUDED.small_business OR t.small_business,
+      woman_owned = EXCLUDED.woman_owned OR t.woman_owned,
+      veteran_owned = EXCLUDED.veteran_owned OR t.veteran_owned,
+      service_disabled_veteran_owned = EXCLUDED.service_disabled_veteran_owned OR t.service_disabled_veteran_owned,
+      hubzone = EXCLUDED.hubzone OR t.hubzone,
+      eight_a_program = EXCLUDED.eight_a_program OR t.eight_a_program,
+      core_competencies = COALESCE(EXCLUDED.core_competencies, t.core_competencies),
+      technical_areas = COALESCE(EXCLUDED.technical_areas, t.technical_areas),
+      naics_codes = COALESCE(EXCLUDED.naics_codes, t.naics_codes),
+      primary_naics = COALESCE(EXCLUDED.primary_naics, t.primary_naics),
+      data_source = EXCLUDED.data_source,
+      source_url = COALESCE(EXCLUDED.source_url, t.source_url),
+      last_scraped = EXCLUDED.last_scraped,
+      updated_at = NOW()
+    RETURNING (xmax = 0) AS was_inserted
+  )
+  SELECT
+    COUNT(*) FILTER (WHERE was_inserted)::INTEGER,
+    COUNT(*) FILTER (WHERE NOT was_inserted)::INTEGER
+  FROM upserted;
+END;
+$$ LANGUAGE plpgsql;